@@ -20,6 +20,16 @@ class ImageConstants:
     # Qualidade de compressão JPEG
     QUALITY = 85
 
+    # Qualidade de compressão das variantes WebP
+    WEBP_QUALITY = 80
+
+    # Resolução máxima aceita (largura x altura), conferida pelo cabeçalho antes
+    # de decodificar; barra "bombas de descompressão" (arquivo pequeno, imagem enorme)
+    MAX_PIXELS = 40_000_000
+
+    # Tamanho dos blocos lidos do upload
+    UPLOAD_CHUNK_SIZE = 64 * 1024
+
     class Sizes(Enum):
         """Tamanhos padrão de imagens"""
         AVATAR = (300, 300)
@@ -27,6 +37,16 @@ class ImageConstants:
         THUMBNAIL = (150, 150)
         BANNER = (1200, 400)
 
+    # Processos dedicados ao processamento (sobrescrevível por IMAGE_WORKERS)
+    WORKERS = 2
+
+    # Uploads aguardando um processo livre; acima disso a requisição recebe 503
+    # (sobrescrevível por IMAGE_QUEUE_SIZE)
+    QUEUE_SIZE = 8
+
+    # Tempo máximo de um processamento, incluindo a espera na fila (segundos)
+    JOB_TIMEOUT = 20
+
 
 class PaginationConstants:
     """Constantes para paginação"""
@@ -82,9 +102,27 @@ class DatabaseConstants:
     # Timeout padrão para operações (segundos)
     DEFAULT_TIMEOUT = 30
 
+    # Pool de conexões (sobrescrevível por DATABASE_POOL_SIZE)
+    POOL_SIZE = 10
+
+    # Conexões ociosas há mais tempo que isso são verificadas antes do uso (segundos)
+    POOL_HEALTHCHECK_INTERVAL = 30
+
     # Tamanho máximo de lote para operações em massa
     MAX_BATCH_SIZE = 1000
 
+    # Máximo de parâmetros por cláusula IN (...) em carregamentos em lote
+    MAX_IN_PARAMS = 500
+
+    # Execuções acima deste tempo vão para o log de consultas lentas, com o
+    # plano de execução (sobrescrevível por DATABASE_SLOW_QUERY_MS)
+    SLOW_QUERY_MS = 100
+
+    # Execuções recentes guardadas por instrução para p50/p95 e consultas
+    # lentas recentes exibidas no relatório
+    SQL_STATS_SAMPLES = 500
+    SLOW_QUERY_HISTORY = 50
+
 
 class BusinessConstants:
     """Constantes de regras de negócio"""
@@ -148,6 +186,28 @@ class EmailConstants:
     MAX_ATTACHMENT_SIZE_MB = 25
 
 
+class LoggingConstants:
+    """Constantes para o logging"""
+
+    # Nível mínimo registrado (sobrescrito por LOG_LEVEL)
+    LEVEL = "INFO"
+
+    # Fração das leituras dos repositórios (listagens, consultas, contagens)
+    # registrada no log; escritas são sempre registradas
+    REPO_READ_SAMPLE_RATE = 0.05
+
+
+class TracingConstants:
+    """Constantes para o rastreamento (spans)"""
+
+    # Fração das requisições rastreadas quando TRACING_FILE está definido
+    # (sobrescrita por TRACING_SAMPLE_RATE)
+    SAMPLE_RATE = 1.0
+
+    # service.name dos spans exportados
+    SERVICE_NAME = "casebem"
+
+
 class CacheConstants:
     """Constantes para cache"""
 
@@ -159,6 +219,17 @@ class CacheConstants:
     CATEGORY_TTL = 1800  # 30 minutos
     ITEM_TTL = 300  # 5 minutos
 
+    # Intervalo entre consultas à versão da tabela (invalidação entre workers)
+    VERSION_CHECK_INTERVAL = 5  # segundos
+
+    # Intervalo entre conferências dos diretórios de imagens no índice de
+    # arquivos (arquivos gravados por outros workers)
+    FILE_INDEX_CHECK_INTERVAL = 5  # segundos
+
+    # Cache-Control dos arquivos estáticos pedidos com a versão atual na URL
+    # (?v=...): o conteúdo de uma URL versionada nunca muda
+    STATIC_IMMUTABLE_MAX_AGE = 31536000  # 1 ano
+
 
 # Alias para manter compatibilidade com código existente
 TAMANHO_PAGINA_PADRAO = PaginationConstants.DEFAULT_PAGE_SIZE
@@ -1,6 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 class StatusDemanda(Enum):
     ATIVA = "ATIVA"
@@ -28,7 +28,39 @@ class Demanda:
     status: StatusDemanda = StatusDemanda.ATIVA
     data_criacao: Optional[str] = None
     observacoes: Optional[str] = None  # Observações adicionais
+    # Contadores mantidos por gatilhos (migração 0005); None quando não lidos
+    itens_total: Optional[int] = None
+    itens_atendidos: Optional[int] = None  # Itens com item de orçamento aceito
+    qtd_orcamentos: Optional[int] = None  # Coluna orcamentos_total
+    orcamentos_pendentes: Optional[int] = None
 
     def __post_init__(self) -> None:
         if isinstance(self.status, str):
-            self.status = StatusDemanda(self.status)
\ No newline at end of file
+            self.status = StatusDemanda(self.status)
+
+    @property
+    def percentual_atendimento(self) -> int:
+        """Percentual dos itens da demanda que já têm um item de orçamento aceito"""
+        if not self.itens_total:
+            return 0
+        return int((self.itens_atendidos or 0) / self.itens_total * 100)
+
+
+@dataclass
+class DemandaCompativel:
+    """
+    Demanda ativa vista por um fornecedor: a demanda, os itens dela nas
+    categorias em que o fornecedor tem itens ativos, se ele já enviou orçamento
+    e se ela ficou compatível depois da última visita dele à lista.
+    """
+    demanda: Demanda
+    total_itens: int = 0
+    itens_compativeis: List[Dict[str, Any]] = field(default_factory=list)
+    ja_tem_orcamento: bool = False
+    nova: bool = False
+    nome_noivo1: Optional[str] = None
+    nome_noivo2: Optional[str] = None
+
+    @property
+    def nome_casal(self) -> str:
+        return " & ".join(nome for nome in (self.nome_noivo1, self.nome_noivo2) if nome)
@@ -0,0 +1,64 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List
+
+
+@dataclass
+class EstatisticasSistema:
+    """Contadores do painel administrativo, lidos em uma única consulta"""
+
+    total_usuarios: int = 0
+    total_noivos: int = 0
+    total_admins: int = 0
+    total_fornecedores: int = 0
+    fornecedores_nao_verificados: int = 0
+    total_itens: int = 0
+    itens_produtos: int = 0
+    itens_servicos: int = 0
+    itens_espacos: int = 0
+    total_categorias: int = 0
+    total_orcamentos: int = 0
+    total_demandas: int = 0
+    fornecedores_vendedores: int = 0
+    fornecedores_prestadores: int = 0
+    fornecedores_locadores: int = 0
+    detalhes_itens: List[Dict[str, Any]] = field(default_factory=list)
+    gerado_em: datetime = field(default_factory=datetime.now)
+
+    @property
+    def fornecedores_verificados(self) -> int:
+        return self.total_fornecedores - self.fornecedores_nao_verificados
+
+    def resumo_sistema(self) -> Dict[str, int]:
+        """Totais gerais no formato usado pelos templates e pela exportação"""
+        return {
+            "total_usuarios": self.total_usuarios,
+            "total_noivos": self.total_noivos,
+            "total_admins": self.total_admins,
+            "total_fornecedores": self.total_fornecedores,
+            "fornecedores_verificados": self.fornecedores_verificados,
+            "fornecedores_nao_verificados": self.fornecedores_nao_verificados,
+            "total_itens": self.total_itens,
+            "total_categorias": self.total_categorias,
+            "total_orcamentos": self.total_orcamentos,
+            "total_demandas": self.total_demandas,
+        }
+
+    def resumo_itens(self) -> Dict[str, int]:
+        """Itens cadastrados por tipo de fornecimento"""
+        return {
+            "produtos": self.itens_produtos,
+            "servicos": self.itens_servicos,
+            "espacos": self.itens_espacos,
+        }
+
+    def resumo_fornecedores(self) -> Dict[str, int]:
+        """Fornecedores por verificação e por tipo de item oferecido"""
+        return {
+            "total": self.total_fornecedores,
+            "verificados": self.fornecedores_verificados,
+            "nao_verificados": self.fornecedores_nao_verificados,
+            "vendedores": self.fornecedores_vendedores,
+            "prestadores": self.fornecedores_prestadores,
+            "locadores": self.fornecedores_locadores,
+        }
@@ -14,6 +14,8 @@ from core.repositories.demanda_repo import demanda_repo
 from core.repositories.orcamento_repo import orcamento_repo
 from core.repositories.item_demanda_repo import item_demanda_repo
 from core.repositories.item_orcamento_repo import item_orcamento_repo
+from core.repositories.estatisticas_repo import estatisticas_repo
+from core.repositories.demanda_match_repo import demanda_match_repo
 
 __all__ = [
     'usuario_repo',
@@ -24,5 +26,7 @@ __all__ = [
     'demanda_repo',
     'orcamento_repo',
     'item_demanda_repo',
-    'item_orcamento_repo'
+    'item_orcamento_repo',
+    'estatisticas_repo',
+    'demanda_match_repo'
 ]
\ No newline at end of file
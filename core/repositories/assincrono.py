@@ -0,0 +1,297 @@
+"""
+Variantes assíncronas dos repositórios, para uso nas rotas
+
+Cada repositório daqui embrulha o singleton síncrono de mesmo nome: os métodos
+têm os mesmos nomes e argumentos, mas devolvem awaitables que rodam a chamada
+no pool de threads do banco (ver infrastructure/database/executor.py), sem
+bloquear o event loop:
+
+    from core.repositories.assincrono import usuario_repo
+    usuario = await usuario_repo.obter_por_id(id_usuario)
+
+Os repositórios síncronos continuam sendo a implementação e seguem valendo
+para quem não roda no event loop (inicialização, scripts, testes).
+
+Os métodos usados pelas rotas são declarados com Assincrono() em cada classe
+abaixo, para que o mypy confira argumentos e retornos; um método novo só
+precisa de uma linha na classe do repositório.
+
+Com o rastreamento ligado, cada chamada é um span (ex:
+item_repo.obter_itens_publicos), pai dos spans das instruções SQL que ela
+executa, e que inclui a espera por uma thread do banco.
+"""
+
+import functools
+import re
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Concatenate,
+    Dict,
+    Generic,
+    Optional,
+    ParamSpec,
+    TypeVar,
+    overload,
+)
+
+from core.repositories import (
+    casal_repo as _casal_repo,
+    categoria_repo as _categoria_repo,
+    demanda_match_repo as _demanda_match_repo,
+    demanda_repo as _demanda_repo,
+    estatisticas_repo as _estatisticas_repo,
+    fornecedor_repo as _fornecedor_repo,
+    item_demanda_repo as _item_demanda_repo,
+    item_orcamento_repo as _item_orcamento_repo,
+    item_repo as _item_repo,
+    orcamento_repo as _orcamento_repo,
+    usuario_repo as _usuario_repo,
+)
+from core.repositories.usuario_repo import UsuarioRepo
+from core.repositories.fornecedor_repo import FornecedorRepo
+from core.repositories.categoria_repo import CategoriaRepo, CategoriasEmCache
+from core.repositories.item_repo import ItemRepo
+from core.repositories.casal_repo import CasalRepo
+from core.repositories.demanda_repo import DemandaRepo
+from core.repositories.orcamento_repo import OrcamentoRepo
+from core.repositories.item_demanda_repo import ItemDemandaRepo
+from core.repositories.item_orcamento_repo import ItemOrcamentoRepo
+from core.repositories.estatisticas_repo import EstatisticasRepo
+from core.repositories.demanda_match_repo import DemandaMatchRepo
+from infrastructure.database.cache_tabela import CacheTabela
+from infrastructure.database.executor import executar_no_banco
+from infrastructure.rastreamento import iniciar_span
+
+R = TypeVar("R")
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+class RepoAssincrono(Generic[R]):
+    """
+    Embrulha um repositório síncrono expondo seus métodos públicos como corrotinas.
+
+    Atributos que não são métodos (ex: categoria_repo.cache) são repassados
+    como estão; o repositório original fica em `sincrono`. Para o mypy, só
+    existem os métodos declarados com Assincrono() nas subclasses abaixo, que
+    mantêm os argumentos e o retorno do método síncrono.
+    """
+
+    def __init__(self, repo: R):
+        self.sincrono = repo
+        # ItemOrcamentoRepo -> item_orcamento_repo, prefixo dos nomes dos spans
+        self.nome = re.sub(r"(?<!^)(?=[A-Z])", "_", type(repo).__name__).lower()
+        self._metodos: Dict[str, Callable[..., Awaitable[Any]]] = {}
+
+    def _corrotina(self, nome: str) -> Callable[..., Awaitable[Any]]:
+        """Corrotina que roda o método síncrono `nome` no pool de threads do banco"""
+        existente = self._metodos.get(nome)
+        if existente is not None:
+            return existente
+
+        @functools.wraps(getattr(self.sincrono, nome))
+        async def metodo(*args: Any, **kwargs: Any) -> Any:
+            with iniciar_span(f"{self.nome}.{nome}") as span:
+                resultado = await executar_no_banco(
+                    getattr(self.sincrono, nome), *args, **kwargs
+                )
+                if span is not None and isinstance(resultado, (list, dict)):
+                    span.set_attribute("repositorio.resultados", len(resultado))
+                return resultado
+
+        self._metodos[nome] = metodo
+        return metodo
+
+    if not TYPE_CHECKING:
+
+        def __getattr__(self, nome: str) -> Any:
+            atributo = getattr(self.sincrono, nome)
+            if nome.startswith("_") or not callable(atributo):
+                return atributo
+            return self._corrotina(nome)
+
+    def __repr__(self) -> str:
+        return f"RepoAssincrono({self.sincrono!r})"
+
+
+class Assincrono(Generic[P, T]):
+    """
+    Declara na subclasse de RepoAssincrono a versão assíncrona de um método.
+
+    Exemplo:
+        class UsuarioRepoAssincrono(RepoAssincrono[UsuarioRepo]):
+            obter_por_id = Assincrono(UsuarioRepo.obter_por_id)
+    """
+
+    def __init__(self, metodo: Callable[Concatenate[Any, P], T]):
+        self.metodo = metodo
+        self.nome = metodo.__name__
+
+    def __set_name__(self, dono: type, nome: str) -> None:
+        self.nome = nome
+
+    @overload
+    def __get__(self, repo: None, dono: type) -> "Assincrono[P, T]": ...
+
+    @overload
+    def __get__(self, repo: RepoAssincrono[Any], dono: type) -> Callable[P, Awaitable[T]]: ...
+
+    def __get__(
+        self, repo: Optional[RepoAssincrono[Any]], dono: type
+    ) -> "Assincrono[P, T] | Callable[P, Awaitable[T]]":
+        if repo is None:
+            return self
+        return repo._corrotina(self.nome)
+
+
+class UsuarioRepoAssincrono(RepoAssincrono[UsuarioRepo]):
+    ativar_usuario = Assincrono(UsuarioRepo.ativar_usuario)
+    atualizar = Assincrono(UsuarioRepo.atualizar)
+    atualizar_senha_usuario = Assincrono(UsuarioRepo.atualizar_senha_usuario)
+    bloquear_usuario = Assincrono(UsuarioRepo.bloquear_usuario)
+    buscar_paginado = Assincrono(UsuarioRepo.buscar_paginado)
+    contar = Assincrono(UsuarioRepo.contar)
+    inserir = Assincrono(UsuarioRepo.inserir)
+    obter_muitos_por_ids = Assincrono(UsuarioRepo.obter_muitos_por_ids)
+    obter_paginado_cursor = Assincrono(UsuarioRepo.obter_paginado_cursor)
+    obter_por_id = Assincrono(UsuarioRepo.obter_por_id)
+    obter_usuario_por_email = Assincrono(UsuarioRepo.obter_usuario_por_email)
+    obter_usuario_por_token = Assincrono(UsuarioRepo.obter_usuario_por_token)
+
+
+class FornecedorRepoAssincrono(RepoAssincrono[FornecedorRepo]):
+    atualizar = Assincrono(FornecedorRepo.atualizar)
+    inserir = Assincrono(FornecedorRepo.inserir)
+    obter_fornecedores_por_pagina = Assincrono(FornecedorRepo.obter_fornecedores_por_pagina)
+    obter_muitos_por_ids = Assincrono(FornecedorRepo.obter_muitos_por_ids)
+    obter_por_id = Assincrono(FornecedorRepo.obter_por_id)
+
+
+class CategoriaRepoAssincrono(RepoAssincrono[CategoriaRepo]):
+    ativar_categoria = Assincrono(CategoriaRepo.ativar_categoria)
+    atualizar = Assincrono(CategoriaRepo.atualizar)
+    buscar_categorias = Assincrono(CategoriaRepo.buscar_categorias)
+    buscar_paginado = Assincrono(CategoriaRepo.buscar_paginado)
+    desativar_categoria = Assincrono(CategoriaRepo.desativar_categoria)
+    excluir = Assincrono(CategoriaRepo.excluir)
+    inserir = Assincrono(CategoriaRepo.inserir)
+    obter_ativas_por_tipo = Assincrono(CategoriaRepo.obter_ativas_por_tipo)
+    obter_muitos_por_ids = Assincrono(CategoriaRepo.obter_muitos_por_ids)
+    obter_paginado_categorias = Assincrono(CategoriaRepo.obter_paginado_categorias)
+    obter_por_id = Assincrono(CategoriaRepo.obter_por_id)
+
+    @property
+    def cache(self) -> CacheTabela[CategoriasEmCache]:
+        """Cache de tabela do repositório síncrono"""
+        return self.sincrono.cache
+
+
+class ItemRepoAssincrono(RepoAssincrono[ItemRepo]):
+    ativar_item = Assincrono(ItemRepo.ativar_item)
+    ativar_item_admin = Assincrono(ItemRepo.ativar_item_admin)
+    atualizar = Assincrono(ItemRepo.atualizar)
+    buscar_itens_publicos = Assincrono(ItemRepo.buscar_itens_publicos)
+    buscar_paginado = Assincrono(ItemRepo.buscar_paginado)
+    contar_por_fornecedor = Assincrono(ItemRepo.contar_por_fornecedor)
+    desativar_item = Assincrono(ItemRepo.desativar_item)
+    desativar_item_admin = Assincrono(ItemRepo.desativar_item_admin)
+    excluir_item_fornecedor = Assincrono(ItemRepo.excluir_item_fornecedor)
+    inserir = Assincrono(ItemRepo.inserir)
+    obter_categorias_do_fornecedor = Assincrono(ItemRepo.obter_categorias_do_fornecedor)
+    obter_item_publico_por_id = Assincrono(ItemRepo.obter_item_publico_por_id)
+    obter_itens_por_fornecedor = Assincrono(ItemRepo.obter_itens_por_fornecedor)
+    obter_itens_publicos_cursor = Assincrono(ItemRepo.obter_itens_publicos_cursor)
+    obter_muitos_por_ids = Assincrono(ItemRepo.obter_muitos_por_ids)
+    obter_paginado_cursor = Assincrono(ItemRepo.obter_paginado_cursor)
+    obter_por_id = Assincrono(ItemRepo.obter_por_id)
+
+
+class CasalRepoAssincrono(RepoAssincrono[CasalRepo]):
+    inserir = Assincrono(CasalRepo.inserir)
+    obter_muitos_por_ids = Assincrono(CasalRepo.obter_muitos_por_ids)
+    obter_por_id = Assincrono(CasalRepo.obter_por_id)
+    obter_por_noivo = Assincrono(CasalRepo.obter_por_noivo)
+
+
+class DemandaRepoAssincrono(RepoAssincrono[DemandaRepo]):
+    atualizar = Assincrono(DemandaRepo.atualizar)
+    contar_compativeis_com_fornecedor = Assincrono(DemandaRepo.contar_compativeis_com_fornecedor)
+    excluir = Assincrono(DemandaRepo.excluir)
+    inserir = Assincrono(DemandaRepo.inserir)
+    obter_compativeis_com_fornecedor = Assincrono(DemandaRepo.obter_compativeis_com_fornecedor)
+    obter_muitos_por_ids = Assincrono(DemandaRepo.obter_muitos_por_ids)
+    obter_por_casal = Assincrono(DemandaRepo.obter_por_casal)
+    obter_por_casal_com_contadores = Assincrono(DemandaRepo.obter_por_casal_com_contadores)
+    obter_por_id = Assincrono(DemandaRepo.obter_por_id)
+
+
+class OrcamentoRepoAssincrono(RepoAssincrono[OrcamentoRepo]):
+    atualizar = Assincrono(OrcamentoRepo.atualizar)
+    atualizar_status_derivado = Assincrono(OrcamentoRepo.atualizar_status_derivado)
+    atualizar_valor_total = Assincrono(OrcamentoRepo.atualizar_valor_total)
+    excluir = Assincrono(OrcamentoRepo.excluir)
+    inserir = Assincrono(OrcamentoRepo.inserir)
+    obter_por_demanda = Assincrono(OrcamentoRepo.obter_por_demanda)
+    obter_por_fornecedor_prestador = Assincrono(OrcamentoRepo.obter_por_fornecedor_prestador)
+    obter_por_id = Assincrono(OrcamentoRepo.obter_por_id)
+    obter_por_noivo = Assincrono(OrcamentoRepo.obter_por_noivo)
+
+
+class ItemDemandaRepoAssincrono(RepoAssincrono[ItemDemandaRepo]):
+    excluir = Assincrono(ItemDemandaRepo.excluir)
+    excluir_por_demanda = Assincrono(ItemDemandaRepo.excluir_por_demanda)
+    inserir_em_lote = Assincrono(ItemDemandaRepo.inserir_em_lote)
+    obter_por_demanda = Assincrono(ItemDemandaRepo.obter_por_demanda)
+
+
+class ItemOrcamentoRepoAssincrono(RepoAssincrono[ItemOrcamentoRepo]):
+    atualizar_status_item = Assincrono(ItemOrcamentoRepo.atualizar_status_item)
+    contar_por_item_demanda = Assincrono(ItemOrcamentoRepo.contar_por_item_demanda)
+    contar_por_orcamentos = Assincrono(ItemOrcamentoRepo.contar_por_orcamentos)
+    excluir_por_orcamento = Assincrono(ItemOrcamentoRepo.excluir_por_orcamento)
+    inserir_em_lote = Assincrono(ItemOrcamentoRepo.inserir_em_lote)
+    obter_por_id = Assincrono(ItemOrcamentoRepo.obter_por_id)
+    obter_por_orcamento = Assincrono(ItemOrcamentoRepo.obter_por_orcamento)
+    obter_total_orcamento = Assincrono(ItemOrcamentoRepo.obter_total_orcamento)
+    verificar_item_demanda_ja_aceito = Assincrono(ItemOrcamentoRepo.verificar_item_demanda_ja_aceito)
+
+
+class EstatisticasRepoAssincrono(RepoAssincrono[EstatisticasRepo]):
+    obter_estatisticas = Assincrono(EstatisticasRepo.obter_estatisticas)
+
+
+class DemandaMatchRepoAssincrono(RepoAssincrono[DemandaMatchRepo]):
+    contar_novas = Assincrono(DemandaMatchRepo.contar_novas)
+    registrar_visita = Assincrono(DemandaMatchRepo.registrar_visita)
+
+
+usuario_repo = UsuarioRepoAssincrono(_usuario_repo)
+fornecedor_repo = FornecedorRepoAssincrono(_fornecedor_repo)
+categoria_repo = CategoriaRepoAssincrono(_categoria_repo)
+item_repo = ItemRepoAssincrono(_item_repo)
+casal_repo = CasalRepoAssincrono(_casal_repo)
+demanda_repo = DemandaRepoAssincrono(_demanda_repo)
+orcamento_repo = OrcamentoRepoAssincrono(_orcamento_repo)
+item_demanda_repo = ItemDemandaRepoAssincrono(_item_demanda_repo)
+item_orcamento_repo = ItemOrcamentoRepoAssincrono(_item_orcamento_repo)
+estatisticas_repo = EstatisticasRepoAssincrono(_estatisticas_repo)
+demanda_match_repo = DemandaMatchRepoAssincrono(_demanda_match_repo)
+
+__all__ = [
+    'Assincrono',
+    'RepoAssincrono',
+    'usuario_repo',
+    'fornecedor_repo',
+    'categoria_repo',
+    'item_repo',
+    'casal_repo',
+    'demanda_repo',
+    'orcamento_repo',
+    'item_demanda_repo',
+    'item_orcamento_repo',
+    'estatisticas_repo',
+    'demanda_match_repo'
+]
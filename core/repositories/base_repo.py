@@ -1,8 +1,25 @@
-from typing import Optional, List, Any, Dict
-from infrastructure.database import obter_conexao
+import os
+import re
+from typing import Optional, List, Any, Callable, Dict, Iterable, TypeVar
+from config.constants import DatabaseConstants, LoggingConstants
+from infrastructure.database import obter_conexao, obter_unidade_atual
 from util.error_handlers import tratar_erro_banco_dados, validar_parametros
 from util.exceptions import RecursoNaoEncontradoError, BancoDadosError, ValidacaoError
 from infrastructure.logging import logger
+from util.pagination import (
+    CURSOR_NEXT,
+    CURSOR_PREVIOUS,
+    CursorPageInfo,
+    decode_cursor,
+    encode_cursor,
+)
+
+# Leituras acontecem várias vezes por requisição: só uma fração vai para o log
+_AMOSTRA_LEITURAS = float(
+    os.environ.get("LOG_REPO_SAMPLE_RATE", LoggingConstants.REPO_READ_SAMPLE_RATE)
+)
+
+T = TypeVar("T")
 
 
 class BaseRepo:
@@ -52,6 +69,34 @@ class BaseRepo:
             logger.info(f"Tabela {self.nome_tabela} criada/verificada com sucesso")
             return True
 
+    @tratar_erro_banco_dados("criação de índices")
+    def criar_indices(self) -> int:
+        """Cria os índices declarados em INDICES no módulo SQL e retorna quantos são"""
+        indices: Dict[str, str] = getattr(self.sql, "INDICES", {})
+        with obter_conexao() as conexao:
+            cursor = conexao.cursor()
+            for comando in indices.values():
+                cursor.execute(comando)
+        if indices:
+            logger.info(
+                f"Índices de {self.nome_tabela} criados/verificados",
+                total_indices=len(indices),
+            )
+        return len(indices)
+
+    @tratar_erro_banco_dados("verificação de índices")
+    def verificar_indices(self) -> List[str]:
+        """Retorna os nomes dos índices declarados que ainda não existem no banco"""
+        indices: Dict[str, str] = getattr(self.sql, "INDICES", {})
+        if not indices:
+            return []
+        resultados = self.executar_consulta(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ?",
+            (self.nome_tabela,),
+        )
+        existentes = {row["name"] for row in resultados}
+        return [nome for nome in indices if nome not in existentes]
+
     @tratar_erro_banco_dados("inserção de registro")
     def inserir(self, objeto: Any) -> int:
         """Insere um novo registro e retorna o ID"""
@@ -71,6 +116,42 @@ class BaseRepo:
             )
             return id_inserido
 
+    @tratar_erro_banco_dados("inserção em lote")
+    def inserir_em_lote(self, objetos: List[Any]) -> List[int]:
+        """
+        Insere vários registros com executemany em uma única transação.
+
+        Tudo ou nada: se qualquer linha falhar, nenhuma é gravada.
+
+        Args:
+            objetos: Objetos a inserir
+
+        Returns:
+            List[int]: IDs gerados, na mesma ordem dos objetos
+        """
+        if not objetos:
+            return []
+
+        valores = [self._objeto_para_tupla_insert(objeto) for objeto in objetos]
+        with obter_conexao() as conexao:
+            cursor = conexao.cursor()
+            cursor.executemany(self.sql.INSERIR, valores)
+            if cursor.rowcount != len(valores):
+                raise BancoDadosError(
+                    f"Esperadas {len(valores)} linhas inseridas, obtidas {cursor.rowcount}",
+                    "inserção em lote",
+                )
+            ultimo_id = conexao.execute("SELECT last_insert_rowid()").fetchone()[0]
+
+        # Dentro de uma transação o SQLite atribui rowids consecutivos às
+        # linhas de um executemany, terminando em last_insert_rowid()
+        ids = list(range(ultimo_id - len(valores) + 1, ultimo_id + 1))
+        logger.info(
+            f"Registros inseridos em lote em {self.nome_tabela}",
+            quantidade=len(ids),
+        )
+        return ids
+
     @tratar_erro_banco_dados("atualização de registro")
     def atualizar(self, objeto: Any) -> bool:
         """Atualiza um registro existente"""
@@ -114,6 +195,17 @@ class BaseRepo:
 
             return excluido
 
+    def _mapeado(self, chave: tuple, carregar: Callable[[], T]) -> T:
+        """
+        Consulta o mapa de identidade da unidade de trabalho ativa.
+
+        Fora de uma unidade (scripts, testes) apenas chama carregar().
+        """
+        unidade = obter_unidade_atual()
+        if unidade is None:
+            return carregar()
+        return unidade.obter((self.nome_tabela, *chave), carregar)
+
     @tratar_erro_banco_dados("obtenção por ID")
     @validar_parametros(int)
     def obter_por_id(self, id: int) -> Any:
@@ -121,6 +213,10 @@ class BaseRepo:
         if id <= 0:
             raise ValidacaoError("ID deve ser um número positivo", "id", id)
 
+        return self._mapeado((id,), lambda: self._carregar_por_id(id))
+
+    def _carregar_por_id(self, id: int) -> Any:
+        """Lê um registro pelo ID diretamente do banco"""
         with obter_conexao() as conexao:
             cursor = conexao.cursor()
             cursor.execute(self.sql.OBTER_POR_ID, (id,))
@@ -133,6 +229,85 @@ class BaseRepo:
 
             return self._linha_para_objeto(resultado)
 
+    # "WHERE id = ?" / "WHERE u.id = ?" ao final de OBTER_POR_ID
+    _FILTRO_POR_ID = re.compile(r"(\b[\w.]*id)\s*=\s*\?\s*;?\s*$")
+
+    @staticmethod
+    def _ids_unicos(ids: Iterable[Optional[int]]) -> List[int]:
+        """IDs positivos sem repetição, na ordem em que aparecem"""
+        return list(dict.fromkeys(i for i in ids if i and i > 0))
+
+    def _consultar_em_lote(self, sql: str, ids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Executa uma consulta com {marcadores} em lotes de IN (...).
+
+        Args:
+            sql: Consulta contendo "{marcadores}" no lugar da lista do IN
+            ids: Valores para a cláusula IN
+
+        Returns:
+            Linhas de todos os lotes
+        """
+        linhas: List[Dict[str, Any]] = []
+        tamanho = DatabaseConstants.MAX_IN_PARAMS
+        for inicio in range(0, len(ids), tamanho):
+            lote = ids[inicio:inicio + tamanho]
+            marcadores = ", ".join("?" for _ in lote)
+            linhas.extend(
+                self.executar_consulta(sql.format(marcadores=marcadores), tuple(lote))
+            )
+        return linhas
+
+    @tratar_erro_banco_dados("carregamento em lote")
+    def obter_muitos_por_ids(self, ids: Iterable[Optional[int]]) -> Dict[int, Any]:
+        """
+        Obtém vários registros pelo ID com uma consulta IN (...) por lote.
+
+        Substitui laços de obter_por_id (N+1). IDs repetidos, nulos ou
+        inválidos são ignorados e IDs inexistentes ficam de fora do
+        resultado, em vez de gerar RecursoNaoEncontradoError.
+
+        Args:
+            ids: IDs a carregar (qualquer iterável)
+
+        Returns:
+            Dict[int, Any]: Objetos indexados pelo ID
+        """
+        ids_unicos = self._ids_unicos(ids)
+        if not ids_unicos:
+            return {}
+
+        # Reaproveita objetos já lidos nesta unidade de trabalho
+        unidade = obter_unidade_atual()
+        encontrados: Dict[int, Any] = {}
+        if unidade is not None:
+            for id in ids_unicos:
+                objeto = unidade.consultar((self.nome_tabela, id))
+                if objeto is not None:
+                    encontrados[id] = objeto
+            ids_unicos = [id for id in ids_unicos if id not in encontrados]
+            if not ids_unicos:
+                return encontrados
+
+        sql = getattr(self.sql, "OBTER_POR_IDS", None)
+        if sql is None:
+            sql, substituicoes = self._FILTRO_POR_ID.subn(
+                r"\1 IN ({marcadores})", self.sql.OBTER_POR_ID.strip()
+            )
+            if not substituicoes:
+                raise BancoDadosError(
+                    f"OBTER_POR_ID de {self.nome_tabela} não termina em filtro por id",
+                    "carregamento em lote",
+                )
+
+        linhas = self._consultar_em_lote(sql, ids_unicos)
+        for linha in linhas:
+            objeto = self._linha_para_objeto(linha)
+            encontrados[objeto.id] = objeto
+            if unidade is not None:
+                unidade.registrar((self.nome_tabela, objeto.id), objeto)
+        return encontrados
+
     @tratar_erro_banco_dados("listagem de registros")
     def listar_todos(self, ativo: Optional[bool] = None) -> List[Any]:
         """Lista todos os registros"""
@@ -148,6 +323,7 @@ class BaseRepo:
             resultados = cursor.fetchall()
             logger.info(
                 f"Listagem realizada em {self.nome_tabela}",
+                amostra=_AMOSTRA_LEITURAS,
                 total_registros=len(resultados),
                 filtro_ativo=ativo,
             )
@@ -162,6 +338,7 @@ class BaseRepo:
             resultados = cursor.fetchall()
             logger.info(
                 f"Consulta executada em {self.nome_tabela}",
+                amostra=_AMOSTRA_LEITURAS,
                 total_resultados=len(resultados),
             )
             return resultados
@@ -207,6 +384,7 @@ class BaseRepo:
         total: int = int(resultados[0]["total"]) if resultados else 0
         logger.info(
             f"Contagem realizada em {self.nome_tabela}",
+            amostra=_AMOSTRA_LEITURAS,
             total_registros=total,
             condicao=condicao or None,
         )
@@ -226,12 +404,147 @@ class BaseRepo:
         objetos = [self._linha_para_objeto(row) for row in resultados]
         logger.info(
             f"Paginação realizada em {self.nome_tabela}",
+            amostra=_AMOSTRA_LEITURAS,
             pagina=pagina,
             tamanho_pagina=tamanho_pagina,
             total_registros=total,
         )
         return objetos, total
 
+    def _paginar_por_cursor(
+        self,
+        consulta_base: str,
+        parametros: tuple,
+        cursor: Optional[str],
+        tamanho_pagina: int,
+        coluna_ordem: str = "id",
+        coluna_id: str = "id",
+        descendente: bool = True,
+        offset: int = 0,
+    ) -> tuple[List[Any], Optional[str], Optional[str]]:
+        """
+        Executa uma consulta paginada por keyset (cursor).
+
+        Args:
+            consulta_base: SELECT terminado em uma cláusula WHERE (ex: "... WHERE 1 = 1")
+            parametros: Parâmetros da consulta base
+            cursor: Cursor recebido do cliente (None para a primeira página)
+            tamanho_pagina: Quantidade de linhas por página
+            coluna_ordem: Coluna de ordenação (não nula), podendo ter alias ("i.data_cadastro")
+            coluna_id: Coluna de desempate única (chave primária)
+            descendente: Ordem decrescente (padrão) ou crescente
+            offset: Deslocamento inicial, usado só sem cursor (salto direto para uma página)
+
+        Returns:
+            Linhas da página, cursor da página anterior e cursor da próxima
+        """
+        colunas = [coluna_ordem] if coluna_ordem == coluna_id else [coluna_ordem, coluna_id]
+        chaves = [coluna.split(".")[-1] for coluna in colunas]
+
+        direcao, valores = CURSOR_NEXT, None
+        if cursor:
+            try:
+                direcao, valores = decode_cursor(cursor, len(colunas))
+            except ValueError:
+                raise ValidacaoError("Cursor de paginação inválido", "cursor", cursor)
+
+        voltando = direcao == CURSOR_PREVIOUS
+        # Voltar uma página = percorrer na ordem inversa e reverter o resultado
+        decrescente = descendente != voltando
+        sentido = "DESC" if decrescente else "ASC"
+        sql = consulta_base
+        argumentos = list(parametros)
+        if valores is not None:
+            operador = "<" if decrescente else ">"
+            marcadores = ", ".join("?" for _ in colunas)
+            sql += f" AND ({', '.join(colunas)}) {operador} ({marcadores})"
+            argumentos.extend(valores)
+        sql += " ORDER BY " + ", ".join(f"{coluna} {sentido}" for coluna in colunas)
+        sql += " LIMIT ?"
+        argumentos.append(tamanho_pagina + 1)
+        if valores is None and offset > 0:
+            sql += " OFFSET ?"
+            argumentos.append(offset)
+
+        linhas = list(self.executar_consulta(sql, tuple(argumentos)))
+        ha_mais = len(linhas) > tamanho_pagina
+        linhas = linhas[:tamanho_pagina]
+        if voltando:
+            linhas.reverse()
+        if not linhas:
+            return [], None, None
+
+        def chave(linha: Any) -> List[Any]:
+            return [linha[c] for c in chaves]
+
+        tem_proxima = ha_mais if not voltando else True
+        tem_anterior = ha_mais if voltando else (valores is not None or offset > 0)
+        proximo = encode_cursor(CURSOR_NEXT, chave(linhas[-1])) if tem_proxima else None
+        anterior = (
+            encode_cursor(CURSOR_PREVIOUS, chave(linhas[0])) if tem_anterior else None
+        )
+        return linhas, anterior, proximo
+
+    def estimar_total(self) -> int:
+        """
+        Estimativa barata do total de registros (maior rowid da tabela).
+
+        Usa o índice da chave primária em vez de percorrer a tabela; é exata
+        enquanto não houver exclusões e um limite superior depois delas.
+        """
+        resultados = self.executar_consulta(
+            f"SELECT MAX(rowid) as total FROM {self.nome_tabela}"
+        )
+        return int(resultados[0]["total"] or 0) if resultados else 0
+
+    @tratar_erro_banco_dados("paginação por cursor")
+    def obter_paginado_cursor(
+        self,
+        cursor: Optional[str] = None,
+        tamanho_pagina: int = 10,
+        coluna_ordem: str = "id",
+        descendente: bool = True,
+        pagina: int = 1,
+        total: Optional[str] = "exato",
+    ) -> CursorPageInfo:
+        """
+        Obtém registros por paginação keyset, com custo constante por página.
+
+        Args:
+            cursor: Cursor da página anterior/seguinte (None para começar)
+            tamanho_pagina: Quantidade de registros por página
+            coluna_ordem: Coluna de ordenação; o id é usado como desempate
+            descendente: Ordem decrescente (padrão) ou crescente
+            pagina: Página inicial quando não há cursor (salto direto via OFFSET)
+            total: "exato" (COUNT), "aproximado" (estimar_total) ou None (sem contagem)
+
+        Returns:
+            CursorPageInfo com os objetos e cursores anterior/próximo
+        """
+        linhas, anterior, proximo = self._paginar_por_cursor(
+            f"SELECT * FROM {self.nome_tabela} WHERE 1 = 1",
+            (),
+            cursor,
+            tamanho_pagina,
+            coluna_ordem=coluna_ordem,
+            descendente=descendente,
+            offset=(max(1, pagina) - 1) * tamanho_pagina,
+        )
+
+        total_registros: Optional[int] = None
+        if total == "exato":
+            total_registros = self.contar_registros()
+        elif total == "aproximado":
+            total_registros = self.estimar_total()
+
+        return CursorPageInfo(
+            items=[self._linha_para_objeto(linha) for linha in linhas],
+            page_size=tamanho_pagina,
+            next_cursor=proximo,
+            previous_cursor=anterior,
+            total_items=total_registros,
+        )
+
     def contar(self) -> int:
         """
         Alias para contar_registros() - mantém compatibilidade com API existente
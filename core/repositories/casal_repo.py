@@ -70,6 +70,10 @@ class CasalRepo(BaseRepo):
 
     def obter_por_noivo(self, id_noivo: int) -> Optional[Casal]:
         """Obtém casal pelo ID de um dos noivos"""
+        return self._mapeado(("noivo", id_noivo), lambda: self._carregar_por_noivo(id_noivo))
+
+    def _carregar_por_noivo(self, id_noivo: int) -> Optional[Casal]:
+        """Lê o casal de um noivo diretamente do banco"""
         resultados = self.executar_consulta(
             casal_sql.OBTER_CASAL_POR_NOIVO, (id_noivo, id_noivo)
         )
@@ -1,15 +1,55 @@
-from typing import Optional, List
+import copy
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Iterable, Any
+from config.constants import CacheConstants
 from core.repositories.base_repo import BaseRepo
 from core.sql import categoria_sql
 from core.models.categoria_model import Categoria
 from core.models.tipo_fornecimento_model import TipoFornecimento
+from infrastructure.database import CacheTabela
+from util.exceptions import RecursoNaoEncontradoError
+
+
+@dataclass
+class CategoriasEmCache:
+    """Tabela de categorias indexada para o cache"""
+
+    todas: List[Categoria]  # ordenadas por tipo e nome, como LISTAR_TODOS
+    por_id: Dict[int, Categoria] = field(default_factory=dict)
+    por_tipo: Dict[TipoFornecimento, List[Categoria]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        for categoria in self.todas:
+            self.por_id[categoria.id] = categoria
+            self.por_tipo.setdefault(categoria.tipo_fornecimento, []).append(categoria)
+
+
+def _copias(categorias: Iterable[Categoria]) -> List[Categoria]:
+    """Cópias dos objetos do cache, que podem ser alteradas pelo chamador"""
+    return [copy.copy(categoria) for categoria in categorias]
 
 
 class CategoriaRepo(BaseRepo):
-    """Repositório para operações com categorias"""
+    """
+    Repositório para operações com categorias.
+
+    Leituras sem filtro textual são servidas por um cache em processo da
+    tabela inteira (ver CacheTabela); todo método de escrita o invalida.
+    """
 
     def __init__(self):
         super().__init__("categoria", Categoria, categoria_sql)
+        self.cache = CacheTabela(
+            "categoria",
+            self._carregar_cache,
+            ttl=CacheConstants.CATEGORY_TTL,
+            intervalo_verificacao=CacheConstants.VERSION_CHECK_INTERVAL,
+        )
+
+    def _carregar_cache(self) -> CategoriasEmCache:
+        """Lê todas as categorias do banco para o cache"""
+        resultados = self.executar_consulta(categoria_sql.LISTAR_TODOS)
+        return CategoriasEmCache([self._linha_para_objeto(row) for row in resultados])
 
     def _objeto_para_tupla_insert(self, categoria: Categoria) -> tuple:
         """Prepara dados da categoria para inserção"""
@@ -40,19 +80,70 @@ class CategoriaRepo(BaseRepo):
             ativo=bool(linha["ativo"]),
         )
 
+    # Escritas: invalidam o cache local (os gatilhos de versao_cache avisam
+    # os demais workers)
+
+    def inserir(self, categoria: Categoria) -> int:
+        """Insere uma categoria e invalida o cache"""
+        id_inserido = super().inserir(categoria)
+        self.cache.invalidar()
+        return id_inserido  # type: ignore[no-any-return]
+
+    def inserir_em_lote(self, categorias: List[Categoria]) -> List[int]:
+        """Insere várias categorias e invalida o cache"""
+        ids = super().inserir_em_lote(categorias)
+        self.cache.invalidar()
+        return ids  # type: ignore[no-any-return]
+
+    def atualizar(self, categoria: Categoria) -> bool:
+        """Atualiza uma categoria e invalida o cache"""
+        atualizado = super().atualizar(categoria)
+        self.cache.invalidar()
+        return atualizado  # type: ignore[no-any-return]
+
+    def excluir(self, id: int) -> bool:
+        """Exclui uma categoria e invalida o cache"""
+        excluido = super().excluir(id)
+        self.cache.invalidar()
+        return excluido  # type: ignore[no-any-return]
+
+    def ativar(self, id: int, campo: str = "ativo") -> bool:
+        """Ativa uma categoria e invalida o cache"""
+        sucesso = super().ativar(id, campo)
+        self.cache.invalidar()
+        return sucesso  # type: ignore[no-any-return]
+
+    def desativar(self, id: int, campo: str = "ativo") -> bool:
+        """Desativa uma categoria e invalida o cache"""
+        sucesso = super().desativar(id, campo)
+        self.cache.invalidar()
+        return sucesso  # type: ignore[no-any-return]
+
+    # Leituras servidas pelo cache
+
+    def _carregar_por_id(self, id: int) -> Categoria:
+        """Obtém a categoria pelo ID a partir do cache"""
+        categoria = self.cache.obter().por_id.get(id)
+        if categoria is None:
+            raise RecursoNaoEncontradoError(
+                recurso=self.nome_tabela.title(), identificador=id
+            )
+        return copy.copy(categoria)
+
+    def obter_muitos_por_ids(self, ids: Iterable[Optional[int]]) -> Dict[int, Any]:
+        """Obtém várias categorias pelo ID a partir do cache"""
+        por_id = self.cache.obter().por_id
+        return {
+            id: copy.copy(por_id[id]) for id in self._ids_unicos(ids) if id in por_id
+        }
+
     def obter_por_tipo(self, tipo: TipoFornecimento) -> List[Categoria]:
         """Método específico: obter categorias por tipo"""
-        resultados = self.executar_consulta(
-            categoria_sql.OBTER_CATEGORIAS_POR_TIPO, (tipo.value,)
-        )
-        return [self._linha_para_objeto(row) for row in resultados]
+        return _copias(self.cache.obter().por_tipo.get(tipo, []))
 
     def obter_ativas_por_tipo(self, tipo: TipoFornecimento) -> List[Categoria]:
         """Método específico: obter categorias ativas por tipo"""
-        resultados = self.executar_consulta(
-            categoria_sql.OBTER_CATEGORIAS_ATIVAS_POR_TIPO, (tipo.value,)
-        )
-        return [self._linha_para_objeto(row) for row in resultados]
+        return [c for c in self.obter_por_tipo(tipo) if c.ativo]
 
     def contar_categorias(self) -> int:
         """Conta o total de categorias no sistema"""
@@ -70,7 +161,20 @@ class CategoriaRepo(BaseRepo):
     def buscar_categorias(
         self, busca: str = "", tipo_fornecimento: str = "", status: str = ""
     ) -> List[Categoria]:
-        """Busca categorias com filtros"""
+        """Busca categorias com filtros (sem busca textual, direto do cache)"""
+        if not busca:
+            categorias = self.cache.obter().todas
+            if tipo_fornecimento:
+                categorias = [
+                    c for c in categorias
+                    if c.tipo_fornecimento.value == tipo_fornecimento
+                ]
+            if status:
+                if status not in ("ativo", "inativo"):
+                    return []
+                categorias = [c for c in categorias if c.ativo == (status == "ativo")]
+            return _copias(categorias)
+
         busca_like = f"%{busca}%" if busca else ""
         resultados = self.executar_consulta(
             categoria_sql.BUSCAR_CATEGORIAS,
@@ -89,11 +193,11 @@ class CategoriaRepo(BaseRepo):
 
     def ativar_categoria(self, id: int) -> bool:
         """Ativa uma categoria"""
-        return self.ativar(id)  # type: ignore[no-any-return]
+        return self.ativar(id)
 
     def desativar_categoria(self, id: int) -> bool:
         """Desativa uma categoria"""
-        return self.desativar(id)  # type: ignore[no-any-return]
+        return self.desativar(id)
 
     def obter_paginado_categorias(
         self, pagina: int, tamanho_pagina: int
@@ -0,0 +1,32 @@
+from core.sql import demanda_match_sql
+from infrastructure.database import obter_conexao
+from util.error_handlers import tratar_erro_banco_dados
+
+
+class DemandaMatchRepo:
+    """
+    Repositório da caixa de entrada de demandas dos fornecedores.
+
+    A tabela demanda_match é mantida por gatilhos (migração 0007), então aqui
+    só há leituras e o registro das visitas; a listagem das demandas fica em
+    DemandaRepo.obter_compativeis_com_fornecedor.
+    """
+
+    @tratar_erro_banco_dados("contagem de demandas novas")
+    def contar_novas(self, id_fornecedor: int) -> int:
+        """Conta as demandas ativas que ficaram compatíveis depois da última visita"""
+        with obter_conexao() as conexao:
+            linha = conexao.execute(
+                demanda_match_sql.CONTAR_NOVAS, (id_fornecedor, id_fornecedor)
+            ).fetchone()
+        return linha["total"] if linha else 0
+
+    @tratar_erro_banco_dados("registro de visita às demandas")
+    def registrar_visita(self, id_fornecedor: int) -> None:
+        """Marca agora como a última visita do fornecedor à lista de demandas"""
+        with obter_conexao() as conexao:
+            conexao.execute(demanda_match_sql.REGISTRAR_VISITA, (id_fornecedor,))
+
+
+# Instância singleton do repositório
+demanda_match_repo = DemandaMatchRepo()
@@ -1,8 +1,9 @@
-from typing import List, Union
+import json
+from typing import List, Optional, Tuple, Union
 from core.repositories.base_repo import BaseRepo
 from infrastructure.logging import logger
 from core.sql import demanda_sql
-from core.models.demanda_model import Demanda, StatusDemanda
+from core.models.demanda_model import Demanda, DemandaCompativel, StatusDemanda
 
 
 class DemandaRepo(BaseRepo):
@@ -48,6 +49,10 @@ class DemandaRepo(BaseRepo):
             status=linha["status"],
             data_criacao=self._safe_get(linha, "data_criacao"),
             observacoes=self._safe_get(linha, "observacoes"),
+            itens_total=self._safe_get(linha, "itens_total"),
+            itens_atendidos=self._safe_get(linha, "itens_atendidos"),
+            qtd_orcamentos=self._safe_get(linha, "orcamentos_total"),
+            orcamentos_pendentes=self._safe_get(linha, "orcamentos_pendentes"),
         )
 
     def atualizar_status(self, id_demanda: int, status: StatusDemanda) -> bool:
@@ -63,6 +68,18 @@ class DemandaRepo(BaseRepo):
         )
         return [self._linha_para_objeto(row) for row in resultados]
 
+    def obter_por_casal_com_contadores(self, id_casal: int) -> List[Demanda]:
+        """
+        Obtém as demandas de um casal já com os contadores de itens e orçamentos.
+
+        Os contadores são colunas mantidas por gatilhos, então a listagem lê
+        uma linha por demanda em vez de contar itens e orçamentos de cada uma.
+        """
+        resultados = self.executar_consulta(
+            demanda_sql.OBTER_DEMANDAS_POR_CASAL_COM_CONTADORES, (id_casal,)
+        )
+        return [self._linha_para_objeto(row) for row in resultados]
+
     def obter_ativas(self) -> List[Demanda]:
         """Obtém todas as demandas ativas"""
         resultados = self.executar_consulta(demanda_sql.OBTER_DEMANDAS_ATIVAS)
@@ -116,6 +133,75 @@ class DemandaRepo(BaseRepo):
         )
         return [self._linha_para_objeto(row) for row in resultados]
 
+    def obter_compativeis_com_fornecedor(
+        self,
+        id_fornecedor: int,
+        id_categoria: Optional[int] = None,
+        cidade: str = "",
+        pagina: int = 1,
+        tamanho_pagina: int = 12,
+    ) -> Tuple[List[DemandaCompativel], int]:
+        """
+        Obtém uma página das demandas ativas compatíveis com um fornecedor.
+
+        Compatível é a demanda com algum item nas categorias em que o
+        fornecedor tem itens ativos. Os pares vêm de demanda_match, mantida
+        por gatilhos (migração 0007); filtros e paginação são feitos no banco,
+        em uma consulta para a página e outra para o total.
+
+        Args:
+            id_fornecedor: ID do fornecedor
+            id_categoria: Só demandas com item compatível desta categoria
+            cidade: Só demandas desta cidade (sem diferenciar maiúsculas)
+            pagina: Número da página (começa em 1)
+            tamanho_pagina: Demandas por página
+
+        Returns:
+            Tuple[List[DemandaCompativel], int]: Demandas da página e total
+        """
+        filtros = self._parametros_compativeis(id_fornecedor, id_categoria, cidade)
+        total = self.contar_compativeis_com_fornecedor(id_fornecedor, id_categoria, cidade)
+        if not total:
+            return [], 0
+
+        offset = (max(1, pagina) - 1) * tamanho_pagina
+        resultados = self.executar_consulta(
+            demanda_sql.OBTER_DEMANDAS_COMPATIVEIS_FORNECEDOR,
+            filtros + (tamanho_pagina, offset, id_fornecedor, id_fornecedor),
+        )
+        demandas = [
+            DemandaCompativel(
+                demanda=self._linha_para_objeto(row),
+                total_itens=row["total_itens"],
+                itens_compativeis=json.loads(row["itens_compativeis_json"] or "[]"),
+                ja_tem_orcamento=bool(row["ja_tem_orcamento"]),
+                nova=bool(row["nova"]),
+                nome_noivo1=row["nome_noivo1"],
+                nome_noivo2=row["nome_noivo2"],
+            )
+            for row in resultados
+        ]
+        return demandas, total
+
+    def contar_compativeis_com_fornecedor(
+        self, id_fornecedor: int, id_categoria: Optional[int] = None, cidade: str = ""
+    ) -> int:
+        """Conta as demandas ativas compatíveis com um fornecedor (mesmos filtros da listagem)"""
+        resultado = self.executar_consulta(
+            demanda_sql.CONTAR_DEMANDAS_COMPATIVEIS_FORNECEDOR,
+            self._parametros_compativeis(id_fornecedor, id_categoria, cidade),
+        )
+        return resultado[0]["total"] if resultado else 0
+
+    @staticmethod
+    def _parametros_compativeis(
+        id_fornecedor: int, id_categoria: Optional[int], cidade: str
+    ) -> tuple:
+        """Parâmetros do bloco comum das consultas de demandas compatíveis"""
+        cidade = (cidade or "").strip()
+        categoria = id_categoria or 0
+        return (id_fornecedor, id_fornecedor, cidade, cidade, categoria, categoria)
+
 
 # Instância singleton do repositório
 demanda_repo = DemandaRepo()
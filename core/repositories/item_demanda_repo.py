@@ -103,14 +103,8 @@ class ItemDemandaRepo(BaseRepo):
             categorias_placeholder=placeholders
         )
 
-        # Executar query para cada tipo de fornecimento
-        ids_demandas: set[int] = set()
-        for tipo in TipoFornecimento:
-            params = [tipo.value] + categorias_fornecedor
-            resultados = self.executar_consulta(query, tuple(params))
-            ids_demandas.update(row["id_demanda"] for row in resultados)
-
-        return list(ids_demandas)
+        resultados = self.executar_consulta(query, tuple(categorias_fornecedor))
+        return [row["id_demanda"] for row in resultados]
 
     def excluir_por_demanda(self, id_demanda: int) -> bool:
         """Exclui todos os itens de uma demanda"""
@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Optional, List, Dict
 from core.repositories.base_repo import BaseRepo
 from core.sql import item_orcamento_sql
 from core.models.item_orcamento_model import ItemOrcamento
@@ -164,6 +164,19 @@ class ItemOrcamentoRepo(BaseRepo):
         )
         return resultados[0]["total"] if resultados else 0
 
+    def contar_por_orcamentos(self, ids_orcamentos: List[int]) -> Dict[int, int]:
+        """
+        Conta os itens de vários orçamentos em uma única consulta.
+
+        Returns:
+            Dict[int, int]: Total de itens por id de orçamento (0 se não houver itens)
+        """
+        ids = self._ids_unicos(ids_orcamentos)
+        totais = {id_orcamento: 0 for id_orcamento in ids}
+        for linha in self._consultar_em_lote(item_orcamento_sql.CONTAR_ITENS_POR_ORCAMENTOS, ids):
+            totais[linha["id_orcamento"]] = linha["total"]
+        return totais
+
     def contar_por_item_demanda(self, id_item_demanda: int) -> int:
         """Conta quantos item_orcamento existem para um item_demanda específico"""
         resultados = self.executar_consulta(
@@ -1,3 +1,4 @@
+import re
 from typing import Optional, List, Dict, Any
 from core.repositories.base_repo import BaseRepo
 from core.sql import item_sql
@@ -8,6 +9,7 @@ from core.sql.item_sql import (
 from core.models.item_model import Item
 from core.models.tipo_fornecimento_model import TipoFornecimento
 from core.repositories.categoria_repo import categoria_repo
+from util.pagination import CursorPageInfo
 
 
 def validar_categoria_para_tipo(tipo: TipoFornecimento, id_categoria: int) -> bool:
@@ -222,6 +224,103 @@ class ItemRepo(BaseRepo):
         ]
         return itens, total
 
+    def obter_itens_publicos_cursor(
+        self,
+        tipo: Optional[str] = None,
+        categoria: Optional[int] = None,
+        cursor: Optional[str] = None,
+        pagina: int = 1,
+        tamanho_pagina: int = 12,
+        contar: bool = True,
+    ) -> CursorPageInfo:
+        """
+        Obtém itens públicos por paginação keyset (mais recentes primeiro).
+
+        Com cursor, o custo da página não depende de quão longe o usuário
+        navegou; sem cursor, 'pagina' permite saltar direto para uma página.
+        Com contar=False a contagem total é dispensada (total_items = None).
+        """
+        tipo_map = {"produto": "PRODUTO", "servico": "SERVIÇO", "espaco": "ESPAÇO"}
+        tipo_param = tipo_map.get(tipo) if tipo else None
+
+        linhas, anterior, proximo = self._paginar_por_cursor(
+            item_sql.LISTAR_ITENS_PUBLICOS_CURSOR,
+            (tipo_param, tipo_param, categoria, categoria),
+            cursor,
+            tamanho_pagina,
+            coluna_ordem="i.data_cadastro",
+            coluna_id="i.id",
+            offset=(max(1, pagina) - 1) * tamanho_pagina,
+        )
+
+        total = None
+        if contar:
+            total_resultado = self.executar_consulta(
+                CONTAR_ITENS_PUBLICOS_FILTRADOS,
+                (tipo_param, tipo_param, None, None, None, None, categoria, categoria),
+            )
+            total = total_resultado[0]["total"] if total_resultado else 0
+
+        return CursorPageInfo(
+            items=[dict(linha, ativo=bool(linha["ativo"])) for linha in linhas],
+            page_size=tamanho_pagina,
+            next_cursor=proximo,
+            previous_cursor=anterior,
+            total_items=total,
+        )
+
+    @staticmethod
+    def _montar_consulta_fts(busca: str) -> Optional[str]:
+        """
+        Converte o texto digitado em uma expressão MATCH do FTS5.
+
+        Cada palavra vira um prefixo entre aspas ("bol"* encontra "bolo"),
+        combinadas com AND. Retorna None se não houver palavras.
+        """
+        palavras = re.findall(r"\w+", busca)
+        if not palavras:
+            return None
+        return " ".join(f'"{palavra}"*' for palavra in palavras)
+
+    def buscar_itens_publicos(
+        self,
+        busca: str,
+        tipo: Optional[str] = None,
+        categoria: Optional[int] = None,
+        pagina: int = 1,
+        tamanho_pagina: int = 12,
+    ) -> tuple[List[dict], int]:
+        """
+        Busca textual no catálogo público, ordenada por relevância (BM25).
+
+        Procura em nome, descrição, observações, categoria e fornecedor, sem
+        diferenciar acentos. Cada item traz também 'trecho' (texto com os termos
+        marcados por \x02/\x03) e 'relevancia'.
+        """
+        consulta = self._montar_consulta_fts(busca)
+        if consulta is None:
+            return self.obter_itens_publicos(
+                tipo=tipo, categoria=categoria, pagina=pagina, tamanho_pagina=tamanho_pagina
+            )
+
+        offset = (pagina - 1) * tamanho_pagina
+        tipo_map = {"produto": "PRODUTO", "servico": "SERVIÇO", "espaco": "ESPAÇO"}
+        tipo_param = tipo_map.get(tipo) if tipo else None
+        filtros = (consulta, tipo_param, tipo_param, categoria, categoria)
+
+        total_resultado = self.executar_consulta(
+            item_sql.CONTAR_ITENS_PUBLICOS_TEXTO, filtros
+        )
+        total = total_resultado[0]["total"] if total_resultado else 0
+
+        resultados = self.executar_consulta(
+            item_sql.BUSCAR_ITENS_PUBLICOS_TEXTO, filtros + (tamanho_pagina, offset)
+        )
+        itens = [
+            dict(resultado, ativo=bool(resultado["ativo"])) for resultado in resultados
+        ]
+        return itens, total
+
     def obter_item_publico_por_id(self, id_item: int) -> Optional[dict]:
         """Obtém um item específico com informações do fornecedor para exibição pública"""
         resultados = self.executar_consulta(
@@ -135,12 +135,15 @@ class OrcamentoRepo(BaseRepo):
         Returns:
             str: Status calculado do orçamento
         """
-        from core.repositories.item_orcamento_repo import item_orcamento_repo
-
-        # Contar itens por status
-        total_aceitos = item_orcamento_repo.contar_por_status(id_orcamento, "ACEITO")
-        total_rejeitados = item_orcamento_repo.contar_por_status(id_orcamento, "REJEITADO")
-        total_pendentes = item_orcamento_repo.contar_por_status(id_orcamento, "PENDENTE")
+        # Contadores por status mantidos por gatilhos (migração 0005)
+        resultado = self.executar_consulta(
+            orcamento_sql.OBTER_CONTADORES_ITENS, (id_orcamento,)
+        )
+        if not resultado:
+            return "PENDENTE"
+        total_aceitos = resultado[0]["itens_aceitos"]
+        total_rejeitados = resultado[0]["itens_rejeitados"]
+        total_pendentes = resultado[0]["itens_pendentes"]
 
         total_itens = total_aceitos + total_rejeitados + total_pendentes
 
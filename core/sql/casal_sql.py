@@ -17,6 +17,12 @@ CREATE TABLE IF NOT EXISTS casal (
 );
 """
 
+# Índices secundários (chaves estrangeiras e colunas de filtro)
+INDICES = {
+    "idx_casal_id_noivo1": "CREATE INDEX IF NOT EXISTS idx_casal_id_noivo1 ON casal(id_noivo1);",
+    "idx_casal_id_noivo2": "CREATE INDEX IF NOT EXISTS idx_casal_id_noivo2 ON casal(id_noivo2);",
+}
+
 INSERIR = """
 INSERT INTO casal (id_noivo1, id_noivo2, data_casamento, local_previsto, orcamento_estimado, numero_convidados)
 VALUES (?, ?, ?, ?, ?, ?);
@@ -0,0 +1,59 @@
+"""
+Queries SQL para a tabela demanda_match.
+
+demanda_match é a "caixa de entrada" dos fornecedores: um par (fornecedor,
+demanda) para cada demanda com itens nas categorias em que o fornecedor tem
+itens ativos, com a quantidade desses itens e quando o par surgiu. É mantida
+por gatilhos (migração 0007); as queries abaixo leem a tabela e a reconstroem
+em caso de divergência.
+
+Estrutura:
+- id_fornecedor, id_demanda: PK composta
+- itens_compativeis: INTEGER - itens da demanda nas categorias do fornecedor
+- criado_em: TEXT - quando a demanda passou a ser compatível (milissegundos)
+
+visita_demandas guarda quando cada fornecedor abriu a lista de demandas pela
+última vez, para as contagens de "novas desde a última visita".
+"""
+
+# Pares esperados, calculados a partir de item_demanda e dos itens ativos
+_PARES_ESPERADOS = """
+SELECT i.id_fornecedor, idm.id_demanda, COUNT(*) AS itens_compativeis
+FROM item_demanda idm
+JOIN (SELECT DISTINCT id_fornecedor, id_categoria FROM item WHERE ativo = 1) i
+  ON i.id_categoria = idm.id_categoria
+GROUP BY i.id_fornecedor, idm.id_demanda
+"""
+
+# Remove os pares que não deveriam existir
+EXCLUIR_PARES_DIVERGENTES = """
+DELETE FROM demanda_match
+WHERE (id_fornecedor, id_demanda) NOT IN (
+    SELECT id_fornecedor, id_demanda FROM (""" + _PARES_ESPERADOS + """)
+);
+"""
+
+# Insere os pares ausentes e corrige as quantidades, preservando criado_em;
+# só altera (e conta no rowcount) as linhas divergentes
+RECALCULAR_PARES = """
+INSERT INTO demanda_match (id_fornecedor, id_demanda, itens_compativeis)
+SELECT id_fornecedor, id_demanda, itens_compativeis FROM (""" + _PARES_ESPERADOS + """) WHERE true
+ON CONFLICT (id_fornecedor, id_demanda)
+DO UPDATE SET itens_compativeis = excluded.itens_compativeis
+WHERE itens_compativeis IS NOT excluded.itens_compativeis;
+"""
+
+CONTAR_NOVAS = """
+SELECT COUNT(*) AS total
+FROM demanda_match m
+JOIN demanda d ON d.id = m.id_demanda
+WHERE m.id_fornecedor = ?
+  AND d.status = 'ATIVA'
+  AND m.criado_em > COALESCE((SELECT visto_em FROM visita_demandas WHERE id_fornecedor = ?), '');
+"""
+
+REGISTRAR_VISITA = """
+INSERT INTO visita_demandas (id_fornecedor, visto_em)
+VALUES (?, strftime('%Y-%m-%d %H:%M:%f', 'now'))
+ON CONFLICT (id_fornecedor) DO UPDATE SET visto_em = excluded.visto_em;
+"""
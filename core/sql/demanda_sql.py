@@ -30,6 +30,12 @@ CREATE TABLE IF NOT EXISTS demanda (
 );
 """
 
+# Índices secundários (chaves estrangeiras e colunas de filtro)
+INDICES = {
+    "idx_demanda_id_casal": "CREATE INDEX IF NOT EXISTS idx_demanda_id_casal ON demanda(id_casal);",
+    "idx_demanda_status": "CREATE INDEX IF NOT EXISTS idx_demanda_status ON demanda(status);",
+}
+
 INSERIR = """
 INSERT INTO demanda (id_casal, descricao, orcamento_total, data_casamento, cidade_casamento, prazo_entrega, observacoes)
 VALUES (?, ?, ?, ?, ?, ?, ?);
@@ -102,3 +108,110 @@ FROM demanda
 WHERE cidade_casamento = ? AND status = 'ATIVA'
 ORDER BY data_criacao DESC;
 """
+
+# ==============================================================================
+# CONTADORES DENORMALIZADOS (mantidos por gatilhos, migração 0005)
+# ==============================================================================
+
+OBTER_DEMANDAS_POR_CASAL_COM_CONTADORES = """
+SELECT id, id_casal, descricao, orcamento_total, data_casamento, cidade_casamento, prazo_entrega, status, data_criacao, observacoes,
+       itens_total, itens_atendidos, orcamentos_total, orcamentos_pendentes
+FROM demanda
+WHERE id_casal = ?
+ORDER BY data_criacao DESC;
+"""
+
+# Recalcula os contadores de todas as demandas; só altera (e conta no
+# rowcount) as linhas cujos valores divergem da contagem real
+RECALCULAR_CONTADORES = """
+UPDATE demanda
+SET itens_total = c.itens_total,
+    itens_atendidos = c.itens_atendidos,
+    orcamentos_total = c.orcamentos_total,
+    orcamentos_pendentes = c.orcamentos_pendentes
+FROM (
+    SELECT d.id,
+           (SELECT COUNT(*) FROM item_demanda idm WHERE idm.id_demanda = d.id) AS itens_total,
+           (SELECT COUNT(DISTINCT io.id_item_demanda)
+            FROM item_orcamento io
+            JOIN item_demanda idm ON idm.id = io.id_item_demanda
+            WHERE idm.id_demanda = d.id AND io.status = 'ACEITO') AS itens_atendidos,
+           (SELECT COUNT(*) FROM orcamento o WHERE o.id_demanda = d.id) AS orcamentos_total,
+           (SELECT COUNT(*) FROM orcamento o
+            WHERE o.id_demanda = d.id AND o.status = 'PENDENTE') AS orcamentos_pendentes
+    FROM demanda d
+) AS c
+WHERE c.id = demanda.id
+  AND (demanda.itens_total, demanda.itens_atendidos, demanda.orcamentos_total, demanda.orcamentos_pendentes)
+      IS NOT (c.itens_total, c.itens_atendidos, c.orcamentos_total, c.orcamentos_pendentes);
+"""
+
+# ==============================================================================
+# DEMANDAS COMPATÍVEIS COM UM FORNECEDOR
+# ==============================================================================
+
+# Demandas ATIVAS com itens nas categorias em que o fornecedor tem itens ativos,
+# lidas dos pares de demanda_match (migração 0007). Filtros opcionais: cidade
+# ('' = todas; sem diferenciar maiúsculas, acentuadas inclusive, com a collation
+# UNICODE_NOCASE registrada pelo pool) e categoria (0 = todas; a demanda precisa
+# ter item compatível dela).
+# Parâmetros: id_fornecedor, id_fornecedor, cidade, cidade, id_categoria, id_categoria
+_DEMANDAS_COMPATIVEIS = """
+WITH categorias AS (
+    SELECT DISTINCT id_categoria FROM item WHERE id_fornecedor = ? AND ativo = 1
+),
+compativeis AS (
+    SELECT d.id, d.id_casal, d.descricao, d.orcamento_total, d.data_casamento, d.cidade_casamento,
+           d.prazo_entrega, d.status, d.data_criacao, d.observacoes,
+           m.itens_compativeis, m.criado_em AS compativel_desde
+    FROM demanda_match m
+    JOIN demanda d ON d.id = m.id_demanda
+    WHERE m.id_fornecedor = ?
+      AND d.status = 'ATIVA'
+      AND (? = '' OR d.cidade_casamento = ? COLLATE UNICODE_NOCASE)
+      AND (? = 0 OR EXISTS (
+          SELECT 1 FROM item_demanda idm
+          WHERE idm.id_demanda = d.id AND idm.id_categoria = ?
+            AND idm.id_categoria IN (SELECT id_categoria FROM categorias)
+      ))
+)
+"""
+
+# Página de demandas compatíveis; o total de itens, os itens compatíveis (JSON),
+# o orçamento já enviado, se é nova desde a última visita e os nomes do casal
+# só são lidos para a página.
+# Parâmetros: os de _DEMANDAS_COMPATIVEIS, limite, deslocamento, id_fornecedor, id_fornecedor
+OBTER_DEMANDAS_COMPATIVEIS_FORNECEDOR = _DEMANDAS_COMPATIVEIS + """,
+pagina AS (
+    SELECT * FROM compativeis
+    ORDER BY data_criacao DESC, id DESC
+    LIMIT ? OFFSET ?
+)
+SELECT p.*,
+       (SELECT COUNT(*) FROM item_demanda t WHERE t.id_demanda = p.id) AS total_itens,
+       (SELECT json_group_array(json_object(
+                   'id', idm.id, 'tipo', idm.tipo, 'id_categoria', idm.id_categoria,
+                   'categoria_nome', c.nome, 'descricao', idm.descricao,
+                   'quantidade', idm.quantidade, 'preco_maximo', idm.preco_maximo))
+        FROM item_demanda idm
+        LEFT JOIN categoria c ON c.id = idm.id_categoria
+        WHERE idm.id_demanda = p.id
+          AND idm.id_categoria IN (SELECT id_categoria FROM categorias)) AS itens_compativeis_json,
+       EXISTS (SELECT 1 FROM orcamento o
+               WHERE o.id_demanda = p.id AND o.id_fornecedor_prestador = ?) AS ja_tem_orcamento,
+       p.compativel_desde > COALESCE(
+           (SELECT visto_em FROM visita_demandas WHERE id_fornecedor = ?), ''
+       ) AS nova,
+       u1.nome AS nome_noivo1,
+       u2.nome AS nome_noivo2
+FROM pagina p
+LEFT JOIN casal ca ON ca.id = p.id_casal
+LEFT JOIN usuario u1 ON u1.id = ca.id_noivo1
+LEFT JOIN usuario u2 ON u2.id = ca.id_noivo2
+ORDER BY p.data_criacao DESC, p.id DESC;
+"""
+
+# Parâmetros: os de _DEMANDAS_COMPATIVEIS
+CONTAR_DEMANDAS_COMPATIVEIS_FORNECEDOR = _DEMANDAS_COMPATIVEIS + """
+SELECT COUNT(*) AS total FROM compativeis;
+"""
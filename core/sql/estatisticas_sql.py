@@ -0,0 +1,40 @@
+from core.sql.item_sql import OBTER_ESTATISTICAS_ITENS
+
+# ==============================================================================
+# ESTATÍSTICAS DO PAINEL ADMINISTRATIVO
+# ==============================================================================
+
+# Todos os contadores em uma única ida ao banco. As contagens por perfil e por
+# tipo usam idx_usuario_perfil e idx_item_tipo; os detalhes de preço por tipo
+# (a mesma consulta de item_sql.OBTER_ESTATISTICAS_ITENS) voltam como um array
+# JSON na coluna detalhes_itens.
+# Parâmetros: perfil NOIVO, perfil ADMIN, tipos PRODUTO, SERVIÇO e ESPAÇO
+# (contagem de itens) e os mesmos três tipos (fornecedores por tipo).
+OBTER_ESTATISTICAS = f"""
+SELECT
+    (SELECT COUNT(*) FROM usuario) AS total_usuarios,
+    (SELECT COUNT(*) FROM usuario WHERE perfil = ?) AS total_noivos,
+    (SELECT COUNT(*) FROM usuario WHERE perfil = ?) AS total_admins,
+    (SELECT COUNT(*) FROM fornecedor) AS total_fornecedores,
+    (SELECT COUNT(*) FROM fornecedor WHERE verificado = 0) AS fornecedores_nao_verificados,
+    (SELECT COUNT(*) FROM item) AS total_itens,
+    (SELECT COUNT(*) FROM item WHERE tipo = ?) AS itens_produtos,
+    (SELECT COUNT(*) FROM item WHERE tipo = ?) AS itens_servicos,
+    (SELECT COUNT(*) FROM item WHERE tipo = ?) AS itens_espacos,
+    (SELECT COUNT(*) FROM categoria) AS total_categorias,
+    (SELECT COUNT(*) FROM orcamento) AS total_orcamentos,
+    (SELECT COUNT(*) FROM demanda) AS total_demandas,
+    (SELECT COUNT(DISTINCT id_fornecedor) FROM item WHERE tipo = ?) AS fornecedores_vendedores,
+    (SELECT COUNT(DISTINCT id_fornecedor) FROM item WHERE tipo = ?) AS fornecedores_prestadores,
+    (SELECT COUNT(DISTINCT id_fornecedor) FROM item WHERE tipo = ?) AS fornecedores_locadores,
+    (
+        SELECT json_group_array(json_object(
+            'tipo', tipo,
+            'quantidade', quantidade,
+            'preco_medio', preco_medio,
+            'preco_minimo', preco_minimo,
+            'preco_maximo', preco_maximo
+        ))
+        FROM ({OBTER_ESTATISTICAS_ITENS.strip().rstrip(";")})
+    ) AS detalhes_itens;
+"""
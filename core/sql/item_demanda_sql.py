@@ -33,6 +33,12 @@ CREATE TABLE IF NOT EXISTS item_demanda (
 # Queries compatíveis com BaseRepo
 CRIAR_TABELA = CRIAR_TABELA_ITEM_DEMANDA
 
+# Índices secundários (chaves estrangeiras e colunas de filtro)
+INDICES = {
+    "idx_item_demanda_id_demanda": "CREATE INDEX IF NOT EXISTS idx_item_demanda_id_demanda ON item_demanda(id_demanda);",
+    "idx_item_demanda_id_categoria": "CREATE INDEX IF NOT EXISTS idx_item_demanda_id_categoria ON item_demanda(id_categoria, tipo);",
+}
+
 INSERIR = """
 INSERT INTO item_demanda (id_demanda, tipo, id_categoria, descricao, quantidade, preco_maximo, observacoes)
 VALUES (?, ?, ?, ?, ?, ?, ?);
@@ -110,9 +116,10 @@ DELETE FROM item_demanda
 WHERE id_demanda = ?;
 """
 
-# Buscar demandas que têm itens de determinado tipo e categoria (para fornecedores)
+# Buscar demandas que têm itens de determinadas categorias (para fornecedores)
 OBTER_DEMANDAS_COM_ITENS_COMPATIVEIS = """
 SELECT DISTINCT id_demanda
 FROM item_demanda
-WHERE tipo = ? AND id_categoria IN ({categorias_placeholder});
+WHERE id_categoria IN ({categorias_placeholder})
+ORDER BY id_demanda;
 """
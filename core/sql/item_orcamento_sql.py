@@ -20,6 +20,13 @@ CREATE TABLE IF NOT EXISTS item_orcamento (
 # Queries compatíveis com BaseRepo
 CRIAR_TABELA = CRIAR_TABELA_ITEM_ORCAMENTO
 
+# Índices secundários (chaves estrangeiras e colunas de filtro)
+# id_orcamento já é coberto pelo índice automático de UNIQUE(id_orcamento, ...)
+INDICES = {
+    "idx_item_orcamento_id_item_demanda": "CREATE INDEX IF NOT EXISTS idx_item_orcamento_id_item_demanda ON item_orcamento(id_item_demanda);",
+    "idx_item_orcamento_id_item": "CREATE INDEX IF NOT EXISTS idx_item_orcamento_id_item ON item_orcamento(id_item);",
+}
+
 INSERIR = """
 INSERT INTO item_orcamento (id_orcamento, id_item_demanda, id_item, quantidade, preco_unitario, observacoes, desconto, status, motivo_rejeicao)
 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?);
@@ -157,6 +164,14 @@ WHERE io.id_orcamento = ? AND io.status = ?
 ORDER BY io.id;
 """
 
+# Contagem de itens de vários orçamentos de uma vez ({marcadores} = ?, ?, ...)
+CONTAR_ITENS_POR_ORCAMENTOS = """
+SELECT id_orcamento, COUNT(*) as total
+FROM item_orcamento
+WHERE id_orcamento IN ({marcadores})
+GROUP BY id_orcamento;
+"""
+
 CONTAR_ITENS_POR_STATUS = """
 SELECT COUNT(*) as total
 FROM item_orcamento
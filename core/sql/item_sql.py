@@ -19,6 +19,14 @@ CREATE TABLE IF NOT EXISTS item (
 );
 """
 
+# Índices secundários (chaves estrangeiras e colunas de filtro)
+# Índices compostos com 'ativo' também atendem buscas só pela primeira coluna
+INDICES = {
+    "idx_item_id_fornecedor": "CREATE INDEX IF NOT EXISTS idx_item_id_fornecedor ON item(id_fornecedor, ativo);",
+    "idx_item_tipo": "CREATE INDEX IF NOT EXISTS idx_item_tipo ON item(tipo, ativo);",
+    "idx_item_id_categoria": "CREATE INDEX IF NOT EXISTS idx_item_id_categoria ON item(id_categoria, ativo);",
+}
+
 INSERIR = """
 INSERT INTO item (id_fornecedor, tipo, nome, descricao, preco, id_categoria, observacoes, ativo)
 VALUES (?, ?, ?, ?, ?, ?, ?, ?);
@@ -116,6 +124,20 @@ ORDER BY i.data_cadastro DESC
 LIMIT ? OFFSET ?;
 """
 
+# Base para paginação keyset do catálogo (BaseRepo._paginar_por_cursor
+# acrescenta a condição do cursor, o ORDER BY e o LIMIT)
+LISTAR_ITENS_PUBLICOS_CURSOR = """
+SELECT i.id, i.id_fornecedor, i.tipo, i.nome, i.descricao, i.preco, i.observacoes, i.ativo, i.data_cadastro, i.id_categoria,
+       u.nome as fornecedor_nome, f.nome_empresa as fornecedor_empresa, c.nome as categoria_nome
+FROM item i
+JOIN usuario u ON i.id_fornecedor = u.id
+LEFT JOIN fornecedor f ON i.id_fornecedor = f.id
+LEFT JOIN categoria c ON i.id_categoria = c.id
+WHERE i.ativo = 1
+  AND (? IS NULL OR i.tipo = ?)
+  AND (? IS NULL OR i.id_categoria = ?)
+"""
+
 CONTAR_ITENS_PUBLICOS_FILTRADOS = """
 SELECT COUNT(*) as total
 FROM item i
@@ -127,6 +149,38 @@ WHERE i.ativo = 1
   AND (? IS NULL OR i.id_categoria = ?);
 """
 
+# Busca textual no catálogo público via item_fts (migração 0002).
+# snippet() marca os termos encontrados com char(2)/char(3); o template troca
+# esses marcadores por <mark> depois de escapar o texto.
+# Pesos do bm25: nome, descricao, observacoes, categoria_nome, fornecedor_nome
+BUSCAR_ITENS_PUBLICOS_TEXTO = """
+SELECT i.id, i.id_fornecedor, i.tipo, i.nome, i.descricao, i.preco, i.observacoes, i.ativo, i.data_cadastro, i.id_categoria,
+       u.nome as fornecedor_nome, f.nome_empresa as fornecedor_empresa, c.nome as categoria_nome,
+       snippet(item_fts, -1, char(2), char(3), '…', 16) as trecho,
+       bm25(item_fts, 10.0, 4.0, 1.0, 3.0, 2.0) as relevancia
+FROM item_fts
+JOIN item i ON i.id = item_fts.rowid
+JOIN usuario u ON i.id_fornecedor = u.id
+LEFT JOIN fornecedor f ON i.id_fornecedor = f.id
+LEFT JOIN categoria c ON i.id_categoria = c.id
+WHERE item_fts MATCH ?
+  AND i.ativo = 1
+  AND (? IS NULL OR i.tipo = ?)
+  AND (? IS NULL OR i.id_categoria = ?)
+ORDER BY relevancia, i.id DESC
+LIMIT ? OFFSET ?;
+"""
+
+CONTAR_ITENS_PUBLICOS_TEXTO = """
+SELECT COUNT(*) as total
+FROM item_fts
+JOIN item i ON i.id = item_fts.rowid
+WHERE item_fts MATCH ?
+  AND i.ativo = 1
+  AND (? IS NULL OR i.tipo = ?)
+  AND (? IS NULL OR i.id_categoria = ?);
+"""
+
 OBTER_ITEM_PUBLICO_POR_ID = """
 SELECT i.id, i.id_fornecedor, i.tipo, i.nome, i.descricao, i.preco, i.observacoes, i.ativo, i.data_cadastro,
        u.nome as fornecedor_nome, u.email as fornecedor_email, u.telefone as fornecedor_telefone,
@@ -16,6 +16,12 @@ CREATE TABLE IF NOT EXISTS orcamento (
 # Queries compatíveis com BaseRepo
 CRIAR_TABELA = CRIAR_TABELA_ORCAMENTO
 
+# Índices secundários (chaves estrangeiras e colunas de filtro)
+INDICES = {
+    "idx_orcamento_id_demanda": "CREATE INDEX IF NOT EXISTS idx_orcamento_id_demanda ON orcamento(id_demanda, status);",
+    "idx_orcamento_id_fornecedor_prestador": "CREATE INDEX IF NOT EXISTS idx_orcamento_id_fornecedor_prestador ON orcamento(id_fornecedor_prestador);",
+}
+
 INSERIR = """
 INSERT INTO orcamento (id_demanda, id_fornecedor_prestador, data_hora_cadastro,
                       data_hora_validade, status, observacoes, valor_total)
@@ -134,4 +140,37 @@ REJEITAR_ORCAMENTO = """
 UPDATE orcamento
 SET status = 'REJEITADO'
 WHERE id = ?;
-"""
\ No newline at end of file
+"""
+
+# ==============================================================================
+# CONTADORES DENORMALIZADOS (mantidos por gatilhos, migração 0005)
+# ==============================================================================
+
+OBTER_CONTADORES_ITENS = """
+SELECT itens_total, itens_aceitos, itens_rejeitados, itens_pendentes
+FROM orcamento
+WHERE id = ?;
+"""
+
+# Recalcula os contadores de todos os orçamentos; só altera (e conta no
+# rowcount) as linhas cujos valores divergem da contagem real
+RECALCULAR_CONTADORES = """
+UPDATE orcamento
+SET itens_total = c.itens_total,
+    itens_aceitos = c.itens_aceitos,
+    itens_rejeitados = c.itens_rejeitados,
+    itens_pendentes = c.itens_pendentes
+FROM (
+    SELECT o.id,
+           COUNT(io.id) AS itens_total,
+           COUNT(CASE WHEN io.status = 'ACEITO' THEN 1 END) AS itens_aceitos,
+           COUNT(CASE WHEN io.status = 'REJEITADO' THEN 1 END) AS itens_rejeitados,
+           COUNT(CASE WHEN io.status = 'PENDENTE' THEN 1 END) AS itens_pendentes
+    FROM orcamento o
+    LEFT JOIN item_orcamento io ON io.id_orcamento = o.id
+    GROUP BY o.id
+) AS c
+WHERE c.id = orcamento.id
+  AND (orcamento.itens_total, orcamento.itens_aceitos, orcamento.itens_rejeitados, orcamento.itens_pendentes)
+      IS NOT (c.itens_total, c.itens_aceitos, c.itens_rejeitados, c.itens_pendentes);
+"""
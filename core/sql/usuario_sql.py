@@ -19,6 +19,12 @@ CREATE TABLE IF NOT EXISTS usuario (
 );
 """
 
+# Índices secundários (chaves estrangeiras e colunas de filtro)
+INDICES = {
+    "idx_usuario_token_redefinicao": "CREATE INDEX IF NOT EXISTS idx_usuario_token_redefinicao ON usuario(token_redefinicao);",
+    "idx_usuario_perfil": "CREATE INDEX IF NOT EXISTS idx_usuario_perfil ON usuario(perfil);",
+}
+
 INSERIR = """
 INSERT INTO usuario (nome, cpf, data_nascimento, email, telefone, senha, perfil)
 VALUES (?, ?, ?, ?, ?, ?, ?);
@@ -3,12 +3,58 @@ Infrastructure Database - Conexões e queries de banco de dados
 
 Este módulo gerencia toda a infraestrutura de banco de dados:
 - connection: Gerenciamento de conexões SQLite
+- pool: Pool de conexões reutilizáveis
+- pragmas: Perfis de PRAGMA (production/test) aplicados às conexões
+- unidade_trabalho: Transação única e mapa de identidade por requisição
+- executor: Pool de threads que tira as chamadas ao banco do event loop
+- instrumentacao: Tempo e linhas por instrução SQL e log de consultas lentas
+- cache_tabela: Cache em processo de tabelas pequenas, invalidado por versão
+- migracoes: Executor de migrações versionadas (pasta migrations/)
 - adapters: Adaptadores customizados para tipos Python/SQLite
 - queries: Todas as queries SQL organizadas por entidade
 """
 
 from infrastructure.database.connection import obter_conexao
+from infrastructure.database.pool import PoolConexoes, obter_pool, fechar_pools
+from infrastructure.database.pragmas import PERFIS_PRAGMA, obter_perfil_pragma
+from infrastructure.database.migracoes import aplicar_migracoes, obter_versao_atual
+from infrastructure.database.unidade_trabalho import (
+    UnidadeTrabalho,
+    UnidadeTrabalhoMiddleware,
+    bloco_assincrono,
+    confirmar_trabalho,
+    liberar_conexao,
+    obter_unidade_atual,
+    unidade_de_trabalho,
+)
+from infrastructure.database.cache_tabela import CacheTabela
+from infrastructure.database.executor import executar_no_banco, encerrar_executor
+from infrastructure.database.instrumentacao import (
+    EstatisticasSql,
+    perfil_sql,
+    normalizar_sql,
+)
 
 __all__ = [
     'obter_conexao',
+    'PoolConexoes',
+    'obter_pool',
+    'fechar_pools',
+    'PERFIS_PRAGMA',
+    'obter_perfil_pragma',
+    'aplicar_migracoes',
+    'obter_versao_atual',
+    'UnidadeTrabalho',
+    'UnidadeTrabalhoMiddleware',
+    'bloco_assincrono',
+    'confirmar_trabalho',
+    'liberar_conexao',
+    'obter_unidade_atual',
+    'unidade_de_trabalho',
+    'CacheTabela',
+    'executar_no_banco',
+    'encerrar_executor',
+    'EstatisticasSql',
+    'perfil_sql',
+    'normalizar_sql',
 ]
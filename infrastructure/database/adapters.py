@@ -15,6 +15,17 @@ def convert_datetime(s: bytes) -> datetime:
     return datetime.fromisoformat(s.decode())
 
 
+def compare_casefold(a: str, b: str) -> int:
+    """Collation UNICODE_NOCASE: como NOCASE, mas para letras fora do ASCII ("SÃO" = "são")"""
+    a, b = a.casefold(), b.casefold()
+    return (a > b) - (a < b)
+
+
+def register_collations(conexao: sqlite3.Connection) -> None:
+    """Registra as collations customizadas na conexão"""
+    conexao.create_collation("UNICODE_NOCASE", compare_casefold)
+
+
 def register_adapters() -> None:
     """Registra os adaptadores customizados para datetime no sqlite3"""
     sqlite3.register_adapter(datetime, adapt_datetime)
@@ -0,0 +1,102 @@
+"""
+Cache em processo para tabelas pequenas e raramente alteradas
+
+CacheTabela guarda um instantâneo da tabela inteira (montado por uma função
+de carga) e o reaproveita até que uma destas condições o descarte:
+- o TTL expirou;
+- o próprio processo escreveu na tabela e chamou invalidar();
+- outro worker escreveu na tabela. Os gatilhos da migração 0004 incrementam
+  versao_cache.versao a cada INSERT/UPDATE/DELETE; o cache compara essa versão
+  com a do instantâneo no máximo uma vez a cada intervalo_verificacao segundos.
+
+Os instantâneos são separados por caminho do banco, então bancos diferentes
+(ex: um por teste) nunca compartilham dados. Em um banco sem a migração 0004
+valem apenas o TTL e a invalidação local.
+"""
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Generic, Optional, TypeVar
+
+from infrastructure.database.connection import obter_conexao
+from infrastructure.database.pool import obter_caminho_banco
+from infrastructure.metricas.registro import registrar_acesso_cache
+
+T = TypeVar("T")
+
+OBTER_VERSAO = "SELECT versao FROM versao_cache WHERE nome = ?"
+
+
+@dataclass
+class _Instantaneo(Generic[T]):
+    """Dados carregados e a versão da tabela no momento da carga"""
+
+    dados: T
+    versao: Optional[int]
+    carregado_em: float
+    verificado_em: float
+
+
+class CacheTabela(Generic[T]):
+    """Instantâneo de leitura (read-through) de uma tabela, com TTL e versão"""
+
+    def __init__(
+        self,
+        nome: str,
+        carregar: Callable[[], T],
+        ttl: float,
+        intervalo_verificacao: float,
+    ):
+        """
+        Args:
+            nome: Nome da tabela em versao_cache (ex: "categoria")
+            carregar: Função que lê a tabela e monta os dados do cache
+            ttl: Tempo máximo (segundos) de vida de um instantâneo
+            intervalo_verificacao: Intervalo (segundos) entre consultas à versão
+        """
+        self.nome = nome
+        self._carregar = carregar
+        self.ttl = ttl
+        self.intervalo_verificacao = intervalo_verificacao
+        self._instantaneos: Dict[str, _Instantaneo[T]] = {}
+        self.acertos = 0
+        self.cargas = 0
+
+    def _ler_versao(self) -> Optional[int]:
+        """Versão atual da tabela no banco (None se versao_cache não existe)"""
+        try:
+            with obter_conexao() as conexao:
+                linha = conexao.execute(OBTER_VERSAO, (self.nome,)).fetchone()
+        except sqlite3.OperationalError:
+            return None
+        return int(linha[0]) if linha else 0
+
+    def obter(self) -> T:
+        """Dados do cache, recarregados da tabela se estiverem desatualizados"""
+        caminho = obter_caminho_banco()
+        agora = time.monotonic()
+        instantaneo = self._instantaneos.get(caminho)
+
+        if instantaneo is not None and agora - instantaneo.carregado_em < self.ttl:
+            if agora - instantaneo.verificado_em < self.intervalo_verificacao:
+                self.acertos += 1
+                registrar_acesso_cache(self.nome, acerto=True)
+                return instantaneo.dados
+            if self._ler_versao() == instantaneo.versao:
+                instantaneo.verificado_em = agora
+                self.acertos += 1
+                registrar_acesso_cache(self.nome, acerto=True)
+                return instantaneo.dados
+
+        # A versão é lida antes dos dados: uma escrita entre as duas leituras
+        # só provoca uma recarga a mais, nunca um instantâneo antigo
+        versao = self._ler_versao()
+        dados = self._carregar()
+        self._instantaneos[caminho] = _Instantaneo(dados, versao, agora, agora)
+        self.cargas += 1
+        registrar_acesso_cache(self.nome, acerto=False)
+        return dados
+
+    def invalidar(self) -> None:
+        """Descarta os instantâneos; a próxima leitura recarrega a tabela"""
+        self._instantaneos.clear()
@@ -1,17 +1,30 @@
 import sqlite3
-import os
+from contextlib import contextmanager
+from typing import Iterator
 from infrastructure.database.adapters import register_adapters
+from infrastructure.database.pool import obter_pool
+from infrastructure.database.unidade_trabalho import obter_unidade_atual
 
-def obter_conexao() -> sqlite3.Connection:
-    # Registra os adaptadores customizados para datetime
-    register_adapters()
-    # Obtém o caminho do banco de dados a partir da variável de ambiente de testes ou usa o padrão
-    database_path = os.environ.get('TEST_DATABASE_PATH', 'dados.db')
-    # Conecta ao banco de dados SQLite
-    conexao = sqlite3.connect(database_path)
-    # Ativa as chaves estrangeiras
-    conexao.execute("PRAGMA foreign_keys = ON")
-    # Define a fábrica de linhas para retornar dicionários
-    conexao.row_factory = sqlite3.Row
-    # Retorna a conexão com o banco de dados
-    return conexao
\ No newline at end of file
+# Registra os adaptadores customizados para datetime (uma única vez por processo)
+register_adapters()
+
+
+@contextmanager
+def obter_conexao() -> Iterator[sqlite3.Connection]:
+    """
+    Empresta uma conexão do pool do banco configurado.
+
+    Deve ser usada com `with`: o bloco roda em uma transação que recebe commit
+    ao final (ou rollback em caso de erro) e a conexão volta ao pool.
+    Dentro de uma unidade de trabalho (ex: durante uma requisição), o bloco usa
+    a conexão da unidade e o commit fica para o final dela.
+    O caminho do banco vem de TEST_DATABASE_PATH ou usa o padrão 'dados.db'.
+    """
+    unidade = obter_unidade_atual()
+    if unidade is not None:
+        with unidade.bloco() as conexao:
+            yield conexao
+        return
+
+    with obter_pool().conexao() as conexao:
+        yield conexao
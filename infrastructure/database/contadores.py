@@ -0,0 +1,47 @@
+"""
+Reparo dos dados denormalizados de demanda, orçamento e demanda_match
+
+Os contadores (migração 0005) e os pares fornecedor-demanda (migração 0007)
+são mantidos por gatilhos, na mesma transação das escritas. Este módulo
+recalcula todos a partir das tabelas de itens e orçamentos, para o caso de
+divergência (restauração parcial de backup, escrita com os gatilhos
+desativados, etc.), e informa quantas linhas estavam erradas.
+
+Uso pela linha de comando:
+    python -m infrastructure.database.contadores
+"""
+from typing import Dict
+
+from core.sql import demanda_match_sql, demanda_sql, orcamento_sql
+from infrastructure.database.connection import obter_conexao
+from infrastructure.logging import logger
+
+
+def recalcular_contadores() -> Dict[str, int]:
+    """
+    Recalcula os contadores de todas as demandas e orçamentos e os pares de
+    demanda_match.
+
+    Returns:
+        Dict[str, int]: Linhas corrigidas por tabela
+    """
+    with obter_conexao() as conexao:
+        corrigidas = {
+            "orcamento": conexao.execute(orcamento_sql.RECALCULAR_CONTADORES).rowcount,
+            "demanda": conexao.execute(demanda_sql.RECALCULAR_CONTADORES).rowcount,
+            "demanda_match": (
+                conexao.execute(demanda_match_sql.EXCLUIR_PARES_DIVERGENTES).rowcount
+                + conexao.execute(demanda_match_sql.RECALCULAR_PARES).rowcount
+            ),
+        }
+
+    if any(corrigidas.values()):
+        logger.warning("Contadores divergentes corrigidos", **corrigidas)
+    else:
+        logger.info("Contadores conferidos, nenhuma divergência")
+    return corrigidas
+
+
+if __name__ == "__main__":
+    for tabela, total in recalcular_contadores().items():
+        print(f"{tabela}: {total} linha(s) corrigida(s)")
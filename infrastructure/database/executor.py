@@ -0,0 +1,90 @@
+"""
+Execução das operações de banco fora do event loop
+
+O sqlite3 é bloqueante: uma consulta lenta chamada direto de uma rota async
+trava todas as requisições do worker. executar_no_banco() roda a função em um
+pool de threads dedicado ao banco, com o mesmo tamanho do pool de conexões, e
+leva junto o contexto atual, de modo que a unidade de trabalho da requisição
+continua valendo dentro da thread.
+
+Chamadas de uma mesma unidade de trabalho são serializadas (a conexão da
+unidade nunca é usada por duas threads ao mesmo tempo), e a conexão da unidade
+é emprestada do pool antes de ocupar uma thread do banco: se o pool estiver
+esgotado, a espera não prende as threads de que as outras requisições precisam
+para terminar e devolver suas conexões.
+"""
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from config.constants import DatabaseConstants
+from infrastructure.database.unidade_trabalho import UnidadeTrabalho, obter_unidade_atual
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+# Uma trava por unidade de trabalho (descartada junto com a unidade)
+_travas: "weakref.WeakKeyDictionary[UnidadeTrabalho, asyncio.Lock]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def obter_executor() -> ThreadPoolExecutor:
+    """Pool de threads do banco, criado no primeiro uso"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=int(
+                        os.environ.get("DATABASE_POOL_SIZE", DatabaseConstants.POOL_SIZE)
+                    ),
+                    thread_name_prefix="banco",
+                )
+    return _executor
+
+
+def encerrar_executor() -> None:
+    """Encerra o pool de threads do banco (encerramento da aplicação)"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+async def executar_no_banco(funcao: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Executa uma função bloqueante de banco no pool de threads do banco.
+
+    Args:
+        funcao: Função síncrona (ex: um método de repositório)
+        *args, **kwargs: Argumentos repassados à função
+
+    Returns:
+        O retorno da função
+    """
+    loop = asyncio.get_running_loop()
+    chamada = functools.partial(funcao, *args, **kwargs)
+
+    unidade = obter_unidade_atual()
+    if unidade is None:
+        contexto = contextvars.copy_context()
+        return await loop.run_in_executor(obter_executor(), contexto.run, chamada)
+
+    trava = _travas.get(unidade)
+    if trava is None:
+        trava = _travas.setdefault(unidade, asyncio.Lock())
+    async with trava:
+        if not unidade.conectada:
+            # Espera por vaga no pool fora das threads do banco
+            await asyncio.to_thread(lambda: unidade.conexao)
+        contexto = contextvars.copy_context()
+        return await loop.run_in_executor(obter_executor(), contexto.run, chamada)
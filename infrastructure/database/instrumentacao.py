@@ -0,0 +1,415 @@
+"""
+Tempo, linhas e texto normalizado de cada instrução SQL
+
+As conexões do pool usam ConexaoInstrumentada: todo cursor (inclusive os de
+conexao.execute) mede a execução e as leituras de linhas (fetchone, fetchall,
+iteração) e soma o resultado em perfil_sql, agrupado pelo SQL
+normalizado (literais e listas de IN trocados por marcadores). Para cada
+instrução ficam o total de execuções, o tempo total e máximo, as linhas e as
+últimas DatabaseConstants.SQL_STATS_SAMPLES execuções, de onde saem p50 e p95.
+
+Uma execução que passa de DATABASE_SLOW_QUERY_MS milissegundos é registrada
+no log como consulta lenta, junto com o EXPLAIN QUERY PLAN, e guardada entre
+as últimas consultas lentas. O relatório é exibido em
+/admin/relatorios/consultas.
+
+Durante uma requisição as instruções também são somadas ao contexto da
+requisição (quantidade e tempo na categoria "db"), usado pelas métricas HTTP
+e pelo cabeçalho Server-Timing. Com o rastreamento ligado, cada instrução é
+um span (SQL normalizado, formato dos parâmetros e linhas), do execute até a
+leitura das linhas.
+"""
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from itertools import groupby
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, TypeVar, overload
+
+from opentelemetry.trace import Span, SpanKind
+
+from config.constants import DatabaseConstants
+from infrastructure.logging import ContextoRequisicao, logger, obter_contexto
+from infrastructure.rastreamento import marcar_erro, obter_tracer
+
+_C = TypeVar("_C", bound=sqlite3.Cursor)
+
+_ESPACOS = re.compile(r"\s+")
+_TEXTO = re.compile(r"'(?:[^']|'')*'")
+_NUMERO = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_LISTA_IN = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=2048)
+def normalizar_sql(sql: str) -> str:
+    """
+    Texto da instrução sem literais, para agrupar execuções da mesma consulta.
+
+    Examples:
+        >>> normalizar_sql("SELECT * FROM item WHERE id IN (?, ?, ?) LIMIT 10")
+        'SELECT * FROM item WHERE id IN (...) LIMIT ?'
+    """
+    normalizado = _ESPACOS.sub(" ", sql).strip().rstrip(";").strip()
+    normalizado = _TEXTO.sub("?", normalizado)
+    normalizado = _NUMERO.sub("?", normalizado)
+    return _LISTA_IN.sub("IN (...)", normalizado)
+
+
+def formato_parametros(parametros: Any) -> str:
+    """
+    Quantidade e tipos dos parâmetros, sem os valores (atributo dos spans).
+
+    Examples:
+        >>> formato_parametros((7, 8, 9, "ativo"))
+        '4: int*3,str'
+    """
+    if isinstance(parametros, dict):
+        return f"{len(parametros)} nomeados: {','.join(sorted(parametros))}"
+    tipos = [
+        f"{tipo}*{quantidade}" if quantidade > 1 else tipo
+        for tipo, quantidade in (
+            (tipo, len(list(grupo)))
+            for tipo, grupo in groupby(type(parametro).__name__ for parametro in parametros)
+        )
+    ]
+    return f"{len(parametros)}: {','.join(tipos)}"
+
+
+def _percentil(valores: List[float], fracao: float) -> float:
+    """Percentil por posição mais próxima de uma lista ordenada"""
+    if not valores:
+        return 0.0
+    return valores[min(len(valores) - 1, int(fracao * len(valores)))]
+
+
+class _Execucao:
+    """Tempo e linhas de uma execução (as leituras de linhas somam depois)"""
+
+    __slots__ = ("tempo", "linhas", "lenta")
+
+    def __init__(self, tempo: float, linhas: int):
+        self.tempo = tempo
+        self.linhas = linhas
+        self.lenta = False
+
+
+class _Instrucao:
+    """Totais de uma instrução normalizada"""
+
+    __slots__ = ("sql", "quantidade", "tempo_total", "tempo_maximo", "linhas", "amostras")
+
+    def __init__(self, sql: str, tamanho_amostra: int):
+        self.sql = sql
+        self.quantidade = 0
+        self.tempo_total = 0.0
+        self.tempo_maximo = 0.0
+        self.linhas = 0
+        self.amostras: Deque[_Execucao] = deque(maxlen=tamanho_amostra)
+
+
+class EstatisticasSql:
+    """Estatísticas por instrução SQL e registro das consultas lentas"""
+
+    def __init__(
+        self,
+        limite_lenta_ms: float,
+        tamanho_amostra: int = DatabaseConstants.SQL_STATS_SAMPLES,
+        historico_lentas: int = DatabaseConstants.SLOW_QUERY_HISTORY,
+    ):
+        """
+        Args:
+            limite_lenta_ms: Execuções acima deste tempo são consultas lentas
+            tamanho_amostra: Execuções guardadas por instrução (p50/p95)
+            historico_lentas: Quantas consultas lentas recentes guardar
+        """
+        self.limite_lenta = limite_lenta_ms / 1000
+        self.tamanho_amostra = tamanho_amostra
+        self._instrucoes: Dict[str, _Instrucao] = {}
+        self._lentas: Deque[Dict[str, Any]] = deque(maxlen=historico_lentas)
+        self._lock = threading.Lock()
+
+    def registrar(self, sql: str, tempo: float, linhas: int) -> Tuple[_Instrucao, _Execucao]:
+        """
+        Soma uma execução à instrução.
+
+        Returns:
+            tuple: (instrução, execução), para somar as leituras de linhas
+        """
+        normalizado = normalizar_sql(sql)
+        execucao = _Execucao(tempo, linhas)
+        with self._lock:
+            instrucao = self._instrucoes.get(normalizado)
+            if instrucao is None:
+                instrucao = self._instrucoes[normalizado] = _Instrucao(
+                    normalizado, self.tamanho_amostra
+                )
+            instrucao.quantidade += 1
+            instrucao.tempo_total += tempo
+            instrucao.linhas += linhas
+            instrucao.tempo_maximo = max(instrucao.tempo_maximo, tempo)
+            instrucao.amostras.append(execucao)
+        return instrucao, execucao
+
+    def somar_leitura(
+        self, instrucao: _Instrucao, execucao: _Execucao, tempo: float, linhas: int
+    ) -> None:
+        """Soma uma leitura de linhas (fetch) à execução e à instrução"""
+        with self._lock:
+            execucao.tempo += tempo
+            execucao.linhas += linhas
+            instrucao.tempo_total += tempo
+            instrucao.linhas += linhas
+            instrucao.tempo_maximo = max(instrucao.tempo_maximo, execucao.tempo)
+
+    def registrar_lenta(
+        self,
+        conexao: sqlite3.Connection,
+        instrucao: _Instrucao,
+        execucao: _Execucao,
+        sql: str,
+        parametros: Any,
+    ) -> None:
+        """Registra a consulta lenta no log, com o plano de execução"""
+        execucao.lenta = True
+        try:
+            plano = [
+                linha[3]
+                for linha in sqlite3.Cursor(conexao).execute(
+                    f"EXPLAIN QUERY PLAN {sql}", parametros
+                )
+            ]
+        except sqlite3.Error:
+            plano = []
+
+        lenta = {
+            "sql": instrucao.sql,
+            "tempo_ms": round(execucao.tempo * 1000, 2),
+            "linhas": execucao.linhas,
+            "plano": plano,
+            "registrada_em": time.time(),
+        }
+        with self._lock:
+            self._lentas.append(lenta)
+        logger.warning("Consulta lenta", **lenta)
+
+    def relatorio(
+        self, ordenar_por: str = "tempo_total_ms", limite: int = 50
+    ) -> List[Dict[str, Any]]:
+        """
+        Tabela das instruções, da mais custosa para a menos custosa.
+
+        Args:
+            ordenar_por: Coluna de ordenação (tempo_total_ms, p95_ms, quantidade...)
+            limite: Máximo de linhas
+
+        Returns:
+            List[Dict[str, Any]]: Uma linha por instrução normalizada
+        """
+        with self._lock:
+            copias = [
+                (i.sql, i.quantidade, i.tempo_total, i.tempo_maximo, i.linhas,
+                 sorted(e.tempo for e in i.amostras))
+                for i in self._instrucoes.values()
+            ]
+
+        linhas: List[Dict[str, Any]] = [
+            {
+                "sql": sql,
+                "quantidade": quantidade,
+                "tempo_total_ms": round(total * 1000, 2),
+                "tempo_medio_ms": round(total / quantidade * 1000, 3),
+                "p50_ms": round(_percentil(tempos, 0.50) * 1000, 3),
+                "p95_ms": round(_percentil(tempos, 0.95) * 1000, 3),
+                "tempo_maximo_ms": round(maximo * 1000, 3),
+                "linhas": total_linhas,
+                "linhas_por_execucao": round(total_linhas / quantidade, 1),
+            }
+            for sql, quantidade, total, maximo, total_linhas, tempos in copias
+        ]
+        linhas.sort(key=lambda linha: linha.get(ordenar_por, 0), reverse=True)
+        return linhas[:limite]
+
+    def consultas_lentas(self) -> List[Dict[str, Any]]:
+        """Consultas lentas recentes, da mais nova para a mais antiga"""
+        with self._lock:
+            return list(reversed(self._lentas))
+
+    def zerar(self) -> None:
+        """Descarta as estatísticas e o histórico de consultas lentas"""
+        with self._lock:
+            self._instrucoes.clear()
+            self._lentas.clear()
+
+
+perfil_sql = EstatisticasSql(
+    limite_lenta_ms=float(
+        os.environ.get("DATABASE_SLOW_QUERY_MS", DatabaseConstants.SLOW_QUERY_MS)
+    ),
+)
+
+
+class CursorInstrumentado(sqlite3.Cursor):
+    """Cursor que soma tempo e linhas de cada instrução em perfil_sql"""
+
+    _medicao: Optional[Tuple[_Instrucao, _Execucao]] = None
+    _requisicao: Optional[ContextoRequisicao] = None
+    _span: Optional[Span] = None
+    # Linhas lidas por __next__ e ainda não somadas em perfil_sql: a soma (e o
+    # lock de perfil_sql) fica para o fim da iteração, e não a cada linha
+    _tempo_iterado = 0.0
+    _linhas_iteradas = 0
+
+    def _abrir_span(self, sql: str, parametros: Any) -> None:
+        # parametros None: executemany (o lote não é percorrido)
+        self._encerrar_span()
+        tracer = obter_tracer()
+        if tracer is not None:
+            normalizado = normalizar_sql(sql)
+            self._span = tracer.start_span(
+                normalizado[:80],
+                kind=SpanKind.CLIENT,
+                attributes={
+                    "db.system": "sqlite",
+                    "db.statement": normalizado,
+                    "db.operation": normalizado.split(" ", 1)[0].upper(),
+                    "db.sqlite.parametros": (
+                        "lote" if parametros is None else formato_parametros(parametros)
+                    ),
+                },
+            )
+
+    def _encerrar_span(self, erro: Optional[BaseException] = None) -> None:
+        # O span da instrução termina na leitura das linhas (ou logo após o
+        # execute, quando a instrução não devolve linhas)
+        span, self._span = self._span, None
+        if span is None:
+            return
+        if erro is not None:
+            marcar_erro(span, erro)
+        elif self._medicao is not None:
+            span.set_attribute("db.linhas", self._medicao[1].linhas)
+        span.end()
+
+    def _registrar(self, sql: str, parametros: Any, inicio: float) -> None:
+        tempo = time.perf_counter() - inicio
+        self._sql, self._parametros = sql, parametros
+        self._medicao = perfil_sql.registrar(sql, tempo, max(self.rowcount, 0))
+        self._requisicao = obter_contexto()
+        if self._requisicao is not None:
+            self._requisicao.consultas += 1
+            self._requisicao.somar("db", tempo)
+        self._verificar_lentidao()
+
+    def _ler(self, inicio: float, linhas: int) -> None:
+        tempo = time.perf_counter() - inicio + self._tempo_iterado
+        linhas += self._linhas_iteradas
+        self._tempo_iterado, self._linhas_iteradas = 0.0, 0
+        if self._medicao is not None:
+            instrucao, execucao = self._medicao
+            perfil_sql.somar_leitura(instrucao, execucao, tempo, linhas)
+            if self._requisicao is not None:
+                self._requisicao.somar("db", tempo)
+            self._verificar_lentidao()
+
+    def _descarregar_iteracao(self) -> None:
+        # Iteração interrompida antes do fim (novo execute ou close)
+        if self._linhas_iteradas:
+            self._ler(time.perf_counter(), 0)
+
+    def _verificar_lentidao(self) -> None:
+        if self._medicao is None:
+            return
+        instrucao, execucao = self._medicao
+        if execucao.tempo >= perfil_sql.limite_lenta and not execucao.lenta:
+            parametros = self._parametros if not isinstance(self._parametros, list) else ()
+            perfil_sql.registrar_lenta(
+                self.connection, instrucao, execucao, self._sql, parametros
+            )
+
+    def execute(self, sql: str, parametros: Any = ()) -> "CursorInstrumentado":
+        self._descarregar_iteracao()
+        self._abrir_span(sql, parametros)
+        inicio = time.perf_counter()
+        try:
+            super().execute(sql, parametros)
+        except BaseException as erro:
+            self._encerrar_span(erro)
+            raise
+        self._registrar(sql, parametros, inicio)
+        if self.description is None:
+            self._encerrar_span()
+        return self
+
+    def executemany(self, sql: str, parametros: Any) -> "CursorInstrumentado":
+        # Os parâmetros podem ser um gerador: só a lista vazia vai para o EXPLAIN
+        self._descarregar_iteracao()
+        self._abrir_span(sql, None)
+        inicio = time.perf_counter()
+        try:
+            super().executemany(sql, parametros)
+        except BaseException as erro:
+            self._encerrar_span(erro)
+            raise
+        self._registrar(sql, [], inicio)
+        self._encerrar_span()
+        return self
+
+    def fetchone(self) -> Any:
+        inicio = time.perf_counter()
+        linha = super().fetchone()
+        self._ler(inicio, int(linha is not None))
+        self._encerrar_span()
+        return linha
+
+    def fetchmany(self, size: Optional[int] = None) -> list:
+        inicio = time.perf_counter()
+        linhas = super().fetchmany(self.arraysize if size is None else size)
+        self._ler(inicio, len(linhas))
+        self._encerrar_span()
+        return linhas
+
+    def fetchall(self) -> list:
+        inicio = time.perf_counter()
+        linhas = super().fetchall()
+        self._ler(inicio, len(linhas))
+        self._encerrar_span()
+        return linhas
+
+    def __next__(self) -> Any:
+        inicio = time.perf_counter()
+        try:
+            linha = super().__next__()
+        except StopIteration:
+            self._ler(inicio, 0)
+            self._encerrar_span()
+            raise
+        self._tempo_iterado += time.perf_counter() - inicio
+        self._linhas_iteradas += 1
+        return linha
+
+    def close(self) -> None:
+        self._descarregar_iteracao()
+        self._encerrar_span()
+        super().close()
+
+
+class ConexaoInstrumentada(sqlite3.Connection):
+    """Conexão cujos cursores são CursorInstrumentado (ver pool.py)"""
+
+    @overload
+    def cursor(self, factory: None = None) -> sqlite3.Cursor: ...
+
+    @overload
+    def cursor(self, factory: Callable[[sqlite3.Connection], _C]) -> _C: ...
+
+    def cursor(self, factory: Optional[Callable[[sqlite3.Connection], Any]] = None) -> Any:
+        return super().cursor(factory or CursorInstrumentado)
+
+    def execute(self, sql: str, parametros: Any = ()) -> CursorInstrumentado:
+        return self.cursor(CursorInstrumentado).execute(sql, parametros)
+
+    def executemany(self, sql: str, parametros: Any) -> CursorInstrumentado:
+        return self.cursor(CursorInstrumentado).executemany(sql, parametros)
@@ -0,0 +1,174 @@
+"""
+Executor de migrações versionadas do esquema
+
+As migrações ficam em infrastructure/database/migrations/, em arquivos
+numerados no formato NNNN_descricao.py. Cada arquivo define COMANDOS (lista
+de instruções SQL) ou uma função aplicar(conexao) para lógica condicional.
+As versões aplicadas são registradas na tabela schema_version; a aplicação é
+somente para frente e cada migração roda em sua própria transação.
+
+Uso pela linha de comando:
+    python -m infrastructure.database.migracoes [--dry-run]
+"""
+import importlib
+import pkgutil
+import re
+import sqlite3
+import sys
+import time
+from dataclasses import dataclass
+from types import ModuleType
+from typing import List
+
+from infrastructure.database.connection import obter_conexao
+from infrastructure.logging import logger
+from util.exceptions import BancoDadosError
+
+PACOTE_MIGRACOES = "infrastructure.database.migrations"
+
+PADRAO_ARQUIVO = re.compile(r"^(\d{4})_(\w+)$")
+
+CRIAR_TABELA_VERSAO = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    versao INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL,
+    aplicada_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    duracao_ms REAL
+);
+"""
+
+
+@dataclass
+class Migracao:
+    """Migração descoberta no pacote de migrações"""
+
+    versao: int
+    nome: str
+    modulo: ModuleType
+
+    def aplicar(self, conexao: sqlite3.Connection) -> None:
+        """Executa a migração na conexão (já dentro de uma transação)"""
+        if hasattr(self.modulo, "aplicar"):
+            self.modulo.aplicar(conexao)
+        else:
+            for comando in self.modulo.COMANDOS:
+                conexao.execute(comando)
+
+
+@dataclass
+class ResultadoMigracao:
+    """Resultado de uma migração aplicada (ou simulada no dry-run)"""
+
+    versao: int
+    nome: str
+    aplicada: bool
+    duracao_ms: float = 0.0
+
+
+def descobrir_migracoes() -> List[Migracao]:
+    """Lista as migrações do pacote em ordem de versão"""
+    pacote = importlib.import_module(PACOTE_MIGRACOES)
+    migracoes: List[Migracao] = []
+    for info in pkgutil.iter_modules(pacote.__path__):
+        correspondencia = PADRAO_ARQUIVO.match(info.name)
+        if not correspondencia:
+            continue
+        modulo = importlib.import_module(f"{PACOTE_MIGRACOES}.{info.name}")
+        migracoes.append(
+            Migracao(
+                versao=int(correspondencia.group(1)),
+                nome=correspondencia.group(2),
+                modulo=modulo,
+            )
+        )
+
+    migracoes.sort(key=lambda m: m.versao)
+    versoes = [m.versao for m in migracoes]
+    if len(versoes) != len(set(versoes)):
+        raise BancoDadosError("Números de migração duplicados", "migração")
+    return migracoes
+
+
+def obter_versao_atual() -> int:
+    """Versão mais recente aplicada ao banco (0 se nenhuma)"""
+    with obter_conexao() as conexao:
+        conexao.execute(CRIAR_TABELA_VERSAO)
+        linha = conexao.execute("SELECT MAX(versao) FROM schema_version").fetchone()
+        return int(linha[0] or 0)
+
+
+def aplicar_migracoes(dry_run: bool = False) -> List[ResultadoMigracao]:
+    """
+    Aplica as migrações pendentes em ordem.
+
+    Args:
+        dry_run: Se True, apenas lista as migrações pendentes sem aplicá-las
+
+    Returns:
+        Lista com o resultado de cada migração pendente
+    """
+    versao_atual = obter_versao_atual()
+    pendentes = [m for m in descobrir_migracoes() if m.versao > versao_atual]
+    resultados: List[ResultadoMigracao] = []
+
+    if not pendentes:
+        logger.info("Esquema do banco atualizado", versao=versao_atual)
+        return resultados
+
+    for migracao in pendentes:
+        if dry_run:
+            resultados.append(
+                ResultadoMigracao(migracao.versao, migracao.nome, aplicada=False)
+            )
+            continue
+
+        inicio = time.perf_counter()
+        with obter_conexao() as conexao:
+            try:
+                conexao.execute("BEGIN")
+                migracao.aplicar(conexao)
+                duracao_ms = (time.perf_counter() - inicio) * 1000
+                conexao.execute(
+                    "INSERT INTO schema_version (versao, nome, duracao_ms) VALUES (?, ?, ?)",
+                    (migracao.versao, migracao.nome, duracao_ms),
+                )
+                conexao.commit()
+            except sqlite3.Error as e:
+                conexao.rollback()
+                logger.error(
+                    "Falha ao aplicar migração",
+                    erro=e,
+                    versao=migracao.versao,
+                    nome=migracao.nome,
+                )
+                raise BancoDadosError(
+                    f"Falha na migração {migracao.versao:04d}_{migracao.nome}",
+                    "migração",
+                    e,
+                )
+
+        logger.info(
+            "Migração aplicada",
+            versao=migracao.versao,
+            nome=migracao.nome,
+            duracao_ms=round(duracao_ms, 2),
+        )
+        resultados.append(
+            ResultadoMigracao(migracao.versao, migracao.nome, True, duracao_ms)
+        )
+
+    return resultados
+
+
+if __name__ == "__main__":
+    simular = "--dry-run" in sys.argv[1:]
+    relatorio = aplicar_migracoes(dry_run=simular)
+    if not relatorio:
+        print("Nenhuma migração pendente")
+    for resultado in relatorio:
+        situacao = (
+            f"aplicada em {resultado.duracao_ms:.1f} ms"
+            if resultado.aplicada
+            else "pendente (dry-run)"
+        )
+        print(f"{resultado.versao:04d}_{resultado.nome}: {situacao}")
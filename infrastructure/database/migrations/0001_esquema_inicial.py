@@ -0,0 +1,159 @@
+"""
+Esquema inicial: tabelas e índices existentes antes do controle de versão.
+
+Usa CREATE ... IF NOT EXISTS para que bancos criados pela versão anterior
+(sem schema_version) sejam apenas registrados nesta versão. O SQL fica
+congelado aqui: mudanças posteriores nos módulos de core.sql (colunas,
+índices) entram no esquema só pelas migrações seguintes.
+"""
+
+TABELAS = [
+    """
+    CREATE TABLE IF NOT EXISTS usuario (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nome TEXT NOT NULL,
+        cpf TEXT,
+        data_nascimento TEXT,
+        email TEXT NOT NULL UNIQUE,
+        telefone TEXT,
+        senha TEXT NOT NULL,
+        perfil TEXT NOT NULL DEFAULT 'NOIVO',
+        token_redefinicao TEXT,
+        data_token TIMESTAMP,
+        data_cadastro TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        ativo BOOLEAN NOT NULL DEFAULT 1
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS fornecedor (
+        id INTEGER PRIMARY KEY,
+        nome_empresa TEXT,
+        cnpj TEXT,
+        descricao TEXT,
+        verificado BOOLEAN DEFAULT 0,
+        data_verificacao DATETIME,
+        newsletter BOOLEAN DEFAULT 0,
+        FOREIGN KEY (id) REFERENCES usuario(id)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS casal (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        id_noivo1 INTEGER NOT NULL,
+        id_noivo2 INTEGER NOT NULL,
+        data_casamento TEXT,
+        local_previsto TEXT,
+        orcamento_estimado TEXT,
+        numero_convidados INTEGER,
+        data_cadastro TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (id_noivo1) REFERENCES usuario(id),
+        FOREIGN KEY (id_noivo2) REFERENCES usuario(id)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS categoria (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nome TEXT NOT NULL,
+        tipo_fornecimento TEXT NOT NULL,
+        descricao TEXT,
+        ativo BOOLEAN NOT NULL DEFAULT 1
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS demanda (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        id_casal INTEGER NOT NULL,
+        descricao TEXT NOT NULL,
+        orcamento_total DECIMAL(10,2),
+        data_casamento DATE,
+        cidade_casamento VARCHAR(255),
+        prazo_entrega VARCHAR(255),
+        status VARCHAR(20) DEFAULT 'ATIVA',
+        data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        observacoes TEXT,
+        FOREIGN KEY (id_casal) REFERENCES casal(id)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS item (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        id_fornecedor INTEGER NOT NULL,
+        tipo TEXT NOT NULL CHECK (tipo IN ('PRODUTO', 'SERVIÇO', 'ESPAÇO')),
+        nome TEXT NOT NULL,
+        descricao TEXT NOT NULL,
+        preco REAL NOT NULL,
+        id_categoria INTEGER NOT NULL,
+        observacoes TEXT,
+        ativo BOOLEAN DEFAULT 1,
+        data_cadastro DATETIME DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (id_fornecedor) REFERENCES fornecedor(id) ON DELETE CASCADE,
+        FOREIGN KEY (id_categoria) REFERENCES categoria(id)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS item_demanda (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        id_demanda INTEGER NOT NULL,
+        tipo VARCHAR(20) NOT NULL,
+        id_categoria INTEGER NOT NULL,
+        descricao TEXT NOT NULL,
+        quantidade INTEGER NOT NULL DEFAULT 1,
+        preco_maximo REAL,
+        observacoes TEXT,
+        FOREIGN KEY (id_demanda) REFERENCES demanda(id) ON DELETE CASCADE,
+        FOREIGN KEY (id_categoria) REFERENCES categoria(id)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS orcamento (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        id_demanda INTEGER NOT NULL,
+        id_fornecedor_prestador INTEGER NOT NULL,
+        data_hora_cadastro TIMESTAMP NOT NULL,
+        data_hora_validade TIMESTAMP,
+        status TEXT NOT NULL DEFAULT 'PENDENTE',
+        observacoes TEXT,
+        valor_total REAL,
+        FOREIGN KEY (id_demanda) REFERENCES demanda(id) ON DELETE CASCADE,
+        FOREIGN KEY (id_fornecedor_prestador) REFERENCES usuario(id) ON DELETE CASCADE
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS item_orcamento (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        id_orcamento INTEGER NOT NULL,
+        id_item_demanda INTEGER NOT NULL,
+        id_item INTEGER NOT NULL,
+        quantidade INTEGER NOT NULL DEFAULT 1,
+        preco_unitario REAL NOT NULL,
+        observacoes TEXT,
+        desconto REAL DEFAULT 0,
+        status TEXT NOT NULL DEFAULT 'PENDENTE',
+        motivo_rejeicao TEXT,
+        FOREIGN KEY (id_orcamento) REFERENCES orcamento(id) ON DELETE CASCADE,
+        FOREIGN KEY (id_item_demanda) REFERENCES item_demanda(id) ON DELETE CASCADE,
+        FOREIGN KEY (id_item) REFERENCES item(id) ON DELETE CASCADE,
+        UNIQUE(id_orcamento, id_item_demanda, id_item)
+    );
+    """,
+]
+
+INDICES = [
+    "CREATE INDEX IF NOT EXISTS idx_usuario_token_redefinicao ON usuario(token_redefinicao);",
+    "CREATE INDEX IF NOT EXISTS idx_usuario_perfil ON usuario(perfil);",
+    "CREATE INDEX IF NOT EXISTS idx_casal_id_noivo1 ON casal(id_noivo1);",
+    "CREATE INDEX IF NOT EXISTS idx_casal_id_noivo2 ON casal(id_noivo2);",
+    "CREATE INDEX IF NOT EXISTS idx_demanda_id_casal ON demanda(id_casal);",
+    "CREATE INDEX IF NOT EXISTS idx_demanda_status ON demanda(status);",
+    "CREATE INDEX IF NOT EXISTS idx_item_id_fornecedor ON item(id_fornecedor, ativo);",
+    "CREATE INDEX IF NOT EXISTS idx_item_tipo ON item(tipo, ativo);",
+    "CREATE INDEX IF NOT EXISTS idx_item_id_categoria ON item(id_categoria, ativo);",
+    "CREATE INDEX IF NOT EXISTS idx_item_demanda_id_demanda ON item_demanda(id_demanda);",
+    "CREATE INDEX IF NOT EXISTS idx_item_demanda_id_categoria ON item_demanda(id_categoria, tipo);",
+    "CREATE INDEX IF NOT EXISTS idx_orcamento_id_demanda ON orcamento(id_demanda, status);",
+    "CREATE INDEX IF NOT EXISTS idx_orcamento_id_fornecedor_prestador ON orcamento(id_fornecedor_prestador);",
+    "CREATE INDEX IF NOT EXISTS idx_item_orcamento_id_item_demanda ON item_orcamento(id_item_demanda);",
+    "CREATE INDEX IF NOT EXISTS idx_item_orcamento_id_item ON item_orcamento(id_item);",
+]
+
+COMANDOS = TABELAS + INDICES
@@ -0,0 +1,86 @@
+"""
+Índice de busca textual (FTS5) para o catálogo público de itens.
+
+item_fts guarda nome, descrição, observações, nome da categoria e nome do
+fornecedor de cada item (rowid = item.id). A tokenização unicode61 com
+remove_diacritics 2 torna a busca insensível a acentos ("cafe" encontra
+"café"). Gatilhos em item, categoria, fornecedor e usuario mantêm o índice
+sincronizado.
+"""
+COMANDOS = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS item_fts USING fts5(
+        nome,
+        descricao,
+        observacoes,
+        categoria_nome,
+        fornecedor_nome,
+        tokenize = 'unicode61 remove_diacritics 2'
+    );
+    """,
+    # Itens
+    """
+    CREATE TRIGGER IF NOT EXISTS item_fts_ai AFTER INSERT ON item BEGIN
+        INSERT INTO item_fts (rowid, nome, descricao, observacoes, categoria_nome, fornecedor_nome)
+        SELECT i.id, i.nome, i.descricao, COALESCE(i.observacoes, ''),
+               COALESCE(c.nome, ''), TRIM(COALESCE(f.nome_empresa, '') || ' ' || COALESCE(u.nome, ''))
+        FROM item i
+        LEFT JOIN categoria c ON c.id = i.id_categoria
+        LEFT JOIN fornecedor f ON f.id = i.id_fornecedor
+        LEFT JOIN usuario u ON u.id = i.id_fornecedor
+        WHERE i.id = NEW.id;
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS item_fts_au
+    AFTER UPDATE OF nome, descricao, observacoes, id_categoria, id_fornecedor ON item BEGIN
+        DELETE FROM item_fts WHERE rowid = OLD.id;
+        INSERT INTO item_fts (rowid, nome, descricao, observacoes, categoria_nome, fornecedor_nome)
+        SELECT i.id, i.nome, i.descricao, COALESCE(i.observacoes, ''),
+               COALESCE(c.nome, ''), TRIM(COALESCE(f.nome_empresa, '') || ' ' || COALESCE(u.nome, ''))
+        FROM item i
+        LEFT JOIN categoria c ON c.id = i.id_categoria
+        LEFT JOIN fornecedor f ON f.id = i.id_fornecedor
+        LEFT JOIN usuario u ON u.id = i.id_fornecedor
+        WHERE i.id = NEW.id;
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS item_fts_ad AFTER DELETE ON item BEGIN
+        DELETE FROM item_fts WHERE rowid = OLD.id;
+    END;
+    """,
+    # Nomes denormalizados: categoria e fornecedor
+    """
+    CREATE TRIGGER IF NOT EXISTS item_fts_categoria_au AFTER UPDATE OF nome ON categoria BEGIN
+        UPDATE item_fts SET categoria_nome = NEW.nome
+        WHERE rowid IN (SELECT id FROM item WHERE id_categoria = NEW.id);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS item_fts_fornecedor_au AFTER UPDATE OF nome_empresa ON fornecedor BEGIN
+        UPDATE item_fts
+        SET fornecedor_nome = TRIM(COALESCE(NEW.nome_empresa, '') || ' ' ||
+                                  COALESCE((SELECT nome FROM usuario WHERE id = NEW.id), ''))
+        WHERE rowid IN (SELECT id FROM item WHERE id_fornecedor = NEW.id);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS item_fts_usuario_au AFTER UPDATE OF nome ON usuario BEGIN
+        UPDATE item_fts
+        SET fornecedor_nome = TRIM(COALESCE((SELECT nome_empresa FROM fornecedor WHERE id = NEW.id), '') ||
+                                  ' ' || COALESCE(NEW.nome, ''))
+        WHERE rowid IN (SELECT id FROM item WHERE id_fornecedor = NEW.id);
+    END;
+    """,
+    # Itens já existentes
+    """
+    INSERT INTO item_fts (rowid, nome, descricao, observacoes, categoria_nome, fornecedor_nome)
+    SELECT i.id, i.nome, i.descricao, COALESCE(i.observacoes, ''),
+           COALESCE(c.nome, ''), TRIM(COALESCE(f.nome_empresa, '') || ' ' || COALESCE(u.nome, ''))
+    FROM item i
+    LEFT JOIN categoria c ON c.id = i.id_categoria
+    LEFT JOIN fornecedor f ON f.id = i.id_fornecedor
+    LEFT JOIN usuario u ON u.id = i.id_fornecedor;
+    """,
+]
@@ -0,0 +1,9 @@
+"""
+Índice para a paginação keyset do catálogo público.
+
+Cobre WHERE ativo = 1 ORDER BY data_cadastro DESC, id DESC e a comparação
+(data_cadastro, id) < (?, ?) usada pelo cursor.
+"""
+COMANDOS = [
+    "CREATE INDEX IF NOT EXISTS idx_item_publicacao ON item(ativo, data_cadastro, id);",
+]
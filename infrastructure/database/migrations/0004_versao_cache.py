@@ -0,0 +1,32 @@
+"""
+Contadores de versão para invalidar caches em processo entre workers.
+
+versao_cache guarda uma versão por tabela cacheada (ver cache_tabela.py).
+Gatilhos incrementam a versão a cada escrita, inclusive as feitas fora dos
+repositórios (carga inicial, scripts), e cada worker descarta seu cache ao
+perceber que a versão mudou.
+"""
+COMANDOS = [
+    """
+    CREATE TABLE IF NOT EXISTS versao_cache (
+        nome TEXT PRIMARY KEY,
+        versao INTEGER NOT NULL DEFAULT 0
+    );
+    """,
+    "INSERT OR IGNORE INTO versao_cache (nome, versao) VALUES ('categoria', 0);",
+    """
+    CREATE TRIGGER IF NOT EXISTS versao_cache_categoria_ai AFTER INSERT ON categoria BEGIN
+        UPDATE versao_cache SET versao = versao + 1 WHERE nome = 'categoria';
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS versao_cache_categoria_au AFTER UPDATE ON categoria BEGIN
+        UPDATE versao_cache SET versao = versao + 1 WHERE nome = 'categoria';
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS versao_cache_categoria_ad AFTER DELETE ON categoria BEGIN
+        UPDATE versao_cache SET versao = versao + 1 WHERE nome = 'categoria';
+    END;
+    """,
+]
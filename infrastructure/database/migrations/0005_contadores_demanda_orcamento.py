@@ -0,0 +1,198 @@
+"""
+Contadores denormalizados de demanda e orçamento, mantidos por gatilhos.
+
+demanda ganha itens_total, itens_atendidos (itens com algum item de orçamento
+ACEITO), orcamentos_total e orcamentos_pendentes; orcamento ganha itens_total,
+itens_aceitos, itens_rejeitados e itens_pendentes. Os gatilhos atualizam os
+contadores na mesma transação da escrita, inclusive em exclusões em cascata.
+Os valores iniciais vêm de uma cópia congelada de RECALCULAR_CONTADORES (o
+reparo, em contadores.py, usa a versão atual de core/sql).
+"""
+import sqlite3
+
+COLUNAS = {
+    "demanda": ["itens_total", "itens_atendidos", "orcamentos_total", "orcamentos_pendentes"],
+    "orcamento": ["itens_total", "itens_aceitos", "itens_rejeitados", "itens_pendentes"],
+}
+
+# Recontagem de itens_atendidos da linha de demanda sendo atualizada: um item
+# aceito em dois orçamentos conta uma vez só, então não dá para só somar 1
+_ITENS_ATENDIDOS = """(
+            SELECT COUNT(DISTINCT io.id_item_demanda)
+            FROM item_orcamento io
+            JOIN item_demanda idm ON idm.id = io.id_item_demanda
+            WHERE idm.id_demanda = demanda.id AND io.status = 'ACEITO'
+        )"""
+
+GATILHOS = [
+    # Itens da demanda
+    """
+    CREATE TRIGGER IF NOT EXISTS contadores_item_demanda_ai AFTER INSERT ON item_demanda BEGIN
+        UPDATE demanda SET itens_total = itens_total + 1 WHERE id = NEW.id_demanda;
+    END;
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS contadores_item_demanda_ad AFTER DELETE ON item_demanda BEGIN
+        UPDATE demanda
+        SET itens_total = itens_total - 1, itens_atendidos = {_ITENS_ATENDIDOS}
+        WHERE id = OLD.id_demanda;
+    END;
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS contadores_item_demanda_au
+    AFTER UPDATE OF id_demanda ON item_demanda
+    WHEN OLD.id_demanda IS NOT NEW.id_demanda BEGIN
+        UPDATE demanda SET itens_total = itens_total - 1 WHERE id = OLD.id_demanda;
+        UPDATE demanda SET itens_total = itens_total + 1 WHERE id = NEW.id_demanda;
+        UPDATE demanda SET itens_atendidos = {_ITENS_ATENDIDOS}
+        WHERE id IN (OLD.id_demanda, NEW.id_demanda);
+    END;
+    """,
+    # Orçamentos da demanda
+    """
+    CREATE TRIGGER IF NOT EXISTS contadores_orcamento_ai AFTER INSERT ON orcamento BEGIN
+        UPDATE demanda
+        SET orcamentos_total = orcamentos_total + 1,
+            orcamentos_pendentes = orcamentos_pendentes + (NEW.status IS 'PENDENTE')
+        WHERE id = NEW.id_demanda;
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS contadores_orcamento_ad AFTER DELETE ON orcamento BEGIN
+        UPDATE demanda
+        SET orcamentos_total = orcamentos_total - 1,
+            orcamentos_pendentes = orcamentos_pendentes - (OLD.status IS 'PENDENTE')
+        WHERE id = OLD.id_demanda;
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS contadores_orcamento_au
+    AFTER UPDATE OF status, id_demanda ON orcamento
+    WHEN OLD.status IS NOT NEW.status OR OLD.id_demanda IS NOT NEW.id_demanda BEGIN
+        UPDATE demanda
+        SET orcamentos_total = orcamentos_total - 1,
+            orcamentos_pendentes = orcamentos_pendentes - (OLD.status IS 'PENDENTE')
+        WHERE id = OLD.id_demanda;
+        UPDATE demanda
+        SET orcamentos_total = orcamentos_total + 1,
+            orcamentos_pendentes = orcamentos_pendentes + (NEW.status IS 'PENDENTE')
+        WHERE id = NEW.id_demanda;
+    END;
+    """,
+    # Itens do orçamento
+    f"""
+    CREATE TRIGGER IF NOT EXISTS contadores_item_orcamento_ai AFTER INSERT ON item_orcamento BEGIN
+        UPDATE orcamento
+        SET itens_total = itens_total + 1,
+            itens_aceitos = itens_aceitos + (NEW.status IS 'ACEITO'),
+            itens_rejeitados = itens_rejeitados + (NEW.status IS 'REJEITADO'),
+            itens_pendentes = itens_pendentes + (NEW.status IS 'PENDENTE')
+        WHERE id = NEW.id_orcamento;
+        UPDATE demanda SET itens_atendidos = {_ITENS_ATENDIDOS}
+        WHERE NEW.status = 'ACEITO'
+          AND id = (SELECT id_demanda FROM item_demanda WHERE id = NEW.id_item_demanda);
+    END;
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS contadores_item_orcamento_ad AFTER DELETE ON item_orcamento BEGIN
+        UPDATE orcamento
+        SET itens_total = itens_total - 1,
+            itens_aceitos = itens_aceitos - (OLD.status IS 'ACEITO'),
+            itens_rejeitados = itens_rejeitados - (OLD.status IS 'REJEITADO'),
+            itens_pendentes = itens_pendentes - (OLD.status IS 'PENDENTE')
+        WHERE id = OLD.id_orcamento;
+        UPDATE demanda SET itens_atendidos = {_ITENS_ATENDIDOS}
+        WHERE OLD.status = 'ACEITO'
+          AND id = (SELECT id_demanda FROM item_demanda WHERE id = OLD.id_item_demanda);
+    END;
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS contadores_item_orcamento_au
+    AFTER UPDATE OF status, id_orcamento, id_item_demanda ON item_orcamento
+    WHEN OLD.status IS NOT NEW.status
+      OR OLD.id_orcamento IS NOT NEW.id_orcamento
+      OR OLD.id_item_demanda IS NOT NEW.id_item_demanda BEGIN
+        UPDATE orcamento
+        SET itens_total = itens_total - 1,
+            itens_aceitos = itens_aceitos - (OLD.status IS 'ACEITO'),
+            itens_rejeitados = itens_rejeitados - (OLD.status IS 'REJEITADO'),
+            itens_pendentes = itens_pendentes - (OLD.status IS 'PENDENTE')
+        WHERE id = OLD.id_orcamento;
+        UPDATE orcamento
+        SET itens_total = itens_total + 1,
+            itens_aceitos = itens_aceitos + (NEW.status IS 'ACEITO'),
+            itens_rejeitados = itens_rejeitados + (NEW.status IS 'REJEITADO'),
+            itens_pendentes = itens_pendentes + (NEW.status IS 'PENDENTE')
+        WHERE id = NEW.id_orcamento;
+        UPDATE demanda SET itens_atendidos = {_ITENS_ATENDIDOS}
+        WHERE (OLD.status = 'ACEITO' OR NEW.status = 'ACEITO')
+          AND id IN (
+              SELECT id_demanda FROM item_demanda
+              WHERE id IN (OLD.id_item_demanda, NEW.id_item_demanda)
+          );
+    END;
+    """,
+]
+
+# Valores iniciais: demanda_sql/orcamento_sql.RECALCULAR_CONTADORES na versão
+# desta migração
+RECALCULAR_DEMANDA = """
+UPDATE demanda
+SET itens_total = c.itens_total,
+    itens_atendidos = c.itens_atendidos,
+    orcamentos_total = c.orcamentos_total,
+    orcamentos_pendentes = c.orcamentos_pendentes
+FROM (
+    SELECT d.id,
+           (SELECT COUNT(*) FROM item_demanda idm WHERE idm.id_demanda = d.id) AS itens_total,
+           (SELECT COUNT(DISTINCT io.id_item_demanda)
+            FROM item_orcamento io
+            JOIN item_demanda idm ON idm.id = io.id_item_demanda
+            WHERE idm.id_demanda = d.id AND io.status = 'ACEITO') AS itens_atendidos,
+           (SELECT COUNT(*) FROM orcamento o WHERE o.id_demanda = d.id) AS orcamentos_total,
+           (SELECT COUNT(*) FROM orcamento o
+            WHERE o.id_demanda = d.id AND o.status = 'PENDENTE') AS orcamentos_pendentes
+    FROM demanda d
+) AS c
+WHERE c.id = demanda.id
+  AND (demanda.itens_total, demanda.itens_atendidos, demanda.orcamentos_total, demanda.orcamentos_pendentes)
+      IS NOT (c.itens_total, c.itens_atendidos, c.orcamentos_total, c.orcamentos_pendentes);
+"""
+
+RECALCULAR_ORCAMENTO = """
+UPDATE orcamento
+SET itens_total = c.itens_total,
+    itens_aceitos = c.itens_aceitos,
+    itens_rejeitados = c.itens_rejeitados,
+    itens_pendentes = c.itens_pendentes
+FROM (
+    SELECT o.id,
+           COUNT(io.id) AS itens_total,
+           COUNT(CASE WHEN io.status = 'ACEITO' THEN 1 END) AS itens_aceitos,
+           COUNT(CASE WHEN io.status = 'REJEITADO' THEN 1 END) AS itens_rejeitados,
+           COUNT(CASE WHEN io.status = 'PENDENTE' THEN 1 END) AS itens_pendentes
+    FROM orcamento o
+    LEFT JOIN item_orcamento io ON io.id_orcamento = o.id
+    GROUP BY o.id
+) AS c
+WHERE c.id = orcamento.id
+  AND (orcamento.itens_total, orcamento.itens_aceitos, orcamento.itens_rejeitados, orcamento.itens_pendentes)
+      IS NOT (c.itens_total, c.itens_aceitos, c.itens_rejeitados, c.itens_pendentes);
+"""
+
+
+def aplicar(conexao: sqlite3.Connection) -> None:
+    """Adiciona as colunas ausentes, cria os gatilhos e calcula os valores iniciais"""
+    for tabela, colunas in COLUNAS.items():
+        existentes = {linha[1] for linha in conexao.execute(f"PRAGMA table_info({tabela})")}
+        for coluna in colunas:
+            if coluna not in existentes:
+                conexao.execute(
+                    f"ALTER TABLE {tabela} ADD COLUMN {coluna} INTEGER NOT NULL DEFAULT 0"
+                )
+
+    for gatilho in GATILHOS:
+        conexao.execute(gatilho)
+
+    conexao.execute(RECALCULAR_DEMANDA)
+    conexao.execute(RECALCULAR_ORCAMENTO)
@@ -0,0 +1,9 @@
+"""
+Índice para a busca de demandas compatíveis com um fornecedor.
+
+Cobre id_categoria IN (categorias do fornecedor) com o agrupamento por
+id_demanda sem ler as linhas de item_demanda.
+"""
+COMANDOS = [
+    "CREATE INDEX IF NOT EXISTS idx_item_demanda_categoria_demanda ON item_demanda(id_categoria, id_demanda);",
+]
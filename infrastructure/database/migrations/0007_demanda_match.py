@@ -0,0 +1,164 @@
+"""
+Caixa de entrada dos fornecedores: pares (fornecedor, demanda) compatíveis.
+
+demanda_match tem um par para cada demanda com itens nas categorias em que o
+fornecedor tem itens ativos, com a quantidade desses itens e quando o par
+surgiu; visita_demandas guarda a última visita de cada fornecedor à lista.
+Gatilhos mantêm os pares na mesma transação das escritas em item_demanda e
+item (inclusão, ativação, troca de categoria, exclusão em cascata). Os valores
+iniciais vêm de uma cópia congelada de RECALCULAR_PARES (o reparo, em
+contadores.py, usa a versão atual de core/sql).
+"""
+import sqlite3
+
+TABELAS = [
+    """
+    CREATE TABLE IF NOT EXISTS demanda_match (
+        id_fornecedor INTEGER NOT NULL,
+        id_demanda INTEGER NOT NULL,
+        itens_compativeis INTEGER NOT NULL DEFAULT 0,
+        criado_em TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now')),
+        PRIMARY KEY (id_fornecedor, id_demanda),
+        FOREIGN KEY (id_demanda) REFERENCES demanda(id) ON DELETE CASCADE
+    ) WITHOUT ROWID;
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_demanda_match_id_demanda ON demanda_match(id_demanda);",
+    """
+    CREATE TABLE IF NOT EXISTS visita_demandas (
+        id_fornecedor INTEGER PRIMARY KEY,
+        visto_em TEXT NOT NULL
+    );
+    """,
+]
+
+
+def _ajustar_demanda(demanda: str, categoria: str, delta: int) -> str:
+    """Soma delta aos pares da demanda com os fornecedores da categoria"""
+    if delta > 0:
+        return f"""
+        INSERT INTO demanda_match (id_fornecedor, id_demanda, itens_compativeis)
+        SELECT DISTINCT id_fornecedor, {demanda}, 1
+        FROM item WHERE id_categoria = {categoria} AND ativo = 1
+        ON CONFLICT (id_fornecedor, id_demanda)
+        DO UPDATE SET itens_compativeis = itens_compativeis + 1;
+        """
+    return f"""
+        UPDATE demanda_match SET itens_compativeis = itens_compativeis - 1
+        WHERE id_demanda = {demanda}
+          AND id_fornecedor IN (
+              SELECT id_fornecedor FROM item WHERE id_categoria = {categoria} AND ativo = 1
+          );
+        DELETE FROM demanda_match WHERE id_demanda = {demanda} AND itens_compativeis <= 0;
+        """
+
+
+def _recontar_fornecedor(fornecedor: str, categoria: str) -> str:
+    """
+    Recalcula os pares do fornecedor com as demandas que têm itens da categoria.
+
+    Usado quando o conjunto de categorias ativas do fornecedor pode ter mudado:
+    cria os pares novos, atualiza as quantidades (preservando criado_em) e
+    remove os pares que deixaram de ser compatíveis.
+    """
+    return f"""
+        INSERT INTO demanda_match (id_fornecedor, id_demanda, itens_compativeis)
+        SELECT {fornecedor}, idm.id_demanda, COUNT(*)
+        FROM item_demanda idm
+        WHERE idm.id_demanda IN (SELECT id_demanda FROM item_demanda WHERE id_categoria = {categoria})
+          AND idm.id_categoria IN (
+              SELECT id_categoria FROM item WHERE id_fornecedor = {fornecedor} AND ativo = 1
+          )
+        GROUP BY idm.id_demanda
+        ON CONFLICT (id_fornecedor, id_demanda)
+        DO UPDATE SET itens_compativeis = excluded.itens_compativeis
+        WHERE itens_compativeis IS NOT excluded.itens_compativeis;
+        DELETE FROM demanda_match
+        WHERE id_fornecedor = {fornecedor}
+          AND id_demanda IN (SELECT id_demanda FROM item_demanda WHERE id_categoria = {categoria})
+          AND NOT EXISTS (
+              SELECT 1 FROM item_demanda idm
+              JOIN item i ON i.id_categoria = idm.id_categoria
+              WHERE idm.id_demanda = demanda_match.id_demanda
+                AND i.id_fornecedor = {fornecedor} AND i.ativo = 1
+          );
+        """
+
+
+def _unico_na_categoria(linha: str) -> str:
+    """Condição: o fornecedor não tem outro item ativo na categoria da linha"""
+    return f"""NOT EXISTS (
+        SELECT 1 FROM item
+        WHERE id_fornecedor = {linha}.id_fornecedor AND id_categoria = {linha}.id_categoria
+          AND ativo = 1 AND id <> {linha}.id
+    )"""
+
+
+GATILHOS = [
+    # Itens da demanda: cada fornecedor da categoria ganha/perde um item compatível
+    f"""
+    CREATE TRIGGER IF NOT EXISTS demanda_match_item_demanda_ai AFTER INSERT ON item_demanda BEGIN
+        {_ajustar_demanda("NEW.id_demanda", "NEW.id_categoria", +1)}
+    END;
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS demanda_match_item_demanda_ad AFTER DELETE ON item_demanda BEGIN
+        {_ajustar_demanda("OLD.id_demanda", "OLD.id_categoria", -1)}
+    END;
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS demanda_match_item_demanda_au
+    AFTER UPDATE OF id_demanda, id_categoria ON item_demanda
+    WHEN OLD.id_demanda IS NOT NEW.id_demanda OR OLD.id_categoria IS NOT NEW.id_categoria BEGIN
+        -- soma antes de subtrair para não recriar (e marcar como novo) um par
+        -- que continua compatível
+        {_ajustar_demanda("NEW.id_demanda", "NEW.id_categoria", +1)}
+        {_ajustar_demanda("OLD.id_demanda", "OLD.id_categoria", -1)}
+    END;
+    """,
+    # Itens do fornecedor: só mexem nos pares quando a categoria entra ou sai
+    # do conjunto de categorias ativas dele
+    f"""
+    CREATE TRIGGER IF NOT EXISTS demanda_match_item_ai AFTER INSERT ON item
+    WHEN NEW.ativo = 1 AND {_unico_na_categoria("NEW")} BEGIN
+        {_recontar_fornecedor("NEW.id_fornecedor", "NEW.id_categoria")}
+    END;
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS demanda_match_item_ad AFTER DELETE ON item
+    WHEN OLD.ativo = 1 AND {_unico_na_categoria("OLD")} BEGIN
+        {_recontar_fornecedor("OLD.id_fornecedor", "OLD.id_categoria")}
+    END;
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS demanda_match_item_au
+    AFTER UPDATE OF ativo, id_categoria, id_fornecedor ON item
+    WHEN OLD.ativo IS NOT NEW.ativo
+      OR OLD.id_categoria IS NOT NEW.id_categoria
+      OR OLD.id_fornecedor IS NOT NEW.id_fornecedor BEGIN
+        {_recontar_fornecedor("OLD.id_fornecedor", "OLD.id_categoria")}
+        {_recontar_fornecedor("NEW.id_fornecedor", "NEW.id_categoria")}
+    END;
+    """,
+]
+
+# Pares iniciais: demanda_match_sql.RECALCULAR_PARES na versão desta migração
+RECALCULAR_PARES = """
+INSERT INTO demanda_match (id_fornecedor, id_demanda, itens_compativeis)
+SELECT id_fornecedor, id_demanda, itens_compativeis FROM (
+SELECT i.id_fornecedor, idm.id_demanda, COUNT(*) AS itens_compativeis
+FROM item_demanda idm
+JOIN (SELECT DISTINCT id_fornecedor, id_categoria FROM item WHERE ativo = 1) i
+  ON i.id_categoria = idm.id_categoria
+GROUP BY i.id_fornecedor, idm.id_demanda
+) WHERE true
+ON CONFLICT (id_fornecedor, id_demanda)
+DO UPDATE SET itens_compativeis = excluded.itens_compativeis
+WHERE itens_compativeis IS NOT excluded.itens_compativeis;
+"""
+
+
+def aplicar(conexao: sqlite3.Connection) -> None:
+    """Cria as tabelas e os gatilhos e calcula os pares iniciais"""
+    for comando in TABELAS + GATILHOS:
+        conexao.execute(comando)
+    conexao.execute(RECALCULAR_PARES)
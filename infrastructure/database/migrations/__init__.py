@@ -0,0 +1,7 @@
+"""
+Migrações versionadas do esquema do banco
+
+Arquivos no formato NNNN_descricao.py, aplicados em ordem por
+infrastructure.database.migracoes. Nunca altere uma migração já publicada:
+crie uma nova com o próximo número.
+"""
@@ -0,0 +1,228 @@
+"""
+Pool de conexões SQLite reutilizáveis
+
+Mantém conexões abertas entre chamadas de repositório, evitando o custo de
+abrir o arquivo, registrar adaptadores e executar PRAGMAs a cada operação.
+"""
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from config.constants import DatabaseConstants
+from infrastructure.database.adapters import register_collations
+from infrastructure.database.instrumentacao import ConexaoInstrumentada
+from infrastructure.database.pragmas import aplicar_pragmas, obter_perfil_pragma
+from util.exceptions import BancoDadosError
+
+
+class PoolConexoes:
+    """
+    Pool limitado de conexões para um único arquivo de banco.
+
+    As conexões ociosas ficam em uma fila LIFO (a mais recente é reutilizada
+    primeiro) e são validadas com `SELECT 1` quando ficam paradas por mais
+    tempo que o intervalo de verificação.
+    """
+
+    def __init__(
+        self,
+        database_path: str,
+        tamanho_maximo: int = DatabaseConstants.POOL_SIZE,
+        timeout: float = DatabaseConstants.DEFAULT_TIMEOUT,
+        intervalo_verificacao: float = DatabaseConstants.POOL_HEALTHCHECK_INTERVAL,
+        perfil_pragma: Optional[str] = None,
+    ):
+        """
+        Inicializa o pool
+
+        Args:
+            database_path: Caminho do arquivo SQLite
+            tamanho_maximo: Número máximo de conexões abertas simultaneamente
+            timeout: Segundos aguardando uma conexão livre antes de falhar
+            intervalo_verificacao: Segundos de ociosidade que disparam a verificação
+            perfil_pragma: Perfil de PRAGMAs (padrão: o configurado no ambiente)
+        """
+        if tamanho_maximo <= 0:
+            raise ValueError("tamanho_maximo deve ser positivo")
+
+        self.database_path = database_path
+        self.tamanho_maximo = tamanho_maximo
+        self.timeout = timeout
+        self.intervalo_verificacao = intervalo_verificacao
+        self.perfil_pragma = perfil_pragma or obter_perfil_pragma()
+
+        self._ociosas: "queue.LifoQueue[tuple[sqlite3.Connection, float]]" = (
+            queue.LifoQueue()
+        )
+        self._vagas = threading.BoundedSemaphore(tamanho_maximo)
+        self._lock = threading.Lock()
+        self._abertas = 0
+        self._fechado = False
+
+    @property
+    def conexoes_abertas(self) -> int:
+        """Total de conexões atualmente abertas (ociosas + emprestadas)"""
+        return self._abertas
+
+    @property
+    def conexoes_ociosas(self) -> int:
+        """Total de conexões paradas no pool aguardando reutilização"""
+        return self._ociosas.qsize()
+
+    def _criar_conexao(self) -> sqlite3.Connection:
+        """Abre e configura uma nova conexão"""
+        # check_same_thread=False: a conexão pode ser devolvida por uma thread
+        # e emprestada por outra, mas nunca é usada por duas ao mesmo tempo.
+        # ConexaoInstrumentada mede cada instrução (ver instrumentacao.py)
+        conexao = sqlite3.connect(
+            self.database_path, check_same_thread=False, factory=ConexaoInstrumentada
+        )
+        aplicar_pragmas(conexao, self.perfil_pragma)
+        register_collations(conexao)
+        conexao.row_factory = sqlite3.Row
+        with self._lock:
+            self._abertas += 1
+        return conexao
+
+    def _descartar(self, conexao: sqlite3.Connection) -> None:
+        """Fecha uma conexão que não deve voltar ao pool"""
+        try:
+            conexao.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._abertas -= 1
+
+    def _conexao_saudavel(self, conexao: sqlite3.Connection) -> bool:
+        """Verifica se a conexão ainda responde"""
+        try:
+            conexao.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def emprestar(self) -> sqlite3.Connection:
+        """
+        Obtém uma conexão do pool, abrindo uma nova se necessário.
+
+        Raises:
+            BancoDadosError: Se o pool estiver fechado ou esgotado após o timeout
+        """
+        if self._fechado:
+            raise BancoDadosError("Pool de conexões encerrado", "obtenção de conexão")
+
+        if not self._vagas.acquire(timeout=self.timeout):
+            raise BancoDadosError(
+                f"Nenhuma conexão livre após {self.timeout}s "
+                f"(limite de {self.tamanho_maximo})",
+                "obtenção de conexão",
+            )
+
+        try:
+            while True:
+                try:
+                    conexao, devolvida_em = self._ociosas.get_nowait()
+                except queue.Empty:
+                    return self._criar_conexao()
+
+                ociosa_ha = time.monotonic() - devolvida_em
+                if ociosa_ha < self.intervalo_verificacao or self._conexao_saudavel(
+                    conexao
+                ):
+                    return conexao
+                self._descartar(conexao)
+        except BaseException:
+            self._vagas.release()
+            raise
+
+    def devolver(self, conexao: sqlite3.Connection) -> None:
+        """Devolve uma conexão ao pool, descartando-a se estiver inutilizável"""
+        try:
+            if conexao.in_transaction:
+                conexao.rollback()
+        except sqlite3.Error:
+            self._descartar(conexao)
+        else:
+            if self._fechado:
+                self._descartar(conexao)
+            else:
+                self._ociosas.put((conexao, time.monotonic()))
+        finally:
+            self._vagas.release()
+
+    @contextmanager
+    def conexao(self) -> Iterator[sqlite3.Connection]:
+        """
+        Empresta uma conexão dentro de uma transação.
+
+        Faz commit ao final do bloco, rollback em caso de exceção e sempre
+        devolve a conexão ao pool.
+        """
+        conexao = self.emprestar()
+        try:
+            with conexao:
+                yield conexao
+        finally:
+            self.devolver(conexao)
+
+    def fechar(self) -> None:
+        """Fecha todas as conexões ociosas e impede novos empréstimos"""
+        self._fechado = True
+        while True:
+            try:
+                conexao, _ = self._ociosas.get_nowait()
+            except queue.Empty:
+                break
+            self._descartar(conexao)
+
+
+_pools: Dict[str, PoolConexoes] = {}
+_pools_lock = threading.Lock()
+
+
+def obter_pool(database_path: Optional[str] = None) -> PoolConexoes:
+    """
+    Retorna o pool do banco informado (ou do banco configurado no ambiente).
+
+    Um pool é criado por caminho de arquivo, o que mantém isolados os bancos
+    temporários usados pelos testes.
+    """
+    caminho = database_path or obter_caminho_banco()
+    pool = _pools.get(caminho)
+    if pool is not None:
+        return pool
+
+    with _pools_lock:
+        pool = _pools.get(caminho)
+        if pool is None:
+            pool = PoolConexoes(
+                caminho,
+                tamanho_maximo=int(
+                    os.environ.get("DATABASE_POOL_SIZE", DatabaseConstants.POOL_SIZE)
+                ),
+                timeout=float(
+                    os.environ.get(
+                        "DATABASE_POOL_TIMEOUT", DatabaseConstants.DEFAULT_TIMEOUT
+                    )
+                ),
+            )
+            _pools[caminho] = pool
+        return pool
+
+
+def obter_caminho_banco() -> str:
+    """Caminho do banco: variável de ambiente de testes ou o padrão"""
+    return os.environ.get("TEST_DATABASE_PATH", "dados.db")
+
+
+def fechar_pools() -> None:
+    """Fecha todos os pools abertos (encerramento da aplicação ou dos testes)"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.fechar()
@@ -0,0 +1,53 @@
+"""
+Perfis de PRAGMA aplicados a cada conexão do pool
+
+O perfil é escolhido pela variável de ambiente DATABASE_PRAGMA_PROFILE.
+Sem ela, usa "test" quando TEST_DATABASE_PATH está definida e
+"production" nos demais casos.
+"""
+import os
+import sqlite3
+from typing import Dict, Union
+
+ValorPragma = Union[int, str]
+
+PERFIS_PRAGMA: Dict[str, Dict[str, ValorPragma]] = {
+    # WAL permite leitores simultâneos a um escritor; NORMAL é seguro com WAL
+    # e evita um fsync por commit
+    "production": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "foreign_keys": "ON",
+        "cache_size": -20000,  # negativo = KiB (~20 MB por conexão)
+        "mmap_size": 268435456,  # 256 MB
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,  # ms
+    },
+    # Bancos temporários descartáveis: sem arquivos -wal/-shm e sem fsync
+    "test": {
+        "journal_mode": "MEMORY",
+        "synchronous": "OFF",
+        "foreign_keys": "ON",
+        "cache_size": -2000,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+}
+
+
+def obter_perfil_pragma() -> str:
+    """Nome do perfil configurado no ambiente"""
+    padrao = "test" if os.environ.get("TEST_DATABASE_PATH") else "production"
+    perfil = os.environ.get("DATABASE_PRAGMA_PROFILE", padrao)
+    if perfil not in PERFIS_PRAGMA:
+        raise ValueError(
+            f"Perfil de PRAGMA desconhecido: {perfil} "
+            f"(opções: {', '.join(PERFIS_PRAGMA)})"
+        )
+    return perfil
+
+
+def aplicar_pragmas(conexao: sqlite3.Connection, perfil: str) -> None:
+    """Aplica os PRAGMAs do perfil informado à conexão"""
+    for nome, valor in PERFIS_PRAGMA[perfil].items():
+        conexao.execute(f"PRAGMA {nome} = {valor}")
@@ -0,0 +1,321 @@
+"""
+Unidade de trabalho (unit of work) e mapa de identidade por requisição
+
+Enquanto uma UnidadeTrabalho está ativa no contexto atual, todas as chamadas a
+obter_conexao() usam a mesma conexão do pool e a mesma transação, que recebe
+commit uma única vez ao final (ou rollback se o trabalho terminar em exceção).
+Cada bloco `with obter_conexao()` continua atômico: dentro da unidade ele roda
+em um SAVEPOINT desfeito se o bloco falhar.
+
+A unidade também mantém um mapa de identidade: objetos lidos por chave
+(obter_por_id, obter_por_noivo, ...) são reaproveitados nas leituras seguintes.
+O mapa é descartado sempre que a conexão registra uma escrita, então nenhuma
+leitura posterior a INSERT/UPDATE/DELETE devolve dados antigos.
+
+Nas rotas, UnidadeTrabalhoMiddleware abre uma unidade por requisição HTTP e
+faz o commit antes de enviar a resposta. Escritas pendentes seguram o lock de
+escrita do SQLite e a conexão emprestada ocupa uma vaga do pool: antes de um
+await demorado (upload, processamento de imagem), chame liberar_conexao().
+"""
+import sqlite3
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, Iterator, Optional, TypeVar, cast
+
+from infrastructure.database.pool import PoolConexoes, obter_pool
+from infrastructure.metricas.registro import registrar_acesso_cache
+
+T = TypeVar("T")
+
+_unidade_atual: ContextVar[Optional["UnidadeTrabalho"]] = ContextVar(
+    "unidade_trabalho", default=None
+)
+
+
+class UnidadeTrabalho:
+    """Conexão, transação e mapa de identidade compartilhados por um trabalho"""
+
+    def __init__(self, pool: Optional[PoolConexoes] = None):
+        self._pool = pool
+        self._conexao: Optional[sqlite3.Connection] = None
+        self._mapa: Dict[Hashable, Any] = {}
+        self._alteracoes = 0
+        self._savepoints = 0
+        self.leituras_evitadas = 0
+
+    @property
+    def conectada(self) -> bool:
+        """Se a unidade já emprestou sua conexão do pool"""
+        return self._conexao is not None
+
+    @property
+    def conexao(self) -> sqlite3.Connection:
+        """Conexão da unidade, emprestada do pool no primeiro uso"""
+        if self._conexao is None:
+            self._pool = self._pool or obter_pool()
+            self._conexao = self._pool.emprestar()
+            self._alteracoes = self._conexao.total_changes
+        return self._conexao
+
+    @contextmanager
+    def bloco(self) -> Iterator[sqlite3.Connection]:
+        """
+        Bloco atômico dentro da transação da unidade (usado por obter_conexao).
+
+        Sem escrita pendente, o bloco abre a transação normalmente; com escrita
+        pendente, roda em um SAVEPOINT. Em caso de exceção só o bloco é desfeito.
+        """
+        conexao = self.conexao
+        nome = self._abrir_bloco()
+        try:
+            yield conexao
+        except BaseException:
+            self._fechar_bloco(nome, erro=True)
+            raise
+        else:
+            self._fechar_bloco(nome, erro=False)
+
+    def _abrir_bloco(self) -> Optional[str]:
+        """Abre o SAVEPOINT do bloco se houver escrita pendente (devolve o nome)"""
+        conexao = self.conexao
+        if not conexao.in_transaction:
+            return None
+        self._savepoints += 1
+        nome = f"unidade_{self._savepoints}"
+        conexao.execute(f"SAVEPOINT {nome}")
+        return nome
+
+    def _fechar_bloco(self, nome: Optional[str], erro: bool) -> None:
+        """Libera o SAVEPOINT do bloco, desfazendo o bloco em caso de erro"""
+        conexao = self.conexao
+        if nome is None:
+            if erro and conexao.in_transaction:
+                self.desfazer()
+            return
+        try:
+            if erro:
+                conexao.execute(f"ROLLBACK TO {nome}")
+                conexao.execute(f"RELEASE {nome}")
+                self._mapa.clear()
+            else:
+                conexao.execute(f"RELEASE {nome}")
+        finally:
+            self._savepoints -= 1
+
+    def _sincronizar_mapa(self) -> None:
+        """Descarta o mapa se a conexão registrou escritas desde a última leitura"""
+        if self._conexao is None:
+            return
+        alteracoes = self._conexao.total_changes
+        if alteracoes != self._alteracoes:
+            self._mapa.clear()
+            self._alteracoes = alteracoes
+
+    def obter(self, chave: Hashable, carregar: Callable[[], T]) -> T:
+        """
+        Devolve o objeto mapeado pela chave, carregando-o na primeira vez.
+
+        Args:
+            chave: Identidade do objeto (ex: ("usuario", 5))
+            carregar: Função que lê o objeto do banco
+
+        Returns:
+            Objeto mapeado (None não é guardado)
+        """
+        self._sincronizar_mapa()
+        if chave in self._mapa:
+            self.leituras_evitadas += 1
+            registrar_acesso_cache("mapa_identidade", acerto=True)
+            return cast(T, self._mapa[chave])
+        registrar_acesso_cache("mapa_identidade", acerto=False)
+        objeto = carregar()
+        self._sincronizar_mapa()
+        if objeto is not None:
+            self._mapa[chave] = objeto
+        return objeto
+
+    def consultar(self, chave: Hashable) -> Optional[Any]:
+        """Objeto já mapeado pela chave, sem ir ao banco"""
+        self._sincronizar_mapa()
+        objeto = self._mapa.get(chave)
+        if objeto is not None:
+            self.leituras_evitadas += 1
+        registrar_acesso_cache("mapa_identidade", acerto=objeto is not None)
+        return objeto
+
+    def registrar(self, chave: Hashable, objeto: Any) -> None:
+        """Guarda um objeto lido por outro caminho (ex: carregamento em lote)"""
+        self._sincronizar_mapa()
+        if objeto is not None:
+            self._mapa[chave] = objeto
+
+    def confirmar(self) -> None:
+        """Faz commit das escritas pendentes (a unidade continua aberta)"""
+        if self._conexao is not None and self._conexao.in_transaction:
+            self._conexao.commit()
+
+    def desfazer(self) -> None:
+        """Desfaz as escritas pendentes e limpa o mapa de identidade"""
+        if self._conexao is not None and self._conexao.in_transaction:
+            self._conexao.rollback()
+        self._mapa.clear()
+
+    def liberar_conexao(self) -> None:
+        """
+        Confirma as escritas pendentes e devolve a conexão ao pool.
+
+        A unidade continua ativa e empresta outra conexão no próximo uso; o
+        mapa de identidade é descartado, pois outras requisições podem escrever
+        enquanto isso.
+        """
+        if self._savepoints:
+            raise RuntimeError("A conexão não pode ser liberada dentro de um bloco")
+        self.encerrar(sucesso=True)
+
+    def encerrar(self, sucesso: bool = True) -> None:
+        """Confirma (ou desfaz) o trabalho e devolve a conexão ao pool"""
+        if self._conexao is None:
+            return
+        try:
+            if sucesso:
+                self.confirmar()
+            else:
+                self.desfazer()
+        finally:
+            assert self._pool is not None
+            self._pool.devolver(self._conexao)
+            self._conexao = None
+            self._mapa.clear()
+
+
+def obter_unidade_atual() -> Optional[UnidadeTrabalho]:
+    """Unidade de trabalho ativa no contexto atual (None fora de uma)"""
+    return _unidade_atual.get()
+
+
+def confirmar_trabalho() -> None:
+    """Faz commit das escritas pendentes da unidade ativa, se houver uma"""
+    unidade = _unidade_atual.get()
+    if unidade is not None:
+        unidade.confirmar()
+
+
+async def liberar_conexao() -> None:
+    """
+    Devolve ao pool a conexão da unidade ativa antes de um await demorado.
+
+    Sem isso, uma rota que leu ou escreveu no banco segura a conexão durante
+    todo o processamento da imagem, e uploads simultâneos esgotam o pool.
+    """
+    from infrastructure.database.executor import executar_no_banco
+
+    unidade = _unidade_atual.get()
+    if unidade is not None and unidade.conectada:
+        await executar_no_banco(unidade.liberar_conexao)
+
+
+@contextmanager
+def unidade_de_trabalho() -> Iterator[UnidadeTrabalho]:
+    """
+    Abre uma unidade de trabalho para o bloco.
+
+    Unidades aninhadas participam da unidade externa, que é quem faz o commit;
+    se uma delas falhar, só as escritas feitas dentro dela são desfeitas. Assim
+    um grupo de escritas fica atômico mesmo que a rota trate a exceção.
+
+    Exemplo:
+        with unidade_de_trabalho():
+            id_orcamento = orcamento_repo.inserir(orcamento)
+            for item in itens:
+                item_orcamento_repo.inserir(item)  # um único commit ao final
+    """
+    existente = _unidade_atual.get()
+    if existente is not None:
+        with existente.bloco():
+            yield existente
+        return
+
+    unidade = UnidadeTrabalho()
+    token = _unidade_atual.set(unidade)
+    try:
+        yield unidade
+    except BaseException:
+        unidade.encerrar(sucesso=False)
+        raise
+    else:
+        unidade.encerrar(sucesso=True)
+    finally:
+        _unidade_atual.reset(token)
+
+
+@asynccontextmanager
+async def bloco_assincrono() -> AsyncIterator[UnidadeTrabalho]:
+    """
+    Versão de unidade_de_trabalho() para rotas async.
+
+    A abertura e o fechamento do bloco (SAVEPOINT, RELEASE, commit) rodam via
+    executar_no_banco(): não bloqueiam o event loop e respeitam a trava da
+    unidade, como as demais chamadas ao banco da requisição.
+
+    Exemplo:
+        async with bloco_assincrono():
+            id_demanda = await demanda_repo.inserir(demanda)
+            await item_demanda_repo.inserir_em_lote(itens)
+    """
+    from infrastructure.database.executor import executar_no_banco
+
+    existente = _unidade_atual.get()
+    if existente is not None:
+        nome = await executar_no_banco(existente._abrir_bloco)
+        try:
+            yield existente
+        except BaseException:
+            await executar_no_banco(existente._fechar_bloco, nome, erro=True)
+            raise
+        else:
+            await executar_no_banco(existente._fechar_bloco, nome, erro=False)
+        return
+
+    unidade = UnidadeTrabalho()
+    token = _unidade_atual.set(unidade)
+    try:
+        yield unidade
+    except BaseException:
+        if unidade.conectada:
+            await executar_no_banco(unidade.encerrar, sucesso=False)
+        raise
+    else:
+        if unidade.conectada:
+            await executar_no_banco(unidade.encerrar, sucesso=True)
+    finally:
+        _unidade_atual.reset(token)
+
+
+class UnidadeTrabalhoMiddleware:
+    """
+    Middleware ASGI que abre uma unidade de trabalho por requisição HTTP.
+
+    O commit é feito antes do início da resposta, para que um redirecionamento
+    nunca chegue ao navegador antes de os dados estarem gravados. Commit,
+    rollback e devolução da conexão ao pool rodam via executar_no_banco().
+    """
+
+    def __init__(self, app, prefixos_ignorados: tuple = ("/static",)):
+        self.app = app
+        self.prefixos_ignorados = prefixos_ignorados
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(self.prefixos_ignorados):
+            await self.app(scope, receive, send)
+            return
+
+        from infrastructure.database.executor import executar_no_banco
+
+        async with bloco_assincrono() as unidade:
+
+            async def enviar(mensagem):
+                if mensagem["type"] == "http.response.start" and unidade.conectada:
+                    await executar_no_banco(unidade.confirmar)
+                await send(mensagem)
+
+            await self.app(scope, receive, enviar)
@@ -2,12 +2,24 @@
 Infrastructure Logging - Sistema de logging estruturado
 
 Este módulo gerencia o sistema de logging:
-- logger: Logger personalizado do CaseBem
+- logger: Logger personalizado do CaseBem (linhas JSON, escritas em segundo plano)
+- contexto: Contexto da requisição atual (id e tempo por categoria)
 """
 
-from infrastructure.logging.logger import CaseBemLogger, logger
+from infrastructure.logging.contexto import (
+    ContextoRequisicao,
+    contexto_requisicao,
+    medir_tempo,
+    obter_contexto,
+)
+from infrastructure.logging.logger import CaseBemLogger, FormatoJson, logger
 
 __all__ = [
+    'ContextoRequisicao',
+    'contexto_requisicao',
+    'medir_tempo',
+    'obter_contexto',
     'CaseBemLogger',
+    'FormatoJson',
     'logger',
 ]
@@ -0,0 +1,77 @@
+"""
+Contexto da requisição em andamento
+
+ContextoRequisicaoMiddleware (infrastructure/metricas) abre um
+ContextoRequisicao por requisição, guardado em uma ContextVar: as threads do
+banco e do FastAPI herdam o contexto, então o mesmo objeto recebe o tempo
+gasto em cada categoria (SQL, renderização de templates, processamento de
+imagens, hash de senhas) de onde quer que o trabalho aconteça. Fora de uma
+requisição obter_contexto() devolve None e medir_tempo() só mede o bloco.
+"""
+
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+
+class ContextoRequisicao:
+    """Identificador da requisição e tempo acumulado por categoria"""
+
+    __slots__ = ("id", "inicio", "tempos", "consultas")
+
+    def __init__(self, id_requisicao: Optional[str] = None):
+        self.id = id_requisicao or uuid.uuid4().hex
+        self.inicio = time.perf_counter()
+        self.tempos: Dict[str, float] = {}
+        self.consultas = 0
+
+    def somar(self, categoria: str, tempo: float) -> None:
+        """Soma segundos à categoria"""
+        self.tempos[categoria] = self.tempos.get(categoria, 0.0) + tempo
+
+    def decorrido(self) -> float:
+        """Segundos desde o início da requisição"""
+        return time.perf_counter() - self.inicio
+
+
+_contexto_atual: ContextVar[Optional[ContextoRequisicao]] = ContextVar(
+    "contexto_requisicao", default=None
+)
+
+
+def obter_contexto() -> Optional[ContextoRequisicao]:
+    """Contexto da requisição atual (None fora de uma requisição)"""
+    return _contexto_atual.get()
+
+
+@contextmanager
+def contexto_requisicao(id_requisicao: Optional[str] = None) -> Iterator[ContextoRequisicao]:
+    """Abre um ContextoRequisicao, que vale até o fim do bloco"""
+    contexto = ContextoRequisicao(id_requisicao)
+    token = _contexto_atual.set(contexto)
+    try:
+        yield contexto
+    finally:
+        _contexto_atual.reset(token)
+
+
+@contextmanager
+def medir_tempo(categoria: str) -> Iterator[None]:
+    """
+    Soma a duração do bloco à categoria no contexto da requisição atual.
+
+    Examples:
+        >>> with medir_tempo("senha"):
+        ...     pwd_context.hash(senha)
+    """
+    contexto = _contexto_atual.get()
+    if contexto is None:
+        yield
+        return
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        contexto.somar(categoria, time.perf_counter() - inicio)
@@ -1,85 +1,162 @@
 """
 Sistema de logging padronizado do CaseBem
+
+Cada chamada custa pouco para quem registra: o nível (e a amostragem, quando
+pedida) é conferido antes de qualquer trabalho, o contexto segue como está no
+registro e a serialização em JSON e a escrita (stderr e, com LOG_FILE, um
+arquivo) ficam para a thread de um QueueListener. Cada registro sai como uma
+linha JSON, com o id_requisicao quando emitido durante uma requisição.
 """
 
-import logging
+import atexit
 import json
-from datetime import datetime
-from typing import Optional, Any
+import logging
+import os
+import queue
+import random
+import sys
+from datetime import date, datetime
+from enum import Enum
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, List, Optional
+from config.constants import LoggingConstants
+from infrastructure.logging.contexto import obter_contexto
 from util.exceptions import CaseBemError
 
 
+def _serializar_valor(valor: Any) -> Any:
+    """Converte valores que o json não serializa (usado como default do dumps)"""
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    if isinstance(valor, Enum):
+        return valor.value
+    if isinstance(valor, (set, frozenset)):
+        return list(valor)
+    return str(valor)
+
+
+class FormatoJson(logging.Formatter):
+    """Formata o registro como uma linha JSON, com o contexto no primeiro nível"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        dados = {
+            "timestamp": datetime.fromtimestamp(record.created).isoformat(),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "sistema": "casebem",
+            "mensagem": record.getMessage(),
+        }
+        for chave, valor in getattr(record, "contexto", {}).items():
+            dados.setdefault(chave, valor)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            dados["excecao"] = record.exc_text
+        return json.dumps(dados, ensure_ascii=False, default=_serializar_valor)
+
+
+class _FilaHandler(QueueHandler):
+    """QueueHandler que deixa a formatação para a thread do listener"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Só o traceback é convertido aqui, enquanto os frames ainda existem
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
 class CaseBemLogger:
     """Logger personalizado para o sistema"""
 
     def __init__(self, nome: str = "casebem"):
         self.logger = logging.getLogger(nome)
+        self._listener: Optional[QueueListener] = None
         self._configurar_logger()
 
     def _configurar_logger(self):
-        """Configura o logger com formato padronizado"""
-        if not self.logger.handlers:
-            handler = logging.StreamHandler()
-            formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-            )
-            handler.setFormatter(formatter)
-            self.logger.addHandler(handler)
-            self.logger.setLevel(logging.INFO)
-
-    def _serializar_valor(self, valor: Any) -> Any:
-        """Serializa valores que não são JSON-serializáveis por padrão"""
-        if isinstance(valor, datetime):
-            return valor.isoformat()
-        elif isinstance(valor, (tuple, list)):
-            return [self._serializar_valor(v) for v in valor]
-        elif isinstance(valor, dict):
-            return {k: self._serializar_valor(v) for k, v in valor.items()}
-        else:
-            # Para outros objetos, tenta converter para string
-            try:
-                json.dumps(valor)
-                return valor
-            except (TypeError, ValueError):
-                return str(valor)
-
-    def _criar_contexto_log(self, **kwargs) -> dict:
-        """Cria contexto padronizado para logs"""
-        contexto_base = {
-            "timestamp": datetime.now().isoformat(),
-            "sistema": "casebem",
-        }
-        # Serializa todos os valores do kwargs
-        for chave, valor in kwargs.items():
-            contexto_base[chave] = self._serializar_valor(valor)
-        return contexto_base
+        """Liga o logger à fila e inicia o listener que escreve os registros"""
+        if self.logger.handlers:
+            return
+
+        formatador = FormatoJson()
+        destinos: List[logging.Handler] = [logging.StreamHandler(sys.stderr)]
+        arquivo = os.environ.get("LOG_FILE")
+        if arquivo:
+            destinos.append(logging.FileHandler(arquivo, encoding="utf-8"))
+        for destino in destinos:
+            destino.setFormatter(formatador)
+
+        fila: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        self.logger.addHandler(_FilaHandler(fila))
+        self.logger.setLevel(os.environ.get("LOG_LEVEL", LoggingConstants.LEVEL).upper())
+
+        self._listener = QueueListener(fila, *destinos, respect_handler_level=True)
+        self._listener.start()
+        atexit.register(self.encerrar)
+
+    def encerrar(self) -> None:
+        """Escreve os registros pendentes e para o listener (encerramento da aplicação)"""
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.stop()
+
+    def _registrar(
+        self,
+        nivel: int,
+        mensagem: str,
+        contexto: dict,
+        amostra: float = 1.0,
+        exc_info: Any = None,
+    ) -> None:
+        """
+        Envia o registro para a fila, se o nível estiver habilitado.
+
+        Args:
+            nivel: Nível do logging (logging.INFO etc.)
+            mensagem: Mensagem do registro
+            contexto: Campos extras da linha JSON (serializados no listener)
+            amostra: Fração dos eventos registrados (1.0 = todos). Para
+                eventos frequentes; a linha informa a fração usada
+            exc_info: Como no logging (True registra a exceção em tratamento)
+        """
+        if not self.logger.isEnabledFor(nivel):
+            return
+        if amostra < 1.0:
+            if random.random() >= amostra:
+                return
+            contexto["amostra"] = amostra
+        requisicao = obter_contexto()
+        if requisicao is not None:
+            contexto.setdefault("id_requisicao", requisicao.id)
+        self.logger.log(nivel, mensagem, exc_info=exc_info, extra={"contexto": contexto})
 
-    def info(self, mensagem: str, **contexto):
+    def info(self, mensagem: str, amostra: float = 1.0, **contexto):
         """Log de informação"""
-        contexto_completo = self._criar_contexto_log(**contexto)
-        self.logger.info(f"{mensagem} - {json.dumps(contexto_completo)}")
+        self._registrar(logging.INFO, mensagem, contexto, amostra)
 
-    def warning(self, mensagem: str, **contexto):
+    def warning(self, mensagem: str, exc_info: Any = None, **contexto):
         """Log de aviso"""
-        contexto_completo = self._criar_contexto_log(**contexto)
-        self.logger.warning(f"{mensagem} - {json.dumps(contexto_completo)}")
+        self._registrar(logging.WARNING, mensagem, contexto, exc_info=exc_info)
 
-    def error(self, mensagem: str, erro: Optional[Exception] = None, **contexto):
+    def error(
+        self, mensagem: str, erro: Optional[Exception] = None, exc_info: Any = None, **contexto
+    ):
         """Log de erro"""
-        contexto_completo = self._criar_contexto_log(**contexto)
+        if not self.logger.isEnabledFor(logging.ERROR):
+            return
 
         if isinstance(erro, CaseBemError):
-            contexto_completo.update(erro.to_dict())
+            contexto.update(erro.to_dict())
         elif erro:
-            contexto_completo["erro_original"] = str(erro)
-            contexto_completo["tipo_erro_original"] = type(erro).__name__
+            contexto["erro_original"] = str(erro)
+            contexto["tipo_erro_original"] = type(erro).__name__
 
-        self.logger.error(f"{mensagem} - {json.dumps(contexto_completo)}")
+        self._registrar(logging.ERROR, mensagem, contexto, exc_info=exc_info)
 
-    def debug(self, mensagem: str, **contexto):
+    def debug(self, mensagem: str, amostra: float = 1.0, **contexto):
         """Log de debug"""
-        contexto_completo = self._criar_contexto_log(**contexto)
-        self.logger.debug(f"{mensagem} - {json.dumps(contexto_completo)}")
+        self._registrar(logging.DEBUG, mensagem, contexto, amostra)
 
 
 # Instância global do logger
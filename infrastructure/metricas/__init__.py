@@ -0,0 +1,28 @@
+"""
+Infrastructure Metricas - Métricas no formato do Prometheus
+
+- registro: Métricas (prometheus_client) e geração do texto de /metrics
+- middleware: ContextoRequisicaoMiddleware (Server-Timing, X-Request-ID e log
+  de acesso), MetricasMiddleware (latência, status, SQL por requisição) e o
+  endpoint /metrics
+"""
+
+from infrastructure.metricas.registro import (
+    encerrar_processo,
+    gerar_metricas,
+    registrar_acesso_cache,
+)
+from infrastructure.metricas.middleware import (
+    ContextoRequisicaoMiddleware,
+    MetricasMiddleware,
+    metricas_endpoint,
+)
+
+__all__ = [
+    'encerrar_processo',
+    'gerar_metricas',
+    'registrar_acesso_cache',
+    'ContextoRequisicaoMiddleware',
+    'MetricasMiddleware',
+    'metricas_endpoint',
+]
@@ -0,0 +1,244 @@
+"""
+Middlewares ASGI que medem as requisições HTTP e o endpoint /metrics
+
+- ContextoRequisicaoMiddleware: abre o contexto da requisição (id e tempo por
+  categoria) e, com o rastreamento ligado, o span da requisição; responde com
+  os cabeçalhos X-Request-ID e Server-Timing e registra uma linha de log de
+  acesso
+- MetricasMiddleware: latência, status e SQL por rota no formato do Prometheus
+
+/metrics só responde a quem apresenta o METRICS_TOKEN (Authorization: Bearer)
+ou vem de um IP de METRICS_ALLOWED_IPS (padrão: só a própria máquina).
+"""
+import os
+import re
+import secrets
+import time
+from typing import Any, Dict
+
+from opentelemetry.propagate import extract
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+
+from infrastructure.database.pool import obter_pool
+from infrastructure.logging import (
+    ContextoRequisicao,
+    contexto_requisicao,
+    logger,
+    obter_contexto,
+)
+from infrastructure.metricas import registro
+from infrastructure.rastreamento import iniciar_span, obter_tracer
+
+# Intervalo mínimo (segundos) entre atualizações dos gauges de estado
+INTERVALO_ESTADO = 1.0
+
+# IPs liberados em /metrics quando METRICS_ALLOWED_IPS não está definida
+IPS_METRICAS_PADRAO = "127.0.0.1,::1"
+
+# Categorias conhecidas do Server-Timing, na ordem do cabeçalho (as demais
+# medidas com medir_tempo vêm depois, com o próprio nome)
+DESCRICOES_TEMPO = {
+    "db": "SQL",
+    "template": "Templates",
+    "imagem": "Imagens",
+    "senha": "Hash de senha",
+}
+
+# X-Request-ID vindo do proxy só é aproveitado se tiver este formato
+_ID_REQUISICAO = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+def _rota(scope) -> str:
+    """Modelo da rota (ex: /fornecedor/orcamentos/{id_orcamento}), não o caminho"""
+    rota = scope.get("route")
+    caminho = getattr(rota, "path", None)
+    return caminho if caminho is not None else "desconhecida"
+
+
+def server_timing(contexto: ContextoRequisicao) -> str:
+    """
+    Valor do cabeçalho Server-Timing com o tempo de cada categoria e o total.
+
+    Examples:
+        >>> server_timing(contexto)
+        'db;dur=12.4;desc="SQL (5 consultas)", template;dur=3.1;desc="Templates", total;dur=18.0'
+    """
+    metricas = []
+    outras = [categoria for categoria in contexto.tempos if categoria not in DESCRICOES_TEMPO]
+    for categoria in [*DESCRICOES_TEMPO, *outras]:
+        tempo = contexto.tempos.get(categoria)
+        if tempo is None:
+            continue
+        descricao = DESCRICOES_TEMPO.get(categoria, categoria)
+        if categoria == "db":
+            plural = "s" if contexto.consultas != 1 else ""
+            descricao = f"{descricao} ({contexto.consultas} consulta{plural})"
+        metricas.append(f'{categoria};dur={tempo * 1000:.1f};desc="{descricao}"')
+    metricas.append(f"total;dur={contexto.decorrido() * 1000:.1f}")
+    return ", ".join(metricas)
+
+
+def atualizar_estado() -> None:
+    """Atualiza os gauges do pool de conexões e da fila de imagens"""
+    from util.image_processor import fila_imagens
+
+    pool = obter_pool()
+    abertas, ociosas = pool.conexoes_abertas, pool.conexoes_ociosas
+    registro.POOL_CONEXOES.labels("open").set(abertas)
+    registro.POOL_CONEXOES.labels("idle").set(ociosas)
+    registro.POOL_CONEXOES.labels("in_use").set(abertas - ociosas)
+    registro.POOL_CONEXOES.labels("max").set(pool.tamanho_maximo)
+
+    fila = fila_imagens.metricas()
+    registro.FILA_IMAGENS.labels("waiting").set(fila["fila"])
+    registro.FILA_IMAGENS.labels("processing").set(fila["em_processamento"])
+
+
+class ContextoRequisicaoMiddleware:
+    """
+    Abre o contexto da requisição, que acumula o tempo de SQL, templates,
+    imagens e hash de senhas, devolve o detalhamento em Server-Timing (visível
+    nas ferramentas do navegador) e registra o acesso no log com o id da
+    requisição.
+    """
+
+    def __init__(self, app, prefixos_ignorados: tuple = ("/static", "/metrics")):
+        self.app = app
+        self.prefixos_ignorados = prefixos_ignorados
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(self.prefixos_ignorados):
+            await self.app(scope, receive, send)
+            return
+
+        cabecalhos_recebidos = Request(scope).headers
+        recebido = cabecalhos_recebidos.get("x-request-id", "")
+        id_requisicao = recebido if _ID_REQUISICAO.match(recebido) else None
+        # traceparent do proxy, para o span da requisição continuar o rastro dele
+        pai = extract(cabecalhos_recebidos) if obter_tracer() is not None else None
+        status = 500
+
+        with contexto_requisicao(id_requisicao) as contexto, iniciar_span(
+            scope["method"],
+            tipo=SpanKind.SERVER,
+            atributos={
+                "http.request.method": scope["method"],
+                "url.path": scope["path"],
+                "casebem.id_requisicao": contexto.id,
+            },
+            contexto=pai,
+        ) as span:
+
+            async def enviar(mensagem):
+                nonlocal status
+                if mensagem["type"] == "http.response.start":
+                    status = mensagem["status"]
+                    cabecalhos = MutableHeaders(scope=mensagem)
+                    cabecalhos["X-Request-ID"] = contexto.id
+                    cabecalhos["Server-Timing"] = server_timing(contexto)
+                await send(mensagem)
+
+            try:
+                await self.app(scope, receive, enviar)
+            finally:
+                campos: Dict[str, Any] = {
+                    f"{categoria}_ms": round(tempo * 1000, 1)
+                    for categoria, tempo in contexto.tempos.items()
+                }
+                if span is not None:
+                    rota = _rota(scope)
+                    span.update_name(f"{scope['method']} {rota}")
+                    span.set_attribute("http.route", rota)
+                    span.set_attribute("http.response.status_code", status)
+                    if status >= 500:
+                        span.set_status(Status(StatusCode.ERROR))
+                    if span.is_recording():
+                        campos["trace_id"] = f"{span.get_span_context().trace_id:032x}"
+                logger.info(
+                    "Requisição",
+                    metodo=scope["method"],
+                    caminho=scope["path"],
+                    rota=_rota(scope),
+                    status=status,
+                    duracao_ms=round(contexto.decorrido() * 1000, 1),
+                    consultas=contexto.consultas,
+                    **campos,
+                )
+
+
+class MetricasMiddleware:
+    """
+    Mede duração, status, instruções SQL e tempo de banco de cada requisição,
+    agrupados pelo modelo da rota. As instruções e o tempo de banco vêm do
+    contexto aberto por ContextoRequisicaoMiddleware, que deve ficar por fora.
+    """
+
+    def __init__(self, app, prefixos_ignorados: tuple = ("/static", "/metrics")):
+        self.app = app
+        self.prefixos_ignorados = prefixos_ignorados
+        self._estado_em = 0.0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(self.prefixos_ignorados):
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def enviar(mensagem):
+            nonlocal status
+            if mensagem["type"] == "http.response.start":
+                status = mensagem["status"]
+            await send(mensagem)
+
+        inicio = time.perf_counter()
+        registro.EM_ANDAMENTO.inc()
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            duracao = time.perf_counter() - inicio
+            registro.EM_ANDAMENTO.dec()
+            rota, metodo = _rota(scope), scope["method"]
+            registro.REQUISICOES.labels(metodo, rota, str(status)).inc()
+            registro.DURACAO.labels(metodo, rota).observe(duracao)
+            contexto = obter_contexto()
+            if contexto is not None:
+                registro.CONSULTAS_POR_REQUISICAO.labels(rota).observe(contexto.consultas)
+                registro.TEMPO_BANCO_POR_REQUISICAO.labels(rota).observe(
+                    contexto.tempos.get("db", 0.0)
+                )
+
+            if inicio - self._estado_em >= INTERVALO_ESTADO:
+                self._estado_em = inicio
+                atualizar_estado()
+
+
+def acesso_metricas_permitido(request: Request) -> bool:
+    """Se a requisição traz o METRICS_TOKEN ou vem de um IP liberado"""
+    token = os.environ.get("METRICS_TOKEN")
+    if token:
+        esquema, _, recebido = request.headers.get("authorization", "").partition(" ")
+        if esquema.lower() == "bearer" and secrets.compare_digest(
+            recebido.strip().encode(), token.encode()
+        ):
+            return True
+
+    liberados = os.environ.get("METRICS_ALLOWED_IPS", IPS_METRICAS_PADRAO)
+    ips = {ip.strip() for ip in liberados.split(",") if ip.strip()}
+    return request.client is not None and request.client.host in ips
+
+
+async def metricas_endpoint(request: Request) -> Response:
+    """GET /metrics: métricas de todos os workers no formato do Prometheus"""
+    if not acesso_metricas_permitido(request):
+        logger.warning(
+            "Acesso negado a /metrics",
+            ip=request.client.host if request.client else None,
+        )
+        return Response("Acesso negado", status_code=403, media_type="text/plain")
+    atualizar_estado()
+    corpo, tipo = registro.gerar_metricas()
+    return Response(corpo, media_type=tipo)
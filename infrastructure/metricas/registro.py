@@ -0,0 +1,95 @@
+"""
+Métricas no formato do Prometheus
+
+As métricas são objetos do prometheus_client. Com PROMETHEUS_MULTIPROC_DIR
+definido, cada worker grava seus valores em arquivos nesse diretório e o
+/metrics de qualquer worker soma os de todos (o diretório deve ser esvaziado
+antes de subir os workers). Sem a variável, cada processo expõe só os seus.
+
+Os gauges de estado (pool de conexões e fila de imagens) são atualizados pelo
+MetricasMiddleware no máximo uma vez por segundo em cada worker.
+"""
+import os
+from typing import Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+REQUISICOES = Counter(
+    "casebem_http_requests_total",
+    "Requisições HTTP por rota e status",
+    ["method", "route", "status"],
+)
+DURACAO = Histogram(
+    "casebem_http_request_duration_seconds",
+    "Duração das requisições HTTP por rota",
+    ["method", "route"],
+)
+EM_ANDAMENTO = Gauge(
+    "casebem_http_requests_in_progress",
+    "Requisições HTTP em andamento",
+    multiprocess_mode="livesum",
+)
+CONSULTAS_POR_REQUISICAO = Histogram(
+    "casebem_db_queries_per_request",
+    "Instruções SQL por requisição",
+    ["route"],
+    buckets=(0, 1, 2, 5, 10, 20, 40, 80, 160, float("inf")),
+)
+TEMPO_BANCO_POR_REQUISICAO = Histogram(
+    "casebem_db_time_per_request_seconds",
+    "Tempo de banco (execução e leitura das linhas) por requisição",
+    ["route"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, float("inf")),
+)
+POOL_CONEXOES = Gauge(
+    "casebem_db_pool_connections",
+    "Conexões do pool por estado (open, idle, in_use) e capacidade (max)",
+    ["state"],
+    multiprocess_mode="livesum",
+)
+FILA_IMAGENS = Gauge(
+    "casebem_image_queue_jobs",
+    "Imagens aguardando (waiting) e em processamento (processing)",
+    ["state"],
+    multiprocess_mode="livesum",
+)
+CACHE = Counter(
+    "casebem_cache_requests_total",
+    "Consultas aos caches em processo, por resultado (hit, miss)",
+    ["cache", "result"],
+)
+
+
+def registrar_acesso_cache(cache: str, acerto: bool) -> None:
+    """Conta uma consulta ao cache (a taxa de acerto sai da razão hit/total)"""
+    CACHE.labels(cache, "hit" if acerto else "miss").inc()
+
+
+def gerar_metricas() -> Tuple[bytes, str]:
+    """
+    Métricas no formato de texto do Prometheus.
+
+    Returns:
+        Tuple[bytes, str]: Corpo e content-type da resposta
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registro = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registro)
+    else:
+        registro = REGISTRY
+    return generate_latest(registro), CONTENT_TYPE_LATEST
+
+
+def encerrar_processo() -> None:
+    """Descarta os gauges deste worker no diretório compartilhado (encerramento)"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(os.getpid())
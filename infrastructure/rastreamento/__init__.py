@@ -0,0 +1,26 @@
+"""
+Infrastructure Rastreamento - Spans no estilo de rastreamento distribuído
+
+- rastreador: Configuração do OpenTelemetry (TRACING_FILE) e abertura de spans
+- exportador: Exportação dos spans para um arquivo OTLP/JSON local
+- cascata: Leitura do arquivo e exibição dos rastros em cascata
+  (python -m infrastructure.rastreamento traces.jsonl)
+"""
+
+from infrastructure.rastreamento.exportador import ExportadorArquivoOtlp
+from infrastructure.rastreamento.rastreador import (
+    configurar_rastreamento,
+    encerrar_rastreamento,
+    iniciar_span,
+    marcar_erro,
+    obter_tracer,
+)
+
+__all__ = [
+    'ExportadorArquivoOtlp',
+    'configurar_rastreamento',
+    'encerrar_rastreamento',
+    'iniciar_span',
+    'marcar_erro',
+    'obter_tracer',
+]
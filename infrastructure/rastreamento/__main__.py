@@ -0,0 +1,20 @@
+"""
+Exibe os últimos rastros de um arquivo de spans como cascatas em texto
+
+Uso:
+    python -m infrastructure.rastreamento traces.jsonl [quantidade]
+"""
+import sys
+
+from infrastructure.rastreamento.cascata import carregar_rastros, formatar_cascata
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__.strip())
+        sys.exit(1)
+
+    quantidade = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    rastros = list(carregar_rastros(sys.argv[1]).values())
+    for spans in rastros[-quantidade:]:
+        print(formatar_cascata(spans))
+        print()
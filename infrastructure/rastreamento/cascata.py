@@ -0,0 +1,68 @@
+"""
+Leitura do arquivo de spans e exibição de cada rastro como cascata em texto
+
+Uso pela linha de comando:
+    python -m infrastructure.rastreamento traces.jsonl [quantidade]
+"""
+import json
+from collections import OrderedDict
+from typing import Any, Dict, List
+
+
+def carregar_rastros(caminho: str) -> "OrderedDict[str, List[Dict[str, Any]]]":
+    """
+    Lê o arquivo OTLP/JSON e agrupa os spans por rastro.
+
+    Returns:
+        OrderedDict[str, List[Dict[str, Any]]]: Spans de cada traceId, na ordem
+        em que os rastros aparecem no arquivo
+    """
+    rastros: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+    with open(caminho, encoding="utf-8") as arquivo:
+        for linha in arquivo:
+            if not linha.strip():
+                continue
+            for recurso in json.loads(linha).get("resourceSpans", []):
+                for escopo in recurso.get("scopeSpans", []):
+                    for span in escopo.get("spans", []):
+                        rastros.setdefault(span["traceId"], []).append(span)
+    return rastros
+
+
+def formatar_cascata(spans: List[Dict[str, Any]], largura: int = 40) -> str:
+    """
+    Cascata de um rastro: início e duração de cada span em ms, uma barra
+    proporcional e o nome, indentado pela profundidade na árvore.
+    """
+    ids = {span["spanId"] for span in spans}
+    filhos: Dict[str, List[Dict[str, Any]]] = {}
+    raizes = []
+    for span in sorted(spans, key=lambda s: int(s["startTimeUnixNano"])):
+        pai = span.get("parentSpanId")
+        if pai is not None and pai in ids:
+            filhos.setdefault(pai, []).append(span)
+        else:
+            raizes.append(span)
+
+    inicio = min(int(span["startTimeUnixNano"]) for span in spans)
+    fim = max(int(span["endTimeUnixNano"]) for span in spans)
+    escala = largura / max(fim - inicio, 1)
+
+    linhas = [f"rastro {spans[0]['traceId']}: {len(spans)} spans, {(fim - inicio) / 1e6:.1f} ms"]
+
+    def exibir(span: Dict[str, Any], profundidade: int) -> None:
+        comeco = int(span["startTimeUnixNano"]) - inicio
+        duracao = int(span["endTimeUnixNano"]) - int(span["startTimeUnixNano"])
+        deslocamento = int(comeco * escala)
+        barra = " " * deslocamento + "█" * max(1, int(duracao * escala))
+        erro = " [ERRO]" if span.get("status", {}).get("code") == 2 else ""
+        linhas.append(
+            f"{comeco / 1e6:9.1f} {duracao / 1e6:9.1f}  {barra[:largura]:<{largura}}  "
+            f"{'  ' * profundidade}{span['name']}{erro}"
+        )
+        for filho in filhos.get(span["spanId"], []):
+            exibir(filho, profundidade + 1)
+
+    for raiz in raizes:
+        exibir(raiz, 0)
+    return "\n".join(linhas)
@@ -0,0 +1,119 @@
+"""
+Exportação dos spans para um arquivo local no formato OTLP/JSON
+
+Cada lote exportado vira uma linha JSON (um ExportTraceServiceRequest, como
+o file exporter do OpenTelemetry Collector), com ids em hexadecimal e tempos
+em nanossegundos. O arquivo pode ser carregado no Jaeger ("JSON File") ou em
+outra ferramenta que leia OTLP, ou resumido com
+python -m infrastructure.rastreamento.
+"""
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+
+def _valor(valor: Any) -> Dict[str, Any]:
+    """AnyValue do OTLP/JSON (inteiros vão como texto, como no protobuf)"""
+    if isinstance(valor, bool):
+        return {"boolValue": valor}
+    if isinstance(valor, int):
+        return {"intValue": str(valor)}
+    if isinstance(valor, float):
+        return {"doubleValue": valor}
+    if isinstance(valor, (list, tuple)):
+        return {"arrayValue": {"values": [_valor(item) for item in valor]}}
+    return {"stringValue": str(valor)}
+
+
+def _atributos(atributos: Any) -> List[Dict[str, Any]]:
+    return [{"key": chave, "value": _valor(valor)} for chave, valor in (atributos or {}).items()]
+
+
+def _span_otlp(span: ReadableSpan) -> Optional[Dict[str, Any]]:
+    """Um span no formato OTLP/JSON (None se o span não tiver contexto)"""
+    contexto = span.get_span_context()
+    if contexto is None:
+        return None
+
+    status: Dict[str, Any] = {"code": span.status.status_code.value}
+    if span.status.description:
+        status["message"] = span.status.description
+
+    convertido: Dict[str, Any] = {
+        "traceId": f"{contexto.trace_id:032x}",
+        "spanId": f"{contexto.span_id:016x}",
+        "name": span.name,
+        # SpanKind do Python começa em INTERNAL = 0; no OTLP, 0 é UNSPECIFIED
+        "kind": span.kind.value + 1,
+        "startTimeUnixNano": str(span.start_time),
+        "endTimeUnixNano": str(span.end_time),
+        "attributes": _atributos(span.attributes),
+        "status": status,
+    }
+    if span.parent is not None:
+        convertido["parentSpanId"] = f"{span.parent.span_id:016x}"
+    if span.events:
+        convertido["events"] = [
+            {
+                "name": evento.name,
+                "timeUnixNano": str(evento.timestamp),
+                "attributes": _atributos(evento.attributes),
+            }
+            for evento in span.events
+        ]
+    return convertido
+
+
+class ExportadorArquivoOtlp(SpanExporter):
+    """Acrescenta os lotes de spans a um arquivo, uma linha OTLP/JSON por lote"""
+
+    def __init__(self, caminho: str):
+        """
+        Args:
+            caminho: Arquivo de destino (criado se não existir; vários workers
+                podem usar o mesmo arquivo, cada lote é uma única escrita)
+        """
+        self.caminho = caminho
+        self._descritor = os.open(caminho, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        if not spans:
+            return SpanExportResult.SUCCESS
+
+        escopos: Dict[str, List[Dict[str, Any]]] = {}
+        for span in spans:
+            convertido = _span_otlp(span)
+            if convertido is None:
+                continue
+            escopo = span.instrumentation_scope.name if span.instrumentation_scope else ""
+            escopos.setdefault(escopo, []).append(convertido)
+
+        lote = {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": _atributos(spans[0].resource.attributes)},
+                    "scopeSpans": [
+                        {"scope": {"name": nome}, "spans": convertidos}
+                        for nome, convertidos in escopos.items()
+                    ],
+                }
+            ]
+        }
+        linha = (json.dumps(lote, ensure_ascii=False, separators=(",", ":")) + "\n").encode()
+        try:
+            with self._lock:
+                os.write(self._descritor, linha)
+        except OSError:
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._descritor >= 0:
+                os.close(self._descritor)
+                self._descritor = -1
@@ -0,0 +1,106 @@
+"""
+Spans da requisição, dos métodos de repositório e das instruções SQL
+
+Desligado por padrão: com TRACING_FILE definido, configurar_rastreamento()
+(na inicialização da aplicação) cria o TracerProvider do OpenTelemetry, que
+exporta em segundo plano para o arquivo (ver exportador.py). Os spans formam
+a árvore requisição > método de repositório > instrução SQL; o contexto do
+OpenTelemetry vive em ContextVars e segue para as threads do banco junto com
+o contexto da requisição.
+
+Desligado, obter_tracer() devolve None e quem instrumenta não cria nada.
+"""
+import os
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import Span, SpanKind, Status, StatusCode
+
+from config.constants import TracingConstants
+from infrastructure.logging import logger
+from infrastructure.rastreamento.exportador import ExportadorArquivoOtlp
+
+_provedor: Optional[TracerProvider] = None
+_tracer: Optional[trace.Tracer] = None
+
+
+def configurar_rastreamento(
+    arquivo: Optional[str] = None, amostra: Optional[float] = None
+) -> bool:
+    """
+    Liga o rastreamento, exportando os spans para o arquivo.
+
+    Args:
+        arquivo: Arquivo OTLP/JSON (padrão: TRACING_FILE; sem ele, nada é feito)
+        amostra: Fração das requisições rastreadas (padrão: TRACING_SAMPLE_RATE)
+
+    Returns:
+        bool: True se o rastreamento ficou ligado
+    """
+    global _provedor, _tracer
+    arquivo = arquivo or os.environ.get("TRACING_FILE")
+    if not arquivo:
+        return False
+    if amostra is None:
+        amostra = float(os.environ.get("TRACING_SAMPLE_RATE", TracingConstants.SAMPLE_RATE))
+
+    encerrar_rastreamento()
+    provedor = TracerProvider(
+        resource=Resource.create({"service.name": TracingConstants.SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(amostra)),
+    )
+    provedor.add_span_processor(BatchSpanProcessor(ExportadorArquivoOtlp(arquivo)))
+    _provedor, _tracer = provedor, provedor.get_tracer("casebem")
+    logger.info("Rastreamento ligado", arquivo=arquivo, amostra=amostra)
+    return True
+
+
+def encerrar_rastreamento() -> None:
+    """Exporta os spans pendentes e desliga o rastreamento"""
+    global _provedor, _tracer
+    provedor, _provedor, _tracer = _provedor, None, None
+    if provedor is not None:
+        provedor.shutdown()
+
+
+def obter_tracer() -> Optional[trace.Tracer]:
+    """Tracer atual (None com o rastreamento desligado)"""
+    return _tracer
+
+
+@contextmanager
+def iniciar_span(
+    nome: str,
+    tipo: SpanKind = SpanKind.INTERNAL,
+    atributos: Optional[Dict[str, Any]] = None,
+    contexto: Any = None,
+) -> Iterator[Optional[Span]]:
+    """
+    Abre um span filho do span atual, que vale até o fim do bloco.
+
+    Exceções que saem do bloco são registradas no span, que fica com status
+    de erro. Com o rastreamento desligado o bloco recebe None.
+
+    Examples:
+        >>> with iniciar_span("item_repo.obter_itens_publicos") as span:
+        ...     itens = item_repo.obter_itens_publicos()
+    """
+    tracer = _tracer
+    if tracer is None:
+        yield None
+        return
+    with tracer.start_as_current_span(
+        nome, context=contexto, kind=tipo, attributes=atributos
+    ) as span:
+        yield span
+
+
+def marcar_erro(span: Span, erro: BaseException) -> None:
+    """Registra a exceção no span e o marca com status de erro"""
+    span.record_exception(erro)
+    span.set_status(Status(StatusCode.ERROR, f"{type(erro).__name__}: {erro}"))
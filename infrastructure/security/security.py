@@ -7,6 +7,8 @@ import os
 from datetime import datetime, timedelta
 from passlib.context import CryptContext
 
+from infrastructure.logging import medir_tempo
+
 # Contexto para hash de senhas usando bcrypt
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -21,7 +23,8 @@ def criar_hash_senha(senha: str) -> str:
     Returns:
         Hash da senha
     """
-    return pwd_context.hash(senha)
+    with medir_tempo("senha"):
+        return pwd_context.hash(senha)
 
 
 def verificar_senha(senha_plana: str, senha_hash: str) -> bool:
@@ -36,7 +39,8 @@ def verificar_senha(senha_plana: str, senha_hash: str) -> bool:
         True se a senha está correta, False caso contrário
     """
     try:
-        return pwd_context.verify(senha_plana, senha_hash)
+        with medir_tempo("senha"):
+            return pwd_context.verify(senha_plana, senha_hash)
     except (ValueError, TypeError):
         # Retorna False se hash inválido ou senha em formato incorreto
         return False
@@ -1,5 +1,4 @@
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
 from starlette.middleware.sessions import SessionMiddleware
 import secrets
 import os
@@ -12,6 +11,17 @@ load_dotenv()
 
 from routes import public_routes, admin_routes, fornecedor_routes, noivo_routes, usuario_routes
 from util.startup import inicializar_sistema
+from util.file_storage import FileStorageManager
+from util.image_processor import fila_imagens
+from util.static_files import ArquivosEstaticos
+from infrastructure.database import encerrar_executor, fechar_pools, UnidadeTrabalhoMiddleware
+from infrastructure.metricas import (
+    ContextoRequisicaoMiddleware,
+    MetricasMiddleware,
+    encerrar_processo,
+    metricas_endpoint,
+)
+from infrastructure.rastreamento import configurar_rastreamento, encerrar_rastreamento
 
 app = FastAPI()
 # Use uma chave fixa para manter as sessões entre reinicializações
@@ -24,7 +34,16 @@ app.add_middleware(
     same_site="lax",
     https_only=False  # Em produção, mude para True com HTTPS
 )
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Uma conexão, uma transação e um mapa de identidade por requisição
+app.add_middleware(UnidadeTrabalhoMiddleware)
+# Latência, status e SQL por rota, expostos em /metrics
+app.add_middleware(MetricasMiddleware)
+# Id e tempos da requisição: Server-Timing, X-Request-ID e log de acesso (a mais externa)
+app.add_middleware(ContextoRequisicaoMiddleware)
+# Só para METRICS_TOKEN ou IPs de METRICS_ALLOWED_IPS (padrão: localhost)
+app.add_route("/metrics", metricas_endpoint, include_in_schema=False)
+# URLs versionadas (?v=...) com cache immutable, ver util/static_files.py
+app.mount("/static", ArquivosEstaticos(directory="static"), name="static")
 
 # Incluir rotas
 app.include_router(public_routes.router)
@@ -33,10 +52,24 @@ app.include_router(admin_routes.router)
 app.include_router(fornecedor_routes.router)
 app.include_router(noivo_routes.router)
 
-# Inicializar sistema na primeira execução
+# Inicializar sistema na primeira execução, montar o índice das fotos e ligar
+# o rastreamento se TRACING_FILE estiver definido
 @app.on_event("startup")
 async def startup_event():
     inicializar_sistema()
+    FileStorageManager.carregar_indice()
+    configurar_rastreamento()
+
+
+# Encerrar os processos de imagem e as threads do banco, fechar conexões do pool,
+# descartar as métricas deste worker e gravar os spans pendentes ao encerrar
+@app.on_event("shutdown")
+async def shutdown_event():
+    fila_imagens.encerrar()
+    encerrar_executor()
+    fechar_pools()
+    encerrar_processo()
+    encerrar_rastreamento()
 
 
 if __name__ == "__main__":
@@ -5,16 +5,16 @@ from infrastructure.security import requer_autenticacao
 from util.error_handlers import tratar_erro_rota
 from util.exceptions import ValidacaoError
 from infrastructure.logging import logger
+from infrastructure.database import perfil_sql
 from core.models.usuario_model import TipoUsuario
 from core.models.categoria_model import Categoria
 from core.models.tipo_fornecimento_model import TipoFornecimento
-from core.repositories import (
+from core.repositories.assincrono import (
     usuario_repo,
     fornecedor_repo,
     item_repo,
     categoria_repo,
-    orcamento_repo,
-    demanda_repo,
+    estatisticas_repo,
 )
 from util.flash_messages import informar_sucesso, informar_erro
 from util.template_helpers import configurar_filtros_jinja, template_response_with_flash
@@ -62,7 +62,7 @@ async def admin_root(_request: Request, _usuario_logado: dict = {}):
 @tratar_erro_rota(template_erro="admin/perfil.html")
 async def perfil_admin(request: Request, usuario_logado: dict = {}):
     """Página de perfil do administrador"""
-    admin = usuario_repo.obter_por_id(usuario_logado["id"])
+    admin = await usuario_repo.obter_por_id(usuario_logado["id"])
     logger.info("Perfil do admin carregado com sucesso", admin_id=usuario_logado["id"])
 
     return template_response_with_flash(
@@ -103,7 +103,7 @@ async def atualizar_perfil_admin(
             data_nascimento_recebida=data_nascimento if data_nascimento else "(vazio)",
         )
 
-        admin = usuario_repo.obter_por_id(usuario_logado["id"])
+        admin = await usuario_repo.obter_por_id(usuario_logado["id"])
         if not admin:
             informar_erro(request, "Usuário não encontrado")
             return RedirectResponse(
@@ -138,11 +138,11 @@ async def atualizar_perfil_admin(
         # Campos específicos do admin podem ser armazenados como propriedades customizadas
         # ou em uma tabela separada dependendo da implementação do banco
 
-        sucesso = usuario_repo.atualizar(admin)
+        sucesso = await usuario_repo.atualizar(admin)
 
         if sucesso:
             # Recarregar do banco de dados para garantir que os dados foram persistidos
-            admin_atualizado = usuario_repo.obter_por_id(usuario_logado["id"])
+            admin_atualizado = await usuario_repo.obter_por_id(usuario_logado["id"])
 
             # Log dos valores após recarregar do banco
             logger.info(
@@ -188,26 +188,15 @@ async def atualizar_perfil_admin(
 async def dashboard_admin(request: Request, usuario_logado: dict = {}):
     """Dashboard principal do administrador"""
     try:
-        # Estatísticas do sistema
+        # Estatísticas do sistema (uma única consulta)
+        estatisticas = await estatisticas_repo.obter_estatisticas()
         stats = {
-            "total_usuarios": usuario_repo.contar(),
-            "total_fornecedores": fornecedor_repo.contar(),
-            "total_noivos": usuario_repo.contar_usuarios_por_tipo(TipoUsuario.NOIVO),
-            "total_admins": usuario_repo.contar_usuarios_por_tipo(TipoUsuario.ADMIN),
-            "fornecedores_nao_verificados": fornecedor_repo.contar_nao_verificados(),
-            "total_itens": item_repo.contar(),
-            "total_categorias": categoria_repo.contar(),
-            "total_orcamentos": orcamento_repo.contar(),
-            "total_demandas": demanda_repo.contar(),
-            "estatisticas_itens": {
-                "produtos": item_repo.contar_itens_por_tipo(TipoFornecimento.PRODUTO),
-                "servicos": item_repo.contar_itens_por_tipo(TipoFornecimento.SERVICO),
-                "espacos": item_repo.contar_itens_por_tipo(TipoFornecimento.ESPACO),
-            },
+            **estatisticas.resumo_sistema(),
+            "estatisticas_itens": estatisticas.resumo_itens(),
         }
 
         # Buscar fornecedores recentes
-        fornecedores_recentes = fornecedor_repo.obter_fornecedores_por_pagina(1, 5)
+        fornecedores_recentes = await fornecedor_repo.obter_fornecedores_por_pagina(1, 5)
 
         return template_response_with_flash(
             templates,
@@ -216,6 +205,7 @@ async def dashboard_admin(request: Request, usuario_logado: dict = {}):
                 "request": request,
                 "usuario_logado": usuario_logado,
                 "stats": stats,
+                "stats_gerado_em": estatisticas.gerado_em,
                 "fornecedores_recentes": fornecedores_recentes,
                 "active_page": get_admin_active_page(request),
             },
@@ -250,16 +240,29 @@ async def listar_usuarios(request: Request, pagina: int = 1, usuario_logado: dic
 
         # Aplicar filtros se fornecidos, senão listar todos
         if busca or tipo_usuario or status:
-            usuarios, total_usuarios = usuario_repo.buscar_paginado(
+            usuarios, total_usuarios = await usuario_repo.buscar_paginado(
                 busca=busca,
                 tipo_usuario=tipo_usuario,
                 status=status,
                 pagina=pagina,
                 tamanho_pagina=tamanho_pagina,
             )
+            links_cursor = None
         else:
-            usuarios, total_usuarios = usuario_repo.obter_paginado_usuarios(
-                pagina=pagina, tamanho_pagina=tamanho_pagina
+            # Paginação keyset: anterior/próxima sem OFFSET nem novo COUNT(*)
+            total_conhecido = PaginationHelper.get_cursor_total(request)
+            pagina_cursor = await usuario_repo.obter_paginado_cursor(
+                cursor=PaginationHelper.get_cursor(request),
+                tamanho_pagina=tamanho_pagina,
+                pagina=pagina,
+                total="exato" if total_conhecido is None else None,
+            )
+            if pagina_cursor.total_items is None:
+                pagina_cursor.total_items = total_conhecido
+            usuarios = pagina_cursor.items
+            total_usuarios = pagina_cursor.total_items or 0
+            links_cursor = PaginationHelper.build_cursor_links(
+                request, pagina_cursor, pagina
             )
 
         # Aplicar paginação
@@ -268,12 +271,9 @@ async def listar_usuarios(request: Request, pagina: int = 1, usuario_logado: dic
         )
 
         # Buscar dados de fornecedores para verificar status de verificação
-        fornecedores_dados = {}
-        for usuario in page_info.items:
-            if usuario.perfil == TipoUsuario.FORNECEDOR:
-                fornecedor = fornecedor_repo.obter_por_id(usuario.id)
-                if fornecedor:
-                    fornecedores_dados[usuario.id] = fornecedor
+        fornecedores_dados = await fornecedor_repo.obter_muitos_por_ids(
+            u.id for u in page_info.items if u.perfil == TipoUsuario.FORNECEDOR
+        )
 
         return template_response_with_flash(
             templates,
@@ -289,6 +289,7 @@ async def listar_usuarios(request: Request, pagina: int = 1, usuario_logado: dic
                 "busca": busca,
                 "tipo_usuario": tipo_usuario,
                 "status": status,
+                "links_cursor": links_cursor,
             },
         )
     except Exception as e:
@@ -365,7 +366,7 @@ async def criar_admin(
             )
 
         # Verificar se já existe usuário com o mesmo email
-        usuario_existente = usuario_repo.obter_usuario_por_email(email)
+        usuario_existente = await usuario_repo.obter_usuario_por_email(email)
         if usuario_existente:
             return template_response_with_flash(
                 templates,
@@ -426,7 +427,7 @@ async def criar_admin(
         )
 
         # Inserir no banco
-        admin_id = usuario_repo.inserir(novo_admin)
+        admin_id = await usuario_repo.inserir(novo_admin)
         if admin_id:
             return RedirectResponse(
                 "/admin/usuarios", status_code=status.HTTP_303_SEE_OTHER
@@ -462,7 +463,7 @@ async def criar_admin(
 async def editar_admin_form(request: Request, id_admin: int, usuario_logado: dict = {}):
     """Formulário para editar administrador"""
     try:
-        admin = usuario_repo.obter_por_id(id_admin)
+        admin = await usuario_repo.obter_por_id(id_admin)
         if not admin or admin.perfil != TipoUsuario.ADMIN:
             return RedirectResponse(
                 "/admin/usuarios", status_code=status.HTTP_303_SEE_OTHER
@@ -500,7 +501,7 @@ async def atualizar_admin(
     """Atualiza dados do administrador"""
     try:
         # Obter administrador atual
-        admin = usuario_repo.obter_por_id(id_admin)
+        admin = await usuario_repo.obter_por_id(id_admin)
         if not admin or admin.perfil != TipoUsuario.ADMIN:
             return RedirectResponse(
                 "/admin/usuarios", status_code=status.HTTP_303_SEE_OTHER
@@ -537,7 +538,7 @@ async def atualizar_admin(
             )
 
         # Verificar se email já existe (exceto para o próprio usuário)
-        usuario_existente = usuario_repo.obter_usuario_por_email(email)
+        usuario_existente = await usuario_repo.obter_usuario_por_email(email)
         if usuario_existente and usuario_existente.id != id_admin:
             return template_response_with_flash(
                 templates,
@@ -560,7 +561,7 @@ async def atualizar_admin(
             data_nascimento.strip() if data_nascimento.strip() else None
         )
 
-        if usuario_repo.atualizar(admin):
+        if await usuario_repo.atualizar(admin):
             # Atualizar sessão se o admin editou a si mesmo
             if usuario_logado["id"] == id_admin:
                 usuario_logado["nome"] = nome
@@ -584,7 +585,7 @@ async def atualizar_admin(
 
     except Exception as e:
         logger.error("Erro ao atualizar administrador: ", erro=e)
-        admin = usuario_repo.obter_por_id(id_admin)
+        admin = await usuario_repo.obter_por_id(id_admin)
         return template_response_with_flash(
             templates,
             "admin/admin_form.html",
@@ -605,7 +606,7 @@ async def visualizar_usuario(
 ):
     """Visualiza detalhes de um usuário específico"""
     try:
-        usuario = usuario_repo.obter_por_id(id_usuario)
+        usuario = await usuario_repo.obter_por_id(id_usuario)
 
         if not usuario:
             return template_response_with_flash(
@@ -621,7 +622,7 @@ async def visualizar_usuario(
         # Se for fornecedor, buscar dados adicionais
         fornecedor = None
         if usuario.perfil == TipoUsuario.FORNECEDOR:
-            fornecedor = fornecedor_repo.obter_por_id(id_usuario)
+            fornecedor = await fornecedor_repo.obter_por_id(id_usuario)
 
         return template_response_with_flash(
             templates,
@@ -658,7 +659,7 @@ async def bloquear_usuario(
             "ID do usuário deve ser um número positivo", "id_usuario", id_usuario
         )
 
-    sucesso = usuario_repo.bloquear_usuario(id_usuario)
+    sucesso = await usuario_repo.bloquear_usuario(id_usuario)
     if sucesso:
         logger.info(
             "Usuário bloqueado com sucesso",
@@ -678,7 +679,7 @@ async def bloquear_usuario(
 async def ativar_usuario(request: Request, id_usuario: int, usuario_logado: dict = {}):
     """Ativa um usuário"""
     try:
-        sucesso = usuario_repo.ativar_usuario(id_usuario)
+        sucesso = await usuario_repo.ativar_usuario(id_usuario)
         if sucesso:
             informar_sucesso(request, "Usuário ativado com sucesso!")
         else:
@@ -705,7 +706,7 @@ async def verificacao_fornecedor_especifico(
     """Página de verificação para um fornecedor específico"""
     try:
         # Buscar o usuário e dados do fornecedor
-        usuario = usuario_repo.obter_por_id(id_fornecedor)
+        usuario = await usuario_repo.obter_por_id(id_fornecedor)
         if not usuario or usuario.perfil != TipoUsuario.FORNECEDOR:
             return template_response_with_flash(
                 templates,
@@ -717,7 +718,7 @@ async def verificacao_fornecedor_especifico(
                 },
             )
 
-        fornecedor = fornecedor_repo.obter_por_id(id_fornecedor)
+        fornecedor = await fornecedor_repo.obter_por_id(id_fornecedor)
         if not fornecedor:
             return template_response_with_flash(
                 templates,
@@ -756,7 +757,7 @@ async def verificacao_fornecedor_especifico(
 async def verificacao_fornecedores(request: Request, usuario_logado: dict = {}):
     """Lista fornecedores pendentes de verificação"""
     try:
-        fornecedores = fornecedor_repo.obter_fornecedores_por_pagina(1, 100)
+        fornecedores = await fornecedor_repo.obter_fornecedores_por_pagina(1, 100)
         fornecedores_pendentes = [f for f in fornecedores if not f.verificado]
 
         return template_response_with_flash(
@@ -788,7 +789,7 @@ async def aprovar_fornecedor(
 ):
     """Aprova um fornecedor"""
     try:
-        fornecedor = fornecedor_repo.obter_por_id(id_fornecedor)
+        fornecedor = await fornecedor_repo.obter_por_id(id_fornecedor)
         if not fornecedor:
             return RedirectResponse(
                 "/admin/verificacao", status_code=status.HTTP_303_SEE_OTHER
@@ -798,7 +799,7 @@ async def aprovar_fornecedor(
         from datetime import datetime
 
         fornecedor.data_verificacao = datetime.now().isoformat()
-        fornecedor_repo.atualizar(fornecedor)
+        await fornecedor_repo.atualizar(fornecedor)
 
         informar_sucesso(request, "Fornecedor aprovado com sucesso!")
         return RedirectResponse(
@@ -821,7 +822,7 @@ async def rejeitar_fornecedor(
 ):
     """Rejeita um fornecedor"""
     try:
-        fornecedor = fornecedor_repo.obter_por_id(id_fornecedor)
+        fornecedor = await fornecedor_repo.obter_por_id(id_fornecedor)
         if not fornecedor:
             return RedirectResponse(
                 "/admin/verificacao", status_code=status.HTTP_303_SEE_OTHER
@@ -830,7 +831,7 @@ async def rejeitar_fornecedor(
         # Rejeitar fornecedor (remover verificação)
         fornecedor.verificado = False
         fornecedor.data_verificacao = None
-        sucesso = fornecedor_repo.atualizar(fornecedor)
+        sucesso = await fornecedor_repo.atualizar(fornecedor)
 
         if not sucesso:
             logger.warning("Falha ao rejeitar fornecedor", fornecedor_id=id_fornecedor)
@@ -862,7 +863,7 @@ async def listar_itens(request: Request, pagina: int = 1, usuario_logado: dict =
 
         # Aplicar filtros se fornecidos, senão listar todos
         if busca or tipo_item or status_filtro or categoria_id:
-            itens, total_itens = item_repo.buscar_paginado(
+            itens, total_itens = await item_repo.buscar_paginado(
                 busca=busca,
                 tipo_item=tipo_item,
                 status=status_filtro,
@@ -870,9 +871,22 @@ async def listar_itens(request: Request, pagina: int = 1, usuario_logado: dict =
                 pagina=pagina,
                 tamanho_pagina=tamanho_pagina,
             )
+            links_cursor = None
         else:
-            itens, total_itens = item_repo.obter_paginado_itens(
-                pagina=pagina, tamanho_pagina=tamanho_pagina
+            # Paginação keyset: anterior/próxima sem OFFSET nem novo COUNT(*)
+            total_conhecido = PaginationHelper.get_cursor_total(request)
+            pagina_cursor = await item_repo.obter_paginado_cursor(
+                cursor=PaginationHelper.get_cursor(request),
+                tamanho_pagina=tamanho_pagina,
+                pagina=pagina,
+                total="exato" if total_conhecido is None else None,
+            )
+            if pagina_cursor.total_items is None:
+                pagina_cursor.total_items = total_conhecido
+            itens = pagina_cursor.items
+            total_itens = pagina_cursor.total_items or 0
+            links_cursor = PaginationHelper.build_cursor_links(
+                request, pagina_cursor, pagina
             )
 
         # Aplicar paginação
@@ -881,23 +895,12 @@ async def listar_itens(request: Request, pagina: int = 1, usuario_logado: dict =
         )
 
         # Buscar dados das categorias para exibir nomes
-        categorias_dados = {}
-        for item in page_info.items:
-            if item.id_categoria and item.id_categoria not in categorias_dados:
-                try:
-                    categoria = categoria_repo.obter_por_id(item.id_categoria)
-                    if categoria:
-                        categorias_dados[item.id_categoria] = categoria
-                except Exception as e:
-                    logger.error(
-                        "Erro ao buscar categoria",
-                        categoria_id=item.id_categoria,
-                        erro=e,
-                    )
-                    continue
+        categorias_dados = await categoria_repo.obter_muitos_por_ids(
+            item.id_categoria for item in page_info.items
+        )
 
         # Buscar todas as categorias para o filtro
-        categorias = categoria_repo.buscar_categorias()
+        categorias = await categoria_repo.buscar_categorias()
 
         return template_response_with_flash(
             templates,
@@ -916,6 +919,7 @@ async def listar_itens(request: Request, pagina: int = 1, usuario_logado: dict =
                 "tipo_item": tipo_item,
                 "status_filtro": status_filtro,
                 "categoria_id": categoria_id,
+                "links_cursor": links_cursor,
             },
         )
     except Exception as e:
@@ -940,7 +944,7 @@ async def listar_itens(request: Request, pagina: int = 1, usuario_logado: dict =
 async def visualizar_item(request: Request, id_item: int, usuario_logado: dict = {}):
     """Visualiza detalhes de um item específico"""
     try:
-        item = item_repo.obter_por_id(id_item)
+        item = await item_repo.obter_por_id(id_item)
 
         if not item:
             return template_response_with_flash(
@@ -954,7 +958,7 @@ async def visualizar_item(request: Request, id_item: int, usuario_logado: dict =
             )
 
         # Buscar dados do fornecedor
-        fornecedor = fornecedor_repo.obter_por_id(item.id_fornecedor)
+        fornecedor = await fornecedor_repo.obter_por_id(item.id_fornecedor)
 
         return template_response_with_flash(
             templates,
@@ -984,7 +988,7 @@ async def visualizar_item(request: Request, id_item: int, usuario_logado: dict =
 async def ativar_item_admin(request: Request, id_item: int, usuario_logado: dict = {}):
     """Ativa um item (admin pode ativar qualquer item)"""
     try:
-        sucesso = item_repo.ativar_item_admin(id_item)
+        sucesso = await item_repo.ativar_item_admin(id_item)
 
         if sucesso:
             informar_sucesso(request, "Item ativado com sucesso!")
@@ -1004,7 +1008,7 @@ async def desativar_item_admin(
 ):
     """Desativa um item (admin pode desativar qualquer item)"""
     try:
-        sucesso = item_repo.desativar_item_admin(id_item)
+        sucesso = await item_repo.desativar_item_admin(id_item)
 
         if sucesso:
             informar_sucesso(request, "Item desativado com sucesso!")
@@ -1025,40 +1029,14 @@ async def desativar_item_admin(
 async def relatorios(request: Request, usuario_logado: dict = {}):
     """Página de relatórios e estatísticas"""
     try:
-        # Estatísticas gerais do sistema
-        stats_gerais = {
-            "total_usuarios": usuario_repo.contar(),
-            "total_noivos": usuario_repo.contar_usuarios_por_tipo(TipoUsuario.NOIVO),
-            "total_admins": usuario_repo.contar_usuarios_por_tipo(TipoUsuario.ADMIN),
-            "total_fornecedores": fornecedor_repo.contar(),
-            "fornecedores_verificados": fornecedor_repo.contar()
-            - fornecedor_repo.contar_nao_verificados(),
-            "fornecedores_nao_verificados": fornecedor_repo.contar_nao_verificados(),
-            "total_itens": item_repo.contar(),
-            "total_categorias": categoria_repo.contar(),
-            "total_orcamentos": orcamento_repo.contar(),
-            "total_demandas": demanda_repo.contar(),
-        }
-
-        # Estatísticas de itens por tipo
+        # Todas as estatísticas em uma única consulta
+        estatisticas = await estatisticas_repo.obter_estatisticas()
+        stats_gerais = estatisticas.resumo_sistema()
         stats_itens = {
-            "produtos": item_repo.contar_itens_por_tipo(TipoFornecimento.PRODUTO),
-            "servicos": item_repo.contar_itens_por_tipo(TipoFornecimento.SERVICO),
-            "espacos": item_repo.contar_itens_por_tipo(TipoFornecimento.ESPACO),
-            "detalhes_por_tipo": item_repo.obter_estatisticas_itens(),
+            **estatisticas.resumo_itens(),
+            "detalhes_por_tipo": estatisticas.detalhes_itens,
         }
-
-        # Estatísticas de fornecedores por categoria
-        try:
-            fornecedores = fornecedor_repo.obter_fornecedores_por_pagina(1, 1000)
-            stats_fornecedores = {
-                "total": len(fornecedores),
-                "verificados": len([f for f in fornecedores if f.verificado]),
-                "nao_verificados": len([f for f in fornecedores if not f.verificado]),
-            }
-        except Exception as e:
-            logger.error("Erro ao obter estatísticas de fornecedores", exc_info=True)
-            stats_fornecedores = {"total": 0, "verificados": 0, "nao_verificados": 0}
+        stats_fornecedores = estatisticas.resumo_fornecedores()
 
         # Calcular percentuais
         total_usuarios = stats_gerais["total_usuarios"]
@@ -1111,6 +1089,7 @@ async def relatorios(request: Request, usuario_logado: dict = {}):
                 "stats_itens": stats_itens,
                 "stats_fornecedores": stats_fornecedores,
                 "percentuais": percentuais,
+                "stats_gerado_em": estatisticas.gerado_em,
             },
         )
     except Exception as e:
@@ -1136,31 +1115,14 @@ async def exportar_relatorios(
         from fastapi.responses import JSONResponse, PlainTextResponse
         from datetime import datetime
 
-        # Coletar todos os dados
+        # Coletar todos os dados (uma única consulta)
+        estatisticas = await estatisticas_repo.obter_estatisticas()
         dados = {
-            "data_geracao": datetime.now().isoformat(),
-            "sistema": {
-                "total_usuarios": usuario_repo.contar(),
-                "total_noivos": usuario_repo.contar_usuarios_por_tipo(
-                    TipoUsuario.NOIVO
-                ),
-                "total_admins": usuario_repo.contar_usuarios_por_tipo(
-                    TipoUsuario.ADMIN
-                ),
-                "total_fornecedores": fornecedor_repo.contar(),
-                "fornecedores_verificados": fornecedor_repo.contar()
-                - fornecedor_repo.contar_nao_verificados(),
-                "fornecedores_nao_verificados": fornecedor_repo.contar_nao_verificados(),
-                "total_itens": item_repo.contar(),
-                "total_categorias": categoria_repo.contar(),
-                "total_orcamentos": orcamento_repo.contar(),
-                "total_demandas": demanda_repo.contar(),
-            },
+            "data_geracao": estatisticas.gerado_em.isoformat(),
+            "sistema": estatisticas.resumo_sistema(),
             "itens": {
-                "produtos": item_repo.contar_itens_por_tipo(TipoFornecimento.PRODUTO),
-                "servicos": item_repo.contar_itens_por_tipo(TipoFornecimento.SERVICO),
-                "espacos": item_repo.contar_itens_por_tipo(TipoFornecimento.ESPACO),
-                "detalhes": item_repo.obter_estatisticas_itens(),
+                **estatisticas.resumo_itens(),
+                "detalhes": estatisticas.detalhes_itens,
             },
         }
 
@@ -1169,17 +1131,17 @@ async def exportar_relatorios(
             csv_content = "Categoria,Subcategoria,Valor\n"
 
             # Dados do sistema
-            for chave, valor in dados["sistema"].items():  # type: ignore[attr-defined]
+            for chave, valor in dados["sistema"].items():
                 csv_content += f"Sistema,{chave.replace('_', ' ').title()},{valor}\n"
 
             # Dados de itens
-            for chave, valor in dados["itens"].items():  # type: ignore[attr-defined]
+            for chave, valor in dados["itens"].items():
                 if chave != "detalhes":
                     csv_content += f"Itens,{chave.replace('_', ' ').title()},{valor}\n"
 
             # Detalhes dos itens
-            if dados["itens"]["detalhes"]:  # type: ignore[index]
-                for item in dados["itens"]["detalhes"]:  # type: ignore[index]
+            if dados["itens"]["detalhes"]:
+                for item in dados["itens"]["detalhes"]:
                     csv_content += (
                         f"Detalhes Itens,{item['tipo']},{item['quantidade']}\n"
                     )
@@ -1205,6 +1167,28 @@ async def exportar_relatorios(
         )
 
 
+@router.get("/admin/relatorios/consultas")
+@requer_autenticacao([TipoUsuario.ADMIN.value])
+async def relatorio_consultas(
+    request: Request,
+    ordenar: str = "tempo_total_ms",
+    limite: int = 50,
+    usuario_logado: dict = {},
+):
+    """Estatísticas por instrução SQL (tempo, p50/p95, linhas) e consultas lentas"""
+    from datetime import datetime
+    from fastapi.responses import JSONResponse
+
+    return JSONResponse(
+        content={
+            "gerado_em": datetime.now().isoformat(),
+            "limite_lenta_ms": perfil_sql.limite_lenta * 1000,
+            "instrucoes": perfil_sql.relatorio(ordenar, max(1, min(limite, 500))),
+            "consultas_lentas": perfil_sql.consultas_lentas(),
+        }
+    )
+
+
 # ==================== CATEGORIAS DE ITEM ====================
 
 
@@ -1223,7 +1207,7 @@ async def listar_categorias(
 
         # Aplicar filtros se fornecidos, senão listar todas
         if busca or tipo_fornecimento or status_filtro:
-            categorias, total_categorias = categoria_repo.buscar_paginado(
+            categorias, total_categorias = await categoria_repo.buscar_paginado(
                 busca=busca,
                 tipo_fornecimento=tipo_fornecimento,
                 status=status_filtro,
@@ -1231,7 +1215,7 @@ async def listar_categorias(
                 tamanho_pagina=tamanho_pagina,
             )
         else:
-            categorias, total_categorias = categoria_repo.obter_paginado_categorias(
+            categorias, total_categorias = await categoria_repo.obter_paginado_categorias(
                 pagina=pagina, tamanho_pagina=tamanho_pagina
             )
 
@@ -1317,7 +1301,7 @@ async def criar_categoria(
             )
 
         # Verificar se já existe categoria com o mesmo nome e tipo
-        todas_categorias = categoria_repo.buscar_categorias()
+        todas_categorias = await categoria_repo.buscar_categorias()
         categoria_existente = next(
             (
                 c
@@ -1348,7 +1332,7 @@ async def criar_categoria(
             ativo=ativo,
         )
 
-        categoria_id = categoria_repo.inserir(categoria)
+        categoria_id = await categoria_repo.inserir(categoria)
         if categoria_id:
             return RedirectResponse(
                 "/admin/categorias", status_code=status.HTTP_303_SEE_OTHER
@@ -1387,7 +1371,7 @@ async def editar_categoria(
 ):
     """Formulário para editar categoria"""
     try:
-        categoria = categoria_repo.obter_por_id(id_categoria)
+        categoria = await categoria_repo.obter_por_id(id_categoria)
         if not categoria:
             return RedirectResponse(
                 "/admin/categorias", status_code=status.HTTP_303_SEE_OTHER
@@ -1427,7 +1411,7 @@ async def atualizar_categoria(
         # Validar se o nome não está vazio
         nome = nome.strip()
         if not nome:
-            categoria_atual = categoria_repo.obter_por_id(id_categoria)
+            categoria_atual = await categoria_repo.obter_por_id(id_categoria)
             return template_response_with_flash(
                 templates,
                 "admin/categoria_form.html",
@@ -1442,7 +1426,7 @@ async def atualizar_categoria(
             )
 
         # Verificar se já existe outra categoria com o mesmo nome e tipo
-        todas_categorias = categoria_repo.buscar_categorias()
+        todas_categorias = await categoria_repo.buscar_categorias()
         categoria_existente = next(
             (
                 c
@@ -1453,7 +1437,7 @@ async def atualizar_categoria(
             None,
         )
         if categoria_existente and categoria_existente.id != id_categoria:
-            categoria_atual = categoria_repo.obter_por_id(id_categoria)
+            categoria_atual = await categoria_repo.obter_por_id(id_categoria)
             return template_response_with_flash(
                 templates,
                 "admin/categoria_form.html",
@@ -1475,12 +1459,12 @@ async def atualizar_categoria(
             ativo=ativo,
         )
 
-        if categoria_repo.atualizar(categoria):
+        if await categoria_repo.atualizar(categoria):
             return RedirectResponse(
                 "/admin/categorias", status_code=status.HTTP_303_SEE_OTHER
             )
         else:
-            categoria_atual = categoria_repo.obter_por_id(id_categoria)
+            categoria_atual = await categoria_repo.obter_por_id(id_categoria)
             return template_response_with_flash(
                 templates,
                 "admin/categoria_form.html",
@@ -1495,7 +1479,7 @@ async def atualizar_categoria(
             )
     except Exception as e:
         logger.error("Erro ao atualizar categoria: ", erro=e)
-        categoria_atual = categoria_repo.obter_por_id(id_categoria)
+        categoria_atual = await categoria_repo.obter_por_id(id_categoria)
         return template_response_with_flash(
             templates,
             "admin/categoria_form.html",
@@ -1517,7 +1501,7 @@ async def excluir_categoria(
 ):
     """Exclui uma categoria"""
     try:
-        categoria_repo.excluir(id_categoria)
+        await categoria_repo.excluir(id_categoria)
         return RedirectResponse(
             "/admin/categorias", status_code=status.HTTP_303_SEE_OTHER
         )
@@ -1535,7 +1519,7 @@ async def ativar_categoria(
 ):
     """Ativa uma categoria"""
     try:
-        sucesso = categoria_repo.ativar_categoria(id_categoria)
+        sucesso = await categoria_repo.ativar_categoria(id_categoria)
         if not sucesso:
             logger.error("Falha ao ativar categoria", categoria_id=id_categoria)
         return RedirectResponse(
@@ -1555,7 +1539,7 @@ async def desativar_categoria(
 ):
     """Desativa uma categoria"""
     try:
-        sucesso = categoria_repo.desativar_categoria(id_categoria)
+        sucesso = await categoria_repo.desativar_categoria(id_categoria)
         if not sucesso:
             logger.error("Falha ao desativar categoria", categoria_id=id_categoria)
         return RedirectResponse(
@@ -1,14 +1,14 @@
 from fastapi import APIRouter, Request, Form, status, UploadFile, File
 from fastapi.responses import RedirectResponse
 from fastapi.templating import Jinja2Templates
-from core.models.demanda_model import StatusDemanda
 from infrastructure.security import requer_autenticacao
+from infrastructure.database import bloco_assincrono, liberar_conexao
 from util.error_handlers import tratar_erro_rota
 from infrastructure.logging import logger
 from core.models.usuario_model import TipoUsuario
 from core.models.item_model import Item
 from core.models.tipo_fornecimento_model import TipoFornecimento
-from core.repositories import (
+from core.repositories.assincrono import (
     fornecedor_repo,
     item_repo,
     orcamento_repo,
@@ -17,11 +17,13 @@ from core.repositories import (
     categoria_repo,
     casal_repo,
     item_orcamento_repo,
+    demanda_match_repo,
 )
 from util.flash_messages import informar_sucesso, informar_erro, informar_aviso
 from util.template_helpers import template_response_with_flash, configurar_filtros_jinja
 from util.item_foto_util import excluir_foto_item
 from util.route_helpers import get_active_page
+from util.pagination import PaginationHelper
 from decimal import Decimal
 
 router = APIRouter()
@@ -52,16 +54,14 @@ async def root_fornecedor(_request: Request, _usuario_logado: dict = {}):
 @tratar_erro_rota(template_erro="fornecedor/dashboard.html")
 async def dashboard_fornecedor(request: Request, usuario_logado: dict = {}):
     """Dashboard principal do fornecedor"""
-    from core.repositories import item_demanda_repo
-
     id_fornecedor = usuario_logado["id"]
 
     # Buscar dados do fornecedor
-    fornecedor = fornecedor_repo.obter_por_id(id_fornecedor)
+    fornecedor = await fornecedor_repo.obter_por_id(id_fornecedor)
 
     # Estatísticas dos itens do fornecedor
-    total_itens = item_repo.contar_por_fornecedor(id_fornecedor)
-    meus_itens = item_repo.obter_itens_por_fornecedor(id_fornecedor)
+    total_itens = await item_repo.contar_por_fornecedor(id_fornecedor)
+    meus_itens = await item_repo.obter_itens_por_fornecedor(id_fornecedor)
 
     # Separar por tipo
     produtos = [item for item in meus_itens if item.tipo == TipoFornecimento.PRODUTO]
@@ -70,7 +70,7 @@ async def dashboard_fornecedor(request: Request, usuario_logado: dict = {}):
 
     # Buscar orçamentos do fornecedor
     try:
-        orcamentos_fornecedor = orcamento_repo.obter_por_fornecedor_prestador(id_fornecedor)
+        orcamentos_fornecedor = await orcamento_repo.obter_por_fornecedor_prestador(id_fornecedor)
         orcamentos_pendentes = [o for o in orcamentos_fornecedor if o.status == "PENDENTE"]
         orcamentos_aceitos = [o for o in orcamentos_fornecedor if o.status == "ACEITO"]
     except Exception as e:
@@ -79,28 +79,14 @@ async def dashboard_fornecedor(request: Request, usuario_logado: dict = {}):
         orcamentos_pendentes = []
         orcamentos_aceitos = []
 
-    # Contar demandas compatíveis
-    total_demandas = 0
+    # Contar demandas compatíveis e as novas desde a última visita à lista
     try:
-        # Buscar categorias que o fornecedor oferece
-        categorias_fornecedor = item_repo.obter_categorias_do_fornecedor(id_fornecedor)
-
-        if categorias_fornecedor:
-            # Buscar todas as demandas ativas
-            demandas_ativas = demanda_repo.obter_por_status(StatusDemanda.ATIVA.value)
-
-            # Filtrar demandas que têm itens compatíveis
-            for demanda in demandas_ativas:
-                itens_demanda = item_demanda_repo.obter_por_demanda(demanda.id)
-                # Verificar se algum item da demanda pertence às categorias do fornecedor
-                itens_compativeis = [
-                    item for item in itens_demanda if item.get("id_categoria") in categorias_fornecedor
-                ]
-                if itens_compativeis:
-                    total_demandas += 1
+        total_demandas = await demanda_repo.contar_compativeis_com_fornecedor(id_fornecedor)
+        demandas_novas = await demanda_match_repo.contar_novas(id_fornecedor)
     except Exception as e:
         logger.warning("Erro ao contar demandas compatíveis", erro=e, fornecedor_id=id_fornecedor)
         total_demandas = 0
+        demandas_novas = 0
 
     stats = {
         "total_itens": total_itens,
@@ -112,6 +98,7 @@ async def dashboard_fornecedor(request: Request, usuario_logado: dict = {}):
         "orcamentos_pendentes": len(orcamentos_pendentes),
         "orcamentos_aceitos": len(orcamentos_aceitos),
         "total_demandas": total_demandas,
+        "demandas_novas": demandas_novas,
     }
 
     logger.info(
@@ -143,7 +130,7 @@ async def dashboard_fornecedor(request: Request, usuario_logado: dict = {}):
 async def listar_itens(request: Request, usuario_logado: dict = {}):
     """Lista todos os itens do fornecedor"""
     id_fornecedor = usuario_logado["id"]
-    meus_itens = item_repo.obter_itens_por_fornecedor(id_fornecedor)
+    meus_itens = await item_repo.obter_itens_por_fornecedor(id_fornecedor)
 
     # Obter parâmetros de filtro
     search = request.query_params.get("search", "").strip()
@@ -192,7 +179,7 @@ async def listar_itens(request: Request, usuario_logado: dict = {}):
 @requer_autenticacao([TipoUsuario.FORNECEDOR.value])
 async def novo_item_form(request: Request, usuario_logado: dict = {}):
     """Formulário para criar novo item"""
-    categorias = [c for c in categoria_repo.buscar_categorias() if c.ativo]
+    categorias = [c for c in await categoria_repo.buscar_categorias() if c.ativo]
     return templates.TemplateResponse(
         "fornecedor/item_form.html",
         {
@@ -227,7 +214,7 @@ async def criar_item(
         tipo_enum = TipoFornecimento(tipo)
     except ValueError:
         logger.warning("Tipo de item inválido", tipo=tipo, fornecedor_id=id_fornecedor)
-        categorias = [c for c in categoria_repo.buscar_categorias() if c.ativo]
+        categorias = [c for c in await categoria_repo.buscar_categorias() if c.ativo]
         return templates.TemplateResponse(
             "fornecedor/item_form.html",
             {
@@ -243,7 +230,7 @@ async def criar_item(
     # Validar categoria
     if not categoria:
         logger.warning("Categoria não fornecida", fornecedor_id=id_fornecedor)
-        categorias = [c for c in categoria_repo.buscar_categorias() if c.ativo]
+        categorias = [c for c in await categoria_repo.buscar_categorias() if c.ativo]
         return templates.TemplateResponse(
             "fornecedor/item_form.html",
             {
@@ -260,7 +247,7 @@ async def criar_item(
         categoria_id = int(categoria)
     except ValueError:
         logger.warning("Categoria inválida", categoria=categoria, fornecedor_id=id_fornecedor)
-        categorias = [c for c in categoria_repo.buscar_categorias() if c.ativo]
+        categorias = [c for c in await categoria_repo.buscar_categorias() if c.ativo]
         return templates.TemplateResponse(
             "fornecedor/item_form.html",
             {
@@ -274,12 +261,12 @@ async def criar_item(
         )
 
     # Validar se categoria pertence ao tipo
-    categoria_obj = categoria_repo.obter_por_id(categoria_id)
+    categoria_obj = await categoria_repo.obter_por_id(categoria_id)
     if not categoria_obj or categoria_obj.tipo_fornecimento != tipo_enum:
         logger.warning(
             "Categoria não pertence ao tipo", tipo=tipo, categoria_id=categoria_id, fornecedor_id=id_fornecedor
         )
-        categorias = [c for c in categoria_repo.buscar_categorias() if c.ativo]
+        categorias = [c for c in await categoria_repo.buscar_categorias() if c.ativo]
         return templates.TemplateResponse(
             "fornecedor/item_form.html",
             {
@@ -306,25 +293,25 @@ async def criar_item(
         id_categoria=categoria_id,
     )
 
-    item_id = item_repo.inserir(novo_item)
+    item_id = await item_repo.inserir(novo_item)
 
     if item_id:
         # Processar foto se fornecida
         if foto and foto.filename:
             from util.image_processor import ImageProcessor
-            from util.file_storage import FileStorageManager, TipoArquivo
-            from config.constants import ImageConstants
-
-            # Criar diretório se não existir
-            FileStorageManager.criar_diretorio(TipoArquivo.ITEM)
+            from util.file_storage import TipoArquivo
+            from util.exceptions import SobrecargaError
 
-            # Obter caminho físico para salvar
-            caminho_arquivo = FileStorageManager.obter_caminho(TipoArquivo.ITEM, item_id, fisico=True)
+            # Gravar o item e devolver a conexão ao pool antes do processamento da
+            # imagem (libera o lock de escrita e a vaga do pool)
+            await liberar_conexao()
 
-            # Processar e salvar usando ImageProcessor
-            sucesso, erro = await ImageProcessor.processar_e_salvar_imagem(
-                foto, caminho_arquivo, tamanho=ImageConstants.Sizes.ITEM.value  # (600, 600)
-            )
+            # Processar e salvar usando ImageProcessor (o item já foi gravado, então
+            # fila de imagens cheia só deixa o item sem foto)
+            try:
+                sucesso, erro = await ImageProcessor.processar_e_salvar_variantes(foto, TipoArquivo.ITEM, item_id)
+            except SobrecargaError as e:
+                sucesso, erro = False, e.mensagem
 
             if sucesso:
                 logger.info("Item criado com foto", item_id=item_id, fornecedor_id=id_fornecedor, nome=nome)
@@ -339,7 +326,7 @@ async def criar_item(
         return RedirectResponse("/fornecedor/itens", status_code=status.HTTP_303_SEE_OTHER)
     else:
         logger.error("Erro ao inserir item no banco", fornecedor_id=id_fornecedor, nome=nome)
-        categorias = [c for c in categoria_repo.buscar_categorias() if c.ativo]
+        categorias = [c for c in await categoria_repo.buscar_categorias() if c.ativo]
         return templates.TemplateResponse(
             "fornecedor/item_form.html",
             {
@@ -359,13 +346,13 @@ async def criar_item(
 async def editar_item_form(request: Request, id_item: int, usuario_logado: dict = {}):
     """Formulário para editar item"""
     id_fornecedor = usuario_logado["id"]
-    item = item_repo.obter_por_id(id_item)
+    item = await item_repo.obter_por_id(id_item)
 
     if not item or item.id_fornecedor != id_fornecedor:
         logger.warning("Tentativa de editar item não autorizado", item_id=id_item, fornecedor_id=id_fornecedor)
         return RedirectResponse("/fornecedor/itens", status_code=status.HTTP_303_SEE_OTHER)
 
-    categorias = [c for c in categoria_repo.buscar_categorias() if c.ativo]
+    categorias = [c for c in await categoria_repo.buscar_categorias() if c.ativo]
     logger.info("Formulário de edição carregado", item_id=id_item, fornecedor_id=id_fornecedor)
     return templates.TemplateResponse(
         "fornecedor/item_form.html",
@@ -399,7 +386,7 @@ async def atualizar_item(
     id_fornecedor = usuario_logado["id"]
 
     # Verificar se o item pertence ao fornecedor
-    item_existente = item_repo.obter_por_id(id_item)
+    item_existente = await item_repo.obter_por_id(id_item)
     if not item_existente or item_existente.id_fornecedor != id_fornecedor:
         logger.warning("Tentativa de atualizar item não autorizado", item_id=id_item, fornecedor_id=id_fornecedor)
         return RedirectResponse("/fornecedor/itens", status_code=status.HTTP_303_SEE_OTHER)
@@ -409,7 +396,7 @@ async def atualizar_item(
         tipo_enum = TipoFornecimento(tipo)
     except ValueError:
         logger.warning("Tipo de item inválido ao atualizar", tipo=tipo, item_id=id_item)
-        categorias = [c for c in categoria_repo.buscar_categorias() if c.ativo]
+        categorias = [c for c in await categoria_repo.buscar_categorias() if c.ativo]
         return templates.TemplateResponse(
             "fornecedor/item_form.html",
             {
@@ -426,7 +413,7 @@ async def atualizar_item(
     # Validar categoria
     if not categoria:
         logger.warning("Categoria não fornecida ao atualizar", item_id=id_item)
-        categorias = [c for c in categoria_repo.buscar_categorias() if c.ativo]
+        categorias = [c for c in await categoria_repo.buscar_categorias() if c.ativo]
         return templates.TemplateResponse(
             "fornecedor/item_form.html",
             {
@@ -444,7 +431,7 @@ async def atualizar_item(
         categoria_id = int(categoria)
     except ValueError:
         logger.warning("Categoria inválida ao atualizar", categoria=categoria, item_id=id_item)
-        categorias = [c for c in categoria_repo.buscar_categorias() if c.ativo]
+        categorias = [c for c in await categoria_repo.buscar_categorias() if c.ativo]
         return templates.TemplateResponse(
             "fornecedor/item_form.html",
             {
@@ -459,12 +446,12 @@ async def atualizar_item(
         )
 
     # Validar se categoria pertence ao tipo
-    categoria_obj_validacao = categoria_repo.obter_por_id(categoria_id)
+    categoria_obj_validacao = await categoria_repo.obter_por_id(categoria_id)
     if not categoria_obj_validacao or categoria_obj_validacao.tipo_fornecimento != tipo_enum:
         logger.warning(
             "Categoria não pertence ao tipo ao atualizar", tipo=tipo, categoria_id=categoria_id, item_id=id_item
         )
-        categorias = [c for c in categoria_repo.buscar_categorias() if c.ativo]
+        categorias = [c for c in await categoria_repo.buscar_categorias() if c.ativo]
         return templates.TemplateResponse(
             "fornecedor/item_form.html",
             {
@@ -492,7 +479,7 @@ async def atualizar_item(
         id_categoria=categoria_id,
     )
 
-    sucesso = item_repo.atualizar(item_atualizado)
+    sucesso = await item_repo.atualizar(item_atualizado)
 
     if sucesso:
         logger.info("Item atualizado com sucesso", item_id=id_item, fornecedor_id=id_fornecedor, nome=nome)
@@ -500,7 +487,7 @@ async def atualizar_item(
         return RedirectResponse("/fornecedor/itens", status_code=status.HTTP_303_SEE_OTHER)
     else:
         logger.error("Erro ao atualizar item no banco", item_id=id_item, fornecedor_id=id_fornecedor)
-        categorias = [c for c in categoria_repo.buscar_categorias() if c.ativo]
+        categorias = [c for c in await categoria_repo.buscar_categorias() if c.ativo]
         return templates.TemplateResponse(
             "fornecedor/item_form.html",
             {
@@ -521,7 +508,7 @@ async def atualizar_item(
 async def excluir_item(request: Request, id_item: int, usuario_logado: dict = {}):
     """Exclui um item"""
     id_fornecedor = usuario_logado["id"]
-    sucesso = item_repo.excluir_item_fornecedor(id_item, id_fornecedor)
+    sucesso = await item_repo.excluir_item_fornecedor(id_item, id_fornecedor)
 
     if sucesso:
         logger.info("Item excluído com sucesso", item_id=id_item, fornecedor_id=id_fornecedor)
@@ -539,7 +526,7 @@ async def excluir_item(request: Request, id_item: int, usuario_logado: dict = {}
 async def ativar_item(request: Request, id_item: int, usuario_logado: dict = {}):
     """Ativa um item"""
     id_fornecedor = usuario_logado["id"]
-    sucesso = item_repo.ativar_item(id_item, id_fornecedor)
+    sucesso = await item_repo.ativar_item(id_item, id_fornecedor)
 
     if sucesso:
         logger.info("Item ativado com sucesso", item_id=id_item, fornecedor_id=id_fornecedor)
@@ -557,7 +544,7 @@ async def ativar_item(request: Request, id_item: int, usuario_logado: dict = {})
 async def desativar_item(request: Request, id_item: int, usuario_logado: dict = {}):
     """Desativa um item"""
     id_fornecedor = usuario_logado["id"]
-    sucesso = item_repo.desativar_item(id_item, id_fornecedor)
+    sucesso = await item_repo.desativar_item(id_item, id_fornecedor)
 
     if sucesso:
         logger.info("Item desativado com sucesso", item_id=id_item, fornecedor_id=id_fornecedor)
@@ -586,38 +573,39 @@ async def listar_orcamentos(request: Request, usuario_logado: dict = {}):
     valor_max = request.query_params.get("valor_max", "").strip()
 
     # Buscar orçamentos do fornecedor
-    orcamentos = orcamento_repo.obter_por_fornecedor_prestador(id_fornecedor)
+    orcamentos = await orcamento_repo.obter_por_fornecedor_prestador(id_fornecedor)
 
     # Filtrar por status se especificado
     if status_filter:
         orcamentos = [o for o in orcamentos if str(o.status).upper() == status_filter.upper()]
 
+    # Carregar demandas, casais, noivos e contagem de itens em lote (evita N+1)
+    demandas = await demanda_repo.obter_muitos_por_ids(o.id_demanda for o in orcamentos)
+    casais = await casal_repo.obter_muitos_por_ids(d.id_casal for d in demandas.values())
+    noivos = await usuario_repo.obter_muitos_por_ids(
+        id_noivo for c in casais.values() for id_noivo in (c.id_noivo1, c.id_noivo2)
+    )
+    itens_por_orcamento = await item_orcamento_repo.contar_por_orcamentos([o.id for o in orcamentos])
+
     # Enriquecer dados dos orçamentos
     orcamentos_enriched = []
     for orcamento in orcamentos:
         try:
-            # Buscar dados da demanda
-            demanda = demanda_repo.obter_por_id(orcamento.id_demanda)
+            demanda = demandas.get(orcamento.id_demanda)
 
-            # Buscar dados do casal e noivos
+            # Nomes dos noivos
             noivos_nomes = "Casal não identificado"
-            if demanda:
-                try:
-                    casal = casal_repo.obter_por_id(demanda.id_casal)
-                    if casal:
-                        noivo1 = usuario_repo.obter_por_id(casal.id_noivo1)
-                        noivo2 = usuario_repo.obter_por_id(casal.id_noivo2) if casal.id_noivo2 else None
-
-                        if noivo1 and noivo2:
-                            noivos_nomes = f"{noivo1.nome} & {noivo2.nome}"
-                        elif noivo1:
-                            noivos_nomes = noivo1.nome
-                except Exception as e_noivos:
-                    logger.warning("Erro ao buscar noivos", erro=e_noivos, demanda_id=demanda.id)
-
-            # Buscar itens do orçamento para contar
-            itens = item_orcamento_repo.obter_por_orcamento(orcamento.id)
-            orcamento.itens_count = len(itens)
+            casal = casais.get(demanda.id_casal) if demanda else None
+            if casal:
+                noivo1 = noivos.get(casal.id_noivo1)
+                noivo2 = noivos.get(casal.id_noivo2) if casal.id_noivo2 else None
+
+                if noivo1 and noivo2:
+                    noivos_nomes = f"{noivo1.nome} & {noivo2.nome}"
+                elif noivo1:
+                    noivos_nomes = noivo1.nome
+
+            orcamento.itens_count = itens_por_orcamento.get(orcamento.id, 0)
 
             # Adicionar data_envio (usar data_hora_cadastro)
             if orcamento.data_hora_cadastro:
@@ -660,14 +648,18 @@ async def listar_orcamentos(request: Request, usuario_logado: dict = {}):
     if search:
         orcamentos_filtrados = [
             o for o in orcamentos_filtrados
-            if search.lower() in o.demanda_titulo.lower() or search.lower() in o.noivos_nomes.lower()
+            if search.lower() in (o.demanda_titulo or "").lower()
+            or search.lower() in (o.noivos_nomes or "").lower()
         ]
 
     # Filtro por valor mínimo
     if valor_min:
         try:
             valor_min_float = float(valor_min)
-            orcamentos_filtrados = [o for o in orcamentos_filtrados if o.valor_total >= valor_min_float]
+            orcamentos_filtrados = [
+                o for o in orcamentos_filtrados
+                if o.valor_total is not None and o.valor_total >= valor_min_float
+            ]
         except ValueError:
             logger.warning("Valor mínimo inválido", valor_min=valor_min)
 
@@ -675,7 +667,10 @@ async def listar_orcamentos(request: Request, usuario_logado: dict = {}):
     if valor_max:
         try:
             valor_max_float = float(valor_max)
-            orcamentos_filtrados = [o for o in orcamentos_filtrados if o.valor_total <= valor_max_float]
+            orcamentos_filtrados = [
+                o for o in orcamentos_filtrados
+                if o.valor_total is not None and o.valor_total <= valor_max_float
+            ]
         except ValueError:
             logger.warning("Valor máximo inválido", valor_max=valor_max)
 
@@ -700,7 +695,7 @@ async def visualizar_orcamento_fornecedor(request: Request, id_orcamento: int, u
     logger.info("Fornecedor visualizando orçamento", fornecedor_id=id_fornecedor, orcamento_id=id_orcamento)
 
     # Buscar orçamento
-    orcamento = orcamento_repo.obter_por_id(id_orcamento)
+    orcamento = await orcamento_repo.obter_por_id(id_orcamento)
     if not orcamento:
         logger.warning("Orçamento não encontrado", orcamento_id=id_orcamento)
         informar_erro(request, "Orçamento não encontrado")
@@ -713,17 +708,17 @@ async def visualizar_orcamento_fornecedor(request: Request, id_orcamento: int, u
         return RedirectResponse("/fornecedor/orcamentos", status_code=status.HTTP_303_SEE_OTHER)
 
     # Buscar demanda relacionada
-    demanda = demanda_repo.obter_por_id(orcamento.id_demanda)
+    demanda = await demanda_repo.obter_por_id(orcamento.id_demanda)
 
     # Buscar noivo (dono da demanda)
     noivo = None
     if demanda:
-        casal = casal_repo.obter_por_id(demanda.id_casal)
+        casal = await casal_repo.obter_por_id(demanda.id_casal)
         if casal:
-            noivo = usuario_repo.obter_por_id(casal.id_noivo1)
+            noivo = await usuario_repo.obter_por_id(casal.id_noivo1)
 
     # Buscar itens do orçamento com detalhes
-    itens_orcamento = item_orcamento_repo.obter_por_orcamento(orcamento.id)
+    itens_orcamento = await item_orcamento_repo.obter_por_orcamento(orcamento.id)
 
     # Enriquecer itens com dados
     itens_enriched = []
@@ -772,14 +767,17 @@ async def visualizar_orcamento_fornecedor(request: Request, id_orcamento: int, u
 @router.get("/fornecedor/demandas")
 @requer_autenticacao([TipoUsuario.FORNECEDOR.value])
 @tratar_erro_rota(template_erro="fornecedor/demandas.html")
-async def listar_demandas(request: Request, categoria: str = "", usuario_logado: dict = {}):
+async def listar_demandas(
+    request: Request, categoria: str = "", cidade: str = "", pagina: int = 1, usuario_logado: dict = {}
+):
     """Lista demandas disponíveis compatíveis com categorias do fornecedor (V2)"""
-    from core.repositories import item_demanda_repo, categoria_repo
+    from core.repositories.assincrono import categoria_repo
 
     id_fornecedor = usuario_logado["id"]
+    cidade = cidade.strip()
 
     # Buscar categorias que o fornecedor oferece itens
-    categorias_fornecedor = item_repo.obter_categorias_do_fornecedor(id_fornecedor)
+    categorias_fornecedor = await item_repo.obter_categorias_do_fornecedor(id_fornecedor)
 
     if not categorias_fornecedor:
         logger.info("Fornecedor sem itens cadastrados", fornecedor_id=id_fornecedor)
@@ -791,90 +789,51 @@ async def listar_demandas(request: Request, categoria: str = "", usuario_logado:
                 "demandas": [],
                 "categorias": [],
                 "categoria_filter": categoria,
+                "cidade_filter": cidade,
                 "mensagem": "Cadastre itens para visualizar demandas compatíveis.",
             },
         )
 
-    # Buscar todas as demandas ativas
-    demandas = demanda_repo.obter_por_status(StatusDemanda.ATIVA.value)
-
-    # Filtrar demandas que têm itens compatíveis (por tipo+categoria)
-    demandas_compativeis = []
-    for demanda in demandas:
-        # Buscar itens da demanda (com descrições livres)
-        itens_demanda = item_demanda_repo.obter_por_demanda(demanda.id)
-
-        # Verificar se algum item da demanda pertence às categorias do fornecedor
-        itens_compativeis = [item for item in itens_demanda if item.get("id_categoria") in categorias_fornecedor]
-
-        if itens_compativeis:
-            demandas_compativeis.append(
-                {"demanda": demanda, "itens_compativeis": itens_compativeis, "total_itens": len(itens_demanda)}
-            )
-
-    # Filtrar por categoria se especificado (agora filtra nos itens, não na demanda)
+    id_categoria = None
     if categoria:
         try:
-            categoria_id = int(categoria)
-            demandas_filtradas = []
-            for d in demandas_compativeis:
-                # Verificar se algum item compatível é da categoria filtrada
-                itens = d.get("itens_compativeis") or []
-                if any(item.get("id_categoria") == categoria_id for item in itens):  # type: ignore[attr-defined]
-                    demandas_filtradas.append(d)
-            demandas_compativeis = demandas_filtradas
+            id_categoria = int(categoria)
         except ValueError:
             logger.warning("Categoria inválida no filtro", categoria=categoria)
 
-    # Enriquecer dados das demandas
-    demandas_enriched = []
-    for dados in demandas_compativeis:
-        demanda = dados["demanda"]  # type: ignore[assignment]
-        try:
-            # Buscar dados do casal e noivo
-            casal = casal_repo.obter_por_id(demanda.id_casal)
-            noivo = None
-            if casal:
-                noivo = usuario_repo.obter_por_id(casal.id_noivo1)
-
-            # Verificar se já existe orçamento deste fornecedor para esta demanda
-            orcamentos_existentes = orcamento_repo.obter_por_demanda(demanda.id)
-            ja_tem_orcamento = any(o.id_fornecedor_prestador == id_fornecedor for o in orcamentos_existentes)
-
-            demanda_data = {
-                "demanda": demanda,
-                "noivo": noivo,
-                "casal": casal,
-                "ja_tem_orcamento": ja_tem_orcamento,
-                "itens_compativeis": dados["itens_compativeis"],
-                "total_itens": dados["total_itens"],
-            }
-            demandas_enriched.append(demanda_data)
-        except Exception as e:
-            logger.warning("Erro ao enriquecer demanda", erro=e, demanda_id=demanda.id)
-            demandas_enriched.append(
-                {
-                    "demanda": demanda,
-                    "noivo": None,
-                    "casal": None,
-                    "ja_tem_orcamento": False,
-                    "itens_compativeis": dados["itens_compativeis"],
-                    "total_itens": dados["total_itens"],
-                }
-            )
+    # Casamento, filtros e paginação são feitos no banco
+    tamanho_pagina = PaginationHelper.PUBLIC_PAGE_SIZE
+    demandas, total_demandas = await demanda_repo.obter_compativeis_com_fornecedor(
+        id_fornecedor,
+        id_categoria=id_categoria,
+        cidade=cidade,
+        pagina=pagina,
+        tamanho_pagina=tamanho_pagina,
+    )
+    page_info = PaginationHelper.paginate(demandas, total_demandas, pagina, tamanho_pagina)
+
+    # Só registra a visita quando todas as demandas novas estão nesta página:
+    # as que ficaram de fora (outra página ou filtro) continuam marcadas como novas
+    novas_exibidas = sum(1 for demanda in demandas if demanda.nova)
+    if novas_exibidas == await demanda_match_repo.contar_novas(id_fornecedor):
+        await demanda_match_repo.registrar_visita(id_fornecedor)
 
     # Buscar categorias para filtro
-    categorias = categoria_repo.buscar_categorias()
+    categorias = await categoria_repo.buscar_categorias()
 
-    logger.info("Demandas listadas V2", fornecedor_id=id_fornecedor, total=len(demandas_enriched))
+    logger.info("Demandas listadas V2", fornecedor_id=id_fornecedor, total=total_demandas)
     return templates.TemplateResponse(
         "fornecedor/demandas.html",
         {
             "request": request,
             "usuario_logado": usuario_logado,
-            "demandas": demandas_enriched,
+            "demandas": page_info.items,
             "categorias": categorias,
             "categoria_filter": categoria,
+            "cidade_filter": cidade,
+            "total_demandas": page_info.total_items,
+            "pagina_atual": page_info.current_page,
+            "total_paginas": page_info.total_pages,
         },
     )
 
@@ -886,38 +845,118 @@ async def listar_demandas(request: Request, categoria: str = "", usuario_logado:
 # que vincula ItemDemanda → Item do catálogo, conforme arquitetura V3.
 
 
+async def _montar_itens_orcamento(
+    id_demanda: int,
+    indices_validos: list[int],
+    id_item_demanda: list[str],
+    id_item: list[str],
+    quantidade: list[str],
+    preco_unitario: list[str],
+    desconto_item: list[str],
+    observacoes_item: list[str],
+) -> tuple[list, list[str]]:
+    """
+    Valida as linhas do formulário de orçamento e monta os ItemOrcamento.
+
+    Itens do catálogo e itens da demanda são carregados uma única vez. Os
+    objetos voltam com id_orcamento=0, a ser preenchido antes da inserção.
+
+    Returns:
+        Itens válidos e mensagens de validação das linhas descartadas
+    """
+    from core.repositories.assincrono import item_demanda_repo
+    from core.models.item_orcamento_model import ItemOrcamento
+
+    itens_demanda = {item["id"]: item for item in await item_demanda_repo.obter_por_demanda(id_demanda)}
+    itens_catalogo = await item_repo.obter_muitos_por_ids(
+        int(id_item[i]) for i in indices_validos if id_item[i].isdigit()
+    )
+
+    itens: list = []
+    erros_validacao: list[str] = []
+    usados: set[tuple[int, int]] = set()
+    for i in indices_validos:
+        try:
+            id_item_demanda_int = int(id_item_demanda[i]) if id_item_demanda[i] else 0
+            id_item_int = int(id_item[i]) if id_item[i] else 0
+            qtd = int(quantidade[i]) if i < len(quantidade) and quantidade[i] else 1
+            preco = float(preco_unitario[i]) if i < len(preco_unitario) and preco_unitario[i] else 0
+            desc_item = float(desconto_item[i]) if i < len(desconto_item) and desconto_item[i] else 0.0
+            obs_item = observacoes_item[i] if i < len(observacoes_item) and observacoes_item[i] else None
+        except (ValueError, TypeError) as e:
+            logger.warning("Linha de orçamento inválida", erro=e, item_index=i)
+            erros_validacao.append(f"Erro ao processar item #{i+1}: {str(e)}")
+            continue
+
+        if id_item_demanda_int == 0 or id_item_int == 0:
+            continue
+
+        # Validar que o item pertence à categoria do item_demanda
+        item_obj = itens_catalogo.get(id_item_int)
+        item_demanda_obj = itens_demanda.get(id_item_demanda_int)
+
+        if not item_obj or not item_demanda_obj:
+            erros_validacao.append(f"Item #{id_item_int} ou ItemDemanda #{id_item_demanda_int} não encontrado")
+            continue
+
+        if item_obj.id_categoria != item_demanda_obj.get("id_categoria"):
+            erros_validacao.append(f"Item '{item_obj.nome}' não pertence à categoria do item solicitado")
+            continue
+
+        # Verificar se item já foi usado para este item_demanda
+        if (id_item_demanda_int, id_item_int) in usados:
+            erros_validacao.append(f"Item '{item_obj.nome}' já foi adicionado para este item da demanda")
+            continue
+        usados.add((id_item_demanda_int, id_item_int))
+
+        itens.append(
+            ItemOrcamento(
+                id=0,  # Será gerado automaticamente
+                id_orcamento=0,  # Preenchido antes da inserção
+                id_item_demanda=id_item_demanda_int,
+                id_item=id_item_int,
+                quantidade=qtd,
+                preco_unitario=preco,
+                observacoes=obs_item,
+                desconto=desc_item,
+            )
+        )
+
+    return itens, erros_validacao
+
+
 @router.get("/fornecedor/demandas/{id_demanda}/orcamento/novo")
 @requer_autenticacao([TipoUsuario.FORNECEDOR.value])
 @tratar_erro_rota(redirect_erro="/fornecedor/demandas")
 async def novo_orcamento_com_itens_form(request: Request, id_demanda: int, usuario_logado: dict = {}):
     """Formulário para criar orçamento detalhado com itens (V2)"""
-    from core.repositories import item_demanda_repo
+    from core.repositories.assincrono import item_demanda_repo
 
     # Buscar a demanda
-    demanda = demanda_repo.obter_por_id(id_demanda)
+    demanda = await demanda_repo.obter_por_id(id_demanda)
     if not demanda:
         logger.warning("Demanda não encontrada ao criar orçamento", demanda_id=id_demanda)
         informar_erro(request, "Demanda não encontrada")
         return RedirectResponse("/fornecedor/demandas", status_code=status.HTTP_303_SEE_OTHER)
 
     # Buscar itens da demanda
-    itens_demanda_todos = item_demanda_repo.obter_por_demanda(id_demanda)
+    itens_demanda_todos = await item_demanda_repo.obter_por_demanda(id_demanda)
 
     # Buscar categorias do fornecedor
-    categorias_fornecedor = item_repo.obter_categorias_do_fornecedor(usuario_logado["id"])
+    categorias_fornecedor = await item_repo.obter_categorias_do_fornecedor(usuario_logado["id"])
 
     # Filtrar apenas itens_demanda compatíveis com as categorias do fornecedor
     itens_demanda = [item for item in itens_demanda_todos if item.get("id_categoria") in categorias_fornecedor]
 
     # Buscar itens do fornecedor (apenas ativos)
-    meus_itens = item_repo.obter_itens_por_fornecedor(usuario_logado["id"])
+    meus_itens = await item_repo.obter_itens_por_fornecedor(usuario_logado["id"])
     meus_itens = [i for i in meus_itens if i.ativo]
 
     # Buscar casal e noivo
-    casal = casal_repo.obter_por_id(demanda.id_casal)
+    casal = await casal_repo.obter_por_id(demanda.id_casal)
     noivo = None
     if casal:
-        noivo = usuario_repo.obter_por_id(casal.id_noivo1)
+        noivo = await usuario_repo.obter_por_id(casal.id_noivo1)
 
     logger.info(
         "Formulário de orçamento V2 carregado",
@@ -958,8 +997,7 @@ async def criar_orcamento_com_itens(
     """Cria orçamento com itens detalhados (V2 - vinculado a item_demanda)"""
     from datetime import datetime
     from core.models.orcamento_model import Orcamento
-    from core.repositories import item_orcamento_repo, item_demanda_repo
-    from core.models.item_orcamento_model import ItemOrcamento
+    from core.repositories.assincrono import item_orcamento_repo
 
     # Log de debug para verificar dados recebidos (IMPORTANTE)
     logger.warning(
@@ -977,14 +1015,14 @@ async def criar_orcamento_com_itens(
     )
 
     # Verificar se a demanda existe
-    demanda = demanda_repo.obter_por_id(id_demanda)
+    demanda = await demanda_repo.obter_por_id(id_demanda)
     if not demanda:
         logger.warning("Demanda não encontrada ao criar orçamento", demanda_id=id_demanda)
         informar_erro(request, "Demanda não encontrada")
         return RedirectResponse("/fornecedor/demandas", status_code=status.HTTP_303_SEE_OTHER)
 
     # Verificar se já existe orçamento
-    orcamentos_existentes = orcamento_repo.obter_por_demanda(id_demanda)
+    orcamentos_existentes = await orcamento_repo.obter_por_demanda(id_demanda)
     ja_tem_orcamento = any(o.id_fornecedor_prestador == usuario_logado["id"] for o in orcamentos_existentes)
 
     if ja_tem_orcamento:
@@ -1054,64 +1092,27 @@ async def criar_orcamento_com_itens(
         valor_total=valor_total,
     )
 
-    # Inserir orçamento no banco
-    id_orcamento = orcamento_repo.inserir(novo_orcamento)
-
-    if id_orcamento:
-        # Inserir itens do orçamento (V2: com id_item_demanda) - apenas itens válidos
-        itens_inseridos = 0
-        erros_validacao = []
+    # Validar e montar os itens antes de gravar qualquer coisa
+    itens_orcamento, erros_validacao = await _montar_itens_orcamento(
+        id_demanda, indices_validos, id_item_demanda, id_item,
+        quantidade, preco_unitario, desconto_item, observacoes_item,
+    )
+    if not itens_orcamento:
+        for erro in erros_validacao:
+            informar_aviso(request, erro)
+        informar_erro(request, "Nenhum item válido foi adicionado ao orçamento")
+        return RedirectResponse(
+            f"/fornecedor/demandas/{id_demanda}/orcamento/novo", status_code=status.HTTP_303_SEE_OTHER
+        )
 
-        for i in indices_validos:
-            try:
-                id_item_demanda_int = int(id_item_demanda[i]) if id_item_demanda[i] else 0
-                id_item_int = int(id_item[i]) if id_item[i] else 0
-                qtd = int(quantidade[i]) if i < len(quantidade) and quantidade[i] else 1
-                preco = float(preco_unitario[i]) if i < len(preco_unitario) and preco_unitario[i] else 0
-                desc_item = float(desconto_item[i]) if i < len(desconto_item) and desconto_item[i] else 0.0
-                obs_item = observacoes_item[i] if i < len(observacoes_item) and observacoes_item[i] else None
-
-                if id_item_demanda_int == 0 or id_item_int == 0:
-                    continue
-
-                # Validar que o item pertence à categoria do item_demanda
-                item_obj = item_repo.obter_por_id(id_item_int)
-                item_demanda_dict = item_demanda_repo.obter_por_demanda(id_demanda)
-                item_demanda_obj = next(
-                    (item for item in item_demanda_dict if item.get("id") == id_item_demanda_int), None
-                )
-
-                if not item_obj or not item_demanda_obj:
-                    erros_validacao.append(f"Item #{id_item_int} ou ItemDemanda #{id_item_demanda_int} não encontrado")
-                    continue
-
-                if item_obj.id_categoria != item_demanda_obj.get("id_categoria"):
-                    erros_validacao.append(f"Item '{item_obj.nome}' não pertence à categoria do item solicitado")
-                    continue
-
-                # Verificar se item já foi usado para este item_demanda
-                if item_orcamento_repo.verificar_item_ja_usado(id_orcamento, id_item_demanda_int, id_item_int):
-                    erros_validacao.append(f"Item '{item_obj.nome}' já foi adicionado para este item da demanda")
-                    continue
-
-                # Criar item_orcamento
-                item_orcamento = ItemOrcamento(
-                    id=0,  # Será gerado automaticamente
-                    id_orcamento=id_orcamento,
-                    id_item_demanda=id_item_demanda_int,
-                    id_item=id_item_int,
-                    quantidade=qtd,
-                    preco_unitario=preco,
-                    observacoes=obs_item,
-                    desconto=desc_item,
-                )
-                item_orcamento_repo.inserir(item_orcamento)
-                itens_inseridos += 1
-
-            except Exception as e:
-                logger.error("Erro ao inserir item do orçamento", erro=e, orcamento_id=id_orcamento, item_index=i)
-                erros_validacao.append(f"Erro ao processar item #{i+1}: {str(e)}")
+    # Orçamento e itens em uma única transação (tudo ou nada)
+    async with bloco_assincrono():
+        id_orcamento = await orcamento_repo.inserir(novo_orcamento)
+        for item_orcamento in itens_orcamento:
+            item_orcamento.id_orcamento = id_orcamento
+        itens_inseridos = len(await item_orcamento_repo.inserir_em_lote(itens_orcamento))
 
+    if id_orcamento:
         if erros_validacao:
             logger.warning("Orçamento criado com avisos", orcamento_id=id_orcamento, erros=erros_validacao)
             for erro in erros_validacao:
@@ -1145,10 +1146,10 @@ async def criar_orcamento_com_itens(
 @tratar_erro_rota(redirect_erro="/fornecedor/orcamentos")
 async def editar_orcamento_form(request: Request, id_orcamento: int, usuario_logado: dict = {}):
     """Formulário para editar orçamento existente (apenas se PENDENTE)"""
-    from core.repositories import item_demanda_repo
+    from core.repositories.assincrono import item_demanda_repo
 
     # Buscar o orçamento
-    orcamento = orcamento_repo.obter_por_id(id_orcamento)
+    orcamento = await orcamento_repo.obter_por_id(id_orcamento)
     if not orcamento:
         logger.warning("Orçamento não encontrado ao editar", orcamento_id=id_orcamento)
         informar_erro(request, "Orçamento não encontrado")
@@ -1176,7 +1177,7 @@ async def editar_orcamento_form(request: Request, id_orcamento: int, usuario_log
         return RedirectResponse(f"/fornecedor/orcamentos/{id_orcamento}", status_code=status.HTTP_303_SEE_OTHER)
 
     # Buscar itens do orçamento
-    itens_orcamento = item_orcamento_repo.obter_por_orcamento(id_orcamento)
+    itens_orcamento = await item_orcamento_repo.obter_por_orcamento(id_orcamento)
 
     # Adicionar id_categoria aos itens (vem como item_id_categoria da query)
     for item in itens_orcamento:
@@ -1184,30 +1185,30 @@ async def editar_orcamento_form(request: Request, id_orcamento: int, usuario_log
             item["id_categoria"] = item["item_id_categoria"]
 
     # Buscar a demanda
-    demanda = demanda_repo.obter_por_id(orcamento.id_demanda)
+    demanda = await demanda_repo.obter_por_id(orcamento.id_demanda)
     if not demanda:
         logger.warning("Demanda não encontrada ao editar orçamento", demanda_id=orcamento.id_demanda)
         informar_erro(request, "Demanda não encontrada")
         return RedirectResponse("/fornecedor/orcamentos", status_code=status.HTTP_303_SEE_OTHER)
 
     # Buscar itens da demanda
-    itens_demanda_todos = item_demanda_repo.obter_por_demanda(orcamento.id_demanda)
+    itens_demanda_todos = await item_demanda_repo.obter_por_demanda(orcamento.id_demanda)
 
     # Buscar categorias do fornecedor
-    categorias_fornecedor = item_repo.obter_categorias_do_fornecedor(usuario_logado["id"])
+    categorias_fornecedor = await item_repo.obter_categorias_do_fornecedor(usuario_logado["id"])
 
     # Filtrar apenas itens_demanda compatíveis com as categorias do fornecedor
     itens_demanda = [item for item in itens_demanda_todos if item.get("id_categoria") in categorias_fornecedor]
 
     # Buscar itens do fornecedor (apenas ativos)
-    meus_itens = item_repo.obter_itens_por_fornecedor(usuario_logado["id"])
+    meus_itens = await item_repo.obter_itens_por_fornecedor(usuario_logado["id"])
     meus_itens = [i for i in meus_itens if i.ativo]
 
     # Buscar casal e noivo
-    casal = casal_repo.obter_por_id(demanda.id_casal)
+    casal = await casal_repo.obter_por_id(demanda.id_casal)
     noivo = None
     if casal:
-        noivo = usuario_repo.obter_por_id(casal.id_noivo1)
+        noivo = await usuario_repo.obter_por_id(casal.id_noivo1)
 
     # Adicionar itens ao objeto orcamento para passar ao template
     orcamento.itens = itens_orcamento
@@ -1249,11 +1250,10 @@ async def atualizar_orcamento_com_itens(
     usuario_logado: dict = {},
 ):
     """Atualiza orçamento existente (apenas se PENDENTE)"""
-    from core.repositories import item_orcamento_repo, item_demanda_repo
-    from core.models.item_orcamento_model import ItemOrcamento
+    from core.repositories.assincrono import item_orcamento_repo
 
     # Buscar o orçamento
-    orcamento = orcamento_repo.obter_por_id(id_orcamento)
+    orcamento = await orcamento_repo.obter_por_id(id_orcamento)
     if not orcamento:
         logger.warning("Orçamento não encontrado ao atualizar", orcamento_id=id_orcamento)
         informar_erro(request, "Orçamento não encontrado")
@@ -1316,60 +1316,21 @@ async def atualizar_orcamento_com_itens(
         except (ValueError, TypeError):
             pass
 
-    # Deletar itens existentes do orçamento
-    item_orcamento_repo.excluir_por_orcamento(id_orcamento)
-
-    # Inserir novos itens (reutilizando lógica do create)
-    itens_inseridos = 0
-    erros_validacao = []
-
-    for i in indices_validos:
-        try:
-            id_item_demanda_int = int(id_item_demanda[i]) if id_item_demanda[i] else 0
-            id_item_int = int(id_item[i]) if id_item[i] else 0
-            qtd = int(quantidade[i]) if i < len(quantidade) and quantidade[i] else 1
-            preco = float(preco_unitario[i]) if i < len(preco_unitario) and preco_unitario[i] else 0
-            desc_item = float(desconto_item[i]) if i < len(desconto_item) and desconto_item[i] else 0.0
-            obs_item = observacoes_item[i] if i < len(observacoes_item) and observacoes_item[i] else None
-
-            if id_item_demanda_int == 0 or id_item_int == 0:
-                continue
-
-            # Validar que o item pertence à categoria do item_demanda
-            item_obj = item_repo.obter_por_id(id_item_int)
-            item_demanda_dict = item_demanda_repo.obter_por_demanda(orcamento.id_demanda)
-            item_demanda_obj = next((item for item in item_demanda_dict if item.get("id") == id_item_demanda_int), None)
-
-            if not item_obj or not item_demanda_obj:
-                erros_validacao.append(f"Item #{id_item_int} ou ItemDemanda #{id_item_demanda_int} não encontrado")
-                continue
-
-            if item_obj.id_categoria != item_demanda_obj.get("id_categoria"):
-                erros_validacao.append(f"Item '{item_obj.nome}' não pertence à categoria do item solicitado")
-                continue
-
-            # Criar item_orcamento
-            item_orcamento = ItemOrcamento(
-                id=0,  # Será gerado automaticamente
-                id_orcamento=id_orcamento,
-                id_item_demanda=id_item_demanda_int,
-                id_item=id_item_int,
-                quantidade=qtd,
-                preco_unitario=preco,
-                observacoes=obs_item,
-                desconto=desc_item,
-            )
-            item_orcamento_repo.inserir(item_orcamento)
-            itens_inseridos += 1
-
-        except Exception as e:
-            logger.error("Erro ao inserir item do orçamento", erro=e, orcamento_id=id_orcamento, item_index=i)
-            erros_validacao.append(f"Erro ao processar item #{i+1}: {str(e)}")
+    # Validar e montar os novos itens (reutilizando lógica do create)
+    itens_orcamento, erros_validacao = await _montar_itens_orcamento(
+        orcamento.id_demanda, indices_validos, id_item_demanda, id_item,
+        quantidade, preco_unitario, desconto_item, observacoes_item,
+    )
+    for item_orcamento in itens_orcamento:
+        item_orcamento.id_orcamento = id_orcamento
 
-    # Atualizar o orçamento
-    orcamento.observacoes = observacoes
-    orcamento.valor_total = valor_total
-    orcamento_repo.atualizar(orcamento)
+    # Substituir itens e atualizar o orçamento em uma única transação
+    async with bloco_assincrono():
+        await item_orcamento_repo.excluir_por_orcamento(id_orcamento)
+        itens_inseridos = len(await item_orcamento_repo.inserir_em_lote(itens_orcamento))
+        orcamento.observacoes = observacoes
+        orcamento.valor_total = valor_total
+        await orcamento_repo.atualizar(orcamento)
 
     if erros_validacao:
         logger.warning("Orçamento atualizado com avisos", orcamento_id=id_orcamento, erros=erros_validacao)
@@ -1401,7 +1362,7 @@ async def atualizar_orcamento_com_itens(
 async def perfil_fornecedor(request: Request, usuario_logado: dict = {}):
     """Página de perfil do fornecedor"""
     id_fornecedor = usuario_logado["id"]
-    fornecedor = fornecedor_repo.obter_por_id(id_fornecedor)
+    fornecedor = await fornecedor_repo.obter_por_id(id_fornecedor)
 
     logger.info("Perfil fornecedor carregado", fornecedor_id=id_fornecedor)
     return templates.TemplateResponse(
@@ -1425,7 +1386,7 @@ async def atualizar_perfil(
 ):
     """Atualiza perfil do fornecedor"""
     id_fornecedor = usuario_logado["id"]
-    fornecedor = fornecedor_repo.obter_por_id(id_fornecedor)
+    fornecedor = await fornecedor_repo.obter_por_id(id_fornecedor)
 
     if not fornecedor:
         logger.error("Fornecedor não encontrado ao atualizar perfil", fornecedor_id=id_fornecedor)
@@ -1446,7 +1407,7 @@ async def atualizar_perfil(
     fornecedor.descricao = descricao
     fornecedor.newsletter = newsletter_bool
 
-    sucesso = fornecedor_repo.atualizar(fornecedor)
+    sucesso = await fornecedor_repo.atualizar(fornecedor)
 
     if sucesso:
         logger.info("Perfil fornecedor atualizado com sucesso", fornecedor_id=id_fornecedor)
@@ -1479,11 +1440,12 @@ async def alterar_foto_item(request: Request, item_id: int, foto: UploadFile = F
     """Processa o upload de foto do item"""
 
     from util.image_processor import ImageProcessor
-    from util.file_storage import FileStorageManager, TipoArquivo
-    from config.constants import ImageConstants
+    from util.file_storage import TipoArquivo
+    from util.exceptions import SobrecargaError
+    from util.error_handlers import resposta_sobrecarga
 
     # Verificar se o item pertence ao fornecedor logado
-    item = item_repo.obter_por_id(item_id)
+    item = await item_repo.obter_por_id(item_id)
     if not item or item.id_fornecedor != usuario_logado["id"]:
         logger.warning(
             "Tentativa de alterar foto de item não autorizado", item_id=item_id, fornecedor_id=usuario_logado["id"]
@@ -1491,16 +1453,15 @@ async def alterar_foto_item(request: Request, item_id: int, foto: UploadFile = F
         informar_erro(request, "Item não encontrado ou não autorizado")
         return RedirectResponse("/fornecedor/itens", status_code=status.HTTP_303_SEE_OTHER)
 
-    # Criar diretório se não existir
-    FileStorageManager.criar_diretorio(TipoArquivo.ITEM)
+    # Devolver a conexão ao pool durante o processamento da imagem
+    await liberar_conexao()
 
-    # Obter caminho físico para salvar
-    caminho_arquivo = FileStorageManager.obter_caminho(TipoArquivo.ITEM, item_id, fisico=True)
-
-    # Processar e salvar usando ImageProcessor
-    sucesso, erro = await ImageProcessor.processar_e_salvar_imagem(
-        foto, caminho_arquivo, tamanho=ImageConstants.Sizes.ITEM.value  # (600, 600)
-    )
+    # Processar e salvar todas as variantes (tamanhos e formatos) da foto
+    try:
+        sucesso, erro = await ImageProcessor.processar_e_salvar_variantes(foto, TipoArquivo.ITEM, item_id)
+    except SobrecargaError as e:
+        logger.warning("Upload de foto recusado, fila de imagens cheia", item_id=item_id)
+        return resposta_sobrecarga(e)
 
     if sucesso:
         logger.info("Foto do item alterada com sucesso", item_id=item_id, fornecedor_id=usuario_logado["id"])
@@ -1519,7 +1480,7 @@ async def remover_foto_item(request: Request, item_id: int, usuario_logado: dict
     """Remove a foto do item"""
 
     # Verificar se o item pertence ao fornecedor logado
-    item = item_repo.obter_por_id(item_id)
+    item = await item_repo.obter_por_id(item_id)
     if not item or item.id_fornecedor != usuario_logado["id"]:
         logger.warning(
             "Tentativa de remover foto de item não autorizado", item_id=item_id, fornecedor_id=usuario_logado["id"]
@@ -2,9 +2,10 @@ from fastapi import APIRouter, Request, Form, status
 from fastapi.responses import RedirectResponse
 from fastapi.templating import Jinja2Templates
 from infrastructure.security import requer_autenticacao
+from infrastructure.database import bloco_assincrono
 from core.models.usuario_model import TipoUsuario
 from core.models.demanda_model import Demanda
-from core.repositories import (
+from core.repositories.assincrono import (
     usuario_repo,
     demanda_repo,
     orcamento_repo,
@@ -56,11 +57,11 @@ async def dashboard_noivo(request: Request, usuario_logado: dict = {}):
     logger.info("Carregando dashboard do noivo", noivo_id=id_noivo)
 
     # Buscar dados do noivo
-    noivo = usuario_repo.obter_por_id(id_noivo)
+    noivo = await usuario_repo.obter_por_id(id_noivo)
 
     # Buscar dados do casal
     try:
-        casal = casal_repo.obter_por_noivo(id_noivo)
+        casal = await casal_repo.obter_por_noivo(id_noivo)
     except Exception as e:
         logger.warning("Casal não encontrado para noivo", noivo_id=id_noivo, erro=e)
         casal = None
@@ -68,14 +69,9 @@ async def dashboard_noivo(request: Request, usuario_logado: dict = {}):
     # Buscar demandas do casal
     try:
         if casal:
-            demandas_casal = demanda_repo.obter_por_casal(casal.id)
+            demandas_casal = await demanda_repo.obter_por_casal_com_contadores(casal.id)
             demandas_ativas = [d for d in demandas_casal if d.status.value == "ATIVA"]
-
-            # Enriquecer demandas recentes com contagem de orçamentos
-            demandas_recentes = []
-            for demanda in demandas_casal[:5]:
-                demanda.orcamentos_count = orcamento_repo.contar_por_demanda(demanda.id)  # type: ignore[attr-defined]
-                demandas_recentes.append(demanda)
+            demandas_recentes = demandas_casal[:5]
         else:
             demandas_casal = []
             demandas_ativas = []
@@ -92,7 +88,7 @@ async def dashboard_noivo(request: Request, usuario_logado: dict = {}):
 
     # Buscar orçamentos do noivo
     try:
-        orcamentos_recebidos = orcamento_repo.obter_por_noivo(id_noivo)
+        orcamentos_recebidos = await orcamento_repo.obter_por_noivo(id_noivo)
         orcamentos_pendentes = [
             o for o in orcamentos_recebidos if o.status == "PENDENTE"
         ]
@@ -141,7 +137,7 @@ async def listar_demandas(
     )
 
     # Buscar casal do noivo
-    casal = casal_repo.obter_por_noivo(id_noivo)
+    casal = await casal_repo.obter_por_noivo(id_noivo)
     if not casal:
         logger.warning("Casal não encontrado para noivo", noivo_id=id_noivo)
         return templates.TemplateResponse(
@@ -153,8 +149,8 @@ async def listar_demandas(
             },
         )
 
-    # Buscar demandas do casal
-    demandas = demanda_repo.obter_por_casal(casal.id)
+    # Buscar demandas do casal, já com os contadores de itens e orçamentos
+    demandas = await demanda_repo.obter_por_casal_com_contadores(casal.id)
 
     # Aplicar filtros
     if status:
@@ -167,66 +163,12 @@ async def listar_demandas(
             if search.lower() in d.descricao.lower()
         ]
 
-    # Enriquecer demandas com contagens de itens e orçamentos
-    from core.repositories import item_demanda_repo
-    demandas_com_contagens = []
-    for demanda in demandas:
-        try:
-            # Adicionar atributos de contagem ao objeto demanda
-            total_itens = item_demanda_repo.contar_por_demanda(demanda.id)
-            demanda.itens_count = total_itens  # type: ignore[attr-defined]
-            demanda.orcamentos_count = orcamento_repo.contar_por_demanda(demanda.id)  # type: ignore[attr-defined]
-            demanda.orcamentos_pendentes = orcamento_repo.contar_por_demanda_e_status(  # type: ignore[attr-defined]
-                demanda.id, "PENDENTE"
-            )
-
-            # Calcular quantos itens foram atendidos (têm item_orcamento aceito)
-            itens_demanda = item_demanda_repo.obter_por_demanda(demanda.id)
-            itens_atendidos = 0
-            for item_demanda in itens_demanda:
-                try:
-                    # Verificar se este item_demanda tem algum item_orcamento ACEITO
-                    item_demanda_id = item_demanda.get("id")
-                    if item_demanda_id and item_orcamento_repo.verificar_item_demanda_ja_aceito(item_demanda_id):
-                        itens_atendidos += 1
-                except Exception as e:
-                    logger.warning(
-                        "Erro ao verificar item_demanda aceito",
-                        demanda_id=demanda.id,
-                        item_demanda_id=item_demanda.get("id"),
-                        erro=e
-                    )
-                    continue
-
-            demanda.itens_atendidos = itens_atendidos  # type: ignore[attr-defined]
-
-            # Calcular percentual de atendimento
-            if total_itens > 0:
-                demanda.percentual_atendimento = int((itens_atendidos / total_itens) * 100)  # type: ignore[attr-defined]
-            else:
-                demanda.percentual_atendimento = 0  # type: ignore[attr-defined]
-
-        except Exception as e:
-            logger.error(
-                "Erro ao enriquecer demanda com dados de atendimento",
-                demanda_id=demanda.id,
-                erro=e
-            )
-            # Garantir que os atributos existam mesmo em caso de erro
-            demanda.itens_count = 0  # type: ignore[attr-defined]
-            demanda.orcamentos_count = 0  # type: ignore[attr-defined]
-            demanda.orcamentos_pendentes = 0  # type: ignore[attr-defined]
-            demanda.itens_atendidos = 0  # type: ignore[attr-defined]
-            demanda.percentual_atendimento = 0  # type: ignore[attr-defined]
-
-        demandas_com_contagens.append(demanda)
-
     return templates.TemplateResponse(
         "noivo/demandas.html",
         {
             "request": request,
             "usuario_logado": usuario_logado,
-            "demandas": demandas_com_contagens,
+            "demandas": demandas,
         },
     )
 
@@ -235,16 +177,16 @@ async def listar_demandas(
 @requer_autenticacao([TipoUsuario.NOIVO.value])
 async def nova_demanda_form(request: Request, usuario_logado: dict = {}):
     """Formulário para criar nova demanda"""
-    from core.repositories import categoria_repo
+    from core.repositories.assincrono import categoria_repo
     from core.models.tipo_fornecimento_model import TipoFornecimento
 
     id_noivo = usuario_logado["id"]
 
     # Buscar casal do noivo
-    casal = casal_repo.obter_por_noivo(id_noivo)
+    casal = await casal_repo.obter_por_noivo(id_noivo)
 
     # Buscar categorias ativas agrupadas por tipo
-    categorias = categoria_repo.buscar_categorias()
+    categorias = await categoria_repo.buscar_categorias()
     # Usar chaves SEM acento para compatibilidade com JavaScript normalize()
     categorias_por_tipo = {
         "PRODUTO": [{"id": c.id, "nome": c.nome} for c in categorias if c.ativo and c.tipo_fornecimento == TipoFornecimento.PRODUTO],
@@ -264,6 +206,52 @@ async def nova_demanda_form(request: Request, usuario_logado: dict = {}):
     )
 
 
+def _montar_itens_demanda(
+    tipo: list,
+    id_categoria: list,
+    descricao_item: list,
+    quantidade: list,
+    preco_maximo: list,
+    observacoes_item: list,
+) -> list:
+    """
+    Converte as linhas do formulário de demanda em objetos ItemDemanda.
+
+    Linhas incompletas ou com valores inválidos são descartadas. Os objetos
+    voltam com id_demanda=0, a ser preenchido antes da inserção.
+    """
+    from core.models.item_demanda_model import ItemDemanda
+
+    itens = []
+    for i in range(len(tipo)):
+        try:
+            # Validar e converter valores
+            tipo_valor = tipo[i] if i < len(tipo) else None
+            id_cat = int(id_categoria[i]) if i < len(id_categoria) and id_categoria[i] else None
+            desc_item = descricao_item[i] if i < len(descricao_item) else None
+            qtd = int(quantidade[i]) if i < len(quantidade) and quantidade[i] else 1
+            preco_max = float(preco_maximo[i]) if i < len(preco_maximo) and preco_maximo[i] else None
+            obs_item = observacoes_item[i] if i < len(observacoes_item) and observacoes_item[i] else None
+        except (ValueError, TypeError) as e:
+            logger.warning("Item de demanda inválido", erro=e, item_index=i)
+            continue
+
+        if tipo_valor and id_cat and desc_item:
+            itens.append(
+                ItemDemanda(
+                    id=0,  # Será definido pelo banco
+                    id_demanda=0,  # Preenchido antes da inserção
+                    tipo=tipo_valor,
+                    id_categoria=id_cat,
+                    descricao=desc_item,
+                    quantidade=qtd,
+                    preco_maximo=preco_max,
+                    observacoes=obs_item
+                )
+            )
+    return itens
+
+
 @router.post("/noivo/demandas/nova")
 @requer_autenticacao([TipoUsuario.NOIVO.value])
 @tratar_erro_rota(template_erro="noivo/demanda_form.html")
@@ -284,14 +272,13 @@ async def criar_demanda(
     usuario_logado: dict = {},
 ):
     """Cria uma nova demanda com itens (descrições livres)"""
-    from core.repositories import item_demanda_repo
-    from core.models.item_demanda_model import ItemDemanda
+    from core.repositories.assincrono import item_demanda_repo
 
     id_noivo = usuario_logado["id"]
     logger.info("Criando nova demanda", noivo_id=id_noivo, total_itens=len(tipo))
 
     # Buscar casal do noivo
-    casal = casal_repo.obter_por_noivo(id_noivo)
+    casal = await casal_repo.obter_por_noivo(id_noivo)
     if not casal:
         logger.warning("Casal não encontrado ao criar demanda", noivo_id=id_noivo)
         informar_erro(request, "Casal não encontrado. Cadastre um casal antes de criar demandas.")
@@ -323,37 +310,18 @@ async def criar_demanda(
         observacoes=observacoes if observacoes else None,
     )
 
-    # Inserir demanda no banco
-    id_demanda = demanda_repo.inserir(nova_demanda)
+    itens_demanda = _montar_itens_demanda(
+        tipo, id_categoria, descricao_item, quantidade, preco_maximo, observacoes_item
+    )
+
+    # Inserir demanda e itens em uma única transação (tudo ou nada)
+    async with bloco_assincrono():
+        id_demanda = await demanda_repo.inserir(nova_demanda)
+        for item_demanda in itens_demanda:
+            item_demanda.id_demanda = id_demanda
+        itens_inseridos = len(await item_demanda_repo.inserir_em_lote(itens_demanda))
 
     if id_demanda:
-        # Inserir itens da demanda (descrições livres)
-        itens_inseridos = 0
-        for i in range(len(tipo)):
-            try:
-                # Validar e converter valores
-                tipo_valor = tipo[i] if i < len(tipo) else None
-                id_cat = int(id_categoria[i]) if i < len(id_categoria) and id_categoria[i] else None
-                desc_item = descricao_item[i] if i < len(descricao_item) else None
-                qtd = int(quantidade[i]) if i < len(quantidade) and quantidade[i] else 1
-                preco_max = float(preco_maximo[i]) if i < len(preco_maximo) and preco_maximo[i] else None
-                obs_item = observacoes_item[i] if i < len(observacoes_item) and observacoes_item[i] else None
-
-                if tipo_valor and id_cat and desc_item:
-                    item_demanda = ItemDemanda(
-                        id=0,  # Será definido pelo banco
-                        id_demanda=id_demanda,
-                        tipo=tipo_valor,
-                        id_categoria=id_cat,
-                        descricao=desc_item,
-                        quantidade=qtd,
-                        preco_maximo=preco_max,
-                        observacoes=obs_item
-                    )
-                    item_demanda_repo.inserir(item_demanda)
-                    itens_inseridos += 1
-            except Exception as e:
-                logger.error("Erro ao inserir item da demanda", erro=e, demanda_id=id_demanda, item_index=i)
         logger.info(
             "Demanda criada com sucesso",
             demanda_id=id_demanda,
@@ -379,20 +347,20 @@ async def visualizar_demanda(
     request: Request, id_demanda: int, usuario_logado: dict = {}
 ):
     """Visualiza detalhes de uma demanda com seus itens"""
-    from core.repositories import item_demanda_repo, orcamento_repo
+    from core.repositories.assincrono import item_demanda_repo, orcamento_repo
 
     id_noivo = usuario_logado["id"]
     logger.info("Visualizando demanda", noivo_id=id_noivo, demanda_id=id_demanda)
 
     # Buscar demanda
-    demanda = demanda_repo.obter_por_id(id_demanda)
+    demanda = await demanda_repo.obter_por_id(id_demanda)
     if not demanda:
         logger.warning("Demanda não encontrada", demanda_id=id_demanda)
         informar_erro(request, "Demanda não encontrada")
         return RedirectResponse("/noivo/demandas", status_code=status.HTTP_303_SEE_OTHER)
 
     # Buscar casal do noivo
-    casal = casal_repo.obter_por_noivo(id_noivo)
+    casal = await casal_repo.obter_por_noivo(id_noivo)
 
     # Verificar se a demanda pertence ao casal do noivo
     if not casal or demanda.id_casal != casal.id:
@@ -407,16 +375,16 @@ async def visualizar_demanda(
         return RedirectResponse("/noivo/demandas", status_code=status.HTTP_303_SEE_OTHER)
 
     # Buscar itens da demanda
-    itens_demanda = item_demanda_repo.obter_por_demanda(id_demanda)
+    itens_demanda = await item_demanda_repo.obter_por_demanda(id_demanda)
 
     # Enriquecer itens com informações de orçamentos
     itens_enriched = []
     for item in itens_demanda:
         # Contar quantos item_orcamento existem para este item_demanda
-        total_orcamentos = item_orcamento_repo.contar_por_item_demanda(item["id"])
+        total_orcamentos = await item_orcamento_repo.contar_por_item_demanda(item["id"])
 
         # Verificar se o item está atendido (tem item_orcamento aceito)
-        esta_atendido = item_orcamento_repo.verificar_item_demanda_ja_aceito(item["id"])
+        esta_atendido = await item_orcamento_repo.verificar_item_demanda_ja_aceito(item["id"])
 
         item_dict = dict(item)
         item_dict["total_orcamentos"] = total_orcamentos
@@ -424,7 +392,7 @@ async def visualizar_demanda(
         itens_enriched.append(item_dict)
 
     # Buscar orçamentos da demanda
-    orcamentos = orcamento_repo.obter_por_demanda(id_demanda)
+    orcamentos = await orcamento_repo.obter_por_demanda(id_demanda)
 
     return templates.TemplateResponse(
         "noivo/demanda_detalhes.html",
@@ -445,20 +413,20 @@ async def excluir_demanda(
     request: Request, id_demanda: int, usuario_logado: dict = {}
 ):
     """Exclui uma demanda e seus itens e orçamentos relacionados"""
-    from core.repositories import item_demanda_repo, orcamento_repo, item_orcamento_repo
+    from core.repositories.assincrono import item_demanda_repo, orcamento_repo, item_orcamento_repo
 
     id_noivo = usuario_logado["id"]
     logger.info("Excluindo demanda", noivo_id=id_noivo, demanda_id=id_demanda)
 
     # Buscar demanda
-    demanda = demanda_repo.obter_por_id(id_demanda)
+    demanda = await demanda_repo.obter_por_id(id_demanda)
     if not demanda:
         logger.warning("Demanda não encontrada para exclusão", demanda_id=id_demanda)
         informar_erro(request, "Demanda não encontrada")
         return RedirectResponse("/noivo/demandas", status_code=status.HTTP_303_SEE_OTHER)
 
     # Buscar casal do noivo
-    casal = casal_repo.obter_por_noivo(id_noivo)
+    casal = await casal_repo.obter_por_noivo(id_noivo)
 
     # Verificar se a demanda pertence ao casal do noivo
     if not casal or demanda.id_casal != casal.id:
@@ -471,23 +439,23 @@ async def excluir_demanda(
         return RedirectResponse("/noivo/demandas", status_code=status.HTTP_303_SEE_OTHER)
 
     # Buscar orçamentos da demanda para excluir seus itens
-    orcamentos = orcamento_repo.obter_por_demanda(id_demanda)
+    orcamentos = await orcamento_repo.obter_por_demanda(id_demanda)
 
     # Excluir itens de cada orçamento
     for orcamento in orcamentos:
-        item_orcamento_repo.excluir_por_orcamento(orcamento.id)
+        await item_orcamento_repo.excluir_por_orcamento(orcamento.id)
 
     # Excluir orçamentos
     for orcamento in orcamentos:
-        orcamento_repo.excluir(orcamento.id)
+        await orcamento_repo.excluir(orcamento.id)
 
     # Buscar e excluir itens da demanda
-    itens = item_demanda_repo.obter_por_demanda(id_demanda)
+    itens = await item_demanda_repo.obter_por_demanda(id_demanda)
     for item in itens:
-        item_demanda_repo.excluir(item['id'])
+        await item_demanda_repo.excluir(item['id'])
 
     # Excluir a demanda
-    demanda_repo.excluir(id_demanda)
+    await demanda_repo.excluir(id_demanda)
 
     logger.info(
         "Demanda excluída com sucesso",
@@ -507,20 +475,20 @@ async def editar_demanda_form(
     request: Request, id_demanda: int, usuario_logado: dict = {}
 ):
     """Formulário para editar demanda"""
-    from core.repositories import item_demanda_repo, categoria_repo
+    from core.repositories.assincrono import item_demanda_repo, categoria_repo
 
     id_noivo = usuario_logado["id"]
     logger.info("Editando demanda", noivo_id=id_noivo, demanda_id=id_demanda)
 
     # Buscar demanda
-    demanda = demanda_repo.obter_por_id(id_demanda)
+    demanda = await demanda_repo.obter_por_id(id_demanda)
     if not demanda:
         logger.warning("Demanda não encontrada para edição", demanda_id=id_demanda)
         informar_erro(request, "Demanda não encontrada")
         return RedirectResponse("/noivo/demandas", status_code=status.HTTP_303_SEE_OTHER)
 
     # Buscar casal do noivo
-    casal = casal_repo.obter_por_noivo(id_noivo)
+    casal = await casal_repo.obter_por_noivo(id_noivo)
 
     # Verificar se a demanda pertence ao casal do noivo
     if not casal or demanda.id_casal != casal.id:
@@ -543,11 +511,11 @@ async def editar_demanda_form(
         return RedirectResponse("/noivo/demandas", status_code=status.HTTP_303_SEE_OTHER)
 
     # Buscar itens da demanda
-    itens_demanda = item_demanda_repo.obter_por_demanda(id_demanda)
+    itens_demanda = await item_demanda_repo.obter_por_demanda(id_demanda)
 
     # Buscar categorias agrupadas por tipo
     from core.models.tipo_fornecimento_model import TipoFornecimento
-    categorias = categoria_repo.buscar_categorias()
+    categorias = await categoria_repo.buscar_categorias()
     # Usar chaves SEM acento para compatibilidade com JavaScript normalize()
     categorias_por_tipo = {
         "PRODUTO": [{"id": c.id, "nome": c.nome} for c in categorias if c.ativo and c.tipo_fornecimento == TipoFornecimento.PRODUTO],
@@ -590,21 +558,20 @@ async def atualizar_demanda(
     usuario_logado: dict = {},
 ):
     """Atualiza uma demanda existente com itens (descrições livres)"""
-    from core.repositories import item_demanda_repo
-    from core.models.item_demanda_model import ItemDemanda
+    from core.repositories.assincrono import item_demanda_repo
 
     id_noivo = usuario_logado["id"]
     logger.info("Atualizando demanda", noivo_id=id_noivo, demanda_id=id_demanda)
 
     # Buscar demanda
-    demanda = demanda_repo.obter_por_id(id_demanda)
+    demanda = await demanda_repo.obter_por_id(id_demanda)
     if not demanda:
         logger.warning("Demanda não encontrada para atualização", demanda_id=id_demanda)
         informar_erro(request, "Demanda não encontrada")
         return RedirectResponse("/noivo/demandas", status_code=status.HTTP_303_SEE_OTHER)
 
     # Buscar casal do noivo
-    casal = casal_repo.obter_por_noivo(id_noivo)
+    casal = await casal_repo.obter_por_noivo(id_noivo)
 
     # Verificar permissão
     if not casal or demanda.id_casal != casal.id:
@@ -634,40 +601,20 @@ async def atualizar_demanda(
     demanda.prazo_entrega = prazo_entrega if prazo_entrega else None
     demanda.observacoes = observacoes if observacoes else None
 
-    # Atualizar demanda no banco
-    sucesso = demanda_repo.atualizar(demanda)
+    itens_demanda = _montar_itens_demanda(
+        tipo, id_categoria, descricao_item, quantidade, preco_maximo, observacoes_item
+    )
+    for item_demanda in itens_demanda:
+        item_demanda.id_demanda = id_demanda
 
-    if sucesso:
-        # Excluir itens antigos
-        item_demanda_repo.excluir_por_demanda(id_demanda)
-
-        # Inserir novos itens (descrições livres)
-        itens_inseridos = 0
-        for i in range(len(tipo)):
-            try:
-                tipo_valor = tipo[i] if i < len(tipo) else None
-                id_cat = int(id_categoria[i]) if i < len(id_categoria) and id_categoria[i] else None
-                desc_item = descricao_item[i] if i < len(descricao_item) else None
-                qtd = int(quantidade[i]) if i < len(quantidade) and quantidade[i] else 1
-                preco_max = float(preco_maximo[i]) if i < len(preco_maximo) and preco_maximo[i] else None
-                obs_item = observacoes_item[i] if i < len(observacoes_item) and observacoes_item[i] else None
-
-                if tipo_valor and id_cat and desc_item:
-                    item_demanda = ItemDemanda(
-                        id=0,  # Será definido pelo banco
-                        id_demanda=id_demanda,
-                        tipo=tipo_valor,
-                        id_categoria=id_cat,
-                        descricao=desc_item,
-                        quantidade=qtd,
-                        preco_maximo=preco_max,
-                        observacoes=obs_item
-                    )
-                    item_demanda_repo.inserir(item_demanda)
-                    itens_inseridos += 1
-            except Exception as e:
-                logger.error("Erro ao inserir item da demanda", erro=e, demanda_id=id_demanda, item_index=i)
+    # Atualizar demanda e substituir itens em uma única transação (tudo ou nada)
+    async with bloco_assincrono():
+        sucesso = await demanda_repo.atualizar(demanda)
+        if sucesso:
+            await item_demanda_repo.excluir_por_demanda(id_demanda)
+            itens_inseridos = len(await item_demanda_repo.inserir_em_lote(itens_demanda))
 
+    if sucesso:
         logger.info(
             "Demanda atualizada com sucesso",
             demanda_id=id_demanda,
@@ -706,7 +653,7 @@ async def listar_orcamentos(
     )
 
     # Buscar orçamentos do noivo
-    orcamentos = orcamento_repo.obter_por_noivo(id_noivo)
+    orcamentos = await orcamento_repo.obter_por_noivo(id_noivo)
 
     # Aplicar filtros
     if status:
@@ -715,40 +662,36 @@ async def listar_orcamentos(
     if demanda:
         orcamentos = [o for o in orcamentos if str(o.id_demanda) == demanda]
 
+    # Carregar fornecedores em lote (usados no filtro e no enriquecimento)
+    fornecedores = await fornecedor_repo.obter_muitos_por_ids(
+        o.id_fornecedor_prestador for o in orcamentos
+    )
+
     if search:
-        # Buscar por nome do fornecedor (precisamos buscar os dados do fornecedor)
-        orcamentos_filtrados = []
-        for orcamento in orcamentos:
-            try:
-                fornecedor = fornecedor_repo.obter_por_id(orcamento.id_fornecedor_prestador)
-                if fornecedor and search.lower() in fornecedor.nome.lower():
-                    orcamentos_filtrados.append(orcamento)
-            except Exception as e:
-                logger.warning(
-                    "Erro ao buscar fornecedor para filtro",
-                    orcamento_id=orcamento.id,
-                    fornecedor_id=orcamento.id_fornecedor_prestador,
-                    erro=e,
-                )
-                continue
-        orcamentos = orcamentos_filtrados
+        # Buscar por nome do fornecedor
+        orcamentos = [
+            o
+            for o in orcamentos
+            if o.id_fornecedor_prestador in fornecedores
+            and search.lower() in fornecedores[o.id_fornecedor_prestador].nome.lower()
+        ]
 
     # Buscar casal do noivo
-    casal = casal_repo.obter_por_noivo(id_noivo)
+    casal = await casal_repo.obter_por_noivo(id_noivo)
 
     # Buscar demandas do casal para o filtro
-    minhas_demandas = demanda_repo.obter_por_casal(casal.id) if casal else []
+    minhas_demandas = await demanda_repo.obter_por_casal(casal.id) if casal else []
+
+    # Carregar demandas e contagem de itens em lote (evita N+1)
+    demandas = await demanda_repo.obter_muitos_por_ids(o.id_demanda for o in orcamentos)
+    itens_por_orcamento = await item_orcamento_repo.contar_por_orcamentos([o.id for o in orcamentos])
 
     # Enriquecer orçamentos com dados adicionais
     orcamentos_enriched = []
     for orcamento in orcamentos:
         try:
-            # Buscar dados da demanda
-            demanda_data = demanda_repo.obter_por_id(orcamento.id_demanda)
-            # Buscar dados do fornecedor
-            fornecedor_data = fornecedor_repo.obter_por_id(orcamento.id_fornecedor_prestador)
-            # Buscar itens do orçamento
-            itens_orcamento = item_orcamento_repo.obter_por_orcamento(orcamento.id)
+            demanda_data = demandas.get(orcamento.id_demanda)
+            fornecedor_data = fornecedores.get(orcamento.id_fornecedor_prestador)
 
             orcamento_dict = {
                 "id": orcamento.id,
@@ -767,7 +710,7 @@ async def listar_orcamentos(
                     if fornecedor_data
                     else "Fornecedor não encontrado"
                 ),
-                "itens_count": len(itens_orcamento),
+                "itens_count": itens_por_orcamento.get(orcamento.id, 0),
             }
             orcamentos_enriched.append(orcamento_dict)
         except Exception as e:
@@ -799,7 +742,7 @@ async def visualizar_orcamento(
     logger.info("Visualizando orçamento", noivo_id=id_noivo, orcamento_id=id_orcamento)
 
     # Buscar orçamento
-    orcamento = orcamento_repo.obter_por_id(id_orcamento)
+    orcamento = await orcamento_repo.obter_por_id(id_orcamento)
     if not orcamento:
         logger.warning("Orçamento não encontrado", orcamento_id=id_orcamento)
         return RedirectResponse(
@@ -807,10 +750,10 @@ async def visualizar_orcamento(
         )
 
     # Buscar demanda relacionada
-    demanda = demanda_repo.obter_por_id(orcamento.id_demanda)
+    demanda = await demanda_repo.obter_por_id(orcamento.id_demanda)
 
     # Buscar casal do noivo
-    casal = casal_repo.obter_por_noivo(id_noivo)
+    casal = await casal_repo.obter_por_noivo(id_noivo)
 
     if not demanda or not casal or demanda.id_casal != casal.id:
         # Verificar se o orçamento pertence ao casal do noivo logado
@@ -826,10 +769,10 @@ async def visualizar_orcamento(
         )
 
     # Buscar fornecedor
-    fornecedor = fornecedor_repo.obter_por_id(orcamento.id_fornecedor_prestador)
+    fornecedor = await fornecedor_repo.obter_por_id(orcamento.id_fornecedor_prestador)
 
     # Buscar itens do orçamento (query já faz JOIN com item, traz nome, descricao, tipo)
-    itens_orcamento = item_orcamento_repo.obter_por_orcamento(orcamento.id)
+    itens_orcamento = await item_orcamento_repo.obter_por_orcamento(orcamento.id)
 
     # Enriquecer itens com dados do item (dados já vêm da query via JOIN)
     itens_enriched = []
@@ -901,10 +844,10 @@ async def aceitar_item_orcamento(
         item_orcamento_id=id_item_orcamento,
     )
 
-    from core.repositories.item_orcamento_repo import item_orcamento_repo
+    from core.repositories.assincrono import item_orcamento_repo
 
     # Buscar o item do orçamento
-    item_orcamento = item_orcamento_repo.obter_por_id(id_item_orcamento)
+    item_orcamento = await item_orcamento_repo.obter_por_id(id_item_orcamento)
     if not item_orcamento:
         logger.warning(
             "Item de orçamento não encontrado", item_orcamento_id=id_item_orcamento
@@ -929,7 +872,7 @@ async def aceitar_item_orcamento(
 
     # Verificar se já existe um item aceito para o mesmo item_demanda
     # REGRA: Não pode aceitar dois orçamentos para o mesmo item_demanda
-    if item_orcamento_repo.verificar_item_demanda_ja_aceito(
+    if await item_orcamento_repo.verificar_item_demanda_ja_aceito(
         item_orcamento.id_item_demanda
     ):
         logger.warning(
@@ -946,7 +889,7 @@ async def aceitar_item_orcamento(
         )
 
     # Aceitar o item
-    sucesso = item_orcamento_repo.atualizar_status_item(id_item_orcamento, "ACEITO")
+    sucesso = await item_orcamento_repo.atualizar_status_item(id_item_orcamento, "ACEITO")
 
     if sucesso:
         logger.info(
@@ -956,11 +899,11 @@ async def aceitar_item_orcamento(
         )
 
         # Atualizar status derivado do orçamento
-        orcamento_repo.atualizar_status_derivado(id_orcamento)
+        await orcamento_repo.atualizar_status_derivado(id_orcamento)
 
         # Atualizar valor total do orçamento (soma apenas itens aceitos)
-        valor_total = item_orcamento_repo.obter_total_orcamento(id_orcamento)
-        orcamento_repo.atualizar_valor_total(id_orcamento, valor_total)
+        valor_total = await item_orcamento_repo.obter_total_orcamento(id_orcamento)
+        await orcamento_repo.atualizar_valor_total(id_orcamento, valor_total)
 
         informar_sucesso(request, "Item aceito com sucesso!")
     else:
@@ -995,10 +938,10 @@ async def rejeitar_item_orcamento(
         motivo=motivo_rejeicao or "Não informado",
     )
 
-    from core.repositories.item_orcamento_repo import item_orcamento_repo
+    from core.repositories.assincrono import item_orcamento_repo
 
     # Buscar o item do orçamento
-    item_orcamento = item_orcamento_repo.obter_por_id(id_item_orcamento)
+    item_orcamento = await item_orcamento_repo.obter_por_id(id_item_orcamento)
     if not item_orcamento:
         logger.warning(
             "Item de orçamento não encontrado", item_orcamento_id=id_item_orcamento
@@ -1023,7 +966,7 @@ async def rejeitar_item_orcamento(
 
     # Rejeitar o item com motivo (se fornecido)
     motivo = motivo_rejeicao.strip() if motivo_rejeicao else None
-    sucesso = item_orcamento_repo.atualizar_status_item(
+    sucesso = await item_orcamento_repo.atualizar_status_item(
         id_item_orcamento, "REJEITADO", motivo
     )
 
@@ -1035,11 +978,11 @@ async def rejeitar_item_orcamento(
         )
 
         # Atualizar status derivado do orçamento
-        orcamento_repo.atualizar_status_derivado(id_orcamento)
+        await orcamento_repo.atualizar_status_derivado(id_orcamento)
 
         # Atualizar valor total do orçamento (soma apenas itens aceitos)
-        valor_total = item_orcamento_repo.obter_total_orcamento(id_orcamento)
-        orcamento_repo.atualizar_valor_total(id_orcamento, valor_total)
+        valor_total = await item_orcamento_repo.obter_total_orcamento(id_orcamento)
+        await orcamento_repo.atualizar_valor_total(id_orcamento, valor_total)
 
         informar_sucesso(request, "Item rejeitado com sucesso!")
     else:
@@ -1066,12 +1009,12 @@ async def perfil_noivo(request: Request, usuario_logado: dict = {}):
     id_noivo = usuario_logado["id"]
     logger.info("Carregando perfil do noivo", noivo_id=id_noivo)
 
-    noivo = usuario_repo.obter_por_id(id_noivo)
+    noivo = await usuario_repo.obter_por_id(id_noivo)
 
     # Buscar dados do casal
     casal = None
     try:
-        casal = casal_repo.obter_por_noivo(id_noivo)
+        casal = await casal_repo.obter_por_noivo(id_noivo)
     except Exception as e:
         logger.warning(
             "Casal não encontrado para noivo no perfil", noivo_id=id_noivo, erro=e
@@ -1104,7 +1047,7 @@ async def atualizar_perfil_noivo(
     id_noivo = usuario_logado["id"]
     logger.info("Atualizando perfil do noivo", noivo_id=id_noivo, email=email)
 
-    noivo = usuario_repo.obter_por_id(id_noivo)
+    noivo = await usuario_repo.obter_por_id(id_noivo)
 
     if not noivo:
         logger.error("Usuário não encontrado ao atualizar perfil", noivo_id=id_noivo)
@@ -1124,7 +1067,7 @@ async def atualizar_perfil_noivo(
     noivo.cpf = cpf if cpf else None
     noivo.data_nascimento = data_nascimento if data_nascimento else None
 
-    sucesso = usuario_repo.atualizar(noivo)
+    sucesso = await usuario_repo.atualizar(noivo)
 
     if sucesso:
         logger.info("Perfil atualizado com sucesso", noivo_id=id_noivo)
@@ -8,7 +8,7 @@ from core.models.usuario_model import TipoUsuario, Usuario
 from core.models.fornecedor_model import Fornecedor
 from core.models.casal_model import Casal
 from dtos import CadastroNoivosDTO, CadastroFornecedorDTO
-from core.repositories import usuario_repo, fornecedor_repo, casal_repo
+from core.repositories.assincrono import usuario_repo, fornecedor_repo, casal_repo
 from infrastructure.security import criar_sessao
 from infrastructure.security import (
     criar_hash_senha,
@@ -267,7 +267,7 @@ async def post_cadastro_noivos(
         data_token=None,
         data_cadastro=None,
     )
-    usuario1_id = usuario_repo.inserir(usuario1)
+    usuario1_id = await usuario_repo.inserir(usuario1)
     logger.info(
         f"Primeiro noivo cadastrado com sucesso",
         usuario_id=usuario1_id,
@@ -288,7 +288,7 @@ async def post_cadastro_noivos(
         data_token=None,
         data_cadastro=None,
     )
-    usuario2_id = usuario_repo.inserir(usuario2)
+    usuario2_id = await usuario_repo.inserir(usuario2)
     logger.info(
         f"Segundo noivo cadastrado com sucesso",
         usuario_id=usuario2_id,
@@ -310,7 +310,7 @@ async def post_cadastro_noivos(
                 int(dados.numero_convidados) if dados.numero_convidados else None
             ),
         )
-        casal_id = casal_repo.inserir(casal)
+        casal_id = await casal_repo.inserir(casal)
         logger.info(
             f"Casal cadastrado com sucesso",
             casal_id=casal_id,
@@ -461,7 +461,7 @@ async def post_cadastro_fornecedor(
         descricao=dados.descricao,
         newsletter=dados.newsletter == "on",
     )
-    fornecedor_id = fornecedor_repo.inserir(fornecedor)
+    fornecedor_id = await fornecedor_repo.inserir(fornecedor)
     logger.info(
         f"Fornecedor cadastrado com sucesso",
         fornecedor_id=fornecedor_id,
@@ -504,7 +504,7 @@ async def post_cadastro_geral(
     tipo: str = Form(...),
 ):
     # Verificar se email já existe
-    if usuario_repo.obter_usuario_por_email(email):
+    if await usuario_repo.obter_usuario_por_email(email):
         logger.warning(f"Tentativa de cadastro com email já existente", email=email)
         return templates.TemplateResponse(
             "publico/cadastro_fornecedor.html",
@@ -533,7 +533,7 @@ async def post_cadastro_geral(
         cnpj=None,
         descricao=None,
     )
-    fornecedor_id = fornecedor_repo.inserir(fornecedor)
+    fornecedor_id = await fornecedor_repo.inserir(fornecedor)
     logger.info(
         f"Cadastro geral realizado com sucesso",
         fornecedor_id=fornecedor_id,
@@ -560,7 +560,7 @@ async def post_login(
     senha: str = Form(...),
     redirect: str = Form(None),
 ):
-    usuario = usuario_repo.obter_usuario_por_email(email)
+    usuario = await usuario_repo.obter_usuario_por_email(email)
 
     if not usuario or not verificar_senha(senha, usuario.senha):
         logger.warning(f"Tentativa de login falhou", email=email)
@@ -622,7 +622,7 @@ async def post_esqueci_senha(request: Request, email: str = Form(...)):
     from infrastructure.email.email_service import enviar_email_recuperacao_senha
 
     # Buscar usuário pelo email
-    usuario = usuario_repo.obter_usuario_por_email(email)
+    usuario = await usuario_repo.obter_usuario_por_email(email)
 
     # Por segurança, sempre mostrar mensagem de sucesso (mesmo se email não existir)
     # Isso evita que atacantes descubram quais emails estão cadastrados
@@ -645,7 +645,7 @@ async def post_esqueci_senha(request: Request, email: str = Form(...)):
     # Atualizar usuário com token
     usuario.token_redefinicao = token
     usuario.data_token = data_expiracao
-    usuario_repo.atualizar(usuario)
+    await usuario_repo.atualizar(usuario)
 
     logger.info(
         f"Token de recuperação de senha gerado",
@@ -686,7 +686,7 @@ async def get_reset_senha(request: Request, token: Optional[str] = None):
         )
 
     # Buscar usuário pelo token
-    usuario = usuario_repo.obter_usuario_por_token(token)
+    usuario = await usuario_repo.obter_usuario_por_token(token)
 
     if not usuario:
         logger.warning(f"Token de recuperação inválido", token=token[:10] + "...")
@@ -773,7 +773,7 @@ async def post_reset_senha(
         )
 
     # Buscar usuário pelo token
-    usuario = usuario_repo.obter_usuario_por_token(token)
+    usuario = await usuario_repo.obter_usuario_por_token(token)
 
     if not usuario:
         logger.warning(
@@ -825,7 +825,7 @@ async def post_reset_senha(
     usuario.senha = criar_hash_senha(senha)
     usuario.token_redefinicao = None
     usuario.data_token = None
-    usuario_repo.atualizar(usuario)
+    await usuario_repo.atualizar(usuario)
 
     logger.info(
         f"Senha redefinida com sucesso", usuario_id=usuario.id, email=usuario.email
@@ -859,7 +859,7 @@ async def listar_itens_publicos(
     pagina: int = 1,
 ):
     """Lista itens públicos com filtros e paginação"""
-    from core.repositories import item_repo, categoria_repo
+    from core.repositories.assincrono import item_repo, categoria_repo
     from core.models.tipo_fornecimento_model import TipoFornecimento
 
     # Converter categoria para int se não estiver vazia
@@ -881,16 +881,37 @@ async def listar_itens_publicos(
         }
         tipo_enum = tipo_map.get(tipo)
         if tipo_enum:
-            categorias = categoria_repo.obter_ativas_por_tipo(tipo_enum)
-
-    # Obter itens e total
-    itens, total_itens = item_repo.obter_itens_publicos(
-        tipo=tipo,
-        busca=busca,
-        categoria=categoria_int,
-        pagina=pagina,
-        tamanho_pagina=PaginationHelper.PUBLIC_PAGE_SIZE,
-    )
+            categorias = await categoria_repo.obter_ativas_por_tipo(tipo_enum)
+
+    # Obter itens e total (com termo de busca, usa o índice textual)
+    if busca and busca.strip():
+        itens, total_itens = await item_repo.buscar_itens_publicos(
+            busca,
+            tipo=tipo,
+            categoria=categoria_int,
+            pagina=pagina,
+            tamanho_pagina=PaginationHelper.PUBLIC_PAGE_SIZE,
+        )
+        links_cursor = None
+    else:
+        # Paginação keyset: anterior/próxima seguem o cursor e reaproveitam o
+        # total recebido na URL, sem OFFSET nem novo COUNT(*)
+        total_conhecido = PaginationHelper.get_cursor_total(request)
+        pagina_cursor = await item_repo.obter_itens_publicos_cursor(
+            tipo=tipo,
+            categoria=categoria_int,
+            cursor=PaginationHelper.get_cursor(request),
+            pagina=pagina,
+            tamanho_pagina=PaginationHelper.PUBLIC_PAGE_SIZE,
+            contar=total_conhecido is None,
+        )
+        if pagina_cursor.total_items is None:
+            pagina_cursor.total_items = total_conhecido
+        itens = pagina_cursor.items
+        total_itens = pagina_cursor.total_items or 0
+        links_cursor = PaginationHelper.build_cursor_links(
+            request, pagina_cursor, pagina
+        )
 
     # Aplicar paginação
     page_info = PaginationHelper.paginate(
@@ -919,6 +940,7 @@ async def listar_itens_publicos(
             "busca": busca,
             "categoria": categoria_int,
             "categorias": categorias,
+            "links_cursor": links_cursor,
         },
     )
 
@@ -951,9 +973,9 @@ async def locais_redirect():
 @tratar_erro_rota(template_erro="publico/item_detalhes.html")
 async def detalhes_item_publico(request: Request, id: int):
     """Exibe detalhes de um item específico"""
-    from core.repositories import item_repo
+    from core.repositories.assincrono import item_repo
 
-    item = item_repo.obter_item_publico_por_id(id)
+    item = await item_repo.obter_item_publico_por_id(id)
 
     if not item:
         logger.warning(f"Item público não encontrado", item_id=id)
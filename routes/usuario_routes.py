@@ -5,7 +5,8 @@ from infrastructure.security import requer_autenticacao
 from util.error_handlers import tratar_erro_rota
 from infrastructure.logging import logger
 from core.models.usuario_model import TipoUsuario
-from core.repositories import usuario_repo
+from core.repositories.assincrono import usuario_repo
+from infrastructure.database import liberar_conexao
 from infrastructure.security import (
     criar_hash_senha,
     verificar_senha,
@@ -68,7 +69,7 @@ async def post_alterar_senha(
         )
 
     # Buscar usuário atual
-    usuario = usuario_repo.obter_por_id(usuario_logado["id"])
+    usuario = await usuario_repo.obter_por_id(usuario_logado["id"])
     if not usuario:
         logger.error(
             f"Usuário não encontrado ao alterar senha - usuario_id: {usuario_logado['id']}"
@@ -94,7 +95,7 @@ async def post_alterar_senha(
     nova_senha_hash = criar_hash_senha(nova_senha)
 
     # Atualizar senha no banco
-    sucesso = usuario_repo.atualizar_senha_usuario(usuario.id, nova_senha_hash)
+    sucesso = await usuario_repo.atualizar_senha_usuario(usuario.id, nova_senha_hash)
 
     if sucesso:
         logger.info(f"Senha alterada com sucesso - usuario_id: {usuario_logado['id']}")
@@ -126,27 +127,25 @@ async def alterar_foto(
 ):
     """Processa o upload de avatar do usuário"""
     from util.image_processor import ImageProcessor
-    from util.file_storage import FileStorageManager, TipoArquivo
-    from config.constants import ImageConstants
+    from util.file_storage import TipoArquivo
+    from util.exceptions import SobrecargaError
+    from util.error_handlers import resposta_sobrecarga
 
     perfil = usuario_logado["perfil"].lower()
 
-    # Criar diretório se não existir
-    FileStorageManager.criar_diretorio(TipoArquivo.USUARIO)
-
-    # Obter caminho físico para salvar
-    caminho_arquivo = FileStorageManager.obter_caminho(
-        TipoArquivo.USUARIO,
-        usuario_logado["id"],
-        fisico=True
-    )
-
-    # Processar e salvar imagem usando ImageProcessor
-    sucesso, erro = await ImageProcessor.processar_e_salvar_imagem(
-        foto,
-        caminho_arquivo,
-        tamanho=ImageConstants.Sizes.AVATAR.value  # (300, 300)
-    )
+    # Devolver a conexão ao pool durante o processamento da imagem
+    await liberar_conexao()
+
+    # Processar e salvar todas as variantes (tamanhos e formatos) do avatar
+    try:
+        sucesso, erro = await ImageProcessor.processar_e_salvar_variantes(
+            foto,
+            TipoArquivo.USUARIO,
+            usuario_logado["id"]
+        )
+    except SobrecargaError as e:
+        logger.warning(f"Upload de avatar recusado, fila de imagens cheia - usuario_id: {usuario_logado['id']}")
+        return resposta_sobrecarga(e)
 
     if sucesso:
         logger.info(f"Avatar atualizado com sucesso - usuario_id: {usuario_logado['id']}")
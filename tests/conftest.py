@@ -34,6 +34,8 @@ def test_db():
     yield db_path
 
     # Cleanup
+    from infrastructure.database import fechar_pools
+    fechar_pools()
     os.close(db_fd)
     os.environ.pop('TEST_DATABASE_PATH', None)
     if os.path.exists(db_path):
@@ -72,6 +74,20 @@ def test_db_with_tables(test_db):
     yield test_db
 
 
+@pytest.fixture(scope="function")
+def test_db_migrado(test_db):
+    """Banco de dados de teste com todas as migrações aplicadas
+
+    Diferente de test_db_with_tables, inclui também os objetos criados
+    apenas por migrações (índice textual, gatilhos, etc.).
+    """
+    from infrastructure.database import aplicar_migracoes
+
+    aplicar_migracoes()
+
+    yield test_db
+
+
 @pytest.fixture
 def usuario_factory():
     """Factory para criar usuários nos testes"""
@@ -24,6 +24,9 @@ class MockSQL:
     LISTAR_TODOS = "SELECT * FROM mock_table"
     LISTAR_ATIVOS = "SELECT * FROM mock_table WHERE ativo = 1"
     LISTAR_INATIVOS = "SELECT * FROM mock_table WHERE ativo = 0"
+    INDICES = {
+        "idx_mock_table_nome": "CREATE INDEX IF NOT EXISTS idx_mock_table_nome ON mock_table(nome);",
+    }
 
 
 # Mock SQL module para BaseRepoChaveComposta
@@ -113,6 +116,27 @@ class TestBaseRepo:
         # Assert
         assert resultado is True
 
+    def test_criar_indices(self, test_db):
+        """Testa criação dos índices declarados no módulo SQL"""
+        # Arrange
+        repo = MockRepo()
+        repo.criar_tabela()
+        # Act
+        total = repo.criar_indices()
+        # Assert
+        assert total == 1
+        assert repo.verificar_indices() == []
+
+    def test_verificar_indices_ausentes(self, test_db):
+        """Testa detecção de índices ausentes em banco existente"""
+        # Arrange
+        repo = MockRepo()
+        repo.criar_tabela()
+        # Act
+        ausentes = repo.verificar_indices()
+        # Assert
+        assert ausentes == ["idx_mock_table_nome"]
+
     def test_inserir(self, test_db):
         """Testa inserção de registro"""
         # Arrange
@@ -126,6 +150,32 @@ class TestBaseRepo:
         obj_db = repo.obter_por_id(id_inserido)
         assert obj_db.nome == "Teste"
 
+    def test_inserir_em_lote(self, test_db):
+        """Testa inserção em lote retornando os IDs na ordem dos objetos"""
+        # Arrange
+        repo = MockRepo()
+        repo.criar_tabela()
+        repo.inserir(MockModel(id=0, nome="Existente"))
+        objetos = [MockModel(id=0, nome=f"Lote {i}") for i in range(3)]
+        # Act
+        ids = repo.inserir_em_lote(objetos)
+        # Assert
+        assert ids == [2, 3, 4]
+        assert [repo.obter_por_id(i).nome for i in ids] == ["Lote 0", "Lote 1", "Lote 2"]
+        assert repo.inserir_em_lote([]) == []
+
+    def test_inserir_em_lote_tudo_ou_nada(self, test_db):
+        """Uma linha inválida impede a gravação de todo o lote"""
+        # Arrange
+        repo = MockRepo()
+        repo.criar_tabela()
+        # nome NULL viola o NOT NULL da tabela
+        objetos = [MockModel(id=0, nome="Válido"), MockModel(id=0, nome=None)]  # type: ignore[arg-type]
+        # Act & Assert
+        with pytest.raises(BancoDadosError):
+            repo.inserir_em_lote(objetos)
+        assert repo.contar_registros() == 0
+
     def test_atualizar_nao_existe(self, test_db):
         """Testa atualização de registro que não existe (linha 89)"""
         # Arrange
@@ -355,6 +405,90 @@ class TestBaseRepo:
         assert len(objetos) == 2
         assert total == 5
 
+    def test_obter_muitos_por_ids(self, test_db):
+        """Carrega vários registros com uma consulta IN, ignorando repetidos e ausentes"""
+        # Arrange
+        repo = MockRepo()
+        repo.criar_tabela()
+        for i in range(3):
+            repo.inserir(MockModel(id=0, nome=f"Item {i+1}"))
+        # Act
+        objetos = repo.obter_muitos_por_ids([3, 1, 3, None, 99])
+        # Assert
+        assert set(objetos) == {1, 3}
+        assert objetos[3].nome == "Item 3"
+        assert repo.obter_muitos_por_ids([]) == {}
+
+    def test_obter_muitos_por_ids_em_lotes(self, test_db, monkeypatch):
+        """Listas maiores que o limite do IN são divididas em lotes"""
+        # Arrange
+        from config.constants import DatabaseConstants
+        monkeypatch.setattr(DatabaseConstants, "MAX_IN_PARAMS", 2)
+        repo = MockRepo()
+        repo.criar_tabela()
+        for i in range(5):
+            repo.inserir(MockModel(id=0, nome=f"Item {i+1}"))
+        # Act
+        objetos = repo.obter_muitos_por_ids(range(1, 6))
+        # Assert
+        assert sorted(objetos) == [1, 2, 3, 4, 5]
+
+    def test_obter_paginado_cursor(self, test_db):
+        """Percorre as páginas por cursor, para frente e para trás"""
+        # Arrange
+        repo = MockRepo()
+        repo.criar_tabela()
+        for i in range(5):
+            repo.inserir(MockModel(id=0, nome=f"Item {i+1}"))
+        # Act
+        primeira = repo.obter_paginado_cursor(tamanho_pagina=2)
+        segunda = repo.obter_paginado_cursor(primeira.next_cursor, tamanho_pagina=2)
+        terceira = repo.obter_paginado_cursor(segunda.next_cursor, tamanho_pagina=2)
+        volta = repo.obter_paginado_cursor(terceira.previous_cursor, tamanho_pagina=2)
+        # Assert
+        assert [o.id for o in primeira.items] == [5, 4]
+        assert [o.id for o in segunda.items] == [3, 2]
+        assert [o.id for o in terceira.items] == [1]
+        assert [o.id for o in volta.items] == [3, 2]
+        assert primeira.previous_cursor is None
+        assert terceira.next_cursor is None
+        assert primeira.total_items == 5
+
+    def test_obter_paginado_cursor_salto_de_pagina(self, test_db):
+        """Sem cursor, o número da página posiciona a consulta"""
+        # Arrange
+        repo = MockRepo()
+        repo.criar_tabela()
+        for i in range(5):
+            repo.inserir(MockModel(id=0, nome=f"Item {i+1}"))
+        # Act
+        pagina = repo.obter_paginado_cursor(tamanho_pagina=2, pagina=2, total=None)
+        # Assert
+        assert [o.id for o in pagina.items] == [3, 2]
+        assert pagina.has_previous and pagina.has_next
+        assert pagina.total_items is None
+
+    def test_obter_paginado_cursor_invalido(self, test_db):
+        """Cursor adulterado é rejeitado"""
+        # Arrange
+        repo = MockRepo()
+        repo.criar_tabela()
+        # Act & Assert
+        with pytest.raises(ValidacaoError):
+            repo.obter_paginado_cursor("nao-e-um-cursor")
+
+    def test_estimar_total(self, test_db):
+        """Estimativa usa o maior rowid da tabela"""
+        # Arrange
+        repo = MockRepo()
+        repo.criar_tabela()
+        for i in range(3):
+            repo.inserir(MockModel(id=0, nome=f"Item {i+1}"))
+        # Act
+        total = repo.obter_paginado_cursor(total="aproximado").total_items
+        # Assert
+        assert total == 3
+
     def test_ativar(self, test_db):
         """Testa ativação de registro"""
         # Arrange
@@ -482,3 +482,80 @@ class TestCategoriaRepo:
         assert len(pagina2) == 3, "Segunda página deveria ter 3 categorias"
         assert len(pagina3) == 1, "Terceira página deveria ter 1 categoria"
         assert total1 == total2 == total3 == 7, "Total deveria ser sempre 7"
+
+    def test_cache_serve_leituras_e_invalida_na_escrita(self, test_db, categoria_factory):
+        """Leituras repetidas usam o cache; escritas do repositório o invalidam"""
+        # Arrange
+        categoria_repo.criar_tabela()
+        categoria = categoria_factory.criar(
+            nome="Buffet", tipo_fornecimento=TipoFornecimento.SERVICO
+        )
+        id_categoria = categoria_repo.inserir(categoria)
+        cargas_antes = categoria_repo.cache.cargas
+        # Act
+        categoria_repo.buscar_categorias()
+        categoria_repo.obter_por_id(id_categoria)
+        categoria_repo.obter_ativas_por_tipo(TipoFornecimento.SERVICO)
+        cargas_leitura = categoria_repo.cache.cargas - cargas_antes
+        categoria_repo.desativar_categoria(id_categoria)
+        ativas = categoria_repo.obter_ativas_por_tipo(TipoFornecimento.SERVICO)
+        # Assert
+        assert cargas_leitura == 1, "As três leituras deveriam usar uma única carga"
+        assert ativas == [], "A desativação deveria invalidar o cache"
+
+    def test_cache_devolve_copias(self, test_db, categoria_factory):
+        """Alterar um objeto devolvido não altera o cache"""
+        # Arrange
+        categoria_repo.criar_tabela()
+        id_categoria = categoria_repo.inserir(categoria_factory.criar(nome="Bolo"))
+        # Act
+        categoria = categoria_repo.obter_por_id(id_categoria)
+        categoria.nome = "Alterado sem salvar"
+        # Assert
+        assert categoria_repo.obter_por_id(id_categoria).nome == "Bolo"
+        assert categoria_repo.buscar_categorias()[0].nome == "Bolo"
+
+    def test_cache_percebe_escrita_de_outro_worker(
+        self, test_db_migrado, categoria_factory, monkeypatch
+    ):
+        """Escritas fora do repositório incrementam versao_cache e recarregam o cache"""
+        # Arrange
+        from infrastructure.database import obter_conexao
+
+        monkeypatch.setattr(categoria_repo.cache, "intervalo_verificacao", 0)
+        id_categoria = categoria_repo.inserir(categoria_factory.criar(nome="Doces"))
+        categoria_repo.obter_por_id(id_categoria)
+        cargas_antes = categoria_repo.cache.cargas
+        # Act
+        categoria_repo.obter_por_id(id_categoria)
+        cargas_sem_escrita = categoria_repo.cache.cargas - cargas_antes
+        with obter_conexao() as conexao:
+            conexao.execute(
+                "UPDATE categoria SET nome = 'Doces Finos' WHERE id = ?", (id_categoria,)
+            )
+        categoria = categoria_repo.obter_por_id(id_categoria)
+        # Assert
+        assert cargas_sem_escrita == 0, "Sem escrita a versão não muda e o cache vale"
+        assert categoria.nome == "Doces Finos", "A nova versão deveria recarregar o cache"
+
+    def test_buscar_categorias_filtros_pelo_cache(self, test_db, categoria_factory):
+        """Filtros de tipo e status aplicados sobre o cache"""
+        # Arrange
+        categoria_repo.criar_tabela()
+        categoria_repo.inserir(categoria_factory.criar(
+            nome="Vestidos", tipo_fornecimento=TipoFornecimento.PRODUTO
+        ))
+        categoria_repo.inserir(categoria_factory.criar(
+            nome="Convites", tipo_fornecimento=TipoFornecimento.PRODUTO, ativo=False
+        ))
+        categoria_repo.inserir(categoria_factory.criar(
+            nome="Música", tipo_fornecimento=TipoFornecimento.SERVICO
+        ))
+        # Act
+        produtos = categoria_repo.buscar_categorias(tipo_fornecimento="PRODUTO")
+        inativas = categoria_repo.buscar_categorias(status="inativo")
+        status_invalido = categoria_repo.buscar_categorias(status="outro")
+        # Assert
+        assert [c.nome for c in produtos] == ["Convites", "Vestidos"]
+        assert [c.nome for c in inativas] == ["Convites"]
+        assert status_invalido == []
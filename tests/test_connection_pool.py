@@ -0,0 +1,123 @@
+"""
+Testes para o pool de conexões SQLite
+"""
+import pytest
+from infrastructure.database import obter_conexao, obter_pool, PoolConexoes
+from util.exceptions import BancoDadosError
+
+
+class TestPoolConexoes:
+    """Testes para PoolConexoes e obter_conexao"""
+
+    def test_reutiliza_conexao(self, test_db):
+        """Conexões devolvidas são reutilizadas em vez de reabertas"""
+        # Arrange
+        with obter_conexao() as conexao:
+            primeira = conexao
+        # Act
+        with obter_conexao() as conexao:
+            segunda = conexao
+        # Assert
+        assert primeira is segunda
+        assert obter_pool().conexoes_abertas == 1
+
+    def test_conexao_configurada(self, test_db):
+        """Conexões do pool têm chaves estrangeiras ativas"""
+        with obter_conexao() as conexao:
+            assert conexao.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+
+    def test_commit_ao_final_do_bloco(self, test_db):
+        """O bloco with faz commit das alterações"""
+        # Arrange
+        with obter_conexao() as conexao:
+            conexao.execute("CREATE TABLE t (x INTEGER)")
+        # Act
+        with obter_conexao() as conexao:
+            conexao.execute("INSERT INTO t VALUES (1)")
+        # Assert
+        with obter_conexao() as conexao:
+            assert conexao.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 1
+
+    def test_rollback_em_excecao(self, test_db):
+        """Exceções no bloco desfazem a transação e devolvem a conexão"""
+        # Arrange
+        with obter_conexao() as conexao:
+            conexao.execute("CREATE TABLE t (x INTEGER)")
+        # Act
+        with pytest.raises(RuntimeError):
+            with obter_conexao() as conexao:
+                conexao.execute("INSERT INTO t VALUES (1)")
+                raise RuntimeError("falha")
+        # Assert
+        with obter_conexao() as conexao:
+            assert conexao.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+        assert obter_pool().conexoes_ociosas == 1
+
+    def test_pool_esgotado(self, test_db):
+        """Pool sem conexões livres falha após o timeout"""
+        # Arrange
+        pool = PoolConexoes(test_db, tamanho_maximo=1, timeout=0.01)
+        conexao = pool.emprestar()
+        # Act / Assert
+        with pytest.raises(BancoDadosError):
+            pool.emprestar()
+        pool.devolver(conexao)
+        pool.fechar()
+
+    def test_descarta_conexao_quebrada(self, test_db):
+        """Conexões que falham na verificação são substituídas"""
+        # Arrange
+        pool = PoolConexoes(test_db, tamanho_maximo=2, intervalo_verificacao=0)
+        conexao = pool.emprestar()
+        pool.devolver(conexao)
+        conexao.close()
+        # Act
+        nova = pool.emprestar()
+        # Assert
+        assert nova is not conexao
+        assert nova.execute("SELECT 1").fetchone()[0] == 1
+        assert pool.conexoes_abertas == 1
+        pool.devolver(nova)
+        pool.fechar()
+
+    def test_fechar(self, test_db):
+        """Pool fechado recusa novos empréstimos"""
+        # Arrange
+        pool = PoolConexoes(test_db)
+        pool.devolver(pool.emprestar())
+        # Act
+        pool.fechar()
+        # Assert
+        assert pool.conexoes_abertas == 0
+        with pytest.raises(BancoDadosError):
+            pool.emprestar()
+
+    def test_perfil_test_aplicado(self, test_db):
+        """Bancos de teste usam o perfil 'test' por padrão"""
+        # Act
+        with obter_conexao() as conexao:
+            journal = conexao.execute("PRAGMA journal_mode").fetchone()[0]
+            temp_store = conexao.execute("PRAGMA temp_store").fetchone()[0]
+        # Assert
+        assert obter_pool().perfil_pragma == "test"
+        assert journal == "memory"
+        assert temp_store == 2  # MEMORY
+
+    def test_perfil_production(self, test_db):
+        """Perfil 'production' ativa WAL e synchronous=NORMAL"""
+        # Arrange
+        pool = PoolConexoes(test_db, perfil_pragma="production")
+        # Act
+        with pool.conexao() as conexao:
+            journal = conexao.execute("PRAGMA journal_mode").fetchone()[0]
+            synchronous = conexao.execute("PRAGMA synchronous").fetchone()[0]
+        pool.fechar()
+        # Assert
+        assert journal == "wal"
+        assert synchronous == 1  # NORMAL
+
+    def test_perfil_desconhecido(self, test_db, monkeypatch):
+        """Perfil inválido no ambiente é rejeitado"""
+        monkeypatch.setenv("DATABASE_PRAGMA_PROFILE", "inexistente")
+        with pytest.raises(ValueError):
+            PoolConexoes(test_db)
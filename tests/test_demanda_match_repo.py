@@ -0,0 +1,134 @@
+import time
+from datetime import datetime
+from decimal import Decimal
+from core.models.casal_model import Casal
+from core.models.categoria_model import Categoria
+from core.models.demanda_model import Demanda
+from core.models.item_demanda_model import ItemDemanda
+from core.models.item_model import Item
+from core.models.tipo_fornecimento_model import TipoFornecimento
+from core.repositories.casal_repo import casal_repo
+from core.repositories.categoria_repo import categoria_repo
+from core.repositories.demanda_match_repo import demanda_match_repo
+from core.repositories.demanda_repo import demanda_repo
+from core.repositories.fornecedor_repo import fornecedor_repo
+from core.repositories.item_demanda_repo import item_demanda_repo
+from core.repositories.item_repo import item_repo
+from core.repositories.usuario_repo import usuario_repo
+from infrastructure.database import obter_conexao
+
+
+def _pares() -> dict:
+    """Pares de demanda_match como {(id_fornecedor, id_demanda): itens_compativeis}"""
+    with obter_conexao() as conexao:
+        linhas = conexao.execute(
+            "SELECT id_fornecedor, id_demanda, itens_compativeis FROM demanda_match"
+        ).fetchall()
+    return {(linha[0], linha[1]): linha[2] for linha in linhas}
+
+
+def _item_demanda(id_demanda: int, id_categoria: int) -> ItemDemanda:
+    return ItemDemanda(0, id_demanda, TipoFornecimento.SERVICO, id_categoria, "Pedido", 1)
+
+
+class TestDemandaMatchRepo:
+    def _cenario(self, noivos, fornecedor):
+        """Fornecedor com item em Flores; demanda com um item de Flores e um de Som"""
+        for noivo in noivos[:2]:
+            usuario_repo.inserir(noivo)
+        id_casal = casal_repo.inserir(Casal(0, 1, 2))
+        id_fornecedor = fornecedor_repo.inserir(fornecedor)
+        id_flores, id_som = [
+            categoria_repo.inserir(Categoria(0, nome, TipoFornecimento.SERVICO, None, True))
+            for nome in ("Flores", "Som")
+        ]
+        assert id_fornecedor is not None and id_flores is not None
+        id_item = item_repo.inserir(Item(
+            0, id_fornecedor, TipoFornecimento.SERVICO, "Arranjos", "Descrição",
+            Decimal("100.00"), id_flores,
+        ))
+        id_demanda = demanda_repo.inserir(Demanda(0, id_casal, "Casamento"))
+        item_demanda_repo.inserir_em_lote(
+            [_item_demanda(id_demanda, id_flores), _item_demanda(id_demanda, id_som)]
+        )
+        return id_casal, id_fornecedor, id_item, id_demanda, id_flores, id_som
+
+    def test_pares_mantidos_por_gatilhos(
+        self, test_db_migrado, lista_noivos_exemplo, fornecedor_exemplo
+    ):
+        # Arrange
+        _, id_fornecedor, id_item, id_demanda, id_flores, id_som = self._cenario(
+            lista_noivos_exemplo, fornecedor_exemplo
+        )
+        par = (id_fornecedor, id_demanda)
+        # Act
+        inicial = _pares()
+        id_item_som = item_repo.inserir(Item(
+            0, id_fornecedor, TipoFornecimento.SERVICO, "DJ", "Descrição",
+            Decimal("500.00"), id_som,
+        ))
+        assert id_item_som is not None
+        com_nova_categoria = _pares()
+        item_demanda_repo.inserir(_item_demanda(id_demanda, id_flores))
+        com_novo_pedido = _pares()
+        item_repo.desativar_item(id_item, id_fornecedor)
+        sem_flores = _pares()
+        item_repo.excluir_item_fornecedor(id_item_som, id_fornecedor)
+        sem_itens = _pares()
+        item_repo.ativar_item(id_item, id_fornecedor)
+        reativado = _pares()
+        # Assert
+        assert inicial == {par: 1}, "Só o item de Flores é compatível"
+        assert com_nova_categoria == {par: 2}, "Item em categoria nova soma os pedidos dela"
+        assert com_novo_pedido == {par: 3}
+        assert sem_flores == {par: 1}, "Desativar o único item de Flores tira a categoria"
+        assert sem_itens == {}, "Sem itens ativos o fornecedor não tem demandas"
+        assert reativado == {par: 2}
+        assert _pares() == {par: len(item_demanda_repo.obter_por_demanda(id_demanda)) - 1}
+
+    def test_novas_desde_ultima_visita(
+        self, test_db_migrado, lista_noivos_exemplo, fornecedor_exemplo
+    ):
+        # Arrange
+        id_casal, id_fornecedor, _, _, id_flores, _ = self._cenario(
+            lista_noivos_exemplo, fornecedor_exemplo
+        )
+        # Act
+        antes_da_visita = demanda_match_repo.contar_novas(id_fornecedor)
+        demanda_match_repo.registrar_visita(id_fornecedor)
+        depois_da_visita = demanda_match_repo.contar_novas(id_fornecedor)
+        time.sleep(0.01)  # criado_em e visto_em têm resolução de milissegundos
+        id_nova = demanda_repo.inserir(Demanda(0, id_casal, "Outra demanda"))
+        item_demanda_repo.inserir(_item_demanda(id_nova, id_flores))
+        com_demanda_nova = demanda_match_repo.contar_novas(id_fornecedor)
+        demandas, _ = demanda_repo.obter_compativeis_com_fornecedor(id_fornecedor)
+        # Assert
+        assert antes_da_visita == 1, "Sem visita registrada, todas são novas"
+        assert depois_da_visita == 0
+        assert com_demanda_nova == 1
+        assert {d.demanda.id: d.nova for d in demandas}[id_nova] is True
+        assert sum(d.nova for d in demandas) == 1
+
+    def test_recalcular_corrige_pares(
+        self, test_db_migrado, lista_noivos_exemplo, fornecedor_exemplo
+    ):
+        # Arrange
+        from infrastructure.database.contadores import recalcular_contadores
+
+        _, id_fornecedor, _, id_demanda, _, _ = self._cenario(
+            lista_noivos_exemplo, fornecedor_exemplo
+        )
+        with obter_conexao() as conexao:
+            criado_em = conexao.execute("SELECT criado_em FROM demanda_match").fetchone()[0]
+            conexao.execute("UPDATE demanda_match SET itens_compativeis = 9")
+            conexao.execute(
+                "INSERT INTO demanda_match (id_fornecedor, id_demanda, itens_compativeis) VALUES (?, ?, 1)",
+                (id_fornecedor + 100, id_demanda),
+            )
+        # Act
+        corrigidas = recalcular_contadores()
+        # Assert
+        assert corrigidas["demanda_match"] == 2, "Um par removido e um corrigido"
+        assert _pares() == {(id_fornecedor, id_demanda): 1}
+        with obter_conexao() as conexao:
+            assert conexao.execute("SELECT criado_em FROM demanda_match").fetchone()[0] == criado_em
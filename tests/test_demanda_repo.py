@@ -1,13 +1,25 @@
 import pytest
 from datetime import datetime
-from core.models.demanda_model import Demanda
+from decimal import Decimal
+from core.models.demanda_model import Demanda, StatusDemanda
 from core.models.casal_model import Casal
 from core.models.categoria_model import Categoria
+from core.models.item_model import Item
+from core.models.item_demanda_model import ItemDemanda
+from core.models.item_orcamento_model import ItemOrcamento
+from core.models.orcamento_model import Orcamento
 from core.models.tipo_fornecimento_model import TipoFornecimento
 from core.repositories.demanda_repo import demanda_repo
 from core.repositories.casal_repo import casal_repo
 from core.repositories.usuario_repo import usuario_repo
 from core.repositories.categoria_repo import categoria_repo
+from core.repositories.fornecedor_repo import fornecedor_repo
+from core.repositories.item_repo import item_repo
+from core.repositories.item_demanda_repo import item_demanda_repo
+from core.repositories.item_orcamento_repo import item_orcamento_repo
+from core.repositories.orcamento_repo import orcamento_repo
+from infrastructure.database import obter_conexao
+from infrastructure.database.contadores import recalcular_contadores
 from util.exceptions import RecursoNaoEncontradoError
 
 
@@ -480,3 +492,153 @@ class TestDemandaRepo:
         # Assert
         assert len(demandas_vitoria) == 2, "Deveria retornar 2 demandas de Vitória"
         assert all(d.cidade_casamento == "Vitória" for d in demandas_vitoria)
+
+    def _criar_demanda_com_orcamentos(self, noivos, fornecedor):
+        """Demanda com 2 itens e 2 orçamentos; o item 1 foi aceito no orçamento 1"""
+        for noivo in noivos[:2]:
+            usuario_repo.inserir(noivo)
+        id_casal = casal_repo.inserir(Casal(0, 1, 2))
+        id_fornecedor = fornecedor_repo.inserir(fornecedor)
+        id_categoria = categoria_repo.inserir(
+            Categoria(0, "Categoria Teste", TipoFornecimento.PRODUTO, "Descrição", True)
+        )
+        assert id_casal is not None and id_fornecedor is not None and id_categoria is not None
+        id_item = item_repo.inserir(Item(
+            0, id_fornecedor, TipoFornecimento.PRODUTO, "Item", "Descrição",
+            Decimal("100.00"), id_categoria,
+        ))
+        id_demanda = demanda_repo.inserir(Demanda(0, id_casal, "Demanda com contadores"))
+        assert id_item is not None and id_demanda is not None
+        ids_itens = [
+            item_demanda_repo.inserir(ItemDemanda(
+                0, id_demanda, TipoFornecimento.PRODUTO, id_categoria, f"Item {i}", 1
+            ))
+            for i in range(2)
+        ]
+        ids_orcamentos = [
+            orcamento_repo.inserir(Orcamento(0, id_demanda, id_fornecedor, datetime.now()))
+            for _ in range(2)
+        ]
+        assert None not in ids_itens and None not in ids_orcamentos
+        item_orcamento_repo.inserir(ItemOrcamento(
+            0, ids_orcamentos[0], ids_itens[0], id_item, 1, 100.0, None, None, "ACEITO"
+        ))
+        ids_itens_orcamento = [
+            item_orcamento_repo.inserir(ItemOrcamento(
+                0, ids_orcamentos[1], id_item_demanda, id_item, 1, 90.0
+            ))
+            for id_item_demanda in ids_itens
+        ]
+        return id_casal, ids_orcamentos, ids_itens_orcamento
+
+    def test_contadores_mantidos_por_gatilhos(
+        self, test_db_migrado, lista_noivos_exemplo, fornecedor_exemplo
+    ):
+        """Os gatilhos mantêm os contadores em inserções, mudanças de status e exclusões"""
+        # Arrange
+        id_casal, ids_orcamentos, ids_itens_orcamento = self._criar_demanda_com_orcamentos(
+            lista_noivos_exemplo, fornecedor_exemplo
+        )
+        # Act
+        inicial = demanda_repo.obter_por_casal_com_contadores(id_casal)[0]
+        item_orcamento_repo.atualizar_status_item(ids_itens_orcamento[1], "ACEITO")
+        orcamento_repo.atualizar_status(ids_orcamentos[0], "ACEITO")
+        apos_aceite = demanda_repo.obter_por_casal_com_contadores(id_casal)[0]
+        status_orcamento = orcamento_repo.calcular_status_derivado(ids_orcamentos[1])
+        orcamento_repo.excluir(ids_orcamentos[1])
+        apos_exclusao = demanda_repo.obter_por_casal_com_contadores(id_casal)[0]
+        # Assert
+        assert (inicial.itens_total, inicial.itens_atendidos) == (2, 1)
+        assert (inicial.qtd_orcamentos, inicial.orcamentos_pendentes) == (2, 2)
+        assert inicial.percentual_atendimento == 50
+        assert apos_aceite.itens_atendidos == 2, "O segundo item passou a ter um aceite"
+        assert apos_aceite.orcamentos_pendentes == 1
+        assert status_orcamento == "PARCIALMENTE_ACEITO", "Um item aceito e um pendente"
+        assert (apos_exclusao.qtd_orcamentos, apos_exclusao.orcamentos_pendentes) == (1, 0)
+        assert apos_exclusao.itens_atendidos == 1, "A exclusão em cascata remove o aceite"
+
+    def test_recalcular_contadores_corrige_divergencias(
+        self, test_db_migrado, lista_noivos_exemplo, fornecedor_exemplo
+    ):
+        """A recontagem corrige contadores divergentes e não mexe nos corretos"""
+        # Arrange
+        id_casal, ids_orcamentos, _ = self._criar_demanda_com_orcamentos(
+            lista_noivos_exemplo, fornecedor_exemplo
+        )
+        with obter_conexao() as conexao:
+            conexao.execute("UPDATE demanda SET itens_total = 99, itens_atendidos = 0")
+            conexao.execute(
+                "UPDATE orcamento SET itens_pendentes = 7 WHERE id = ?",
+                (ids_orcamentos[1],),
+            )
+        # Act
+        corrigidas = recalcular_contadores()
+        conferencia = recalcular_contadores()
+        # Assert
+        demanda = demanda_repo.obter_por_casal_com_contadores(id_casal)[0]
+        assert corrigidas == {"orcamento": 1, "demanda": 1, "demanda_match": 0}
+        assert conferencia == {"orcamento": 0, "demanda": 0, "demanda_match": 0}, "Nada a corrigir na 2ª vez"
+        assert (demanda.itens_total, demanda.itens_atendidos) == (2, 1)
+
+    def test_obter_compativeis_com_fornecedor(
+        self, test_db_migrado, lista_noivos_exemplo, fornecedor_exemplo
+    ):
+        """Demandas ativas com item em categoria de item ativo do fornecedor, paginadas e filtradas"""
+        # Arrange
+        for noivo in lista_noivos_exemplo[:2]:
+            usuario_repo.inserir(noivo)
+        id_casal = casal_repo.inserir(Casal(0, 1, 2))
+        id_fornecedor = fornecedor_repo.inserir(fornecedor_exemplo)
+        assert id_casal is not None and id_fornecedor is not None
+        id_flores, id_buffet, id_som = [
+            categoria_repo.inserir(Categoria(0, nome, TipoFornecimento.SERVICO, None, True))
+            for nome in ("Flores", "Buffet", "Som")
+        ]
+        for id_categoria, ativo in ((id_flores, True), (id_buffet, True), (id_som, False)):
+            item_repo.inserir(Item(
+                0, id_fornecedor, TipoFornecimento.SERVICO, "Item", "Descrição",
+                Decimal("100.00"), id_categoria, ativo=ativo,
+            ))
+
+        def criar_demanda(cidade, categorias):
+            id_demanda = demanda_repo.inserir(Demanda(0, id_casal, "Demanda", cidade_casamento=cidade))
+            for id_categoria in categorias:
+                item_demanda_repo.inserir(ItemDemanda(
+                    0, id_demanda, TipoFornecimento.SERVICO, id_categoria, "Pedido", 1
+                ))
+            return id_demanda
+
+        id_vitoria = criar_demanda("Vitória", [id_flores, id_som])
+        id_serra = criar_demanda("Serra", [id_buffet, id_buffet])
+        criar_demanda("Serra", [id_som])  # só categoria de item inativo
+        id_finalizada = criar_demanda("Serra", [id_flores])
+        assert id_serra is not None and id_finalizada is not None
+        demanda_repo.atualizar_status(id_finalizada, StatusDemanda.FINALIZADA)
+        orcamento_repo.inserir(Orcamento(0, id_serra, id_fornecedor, datetime.now()))
+        # Act
+        pagina1, total = demanda_repo.obter_compativeis_com_fornecedor(id_fornecedor, tamanho_pagina=1)
+        pagina2, _ = demanda_repo.obter_compativeis_com_fornecedor(id_fornecedor, pagina=2, tamanho_pagina=1)
+        por_cidade, total_cidade = demanda_repo.obter_compativeis_com_fornecedor(id_fornecedor, cidade="VITÓRIA")
+        por_categoria, _ = demanda_repo.obter_compativeis_com_fornecedor(id_fornecedor, id_categoria=id_buffet)
+        # Assert
+        assert total == 2, "Só demandas ativas com item em categoria de item ativo do fornecedor"
+        assert total == demanda_repo.contar_compativeis_com_fornecedor(id_fornecedor)
+        serra, vitoria = pagina1[0], pagina2[0]
+        assert (serra.demanda.id, vitoria.demanda.id) == (id_serra, id_vitoria), "Mais recentes primeiro"
+        assert (serra.total_itens, len(serra.itens_compativeis)) == (2, 2)
+        assert (vitoria.total_itens, len(vitoria.itens_compativeis)) == (2, 1)
+        assert vitoria.itens_compativeis[0]["categoria_nome"] == "Flores"
+        assert serra.ja_tem_orcamento and not vitoria.ja_tem_orcamento
+        assert vitoria.nome_casal == f"{lista_noivos_exemplo[0].nome} & {lista_noivos_exemplo[1].nome}"
+        assert total_cidade == 1 and por_cidade[0].demanda.id == id_vitoria
+        assert [d.demanda.id for d in por_categoria] == [id_serra]
+
+    def test_obter_compativeis_fornecedor_sem_itens(self, test_db_migrado, fornecedor_exemplo):
+        """Fornecedor sem itens ativos não tem demandas compatíveis"""
+        # Arrange
+        id_fornecedor = fornecedor_repo.inserir(fornecedor_exemplo)
+        assert id_fornecedor is not None
+        # Act
+        demandas, total = demanda_repo.obter_compativeis_com_fornecedor(id_fornecedor)
+        # Assert
+        assert (demandas, total) == ([], 0)
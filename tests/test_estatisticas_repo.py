@@ -0,0 +1,97 @@
+from decimal import Decimal
+from core.models.categoria_model import Categoria
+from core.models.item_model import Item
+from core.models.tipo_fornecimento_model import TipoFornecimento
+from core.models.usuario_model import TipoUsuario
+from core.repositories.categoria_repo import categoria_repo
+from core.repositories.demanda_repo import demanda_repo
+from core.repositories.estatisticas_repo import estatisticas_repo
+from core.repositories.fornecedor_repo import fornecedor_repo
+from core.repositories.item_repo import item_repo
+from core.repositories.orcamento_repo import orcamento_repo
+from core.repositories.usuario_repo import usuario_repo
+
+
+def _item(
+    id_fornecedor: int,
+    tipo: TipoFornecimento,
+    id_categoria: int,
+    preco: float,
+    ativo: bool = True,
+) -> Item:
+    return Item(
+        id=0,
+        id_fornecedor=id_fornecedor,
+        tipo=tipo,
+        nome=f"Item {tipo.name}",
+        descricao="Descrição do item",
+        preco=Decimal(str(preco)),
+        id_categoria=id_categoria,
+        observacoes=None,
+        ativo=ativo,
+        data_cadastro=None,
+    )
+
+
+class TestEstatisticasRepo:
+    def test_estatisticas_banco_vazio(self, test_db_with_tables):
+        # Arrange
+        # Act
+        estatisticas = estatisticas_repo.obter_estatisticas()
+        # Assert
+        assert estatisticas.total_usuarios == 0
+        assert estatisticas.fornecedores_verificados == 0
+        assert estatisticas.detalhes_itens == [], "Sem itens não há detalhes por tipo"
+        assert estatisticas.gerado_em is not None, "Deveria informar quando foi gerada"
+
+    def test_estatisticas_iguais_as_contagens_individuais(
+        self, test_db_with_tables, usuario_factory, fornecedor_factory
+    ):
+        # Arrange
+        usuario_repo.inserir(usuario_factory.criar())
+        usuario_repo.inserir(usuario_factory.criar())
+        usuario_repo.inserir(usuario_factory.criar_admin())
+        id_vendedor = fornecedor_repo.inserir(fornecedor_factory.criar(verificado=True))
+        id_prestador = fornecedor_repo.inserir(fornecedor_factory.criar(verificado=False))
+        id_produto = categoria_repo.inserir(
+            Categoria(0, "Vestidos", TipoFornecimento.PRODUTO, None, True)
+        )
+        id_servico = categoria_repo.inserir(
+            Categoria(0, "Buffet", TipoFornecimento.SERVICO, None, True)
+        )
+        assert id_vendedor is not None and id_prestador is not None
+        assert id_produto is not None and id_servico is not None
+        item_repo.inserir(_item(id_vendedor, TipoFornecimento.PRODUTO, id_produto, 100))
+        item_repo.inserir(_item(id_vendedor, TipoFornecimento.PRODUTO, id_produto, 300))
+        item_repo.inserir(
+            _item(id_vendedor, TipoFornecimento.PRODUTO, id_produto, 999, ativo=False)
+        )
+        item_repo.inserir(_item(id_prestador, TipoFornecimento.SERVICO, id_servico, 50))
+        # Act
+        estatisticas = estatisticas_repo.obter_estatisticas()
+        # Assert
+        assert estatisticas.resumo_sistema() == {
+            "total_usuarios": usuario_repo.contar(),
+            "total_noivos": usuario_repo.contar_usuarios_por_tipo(TipoUsuario.NOIVO),
+            "total_admins": usuario_repo.contar_usuarios_por_tipo(TipoUsuario.ADMIN),
+            "total_fornecedores": fornecedor_repo.contar(),
+            "fornecedores_verificados": 1,
+            "fornecedores_nao_verificados": fornecedor_repo.contar_nao_verificados(),
+            "total_itens": item_repo.contar(),
+            "total_categorias": categoria_repo.contar(),
+            "total_orcamentos": orcamento_repo.contar(),
+            "total_demandas": demanda_repo.contar(),
+        }
+        assert estatisticas.resumo_itens() == {
+            "produtos": 3,
+            "servicos": 1,
+            "espacos": 0,
+        }
+        fornecedores = estatisticas.resumo_fornecedores()
+        assert fornecedores["vendedores"] == 1 and fornecedores["prestadores"] == 1
+        assert fornecedores["locadores"] == 0
+        detalhes = {d["tipo"]: d for d in estatisticas.detalhes_itens}
+        assert detalhes == {
+            d["tipo"]: dict(d) for d in item_repo.obter_estatisticas_itens()
+        }, "Os detalhes por tipo deveriam coincidir com obter_estatisticas_itens"
+        assert detalhes["PRODUTO"]["quantidade"] == 2, "Itens inativos ficam de fora"
@@ -0,0 +1,132 @@
+"""
+Testes para a execução das chamadas ao banco fora do event loop
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+from core.repositories import assincrono
+from core.repositories.usuario_repo import usuario_repo
+from infrastructure.database import (
+    bloco_assincrono,
+    executar_no_banco,
+    liberar_conexao,
+    obter_conexao,
+    obter_pool,
+    unidade_de_trabalho,
+)
+
+
+class TestExecutorBanco:
+    """Testes para executar_no_banco e os repositórios assíncronos"""
+
+    @pytest.mark.asyncio
+    async def test_repo_assincrono_mesmo_resultado(self, test_db_with_tables, usuario_factory):
+        """Os métodos assíncronos têm os mesmos nomes e retornos dos síncronos"""
+        # Arrange
+        id_usuario = usuario_repo.inserir(usuario_factory.criar(email="async@teste.com"))
+        # Act
+        usuario = await assincrono.usuario_repo.obter_por_id(id_usuario)
+        total = await assincrono.usuario_repo.contar()
+        thread = await executar_no_banco(threading.current_thread)
+        # Assert
+        assert usuario == usuario_repo.obter_por_id(id_usuario)
+        assert total == usuario_repo.contar() == 1
+        assert thread.name.startswith("banco"), "Deveria rodar no pool de threads do banco"
+        assert assincrono.categoria_repo.cache is assincrono.categoria_repo.sincrono.cache
+
+    @pytest.mark.asyncio
+    async def test_event_loop_livre_durante_consulta(self, test_db):
+        """Uma chamada lenta não impede as outras tarefas do loop de rodar"""
+        # Arrange
+        ticks = 0
+
+        async def relogio():
+            nonlocal ticks
+            for _ in range(5):
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        # Act
+        await asyncio.gather(executar_no_banco(time.sleep, 0.2), relogio())
+        # Assert
+        assert ticks == 5
+
+    @pytest.mark.asyncio
+    async def test_unidade_de_trabalho_vale_nas_threads(self, test_db_with_tables, usuario_factory):
+        """As chamadas da unidade usam a conexão dela, uma por vez, com commit único"""
+        # Arrange
+        ativas = 0
+        sobreposicoes = 0
+
+        def conexao_usada():
+            nonlocal ativas, sobreposicoes
+            ativas += 1
+            sobreposicoes += ativas > 1
+            time.sleep(0.05)
+            ativas -= 1
+            with obter_conexao() as conexao:
+                return conexao
+
+        # Act
+        with unidade_de_trabalho():
+            conexoes = await asyncio.gather(*(executar_no_banco(conexao_usada) for _ in range(3)))
+            await assincrono.usuario_repo.inserir(usuario_factory.criar(email="unidade@teste.com"))
+            with obter_pool().conexao() as outra:
+                visiveis_durante = outra.execute("SELECT COUNT(*) FROM usuario").fetchone()[0]
+        # Assert
+        assert len({id(c) for c in conexoes}) == 1, "Todas deveriam usar a conexão da unidade"
+        assert sobreposicoes == 0, "Chamadas da mesma unidade não deveriam rodar juntas"
+        assert visiveis_durante == 0, "A escrita só é confirmada ao final da unidade"
+        assert usuario_repo.contar() == 1
+
+    @pytest.mark.asyncio
+    async def test_bloco_assincrono_desfaz_so_o_bloco(self, test_db_with_tables, usuario_factory):
+        """Um bloco async que falha desfaz só as suas escritas, sem usar o event loop"""
+        # Arrange
+        threads = []
+
+        def registrar_thread(sql):
+            if sql.startswith(("SAVEPOINT", "RELEASE", "ROLLBACK TO")):
+                threads.append(threading.current_thread().name)
+
+        # Act
+        with unidade_de_trabalho() as unidade:
+            await assincrono.usuario_repo.inserir(usuario_factory.criar(email="fora@teste.com"))
+            unidade.conexao.set_trace_callback(registrar_thread)
+            with pytest.raises(ValueError):
+                async with bloco_assincrono():
+                    await assincrono.usuario_repo.inserir(usuario_factory.criar(email="dentro@teste.com"))
+                    raise ValueError("falha no bloco")
+            unidade.conexao.set_trace_callback(None)
+        async with bloco_assincrono():
+            await assincrono.usuario_repo.inserir(usuario_factory.criar(email="sozinho@teste.com"))
+        # Assert
+        assert usuario_repo.obter_usuario_por_email("fora@teste.com") is not None
+        assert usuario_repo.obter_usuario_por_email("dentro@teste.com") is None
+        assert usuario_repo.obter_usuario_por_email("sozinho@teste.com") is not None
+        assert threads, "SAVEPOINT, ROLLBACK TO e RELEASE deveriam ter rodado"
+        assert all(nome.startswith("banco") for nome in threads), "Deveriam rodar nas threads do banco"
+
+    @pytest.mark.asyncio
+    async def test_liberar_conexao_devolve_ao_pool(self, test_db_with_tables, usuario_factory):
+        """A unidade confirma, devolve a conexão durante a espera e empresta outra depois"""
+        # Arrange
+        pool = obter_pool()
+        # Act
+        with unidade_de_trabalho() as unidade:
+            await assincrono.usuario_repo.inserir(usuario_factory.criar(email="antes@teste.com"))
+            ociosas_antes = pool.conexoes_ociosas
+            await liberar_conexao()
+            conectada_na_espera = unidade.conectada
+            ociosas_na_espera = pool.conexoes_ociosas
+            with pool.conexao() as outra:
+                visiveis_na_espera = outra.execute("SELECT COUNT(*) FROM usuario").fetchone()[0]
+            await assincrono.usuario_repo.inserir(usuario_factory.criar(email="depois@teste.com"))
+            conectada_depois = unidade.conectada
+        # Assert
+        assert not conectada_na_espera and conectada_depois
+        assert ociosas_na_espera == ociosas_antes + 1, "A conexão deveria voltar ao pool"
+        assert visiveis_na_espera == 1, "As escritas anteriores já deveriam estar confirmadas"
+        assert usuario_repo.contar() == 2
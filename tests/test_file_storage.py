@@ -0,0 +1,144 @@
+"""
+Testes para o índice em memória dos arquivos de imagem e as URLs versionadas
+"""
+import os
+import stat
+from typing import List
+
+import pytest
+from starlette.applications import Starlette
+from starlette.testclient import TestClient
+from util import file_storage
+from util.file_storage import FileStorageManager, IndiceArquivos, TipoArquivo
+from util.static_files import ArquivosEstaticos
+from util.template_helpers import url_estatica
+
+
+@pytest.fixture
+def indice(tmp_path, monkeypatch):
+    """Índice novo, sem reconferência automática, sobre um diretório temporário"""
+    indice = IndiceArquivos(intervalo_verificacao=3600)
+    monkeypatch.setattr(FileStorageManager, "indice", indice)
+    monkeypatch.setattr(FileStorageManager, "BASE_DIR", str(tmp_path))
+    return indice
+
+
+class TestIndiceArquivos:
+    """Testes para IndiceArquivos e seu uso por FileStorageManager"""
+
+    def test_consultas_sem_acessar_o_disco(self, indice, monkeypatch):
+        """Depois da carga, as consultas são só buscas no índice"""
+        # Arrange
+        FileStorageManager.gravar(FileStorageManager.obter_caminho(TipoArquivo.ITEM, 3, fisico=True), b"x")
+        FileStorageManager.indice.invalidar()
+        leituras: List[str] = []
+        original = IndiceArquivos._modificado_em
+
+        def modificado_em(diretorio: str):
+            leituras.append(diretorio)
+            return original(diretorio)
+
+        monkeypatch.setattr(IndiceArquivos, "_modificado_em", staticmethod(modificado_em))
+        # Act
+        urls = [FileStorageManager.obter_ou_padrao(TipoArquivo.ITEM, i) for i in range(1, 101)]
+        # Assert
+        assert urls[2].startswith("/static/img/itens/000003.jpg?v=")
+        assert urls.count(FileStorageManager.DEFAULTS[TipoArquivo.ITEM]) == 99
+        assert indice.cargas == 2 and len(leituras) == 2, "Uma carga por diretório (itens e imagens padrão)"
+
+    def test_gravar_e_excluir_atualizam_o_indice(self, indice):
+        """Gravações e exclusões pelo FileStorageManager valem na hora"""
+        # Arrange
+        FileStorageManager.carregar_indice()
+        caminho = FileStorageManager.obter_caminho(TipoArquivo.USUARIO, 5, fisico=True)
+        # Act
+        FileStorageManager.gravar(caminho, b"jpg")
+        existe_apos_gravar = FileStorageManager.arquivo_existe(TipoArquivo.USUARIO, 5)
+        FileStorageManager.excluir(TipoArquivo.USUARIO, 5)
+        # Assert
+        assert existe_apos_gravar
+        assert not FileStorageManager.arquivo_existe(TipoArquivo.USUARIO, 5)
+        assert FileStorageManager.listar_arquivos(TipoArquivo.USUARIO) == []
+        assert indice.cargas == 2, "Só a carga inicial de cada diretório"
+
+    def test_gravar_usa_permissoes_de_arquivo_comum(self, indice):
+        """O arquivo final não herda o 0600 do temporário do mkstemp"""
+        # Arrange
+        caminho = FileStorageManager.obter_caminho(TipoArquivo.ITEM, 7, fisico=True)
+        # Act
+        FileStorageManager.gravar(caminho, b"jpg")
+        # Assert
+        assert stat.S_IMODE(os.stat(caminho).st_mode) == file_storage.PERMISSAO_ARQUIVO == 0o644
+
+    def test_arquivo_gravado_por_outro_processo(self, indice, tmp_path):
+        """Arquivos criados por fora aparecem quando o diretório é reconferido"""
+        # Arrange
+        FileStorageManager.carregar_indice()
+        (tmp_path / "itens").mkdir()
+        (tmp_path / "itens" / "000009.jpg").write_bytes(b"jpg")
+        # Act
+        antes = FileStorageManager.arquivo_existe(TipoArquivo.ITEM, 9)
+        indice.intervalo_verificacao = 0
+        depois = FileStorageManager.arquivo_existe(TipoArquivo.ITEM, 9)
+        # Assert
+        assert not antes, "Dentro do intervalo vale o índice"
+        assert depois, "A data de modificação do diretório mudou"
+
+
+class TestArquivosEstaticos:
+    """Testes para as URLs versionadas e o servidor de estáticos"""
+
+    @pytest.fixture
+    def cliente(self, tmp_path, indice, monkeypatch):
+        """App com /static servido de um diretório temporário"""
+        monkeypatch.setattr(FileStorageManager, "STATIC_DIR", str(tmp_path))
+        app = Starlette()
+        app.mount("/static", ArquivosEstaticos(directory=str(tmp_path)), name="static")
+        return TestClient(app)
+
+    def test_url_muda_quando_o_arquivo_e_regravado(self, indice, tmp_path):
+        """A versão na URL acompanha o conteúdo do arquivo"""
+        # Arrange
+        caminho = FileStorageManager.obter_caminho(TipoArquivo.ITEM, 4, fisico=True)
+        FileStorageManager.gravar(caminho, b"primeira")
+        # Act
+        url_antes = FileStorageManager.obter_ou_padrao(TipoArquivo.ITEM, 4)
+        url_repetida = FileStorageManager.obter_ou_padrao(TipoArquivo.ITEM, 4)
+        FileStorageManager.gravar(caminho, b"segunda versao")
+        url_depois = FileStorageManager.obter_ou_padrao(TipoArquivo.ITEM, 4)
+        # Assert
+        assert url_antes == url_repetida
+        assert url_antes != url_depois
+        assert url_depois.startswith("/static/img/itens/000004.jpg?v=")
+
+    def test_url_versionada_imutavel(self, cliente, tmp_path):
+        """Com a versão atual na URL o arquivo é servido com cache immutable"""
+        # Arrange
+        (tmp_path / "css").mkdir()
+        (tmp_path / "css" / "estilo.css").write_text("body { color: red }")
+        url = url_estatica("css/estilo.css")
+        # Act
+        resposta = cliente.get(url)
+        sem_versao = cliente.get("/static/css/estilo.css")
+        versao_antiga = cliente.get("/static/css/estilo.css?v=0000000000000000")
+        # Assert
+        assert url.startswith("/static/css/estilo.css?v=")
+        assert resposta.status_code == 200 and resposta.text == "body { color: red }"
+        assert resposta.headers["cache-control"] == ArquivosEstaticos.CACHE_IMUTAVEL
+        assert resposta.headers["etag"] == f'"{url.split("?v=")[1]}"'
+        assert sem_versao.headers["cache-control"] == "no-cache"
+        assert versao_antiga.headers["cache-control"] == "no-cache", "Versão antiga não pode ser imutável"
+
+    def test_if_none_match_e_range(self, cliente, tmp_path):
+        """Revalidação devolve 304 e pedidos parciais devolvem 206"""
+        # Arrange
+        (tmp_path / "video.bin").write_bytes(bytes(range(100)))
+        etag = cliente.get("/static/video.bin").headers["etag"]
+        # Act
+        revalidacao = cliente.get("/static/video.bin", headers={"If-None-Match": etag})
+        parcial = cliente.get("/static/video.bin", headers={"Range": "bytes=10-19"})
+        # Assert
+        assert revalidacao.status_code == 304
+        assert revalidacao.headers["etag"] == etag and "cache-control" in revalidacao.headers
+        assert parcial.status_code == 206
+        assert parcial.content == bytes(range(10, 20))
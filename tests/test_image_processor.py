@@ -0,0 +1,215 @@
+"""
+Testes para o processamento de imagens no pool de processos
+"""
+import asyncio
+import re
+from io import BytesIO
+from typing import BinaryIO, cast
+
+import pytest
+from fastapi import UploadFile
+from PIL import Image
+from starlette.datastructures import Headers
+
+import util.image_processor as image_processor
+from config.constants import ImageConstants
+from util.exceptions import SobrecargaError
+from util.file_storage import FileStorageManager, TipoArquivo
+from util.image_processor import FilaImagens, ImageProcessor
+from util.template_helpers import foto_item_responsiva
+
+
+def _png(largura: int = 800, altura: int = 400) -> bytes:
+    saida = BytesIO()
+    Image.new("RGBA", (largura, altura), (200, 30, 30, 255)).save(saida, "PNG")
+    return saida.getvalue()
+
+
+def _upload(conteudo: bytes, tipo: str = "image/png") -> UploadFile:
+    return UploadFile(file=BytesIO(conteudo), filename="foto.png", headers=Headers({"content-type": tipo}))
+
+
+@pytest.fixture
+def fila():
+    fila = FilaImagens(processos=1, tamanho_fila=0, timeout=30)
+    yield fila
+    fila.encerrar()
+
+
+class TestImageProcessor:
+    """Testes para ImageProcessor e FilaImagens"""
+
+    @pytest.mark.asyncio
+    async def test_processa_e_salva_fora_do_event_loop(self, fila, tmp_path, monkeypatch):
+        """A imagem é redimensionada no pool e gravada como JPEG quadrado"""
+        # Arrange
+        monkeypatch.setattr(image_processor, "fila_imagens", fila)
+        monkeypatch.setattr(FileStorageManager, "BASE_DIR", str(tmp_path))
+        destino = tmp_path / "usuarios" / "000001.jpg"
+        lado = FileStorageManager.VARIANTES[TipoArquivo.USUARIO]["detail"]
+        # Act
+        sucesso, erro = await ImageProcessor.processar_e_salvar_variantes(
+            _upload(_png()), TipoArquivo.USUARIO, 1
+        )
+        # Assert
+        assert sucesso and erro is None
+        with Image.open(destino) as imagem:
+            assert imagem.format == "JPEG" and imagem.size == (lado, lado)
+        caminhos = FileStorageManager.caminhos_variantes(TipoArquivo.USUARIO, 1, fisico=True)
+        assert sorted(map(str, destino.parent.iterdir())) == sorted(caminhos.values()), (
+            "Não deveria sobrar arquivo temporário"
+        )
+        metricas = fila.metricas()
+        assert metricas["processadas"] == 1 and metricas["fila"] == 0
+        assert metricas["tempo_maximo_ms"] > 0
+
+    @pytest.mark.asyncio
+    async def test_fila_cheia_recusa_com_sobrecarga(self, fila):
+        """Com o processo e a fila ocupados, a próxima imagem é recusada na hora"""
+        # Arrange
+        lados = FileStorageManager.VARIANTES[TipoArquivo.ITEM]
+        primeira = asyncio.create_task(fila.executar(image_processor._gerar_variantes, _png(), lados, 85))
+        await asyncio.sleep(0)
+        # Act
+        with pytest.raises(SobrecargaError) as erro:
+            await fila.executar(image_processor._gerar_variantes, _png(), lados, 85)
+        await primeira
+        # Assert
+        assert erro.value.codigo_erro == "SOBRECARGA"
+        assert fila.metricas()["rejeitadas"] == 1
+        assert fila.metricas()["processadas"] == 1
+
+    @pytest.mark.asyncio
+    async def test_timeout_nao_grava_arquivo(self, tmp_path, monkeypatch):
+        """Processamento que excede o timeout falha sem gravar a imagem"""
+        # Arrange
+        fila = FilaImagens(processos=1, tamanho_fila=0, timeout=0.001)
+        monkeypatch.setattr(image_processor, "fila_imagens", fila)
+        monkeypatch.setattr(FileStorageManager, "BASE_DIR", str(tmp_path))
+        destino = tmp_path / "itens" / "000001.jpg"
+        # Act
+        try:
+            sucesso, erro = await ImageProcessor.processar_e_salvar_variantes(_upload(_png()), TipoArquivo.ITEM, 1)
+        finally:
+            fila.encerrar()
+        # Assert
+        assert not sucesso and erro is not None and "Tempo esgotado" in erro
+        assert not destino.exists()
+        assert fila.metricas()["expiradas"] == 1
+
+    @pytest.mark.asyncio
+    async def test_imagem_invalida(self, fila, tmp_path, monkeypatch):
+        """Conteúdo que não é imagem é recusado pelos bytes iniciais, antes do pool"""
+        # Arrange
+        monkeypatch.setattr(image_processor, "fila_imagens", fila)
+        # Act
+        sucesso, erro = await ImageProcessor.processar_e_salvar_variantes(
+            _upload(b"nao sou uma imagem", tipo="image/png"), TipoArquivo.ITEM, 1
+        )
+        # Assert
+        assert not sucesso and erro is not None and erro.startswith("Tipo de arquivo inválido")
+        assert fila.metricas()["processadas"] == fila.metricas()["falhas"] == 0
+
+    @pytest.mark.asyncio
+    async def test_upload_grande_interrompido(self, fila, tmp_path, monkeypatch):
+        """A leitura para assim que o limite é ultrapassado, sem ler o resto"""
+        # Arrange
+        monkeypatch.setattr(image_processor, "fila_imagens", fila)
+
+        class ArquivoSemFim:
+            lidos = 0
+
+            def read(self, tamanho=-1):
+                bloco = (b"\xff\xd8\xff" if not self.lidos else b"") + b"\0" * tamanho
+                self.lidos += len(bloco)
+                return bloco
+
+        arquivo = ArquivoSemFim()
+        # Act
+        sucesso, erro = await ImageProcessor.processar_e_salvar_variantes(
+            UploadFile(file=cast(BinaryIO, arquivo), filename="foto.jpg", headers=Headers({"content-type": "image/jpeg"})),
+            TipoArquivo.ITEM,
+            1,
+        )
+        # Assert
+        assert not sucesso and erro is not None and erro.startswith("Arquivo muito grande")
+        assert arquivo.lidos <= ImageProcessor.TAMANHO_MAXIMO_BYTES + ImageConstants.UPLOAD_CHUNK_SIZE + 3
+
+    @pytest.mark.asyncio
+    async def test_bomba_de_descompressao(self, fila, tmp_path, monkeypatch):
+        """Arquivo pequeno com resolução enorme é recusado pelo cabeçalho"""
+        # Arrange
+        monkeypatch.setattr(image_processor, "fila_imagens", fila)
+        saida = BytesIO()
+        Image.new("1", (10000, 5000)).save(saida, "PNG")
+        # Act
+        sucesso, erro = await ImageProcessor.processar_e_salvar_variantes(
+            _upload(saida.getvalue()), TipoArquivo.ITEM, 1
+        )
+        # Assert
+        assert len(saida.getvalue()) < 100 * 1024
+        assert not sucesso and erro is not None and erro.startswith("Resolução muito alta (10000x5000)")
+        assert fila.metricas()["processadas"] == 0
+
+    def test_jpeg_decodificado_reduzido(self):
+        """JPEGs grandes são abertos já na escala mais próxima do tamanho final"""
+        # Arrange
+        saida = BytesIO()
+        Image.new("RGB", (2400, 1200), (10, 120, 60)).save(saida, "JPEG")
+        # Act
+        imagem = image_processor._abrir(saida.getvalue(), (600, 600))
+        # Assert
+        assert imagem.size == (600, 300), "Deveria decodificar em 1/4 da resolução"
+
+    @pytest.mark.asyncio
+    async def test_variantes_em_webp_e_jpeg(self, fila, tmp_path, monkeypatch):
+        """Cada variante do tipo é gravada nos dois formatos, no lado configurado"""
+        # Arrange
+        monkeypatch.setattr(image_processor, "fila_imagens", fila)
+        monkeypatch.setattr(FileStorageManager, "BASE_DIR", str(tmp_path))
+        # Act
+        sucesso, erro = await ImageProcessor.processar_e_salvar_variantes(
+            _upload(_png()), TipoArquivo.ITEM, 42
+        )
+        # Assert
+        assert sucesso and erro is None
+        lados = FileStorageManager.VARIANTES[TipoArquivo.ITEM]
+        caminhos = FileStorageManager.caminhos_variantes(TipoArquivo.ITEM, 42, fisico=True)
+        assert len(caminhos) == len(lados) * 2
+        for (variante, formato), caminho in caminhos.items():
+            with Image.open(caminho) as imagem:
+                assert imagem.format == {"webp": "WEBP", "jpg": "JPEG"}[formato]
+                assert imagem.size == (lados[variante], lados[variante])
+        assert caminhos[("detail", "jpg")] == FileStorageManager.obter_caminho(TipoArquivo.ITEM, 42, fisico=True)
+        assert FileStorageManager.variantes_existem(TipoArquivo.ITEM, 42)
+        assert FileStorageManager.listar_arquivos(TipoArquivo.ITEM) == [42]
+        # Act
+        excluido = FileStorageManager.excluir(TipoArquivo.ITEM, 42)
+        # Assert
+        assert excluido
+        assert list((tmp_path / "itens").iterdir()) == [], "As variantes deveriam ser excluídas junto"
+
+    def test_helper_srcset(self, tmp_path, monkeypatch):
+        """Com variantes o helper gera <picture> com srcset; sem elas, um <img> simples"""
+        # Arrange
+        monkeypatch.setattr(FileStorageManager, "BASE_DIR", str(tmp_path))
+        FileStorageManager.gravar(str(tmp_path / "itens" / "000007.jpg"), b"jpg")
+        # Act
+        sem_variantes = foto_item_responsiva(7, "50vw", alt='Bolo "3 andares"', class_="w-100")
+        for caminho in FileStorageManager.caminhos_variantes(TipoArquivo.ITEM, 7, fisico=True).values():
+            FileStorageManager.gravar(caminho, b"")
+        html_variantes = foto_item_responsiva(7, "50vw", alt="Bolo", class_="w-100", loading="lazy")
+        sem_foto = foto_item_responsiva(8)
+        versoes = re.findall(r"\?v=[0-9a-f]{16}", html_variantes)
+        com_variantes = re.sub(r"\?v=[0-9a-f]{16}", "", html_variantes)
+        # Assert
+        assert re.fullmatch(
+            r'<img src="/static/img/itens/000007\.jpg\?v=[0-9a-f]{16}" alt="Bolo &#34;3 andares&#34;" class="w-100">',
+            sem_variantes
+        )
+        assert len(versoes) == 7, "Todas as URLs levam a versão do arquivo"
+        assert '<source type="image/webp" srcset="/static/img/itens/000007-thumb.webp 150w, ' in com_variantes
+        assert 'srcset="/static/img/itens/000007-thumb.jpg 150w, /static/img/itens/000007-card.jpg 400w, ' \
+               '/static/img/itens/000007.jpg 600w" sizes="50vw"' in com_variantes
+        assert 'alt="Bolo" class="w-100" loading="lazy"></picture>' in com_variantes
+        assert sem_foto == '<img src="/static/img/item-default.svg">'
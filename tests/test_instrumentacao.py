@@ -0,0 +1,85 @@
+"""
+Testes para a medição das instruções SQL e o log de consultas lentas
+"""
+import pytest
+from core.repositories.usuario_repo import usuario_repo
+from core.sql import usuario_sql
+from infrastructure.database import perfil_sql, normalizar_sql, obter_conexao
+
+
+@pytest.fixture
+def estatisticas(test_db_with_tables):
+    """Estatísticas zeradas depois da criação das tabelas"""
+    perfil_sql.zerar()
+    yield perfil_sql
+    perfil_sql.zerar()
+
+
+class TestInstrumentacaoSql:
+    """Testes para CursorInstrumentado e EstatisticasSql"""
+
+    def test_normalizar_sql(self):
+        """Literais e listas de IN viram marcadores"""
+        # Arrange
+        sql = "SELECT *\n  FROM item i WHERE i.id IN (?, ?,?) AND nome = 'Bolo ''3''' LIMIT 10;"
+        # Act
+        normalizado = normalizar_sql(sql)
+        # Assert
+        assert normalizado == "SELECT * FROM item i WHERE i.id IN (...) AND nome = ? LIMIT ?"
+
+    def test_execucoes_agrupadas_por_instrucao(self, estatisticas, usuario_factory):
+        """Cada execução soma tempo e linhas (inclusive as lidas depois) à sua instrução"""
+        # Arrange
+        ids = [usuario_repo.inserir(usuario_factory.criar(email=f"usuario{i}@teste.com")) for i in range(3)]
+        # Act
+        for id_usuario in ids:
+            usuario_repo.obter_por_id(id_usuario)
+        usuario_repo.listar_todos()
+        relatorio = {linha["sql"]: linha for linha in estatisticas.relatorio(limite=500)}
+        # Assert
+        por_id = relatorio[normalizar_sql(usuario_sql.OBTER_POR_ID)]
+        inserir = relatorio[normalizar_sql(usuario_sql.INSERIR)]
+        assert por_id["quantidade"] == 3 and por_id["linhas"] == 3
+        assert inserir["quantidade"] == 3 and inserir["linhas"] == 3, "Em escritas, linhas afetadas"
+        assert all(linha["p50_ms"] <= linha["p95_ms"] <= linha["tempo_maximo_ms"] for linha in relatorio.values())
+
+    def test_consulta_lenta_com_plano(self, estatisticas, monkeypatch, usuario_factory):
+        """Acima do limite a execução vai para o log de lentas, com o EXPLAIN QUERY PLAN"""
+        # Arrange
+        usuario_repo.inserir(usuario_factory.criar(email="lento@teste.com"))
+        monkeypatch.setattr(estatisticas, "limite_lenta", 0.0)
+        # Act
+        with obter_conexao() as conexao:
+            linhas = conexao.execute("SELECT * FROM usuario WHERE email = ?", ("lento@teste.com",)).fetchall()
+        lentas = estatisticas.consultas_lentas()
+        # Assert
+        assert len(linhas) == 1
+        assert lentas[0]["sql"] == "SELECT * FROM usuario WHERE email = ?"
+        assert lentas[0]["plano"] and any("usuario" in passo for passo in lentas[0]["plano"])
+
+    def test_iteracao_soma_uma_vez(self, estatisticas, monkeypatch, usuario_factory):
+        """Linhas lidas iterando o cursor são somadas de uma vez, no fim ou no close"""
+        # Arrange
+        for i in range(5):
+            usuario_repo.inserir(usuario_factory.criar(email=f"iterado{i}@teste.com"))
+        leituras = []
+        original = estatisticas.somar_leitura
+
+        def somar_leitura(instrucao, execucao, tempo, linhas):
+            leituras.append(linhas)
+            original(instrucao, execucao, tempo, linhas)
+
+        monkeypatch.setattr(estatisticas, "somar_leitura", somar_leitura)
+        # Act
+        with obter_conexao() as conexao:
+            todas = list(conexao.execute("SELECT id FROM usuario"))
+            cursor = conexao.execute("SELECT id FROM usuario LIMIT 3")
+            primeira = next(cursor)
+            next(cursor)
+            cursor.close()
+        relatorio = {linha["sql"]: linha for linha in estatisticas.relatorio(limite=500)}
+        # Assert
+        assert len(todas) == 5 and primeira
+        assert leituras == [5, 2], "Uma soma por cursor, e não uma por linha"
+        assert relatorio["SELECT id FROM usuario"]["linhas"] == 5
+        assert relatorio["SELECT id FROM usuario LIMIT ?"]["linhas"] == 2
@@ -351,6 +351,20 @@ class TestItemOrcamentoRepo:
         # Assert
         assert total_aceitos == 2, "Deveria contar 2 itens aceitos"
 
+    def test_contar_por_orcamentos(self, test_db, item_orcamento_factory, item_demanda_factory):
+        """Testa contagem de itens de vários orçamentos em uma consulta"""
+        # Arrange
+        dados = setup_test_data()
+        outro = Orcamento(id=0, id_demanda=dados["id_demanda"], id_fornecedor_prestador=dados["id_fornecedor"], data_hora_cadastro=datetime.now())
+        id_outro = orcamento_repo.inserir(outro)
+        for descricao in ("Item Demanda 1", "Item Demanda 2"):
+            id_item_demanda = item_demanda_repo.inserir(item_demanda_factory.criar(id=0, id_demanda=dados["id_demanda"], id_categoria=1, descricao=descricao))
+            item_orcamento_repo.inserir(item_orcamento_factory.criar(id_orcamento=dados["id_orcamento"], id_item_demanda=id_item_demanda, id_item=dados["id_item"]))
+        # Act
+        totais = item_orcamento_repo.contar_por_orcamentos([dados["id_orcamento"], id_outro, dados["id_orcamento"]])
+        # Assert
+        assert totais == {dados["id_orcamento"]: 2, id_outro: 0}
+
     def test_contar_por_item_demanda(self, test_db, item_orcamento_factory, item_demanda_factory):
         """Testa contagem de itens por item_demanda (linhas 170-174)"""
         # Arrange
@@ -626,4 +626,96 @@ class TestItemRepo:
         # Act & Assert - obter_por_id lança exceção quando não encontra
         from core.repositories.item_repo import validar_categoria_para_tipo
         with pytest.raises(RecursoNaoEncontradoError):
-            validar_categoria_para_tipo(TipoFornecimento.PRODUTO, 999)
\ No newline at end of file
+            validar_categoria_para_tipo(TipoFornecimento.PRODUTO, 999)
+
+
+class TestItemRepoBuscaTextual:
+    """Testes para a busca textual (FTS5) do catálogo público"""
+
+    @pytest.fixture
+    def catalogo(self, test_db_migrado, fornecedor_exemplo):
+        """Catálogo com dois produtos de doces e um serviço de buffet"""
+        id_fornecedor = fornecedor_repo.inserir(fornecedor_exemplo)
+        assert id_fornecedor is not None
+        id_doces = categoria_repo.inserir(
+            Categoria(0, "Doces", TipoFornecimento.PRODUTO, "Doces finos", True)
+        )
+        id_buffet = categoria_repo.inserir(
+            Categoria(0, "Buffet", TipoFornecimento.SERVICO, "Buffet completo", True)
+        )
+        ids = {
+            "bolo": item_repo.inserir(Item(0, id_fornecedor, TipoFornecimento.PRODUTO, "Bolo de Chocolate",
+                                           "Bolo com café e cobertura", Decimal(50), id_doces, None, True, None)),
+            "torta": item_repo.inserir(Item(0, id_fornecedor, TipoFornecimento.PRODUTO, "Torta de Morango",
+                                            "Torta saborosa", Decimal(60), id_doces, "Acompanha bolo", True, None)),
+            "jantar": item_repo.inserir(Item(0, id_fornecedor, TipoFornecimento.SERVICO, "Jantar Completo",
+                                             "Serviço de jantar", Decimal(900), id_buffet, None, True, None)),
+        }
+        return ids, id_doces, id_buffet
+
+    def test_busca_sem_acento_e_por_prefixo(self, catalogo):
+        """A busca ignora acentos e aceita o começo de uma palavra"""
+        # Act
+        itens, total = item_repo.buscar_itens_publicos("cafe")
+        prefixo, _ = item_repo.buscar_itens_publicos("choc")
+        # Assert
+        assert total == 1
+        assert itens[0]["nome"] == "Bolo de Chocolate"
+        assert "\x02café\x03" in itens[0]["trecho"]
+        assert prefixo[0]["nome"] == "Bolo de Chocolate"
+
+    def test_relevancia_prioriza_nome(self, catalogo):
+        """O termo no nome pesa mais que nas observações (BM25)"""
+        # Act
+        itens, total = item_repo.buscar_itens_publicos("bolo")
+        # Assert
+        assert total == 2
+        assert itens[0]["nome"] == "Bolo de Chocolate", "Termo no nome deve pesar mais que nas observações"
+
+    def test_busca_por_categoria_e_filtros(self, catalogo):
+        """O nome da categoria é pesquisável e os filtros de tipo se aplicam"""
+        ids, id_doces, id_buffet = catalogo
+        # Act
+        por_categoria, _ = item_repo.buscar_itens_publicos("buffet")
+        filtrado, total = item_repo.buscar_itens_publicos("bolo", tipo="servico")
+        # Assert
+        assert [i["id"] for i in por_categoria] == [ids["jantar"]]
+        assert total == 0 and filtrado == []
+
+    def test_indice_sincronizado_com_alteracoes(self, catalogo):
+        """Atualizações e desativações refletem no índice de busca"""
+        ids, _, _ = catalogo
+        # Arrange
+        item = item_repo.obter_por_id(ids["jantar"])
+        assert item is not None
+        item.nome = "Coquetel Volante"
+        # Act
+        item_repo.atualizar(item)
+        item_repo.desativar_item_admin(ids["torta"])
+        # Assert
+        assert item_repo.buscar_itens_publicos("jantar completo")[1] == 0
+        assert item_repo.buscar_itens_publicos("coquetel")[1] == 1
+        assert item_repo.buscar_itens_publicos("morango")[1] == 0
+
+    def test_busca_sem_palavras_lista_todos(self, catalogo):
+        """Um termo só com pontuação lista todo o catálogo"""
+        # Act
+        itens, total = item_repo.buscar_itens_publicos('"*')
+        # Assert
+        assert total == 3
+
+    def test_listagem_publica_por_cursor(self, catalogo):
+        """A listagem pública pagina por cursor, mais recentes primeiro"""
+        ids, _, _ = catalogo
+        # Act
+        primeira = item_repo.obter_itens_publicos_cursor(tamanho_pagina=2)
+        segunda = item_repo.obter_itens_publicos_cursor(
+            cursor=primeira.next_cursor, tamanho_pagina=2, contar=False
+        )
+        produtos = item_repo.obter_itens_publicos_cursor(tipo="produto")
+        # Assert
+        assert [i["id"] for i in primeira.items] == [ids["jantar"], ids["torta"]]
+        assert [i["id"] for i in segunda.items] == [ids["bolo"]]
+        assert primeira.total_items == 3 and segunda.total_items is None
+        assert segunda.next_cursor is None and segunda.previous_cursor
+        assert produtos.total_items == 2
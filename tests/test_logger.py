@@ -0,0 +1,97 @@
+"""
+Testes para o logging estruturado em segundo plano
+"""
+import json
+import logging
+import random
+import threading
+
+import pytest
+
+from infrastructure.logging.logger import CaseBemLogger
+
+
+class _Observado:
+    """Valor de contexto que anota em que thread foi serializado"""
+
+    def __init__(self):
+        self.threads = []
+
+    def __str__(self):
+        self.threads.append(threading.current_thread().name)
+        return "observado"
+
+
+@pytest.fixture
+def log_em_arquivo(tmp_path, monkeypatch):
+    """CaseBemLogger próprio, escrevendo em um arquivo temporário"""
+    arquivo = tmp_path / "casebem.log"
+    monkeypatch.setenv("LOG_FILE", str(arquivo))
+    instancia = CaseBemLogger(f"casebem_teste_{tmp_path.name}")
+    instancia.logger.propagate = False
+    yield instancia, arquivo
+    instancia.encerrar()
+    for handler in list(instancia.logger.handlers):
+        instancia.logger.removeHandler(handler)
+
+
+def _linhas(instancia, arquivo):
+    instancia.encerrar()
+    return [json.loads(linha) for linha in arquivo.read_text(encoding="utf-8").splitlines()]
+
+
+class TestCaseBemLogger:
+    """Testes para CaseBemLogger"""
+
+    def test_linhas_json_serializadas_no_listener(self, log_em_arquivo):
+        """Cada registro vira uma linha JSON, montada fora da thread de quem registra"""
+        # Arrange
+        instancia, arquivo = log_em_arquivo
+        valor = _Observado()
+        # Act
+        instancia.info("Registro inserido", id_inserido=7, objeto=valor, chaves=(1, 2))
+        try:
+            raise ValueError("falhou")
+        except ValueError as erro:
+            instancia.error("Erro ao gravar", erro=erro, exc_info=True)
+        linhas = _linhas(instancia, arquivo)
+        # Assert
+        assert linhas[0]["mensagem"] == "Registro inserido" and linhas[0]["nivel"] == "INFO"
+        assert linhas[0]["id_inserido"] == 7 and linhas[0]["chaves"] == [1, 2]
+        assert linhas[0]["objeto"] == "observado"
+        assert valor.threads and threading.current_thread().name not in valor.threads
+        assert linhas[1]["tipo_erro_original"] == "ValueError"
+        assert "ValueError: falhou" in linhas[1]["excecao"]
+
+    def test_nivel_desabilitado_nao_faz_trabalho(self, log_em_arquivo):
+        """Abaixo do nível, o contexto nem chega a ser serializado"""
+        # Arrange
+        instancia, arquivo = log_em_arquivo
+        instancia.logger.setLevel(logging.WARNING)
+        valor = _Observado()
+        # Act
+        instancia.info("Listagem realizada", objeto=valor)
+        instancia.debug("Detalhe", objeto=valor)
+        instancia.warning("Aviso")
+        linhas = _linhas(instancia, arquivo)
+        # Assert
+        assert [linha["mensagem"] for linha in linhas] == ["Aviso"]
+        assert valor.threads == []
+
+    def test_amostragem(self, log_em_arquivo, monkeypatch):
+        """Com amostra, só a fração sorteada é registrada e a linha informa a fração"""
+        # Arrange
+        instancia, arquivo = log_em_arquivo
+        sorteios = iter([0.5, 0.05, 0.99])
+        monkeypatch.setattr(random, "random", lambda: next(sorteios))
+        # Act
+        for pagina in range(3):
+            instancia.info("Consulta executada", amostra=0.1, pagina=pagina)
+        instancia.info("Registro inserido")
+        linhas = _linhas(instancia, arquivo)
+        # Assert
+        assert [(linha["mensagem"], linha.get("pagina")) for linha in linhas] == [
+            ("Consulta executada", 1),
+            ("Registro inserido", None),
+        ]
+        assert linhas[0]["amostra"] == 0.1 and "amostra" not in linhas[1]
@@ -0,0 +1,170 @@
+"""
+Testes para as métricas no formato do Prometheus
+"""
+import os
+import sqlite3
+import subprocess
+import sys
+
+from fastapi import FastAPI, Request
+from fastapi.templating import Jinja2Templates
+from fastapi.testclient import TestClient
+from jinja2 import DictLoader, Environment
+from prometheus_client import REGISTRY
+
+from infrastructure.database.instrumentacao import ConexaoInstrumentada
+from infrastructure.logging import contexto_requisicao, logger
+from infrastructure.metricas import (
+    ContextoRequisicaoMiddleware,
+    MetricasMiddleware,
+    metricas_endpoint,
+)
+from infrastructure.security import criar_hash_senha
+from util.template_helpers import configurar_filtros_jinja
+
+
+def _valor(nome: str, **rotulos) -> float:
+    return REGISTRY.get_sample_value(nome, rotulos) or 0.0
+
+
+def _app() -> FastAPI:
+    conexao = sqlite3.connect(":memory:", check_same_thread=False, factory=ConexaoInstrumentada)
+    templates = Jinja2Templates(env=Environment(loader=DictLoader({
+        "base.html": "<main>{% block conteudo %}{% endblock %}</main>",
+        "pagina.html": "{% extends 'base.html' %}{% block conteudo %}{{ total }}{% endblock %}",
+    })))
+    configurar_filtros_jinja(templates)
+
+    app = FastAPI()
+    app.add_middleware(MetricasMiddleware)
+    app.add_middleware(ContextoRequisicaoMiddleware)
+    app.add_route("/metrics", metricas_endpoint)
+
+    @app.get("/teste-metricas/{id_item}")
+    def consultar(id_item: int):
+        for _ in range(id_item):
+            conexao.execute("SELECT 1").fetchone()
+        return {"id": id_item}
+
+    @app.get("/teste-contexto")
+    def pagina(request: Request):
+        total = conexao.execute("SELECT 1 + 1").fetchone()[0]
+        conexao.execute("SELECT 2").fetchall()
+        logger.info("Dentro da rota")
+        return templates.TemplateResponse(request, "pagina.html", {"total": total})
+
+    return app
+
+
+class TestMetricas:
+    """Testes para MetricasMiddleware e /metrics"""
+
+    def test_requisicoes_por_modelo_de_rota(self, monkeypatch):
+        """Caminhos diferentes da mesma rota somam na mesma série, com as consultas SQL"""
+        # Arrange
+        monkeypatch.setenv("METRICS_TOKEN", "segredo")
+        cliente = TestClient(_app())
+        rota = "/teste-metricas/{id_item}"
+        antes = _valor("casebem_http_requests_total", method="GET", route=rota, status="200")
+        consultas_antes = _valor("casebem_db_queries_per_request_sum", route=rota)
+        # Act
+        cliente.get("/teste-metricas/2")
+        cliente.get("/teste-metricas/3")
+        cliente.get("/nao-existe")
+        resposta = cliente.get("/metrics", headers={"Authorization": "Bearer segredo"})
+        # Assert
+        assert _valor("casebem_http_requests_total", method="GET", route=rota, status="200") - antes == 2
+        assert _valor("casebem_db_queries_per_request_sum", route=rota) - consultas_antes == 5
+        assert _valor("casebem_http_request_duration_seconds_count", method="GET", route=rota) >= 2
+        assert 'route="desconhecida",status="404"' in resposta.text
+        assert 'casebem_db_pool_connections{state="max"}' in resposta.text
+        assert resposta.headers["content-type"].startswith("text/plain")
+
+    def test_acesso_restrito(self, monkeypatch):
+        """/metrics só responde ao token configurado ou a um IP liberado"""
+        # Arrange
+        monkeypatch.setenv("METRICS_TOKEN", "segredo")
+        monkeypatch.delenv("METRICS_ALLOWED_IPS", raising=False)
+        cliente = TestClient(_app())
+        # Act
+        sem_token = cliente.get("/metrics")
+        token_errado = cliente.get("/metrics", headers={"Authorization": "Bearer outro"})
+        monkeypatch.delenv("METRICS_TOKEN")
+        monkeypatch.setenv("METRICS_ALLOWED_IPS", "10.0.0.1, testclient")
+        ip_liberado = cliente.get("/metrics")
+        # Assert
+        assert sem_token.status_code == 403
+        assert token_errado.status_code == 403
+        assert "casebem_" not in sem_token.text
+        assert ip_liberado.status_code == 200
+
+    def test_agregacao_entre_workers(self, tmp_path):
+        """Com PROMETHEUS_MULTIPROC_DIR, /metrics soma os valores de todos os processos"""
+        # Arrange
+        ambiente = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+        worker = (
+            "from infrastructure.metricas import registro;"
+            "registro.REQUISICOES.labels('GET', '/itens', '200').inc(3)"
+        )
+        leitura = (
+            "from infrastructure.metricas import gerar_metricas;"
+            "print(gerar_metricas()[0].decode())"
+        )
+        # Act
+        for _ in range(2):
+            subprocess.run([sys.executable, "-c", worker], env=ambiente, check=True)
+        saida = subprocess.run(
+            [sys.executable, "-c", leitura], env=ambiente, check=True, capture_output=True, text=True
+        ).stdout
+        # Assert
+        assert 'casebem_http_requests_total{method="GET",route="/itens",status="200"} 6.0' in saida
+
+
+class TestContextoRequisicao:
+    """Testes para ContextoRequisicaoMiddleware (Server-Timing e log de acesso)"""
+
+    def test_server_timing_por_categoria(self):
+        """SQL e templates aparecem no Server-Timing, com a quantidade de consultas"""
+        # Arrange
+        cliente = TestClient(_app())
+        # Act
+        resposta = cliente.get("/teste-contexto")
+        # Assert
+        assert resposta.text == "<main>2</main>"
+        timing = resposta.headers["server-timing"]
+        assert 'desc="SQL (2 consultas)"' in timing
+        assert timing.startswith("db;dur=")
+        assert "template;dur=" in timing
+        assert "total;dur=" in timing
+        assert len(resposta.headers["x-request-id"]) == 32
+
+    def test_id_requisicao_no_log(self, monkeypatch):
+        """O id recebido do proxy volta na resposta e vai em todas as linhas de log"""
+        # Arrange
+        registros = []
+        monkeypatch.setattr(
+            logger.logger, "log",
+            lambda nivel, mensagem, **kwargs: registros.append((mensagem, kwargs["extra"]["contexto"])),
+        )
+        cliente = TestClient(_app())
+        # Act
+        resposta = cliente.get("/teste-contexto", headers={"X-Request-ID": "proxy-42"})
+        invalido = cliente.get("/teste-contexto", headers={"X-Request-ID": "com espaco"})
+        # Assert
+        assert resposta.headers["x-request-id"] == "proxy-42"
+        assert invalido.headers["x-request-id"] != "com espaco"
+        dentro, acesso = registros[0][1], registros[1][1]
+        assert registros[0][0] == "Dentro da rota" and dentro["id_requisicao"] == "proxy-42"
+        assert registros[1][0] == "Requisição"
+        assert acesso["id_requisicao"] == "proxy-42"
+        assert acesso["rota"] == "/teste-contexto" and acesso["status"] == 200
+        assert acesso["consultas"] == 2 and "template_ms" in acesso and "db_ms" in acesso
+
+    def test_tempo_de_hash_de_senha(self):
+        """O hash de senha soma na categoria "senha" da requisição"""
+        # Act
+        with contexto_requisicao() as contexto:
+            criar_hash_senha("1234aA@#")
+        # Assert
+        assert contexto.tempos["senha"] > 0
+        assert contexto.consultas == 0
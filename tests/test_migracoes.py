@@ -0,0 +1,93 @@
+"""
+Testes para o executor de migrações versionadas
+"""
+import types
+import pytest
+from infrastructure.database import obter_conexao
+from infrastructure.database import migracoes
+from infrastructure.database.migracoes import (
+    Migracao,
+    aplicar_migracoes,
+    descobrir_migracoes,
+    obter_versao_atual,
+)
+from util.exceptions import BancoDadosError
+
+
+def _tabelas() -> set:
+    with obter_conexao() as conexao:
+        linhas = conexao.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"
+        ).fetchall()
+    return {linha["name"] for linha in linhas}
+
+
+class TestMigracoes:
+    """Testes para aplicar_migracoes e schema_version"""
+
+    def test_descobrir_migracoes_ordenadas(self):
+        """Migrações são descobertas em ordem de versão"""
+        versoes = [m.versao for m in descobrir_migracoes()]
+        assert versoes[0] == 1
+        assert versoes == sorted(versoes)
+
+    def test_aplicar_em_banco_vazio(self, test_db):
+        """Banco novo recebe todas as migrações e registra a versão"""
+        # Act
+        resultados = aplicar_migracoes()
+        # Assert
+        assert all(r.aplicada for r in resultados)
+        assert obter_versao_atual() == resultados[-1].versao
+        assert {"usuario", "item", "orcamento", "schema_version"} <= _tabelas()
+
+    def test_aplicar_novamente_nao_faz_nada(self, test_db):
+        """Migrações já aplicadas não são reaplicadas"""
+        aplicar_migracoes()
+        assert aplicar_migracoes() == []
+
+    def test_dry_run(self, test_db):
+        """Dry-run lista pendências sem alterar o banco"""
+        # Act
+        resultados = aplicar_migracoes(dry_run=True)
+        # Assert
+        assert resultados and not any(r.aplicada for r in resultados)
+        assert obter_versao_atual() == 0
+        assert "usuario" not in _tabelas()
+
+    def test_banco_existente_sem_versao(self, test_db_with_tables):
+        """Banco criado antes das migrações é registrado sem erros"""
+        resultados = aplicar_migracoes()
+        assert resultados[0].versao == 1 and resultados[0].aplicada
+
+    def test_falha_desfaz_migracao(self, test_db, monkeypatch):
+        """Migração com erro é desfeita por completo e a versão não avança"""
+        # Arrange
+        modulo = types.ModuleType("quebrada")
+        setattr(modulo, "COMANDOS", ["CREATE TABLE parcial (id INTEGER)", "SELECT * FROM inexistente"])
+        monkeypatch.setattr(
+            migracoes,
+            "descobrir_migracoes",
+            lambda: [Migracao(versao=1, nome="quebrada", modulo=modulo)],
+        )
+        # Act / Assert
+        with pytest.raises(BancoDadosError):
+            aplicar_migracoes()
+        assert obter_versao_atual() == 0
+        assert "parcial" not in _tabelas()
+
+    def test_esquema_inicial_nao_inclui_indices_posteriores(self, test_db, monkeypatch):
+        """Índices criados por migrações seguintes não aparecem já na 0001"""
+        # Arrange
+        inicial = descobrir_migracoes()[0]
+        monkeypatch.setattr(migracoes, "descobrir_migracoes", lambda: [inicial])
+        # Act
+        aplicar_migracoes()
+        with obter_conexao() as conexao:
+            indices = {
+                linha["name"]
+                for linha in conexao.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+            }
+        # Assert
+        assert "idx_item_id_fornecedor" in indices
+        assert "idx_item_publicacao" not in indices
+        assert "idx_item_demanda_categoria_demanda" not in indices
@@ -670,7 +670,7 @@ class TestOrcamentoRepo:
         assert total_pendentes == 2, "Deveria contar 2 orçamentos pendentes"
         assert total_aceitos == 1, "Deveria contar 1 orçamento aceito"
 
-    def test_calcular_status_derivado_sem_itens(self, test_db, lista_noivos_exemplo, fornecedor_exemplo):
+    def test_calcular_status_derivado_sem_itens(self, test_db_migrado, lista_noivos_exemplo, fornecedor_exemplo):
         """Testa cálculo de status derivado sem itens - retorna PENDENTE (linhas 151-152)"""
         # Arrange
         usuario_repo.criar_tabela()
@@ -697,7 +697,7 @@ class TestOrcamentoRepo:
         # Assert
         assert status == "PENDENTE", "Orçamento sem itens deveria retornar PENDENTE"
 
-    def test_calcular_status_derivado_todos_aceitos(self, test_db, lista_noivos_exemplo, fornecedor_exemplo):
+    def test_calcular_status_derivado_todos_aceitos(self, test_db_migrado, lista_noivos_exemplo, fornecedor_exemplo):
         """Testa cálculo de status derivado com todos itens aceitos - retorna ACEITO (linhas 155-156)"""
         # Arrange
         usuario_repo.criar_tabela()
@@ -741,7 +741,7 @@ class TestOrcamentoRepo:
         # Assert
         assert status == "ACEITO", "Todos itens aceitos deveria retornar ACEITO"
 
-    def test_calcular_status_derivado_todos_rejeitados(self, test_db, lista_noivos_exemplo, fornecedor_exemplo):
+    def test_calcular_status_derivado_todos_rejeitados(self, test_db_migrado, lista_noivos_exemplo, fornecedor_exemplo):
         """Testa cálculo de status derivado com todos itens rejeitados - retorna REJEITADO (linhas 159-160)"""
         # Arrange
         usuario_repo.criar_tabela()
@@ -783,7 +783,7 @@ class TestOrcamentoRepo:
         # Assert
         assert status == "REJEITADO", "Todos itens rejeitados deveria retornar REJEITADO"
 
-    def test_calcular_status_derivado_todos_pendentes(self, test_db, lista_noivos_exemplo, fornecedor_exemplo):
+    def test_calcular_status_derivado_todos_pendentes(self, test_db_migrado, lista_noivos_exemplo, fornecedor_exemplo):
         """Testa cálculo de status derivado com todos itens pendentes - retorna PENDENTE (linhas 163-164)"""
         # Arrange
         usuario_repo.criar_tabela()
@@ -825,7 +825,7 @@ class TestOrcamentoRepo:
         # Assert
         assert status == "PENDENTE", "Todos itens pendentes deveria retornar PENDENTE"
 
-    def test_calcular_status_derivado_parcialmente_aceito(self, test_db, lista_noivos_exemplo, fornecedor_exemplo):
+    def test_calcular_status_derivado_parcialmente_aceito(self, test_db_migrado, lista_noivos_exemplo, fornecedor_exemplo):
         """Testa cálculo de status derivado com itens mistos - retorna PARCIALMENTE_ACEITO (linhas 167-168)"""
         # Arrange
         usuario_repo.criar_tabela()
@@ -877,7 +877,7 @@ class TestOrcamentoRepo:
         # Assert
         assert status == "PARCIALMENTE_ACEITO", "Itens mistos com pelo menos um aceito deveria retornar PARCIALMENTE_ACEITO"
 
-    def test_atualizar_status_derivado(self, test_db, lista_noivos_exemplo, fornecedor_exemplo):
+    def test_atualizar_status_derivado(self, test_db_migrado, lista_noivos_exemplo, fornecedor_exemplo):
         """Testa atualização de status derivado (linhas 180-181)"""
         # Arrange
         usuario_repo.criar_tabela()
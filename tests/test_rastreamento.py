@@ -0,0 +1,109 @@
+"""
+Testes para o rastreamento (spans da requisição, dos repositórios e do SQL)
+"""
+import sqlite3
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core.repositories.assincrono import Assincrono, RepoAssincrono
+from infrastructure.database.instrumentacao import ConexaoInstrumentada
+from infrastructure.metricas import ContextoRequisicaoMiddleware
+from infrastructure.rastreamento import (
+    configurar_rastreamento,
+    encerrar_rastreamento,
+    iniciar_span,
+)
+from infrastructure.rastreamento.cascata import carregar_rastros, formatar_cascata
+
+
+@pytest.fixture
+def arquivo_rastros(tmp_path):
+    """Rastreamento ligado, exportando para um arquivo temporário"""
+    caminho = tmp_path / "traces.jsonl"
+    configurar_rastreamento(str(caminho), amostra=1.0)
+    yield caminho
+    encerrar_rastreamento()
+
+
+def _atributos(span: dict) -> dict:
+    return {
+        atributo["key"]: next(iter(atributo["value"].values()))
+        for atributo in span["attributes"]
+    }
+
+
+class ProdutoRepo:
+    def __init__(self):
+        self.conexao = sqlite3.connect(
+            ":memory:", check_same_thread=False, factory=ConexaoInstrumentada
+        )
+
+    def listar(self, minimo: int) -> list:
+        return self.conexao.execute("SELECT ? + 1 AS valor", (minimo,)).fetchall()
+
+
+class ProdutoRepoAssincrono(RepoAssincrono[ProdutoRepo]):
+    listar = Assincrono(ProdutoRepo.listar)
+
+
+class TestRastreamento:
+    """Testes para os spans e o arquivo OTLP/JSON"""
+
+    def test_arvore_requisicao_repositorio_sql(self, arquivo_rastros):
+        """Requisição, método de repositório e instrução SQL formam um único rastro"""
+        # Arrange
+        produto_repo = ProdutoRepoAssincrono(ProdutoRepo())
+        app = FastAPI()
+        app.add_middleware(ContextoRequisicaoMiddleware)
+
+        @app.get("/produtos/{minimo}")
+        async def listar(minimo: int):
+            return {"total": len(await produto_repo.listar(minimo))}
+
+        # Act
+        TestClient(app).get("/produtos/3")
+        encerrar_rastreamento()
+        rastros = list(carregar_rastros(str(arquivo_rastros)).values())
+        # Assert
+        assert len(rastros) == 1
+        spans = {span["name"]: span for span in rastros[0]}
+        requisicao = spans["GET /produtos/{minimo}"]
+        repositorio = spans["produto_repo.listar"]
+        sql = spans["SELECT ? + ? AS valor"]
+        assert requisicao["kind"] == 2 and "parentSpanId" not in requisicao
+        assert repositorio["parentSpanId"] == requisicao["spanId"]
+        assert sql["parentSpanId"] == repositorio["spanId"]
+        assert _atributos(requisicao)["http.route"] == "/produtos/{minimo}"
+        assert _atributos(repositorio)["repositorio.resultados"] == "1"
+        assert _atributos(sql)["db.sqlite.parametros"] == "1: int"
+        assert _atributos(sql)["db.linhas"] == "1"
+
+    def test_erro_sql_marcado_no_span(self, arquivo_rastros):
+        """Instrução com erro fica com status de erro e aparece marcada na cascata"""
+        # Arrange
+        conexao = sqlite3.connect(":memory:", factory=ConexaoInstrumentada)
+        # Act
+        with iniciar_span("tarefa"):
+            with pytest.raises(sqlite3.OperationalError):
+                conexao.execute("SELECT * FROM inexistente WHERE id IN (?, ?)", (1, 2))
+        encerrar_rastreamento()
+        spans = next(iter(carregar_rastros(str(arquivo_rastros)).values()))
+        # Assert
+        erro = next(span for span in spans if span["name"].startswith("SELECT"))
+        assert erro["status"]["code"] == 2
+        assert erro["events"][0]["name"] == "exception"
+        assert _atributos(erro)["db.statement"] == "SELECT * FROM inexistente WHERE id IN (...)"
+        assert "[ERRO]" in formatar_cascata(spans)
+
+    def test_desligado_nao_cria_spans(self):
+        """Sem TRACING_FILE nenhum span é criado"""
+        # Arrange
+        conexao = sqlite3.connect(":memory:", factory=ConexaoInstrumentada)
+        # Act
+        with iniciar_span("tarefa") as span:
+            cursor = conexao.execute("SELECT 1")
+        # Assert
+        assert span is None
+        assert cursor._span is None
@@ -0,0 +1,191 @@
+"""
+Testes para a unidade de trabalho e o mapa de identidade por requisição
+"""
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+from core.repositories.usuario_repo import usuario_repo
+from infrastructure.database import (
+    UnidadeTrabalho,
+    UnidadeTrabalhoMiddleware,
+    obter_conexao,
+    obter_pool,
+    unidade_de_trabalho,
+)
+
+
+def _contar(tabela: str = "t") -> int:
+    with obter_conexao() as conexao:
+        return int(conexao.execute(f"SELECT COUNT(*) FROM {tabela}").fetchone()[0])
+
+
+@pytest.fixture
+def tabela_t(test_db):
+    with obter_conexao() as conexao:
+        conexao.execute("CREATE TABLE t (x INTEGER)")
+    return test_db
+
+
+class TestUnidadeTrabalho:
+    """Testes para unidade_de_trabalho, obter_conexao e o mapa de identidade"""
+
+    def test_conexao_unica(self, tabela_t):
+        """Todos os blocos da unidade usam a mesma conexão"""
+        # Act
+        with unidade_de_trabalho():
+            with obter_conexao() as primeira:
+                pass
+            with obter_conexao() as segunda:
+                pass
+        # Assert
+        assert primeira is segunda
+        assert obter_pool().conexoes_abertas == 1
+
+    def test_commit_unico_ao_final(self, tabela_t):
+        """Escritas só ficam visíveis para outras conexões ao final da unidade"""
+        # Act
+        with unidade_de_trabalho():
+            for i in range(3):
+                with obter_conexao() as conexao:
+                    conexao.execute("INSERT INTO t VALUES (?)", (i,))
+            with obter_pool().conexao() as outra:
+                visiveis_durante = outra.execute("SELECT COUNT(*) FROM t").fetchone()[0]
+        # Assert
+        assert visiveis_durante == 0
+        assert _contar() == 3
+
+    def test_rollback_em_excecao(self, tabela_t):
+        """Exceção na unidade desfaz todas as escritas"""
+        # Act
+        with pytest.raises(RuntimeError):
+            with unidade_de_trabalho():
+                with obter_conexao() as conexao:
+                    conexao.execute("INSERT INTO t VALUES (1)")
+                raise RuntimeError("falha")
+        # Assert
+        assert _contar() == 0
+        assert obter_pool().conexoes_ociosas == 1
+
+    def test_bloco_com_erro_desfaz_apenas_o_bloco(self, tabela_t):
+        """Um bloco que falha não desfaz as escritas anteriores da unidade"""
+        # Act
+        with unidade_de_trabalho():
+            with obter_conexao() as conexao:
+                conexao.execute("INSERT INTO t VALUES (1)")
+            with pytest.raises(RuntimeError):
+                with obter_conexao() as conexao:
+                    conexao.execute("INSERT INTO t VALUES (2)")
+                    raise RuntimeError("falha")
+        # Assert
+        with obter_conexao() as conexao:
+            assert [l[0] for l in conexao.execute("SELECT x FROM t")] == [1]
+
+    def test_unidade_aninhada_atomica(self, tabela_t):
+        """Falha em uma unidade aninhada desfaz só as escritas dela"""
+        # Act
+        with unidade_de_trabalho():
+            with obter_conexao() as conexao:
+                conexao.execute("INSERT INTO t VALUES (1)")
+            with pytest.raises(RuntimeError):
+                with unidade_de_trabalho():
+                    with obter_conexao() as conexao:
+                        conexao.execute("INSERT INTO t VALUES (2)")
+                    with obter_conexao() as conexao:
+                        conexao.execute("INSERT INTO t VALUES (3)")
+                    raise RuntimeError("falha")
+        # Assert
+        with obter_conexao() as conexao:
+            assert [l[0] for l in conexao.execute("SELECT x FROM t")] == [1]
+
+    def test_mapa_de_identidade(self, test_db, usuario_factory):
+        """Leituras repetidas pelo ID devolvem o mesmo objeto sem nova consulta"""
+        # Arrange
+        usuario_repo.criar_tabela()
+        id_usuario = usuario_repo.inserir(usuario_factory.criar(email="um@teste.com"))
+        # Act
+        with unidade_de_trabalho() as unidade:
+            primeiro = usuario_repo.obter_por_id(id_usuario)
+            segundo = usuario_repo.obter_por_id(id_usuario)
+            em_lote = usuario_repo.obter_muitos_por_ids([id_usuario])
+        # Assert
+        assert primeiro is segundo
+        assert em_lote[id_usuario] is primeiro
+        assert unidade.leituras_evitadas == 2
+        assert usuario_repo.obter_por_id(id_usuario) is not primeiro
+
+    def test_escrita_invalida_mapa(self, test_db, usuario_factory):
+        """Depois de uma escrita, a leitura volta ao banco"""
+        # Arrange
+        usuario_repo.criar_tabela()
+        id_usuario = usuario_repo.inserir(usuario_factory.criar(email="um@teste.com"))
+        # Act
+        with unidade_de_trabalho():
+            antes = usuario_repo.obter_por_id(id_usuario)
+            usuario_repo.executar_comando(
+                "UPDATE usuario SET nome = ? WHERE id = ?", ("Outro Nome", id_usuario)
+            )
+            depois = usuario_repo.obter_por_id(id_usuario)
+        # Assert
+        assert antes is not depois
+        assert depois.nome == "Outro Nome"
+
+    def test_middleware_confirma_antes_da_resposta(self, tabela_t):
+        """O middleware abre uma unidade por requisição e faz commit ao responder"""
+        # Arrange
+        app = FastAPI()
+        app.add_middleware(UnidadeTrabalhoMiddleware)
+        conexoes = []
+
+        @app.post("/gravar")
+        async def gravar():
+            for i in range(2):
+                with obter_conexao() as conexao:
+                    conexao.execute("INSERT INTO t VALUES (?)", (i,))
+                    conexoes.append(conexao)
+            return PlainTextResponse("ok")
+
+        @app.post("/falhar")
+        async def falhar():
+            with obter_conexao() as conexao:
+                conexao.execute("INSERT INTO t VALUES (99)")
+            raise RuntimeError("falha")
+
+        cliente = TestClient(app, raise_server_exceptions=False)
+        # Act
+        resposta = cliente.post("/gravar")
+        resposta_erro = cliente.post("/falhar")
+        # Assert
+        assert resposta.status_code == 200
+        assert resposta_erro.status_code == 500
+        assert conexoes[0] is conexoes[1]
+        assert _contar() == 2
+
+    def test_middleware_encerra_fora_do_event_loop(self, tabela_t, monkeypatch):
+        """O encerramento da unidade (commit e devolução da conexão) roda nas threads do banco"""
+        # Arrange
+        threads = []
+        encerrar = UnidadeTrabalho.encerrar
+
+        def encerrar_registrando(unidade, sucesso=True):
+            threads.append(threading.current_thread().name)
+            encerrar(unidade, sucesso)
+
+        monkeypatch.setattr(UnidadeTrabalho, "encerrar", encerrar_registrando)
+        app = FastAPI()
+        app.add_middleware(UnidadeTrabalhoMiddleware)
+
+        @app.post("/gravar")
+        def gravar():
+            with obter_conexao() as conexao:
+                conexao.execute("INSERT INTO t VALUES (1)")
+            return PlainTextResponse("ok")
+
+        # Act
+        resposta = TestClient(app).post("/gravar")
+        # Assert
+        assert resposta.status_code == 200
+        assert len(threads) == 1 and threads[0].startswith("banco")
+        assert _contar() == 1
@@ -1,5 +1,6 @@
 import os
 from infrastructure.logging import logger
+from util.file_storage import FileStorageManager, TipoArquivo
 
 def obter_caminho_avatar(usuario_id: int) -> str:
     """
@@ -37,8 +38,7 @@ def avatar_existe(usuario_id: int) -> bool:
     Returns:
         True se o avatar existe, False caso contrário
     """
-    caminho_fisico = obter_caminho_avatar_fisico(usuario_id)
-    return os.path.exists(caminho_fisico)
+    return FileStorageManager.arquivo_existe(TipoArquivo.USUARIO, usuario_id)
 
 def obter_avatar_ou_padrao(usuario_id: int) -> str:
     """
@@ -56,7 +56,7 @@ def obter_avatar_ou_padrao(usuario_id: int) -> str:
 
 def excluir_avatar(usuario_id: int) -> bool:
     """
-    Exclui o avatar do usuário do sistema de arquivos.
+    Exclui o avatar do usuário (e suas variantes) do sistema de arquivos.
 
     Args:
         usuario_id: ID do usuário
@@ -64,18 +64,7 @@ def excluir_avatar(usuario_id: int) -> bool:
     Returns:
         True se excluído com sucesso, False caso contrário
     """
-    try:
-        caminho_fisico = obter_caminho_avatar_fisico(usuario_id)
-        if os.path.exists(caminho_fisico):
-            os.remove(caminho_fisico)
-            return True
-        return False
-    except Exception as _e:
-        logger.error("Erro ao excluir avatar do usuário",
-            usuario_id=usuario_id,
-            exc_info=True
-        )
-        return False
+    return FileStorageManager.excluir(TipoArquivo.USUARIO, usuario_id)
 
 def criar_diretorio_usuarios() -> bool:
     """
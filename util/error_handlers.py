@@ -6,10 +6,11 @@ import functools
 import sqlite3
 from typing import Callable, Optional, Type
 from fastapi import Request
+from fastapi.responses import PlainTextResponse
 from fastapi.templating import Jinja2Templates
 from util.exceptions import (
     CaseBemError, BancoDadosError, ValidacaoError,
-    RecursoNaoEncontradoError
+    RecursoNaoEncontradoError, SobrecargaError
 )
 from infrastructure.logging import logger
 from util.flash_messages import informar_erro
@@ -57,6 +58,13 @@ def tratar_erro_banco_dados(operacao: str = "operação de banco"):
     return decorator
 
 
+def resposta_sobrecarga(erro: SobrecargaError) -> PlainTextResponse:
+    """Resposta 503 para um recurso saturado, indicando quando tentar de novo"""
+    return PlainTextResponse(
+        erro.mensagem, status_code=503, headers={"Retry-After": str(erro.tentar_em)}
+    )
+
+
 def tratar_erro_rota(template_erro: Optional[str] = None,
                      redirect_erro: Optional[str] = None):
     """
@@ -88,6 +96,10 @@ def tratar_erro_rota(template_erro: Optional[str] = None,
                 logger.info("Recurso não encontrado", erro=e, rota=str(request.url))
                 informar_erro(request, e.mensagem)
 
+            except SobrecargaError as e:
+                logger.warning("Recurso saturado em rota", erro=e, rota=str(request.url))
+                return resposta_sobrecarga(e)
+
             except CaseBemError as e:
                 logger.error("Erro de negócio em rota", erro=e, rota=str(request.url))
                 informar_erro(request, e.mensagem)
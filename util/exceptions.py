@@ -133,4 +133,17 @@ class AutorizacaoError(CaseBemError):
             tipo_erro=TipoErro.AUTORIZACAO,
             codigo_erro="AUTORIZACAO_ERRO",
             detalhes={"acao": acao} if acao else {}
-        )
\ No newline at end of file
+        )
+
+
+class SobrecargaError(CaseBemError):
+    """Erro quando um recurso limitado está saturado (a requisição pode ser repetida)"""
+
+    def __init__(self, mensagem: str, recurso: str, tentar_em: int = 5):
+        super().__init__(
+            mensagem=mensagem,
+            tipo_erro=TipoErro.SISTEMA,
+            codigo_erro="SOBRECARGA",
+            detalhes={"recurso": recurso, "tentar_em": tentar_em}
+        )
+        self.tentar_em = tentar_em
@@ -3,12 +3,38 @@ Gerenciador centralizado de armazenamento de arquivos.
 
 Este módulo substitui avatar_util.py e item_foto_util.py,
 consolidando a lógica duplicada de gerenciamento de arquivos.
+
+A existência das fotos é consultada em um índice em memória (nomes dos
+arquivos de cada diretório), e não com os.path.exists: as listagens chamam
+obter_ou_padrao uma vez por linha. Gravações e exclusões feitas por
+FileStorageManager atualizam o índice na hora; as de outros workers são
+percebidas pela data de modificação do diretório, conferida no máximo uma vez
+a cada CacheConstants.FILE_INDEX_CHECK_INTERVAL segundos.
+
+O índice também guarda a versão de cada arquivo (data de modificação e
+tamanho, ver versao_arquivo), e as URLs geradas levam essa versão (?v=...):
+um arquivo regravado ganha uma URL nova, e o servidor de estáticos
+(util/static_files.py) pode mandar o navegador guardar as URLs versionadas
+sem nunca revalidar.
 """
 
+from dataclasses import dataclass, field
 from enum import Enum
+from typing import Dict, FrozenSet, Optional, Set, Tuple
+import hashlib
 import os
+import tempfile
+import threading
+import time
+from config.constants import CacheConstants, ImageConstants
 from infrastructure.logging import logger
 
+# mkstemp cria o temporário com 0600; os arquivos gravados ficam com 0644,
+# para que o servidor de estáticos consiga lê-los mesmo rodando com outro
+# usuário. É uma constante, e não a umask do processo: ler a umask exige
+# trocá-la (os.umask), o que afetaria arquivos criados por outras threads
+PERMISSAO_ARQUIVO = 0o644
+
 
 class TipoArquivo(Enum):
     """Tipos de arquivo gerenciados pelo sistema"""
@@ -16,11 +42,126 @@ class TipoArquivo(Enum):
     ITEM = "itens"
 
 
+@dataclass
+class _Diretorio:
+    """Nomes dos arquivos de um diretório e a data de modificação lida na carga"""
+
+    nomes: Set[str]
+    modificado_em: Optional[int]
+    verificado_em: float
+    # Versão de cada arquivo, lida no primeiro pedido
+    versoes: Dict[str, str] = field(default_factory=dict)
+
+
+def versao_arquivo(stat_result: os.stat_result) -> str:
+    """
+    Versão do arquivo: muda quando ele é regravado.
+
+    Args:
+        stat_result: Resultado de os.stat do arquivo
+
+    Returns:
+        str: 16 dígitos hexadecimais
+    """
+    base = f"{stat_result.st_mtime_ns}-{stat_result.st_size}".encode()
+    return hashlib.blake2b(base, digest_size=8).hexdigest()
+
+
+class IndiceArquivos:
+    """Índice em memória dos arquivos de cada diretório, por caminho"""
+
+    def __init__(self, intervalo_verificacao: float):
+        """
+        Args:
+            intervalo_verificacao: Intervalo (segundos) entre conferências da
+                data de modificação de cada diretório
+        """
+        self.intervalo_verificacao = intervalo_verificacao
+        self._diretorios: Dict[str, _Diretorio] = {}
+        self._lock = threading.Lock()
+        self.cargas = 0
+
+    @staticmethod
+    def _modificado_em(diretorio: str) -> Optional[int]:
+        try:
+            return os.stat(diretorio).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _entrada(self, diretorio: str) -> _Diretorio:
+        """Entrada atualizada do diretório (chamar com o lock adquirido)"""
+        agora = time.monotonic()
+        entrada = self._diretorios.get(diretorio)
+        if entrada is not None and agora - entrada.verificado_em < self.intervalo_verificacao:
+            return entrada
+
+        modificado_em = self._modificado_em(diretorio)
+        if entrada is not None and entrada.modificado_em == modificado_em:
+            entrada.verificado_em = agora
+            return entrada
+
+        # A data é lida antes da listagem: uma gravação entre as duas só
+        # provoca uma recarga a mais, nunca um índice antigo
+        try:
+            nomes = set(os.listdir(diretorio))
+        except FileNotFoundError:
+            nomes = set()
+        entrada = self._diretorios[diretorio] = _Diretorio(nomes, modificado_em, agora)
+        self.cargas += 1
+        return entrada
+
+    def nomes(self, diretorio: str) -> FrozenSet[str]:
+        """Nomes dos arquivos do diretório (vazio se ele não existe)"""
+        with self._lock:
+            return frozenset(self._entrada(diretorio).nomes)
+
+    def contem(self, caminho: str) -> bool:
+        """Verifica se o arquivo existe, pelo índice do seu diretório"""
+        diretorio, nome = os.path.split(caminho)
+        with self._lock:
+            return nome in self._entrada(diretorio).nomes
+
+    def versao(self, caminho: str) -> Optional[str]:
+        """Versão do arquivo (ver versao_arquivo), ou None se ele não existe"""
+        diretorio, nome = os.path.split(caminho)
+        with self._lock:
+            entrada = self._entrada(diretorio)
+            if nome not in entrada.nomes:
+                return None
+            versao = entrada.versoes.get(nome)
+            if versao is None:
+                try:
+                    versao = entrada.versoes[nome] = versao_arquivo(os.stat(caminho))
+                except FileNotFoundError:
+                    return None
+            return versao
+
+    def registrar(self, caminho: str, existe: bool) -> None:
+        """Atualiza o índice após gravar (existe=True) ou excluir um arquivo"""
+        diretorio, nome = os.path.split(caminho)
+        with self._lock:
+            entrada = self._diretorios.get(diretorio)
+            if entrada is None:
+                return
+            entrada.versoes.pop(nome, None)
+            if existe:
+                entrada.nomes.add(nome)
+            else:
+                entrada.nomes.discard(nome)
+
+    def invalidar(self) -> None:
+        """Descarta o índice; a próxima consulta lista os diretórios de novo"""
+        with self._lock:
+            self._diretorios.clear()
+
+
 class FileStorageManager:
     """Gerenciador centralizado de armazenamento de arquivos"""
 
     BASE_DIR = "static/img"
     BASE_URL = "/static/img"
+    STATIC_DIR = "static"
+    STATIC_URL = "/static"
 
     # Arquivos padrão quando não há imagem personalizada
     DEFAULTS = {
@@ -28,6 +169,17 @@ class FileStorageManager:
         TipoArquivo.ITEM: "/static/img/item-default.svg"
     }
 
+    # Variantes geradas a cada upload (nome -> lado do quadrado em px). A maior
+    # variante em JPEG é o próprio arquivo principal (NNNNNN.jpg); as demais
+    # ficam ao lado dele como NNNNNN-<variante>.<formato>
+    VARIANTES = {
+        TipoArquivo.USUARIO: {"thumb": 64, "card": 150, "detail": ImageConstants.Sizes.AVATAR.value[0]},
+        TipoArquivo.ITEM: {"thumb": 150, "card": 400, "detail": ImageConstants.Sizes.ITEM.value[0]},
+    }
+    FORMATOS = ("webp", "jpg")
+
+    indice = IndiceArquivos(CacheConstants.FILE_INDEX_CHECK_INTERVAL)
+
     @staticmethod
     def obter_caminho(
         tipo: TipoArquivo,
@@ -58,6 +210,82 @@ class FileStorageManager:
             return f"{FileStorageManager.BASE_DIR}/{subdir}/{nome_arquivo}"
         return f"{FileStorageManager.BASE_URL}/{subdir}/{nome_arquivo}"
 
+    @staticmethod
+    def obter_caminho_variante(
+        tipo: TipoArquivo,
+        id_recurso: int,
+        variante: str,
+        formato: str = "jpg",
+        fisico: bool = False
+    ) -> str:
+        """
+        Obtém caminho de uma variante da imagem (web ou físico).
+
+        Args:
+            tipo: Tipo de arquivo (USUARIO ou ITEM)
+            id_recurso: ID do recurso
+            variante: Nome da variante (ver VARIANTES)
+            formato: "webp" ou "jpg"
+            fisico: Se True, retorna caminho físico; se False, retorna URL web
+
+        Returns:
+            str: Caminho do arquivo
+
+        Examples:
+            >>> FileStorageManager.obter_caminho_variante(TipoArquivo.ITEM, 42, "card", "webp")
+            '/static/img/itens/000042-card.webp'
+            >>> FileStorageManager.obter_caminho_variante(TipoArquivo.ITEM, 42, "detail", "jpg")
+            '/static/img/itens/000042.jpg'
+        """
+        variantes = FileStorageManager.VARIANTES[tipo]
+        if formato == "jpg" and variantes[variante] == max(variantes.values()):
+            return FileStorageManager.obter_caminho(tipo, id_recurso, fisico)
+
+        nome_arquivo = f"{id_recurso:06d}-{variante}.{formato}"
+        base = FileStorageManager.BASE_DIR if fisico else FileStorageManager.BASE_URL
+        return f"{base}/{tipo.value}/{nome_arquivo}"
+
+    @staticmethod
+    def caminhos_variantes(
+        tipo: TipoArquivo,
+        id_recurso: int,
+        fisico: bool = False
+    ) -> Dict[Tuple[str, str], str]:
+        """
+        Caminhos de todas as variantes da imagem.
+
+        Returns:
+            Dict[Tuple[str, str], str]: (variante, formato) -> caminho, da
+                maior para a menor variante
+        """
+        variantes = FileStorageManager.VARIANTES[tipo]
+        return {
+            (variante, formato): FileStorageManager.obter_caminho_variante(
+                tipo, id_recurso, variante, formato, fisico
+            )
+            for variante in sorted(variantes, key=lambda v: variantes[v], reverse=True)
+            for formato in FileStorageManager.FORMATOS
+        }
+
+    @staticmethod
+    def variantes_existem(tipo: TipoArquivo, id_recurso: int) -> bool:
+        """
+        Verifica se a imagem tem as variantes responsivas (imagens enviadas
+        antes delas existirem só têm o arquivo principal).
+
+        Args:
+            tipo: Tipo de arquivo
+            id_recurso: ID do recurso
+
+        Returns:
+            bool: True se as variantes existem
+        """
+        variantes = FileStorageManager.VARIANTES[tipo]
+        menor = min(variantes, key=lambda v: variantes[v])
+        return FileStorageManager.indice.contem(
+            FileStorageManager.obter_caminho_variante(tipo, id_recurso, menor, "webp", fisico=True)
+        )
+
     @staticmethod
     def arquivo_existe(tipo: TipoArquivo, id_recurso: int) -> bool:
         """
@@ -71,7 +299,7 @@ class FileStorageManager:
             bool: True se arquivo existe, False caso contrário
         """
         caminho = FileStorageManager.obter_caminho(tipo, id_recurso, fisico=True)
-        return os.path.exists(caminho)
+        return FileStorageManager.indice.contem(caminho)
 
     @staticmethod
     def obter_ou_padrao(tipo: TipoArquivo, id_recurso: int) -> str:
@@ -83,17 +311,42 @@ class FileStorageManager:
             id_recurso: ID do recurso
 
         Returns:
-            str: URL do arquivo personalizado ou padrão
+            str: URL versionada do arquivo personalizado ou padrão
         """
         if FileStorageManager.arquivo_existe(tipo, id_recurso):
-            return FileStorageManager.obter_caminho(tipo, id_recurso, fisico=False)
+            url = FileStorageManager.obter_caminho(tipo, id_recurso, fisico=False)
+        else:
+            url = FileStorageManager.DEFAULTS[tipo]
+        return FileStorageManager.versionar(url)
 
-        return FileStorageManager.DEFAULTS[tipo]
+    @staticmethod
+    def versionar(url: str) -> str:
+        """
+        Acrescenta à URL de um arquivo estático a versão atual dele.
+
+        Args:
+            url: URL do arquivo (ex: '/static/img/itens/000042.jpg')
+
+        Returns:
+            str: URL com ?v=<versão>, ou a própria URL se o arquivo não existe
+
+        Examples:
+            >>> FileStorageManager.versionar('/static/img/itens/000042.jpg')
+            '/static/img/itens/000042.jpg?v=5f0c3a1e9b7d2c44'
+        """
+        for base_url, base_dir in (
+            (FileStorageManager.BASE_URL, FileStorageManager.BASE_DIR),
+            (FileStorageManager.STATIC_URL, FileStorageManager.STATIC_DIR),
+        ):
+            if url.startswith(base_url + "/"):
+                versao = FileStorageManager.indice.versao(base_dir + url[len(base_url):])
+                return f"{url}?v={versao}" if versao else url
+        return url
 
     @staticmethod
     def excluir(tipo: TipoArquivo, id_recurso: int) -> bool:
         """
-        Exclui arquivo do sistema.
+        Exclui arquivo do sistema, junto com suas variantes.
 
         Args:
             tipo: Tipo de arquivo
@@ -103,11 +356,15 @@ class FileStorageManager:
             bool: True se arquivo foi excluído, False se não existia ou erro
         """
         try:
-            caminho = FileStorageManager.obter_caminho(tipo, id_recurso, fisico=True)
-            if os.path.exists(caminho):
-                os.remove(caminho)
-                return True
-            return False
+            excluido = False
+            for caminho in FileStorageManager.caminhos_variantes(tipo, id_recurso, fisico=True).values():
+                try:
+                    os.remove(caminho)
+                    excluido = True
+                except FileNotFoundError:
+                    pass
+                FileStorageManager.indice.registrar(caminho, existe=False)
+            return excluido
         except Exception as _e:
             logger.error("Erro ao excluir arquivo",
                 tipo=tipo.value,
@@ -116,6 +373,37 @@ class FileStorageManager:
             )
             return False
 
+    @staticmethod
+    def gravar(caminho_fisico: str, dados: bytes) -> None:
+        """
+        Grava o arquivo de forma atômica (quem lê nunca vê um arquivo pela
+        metade) e o registra no índice.
+
+        Args:
+            caminho_fisico: Caminho do arquivo (ex: obter_caminho(..., fisico=True))
+            dados: Conteúdo do arquivo
+        """
+        diretorio = os.path.dirname(caminho_fisico)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+
+        descritor, temporario = tempfile.mkstemp(dir=diretorio or ".", suffix=".tmp")
+        try:
+            with os.fdopen(descritor, "wb") as arquivo:
+                os.fchmod(arquivo.fileno(), PERMISSAO_ARQUIVO)
+                arquivo.write(dados)
+            os.replace(temporario, caminho_fisico)
+        except BaseException:
+            os.unlink(temporario)
+            raise
+        FileStorageManager.indice.registrar(caminho_fisico, existe=True)
+
+    @staticmethod
+    def carregar_indice() -> None:
+        """Monta o índice de todos os tipos de arquivo (inicialização)"""
+        for tipo in TipoArquivo:
+            FileStorageManager.listar_arquivos(tipo)
+
     @staticmethod
     def criar_diretorio(tipo: TipoArquivo) -> bool:
         """
@@ -151,10 +439,7 @@ class FileStorageManager:
         """
         try:
             diretorio = f"{FileStorageManager.BASE_DIR}/{tipo.value}"
-            if not os.path.exists(diretorio):
-                return []
-
-            arquivos = os.listdir(diretorio)
+            arquivos = FileStorageManager.indice.nomes(diretorio)
             # Extrair IDs dos nomes de arquivo (000042.jpg -> 42)
             ids = []
             for arquivo in arquivos:
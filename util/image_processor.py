@@ -3,13 +3,280 @@ Processador centralizado de imagens para o sistema CaseBem.
 
 Este módulo elimina a duplicação de código de processamento de imagens
 que estava espalhada em múltiplas rotas.
+
+Decodificar, redimensionar e codificar em JPEG leva centenas de milissegundos
+de CPU por imagem; feito dentro da rota, trava o event loop. O trabalho roda em
+um pool limitado de processos (fila_imagens): quando os processos e a fila de
+espera estão cheios, o upload é recusado com SobrecargaError (503 nas rotas)
+em vez de acumular requisições.
+
+Fotos de usuários e itens são gravadas em várias resoluções, em WebP e JPEG
+(FileStorageManager.VARIANTES), para as páginas usarem srcset. Para gerar as
+variantes das imagens enviadas antes disso:
+    python -m util.image_processor
 """
 
-from typing import Tuple, Optional
+from typing import Any, Callable, Dict, List, Tuple, Optional
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from io import BytesIO
 from PIL import Image
 from fastapi import UploadFile
+import asyncio
+import multiprocessing
 import os
+import threading
+import time
+
+from config.constants import ImageConstants
+from infrastructure.logging import logger, medir_tempo
+from util.exceptions import SobrecargaError
+from util.file_storage import FileStorageManager, TipoArquivo
+
+
+# Formatos aceitos, identificados pelos bytes iniciais (e não pelo content-type)
+FORMATOS_PERMITIDOS = ("JPEG", "PNG", "WEBP")
+
+
+def _formato_pelos_bytes(inicio: bytes) -> Optional[str]:
+    """Identifica o formato pela assinatura no início do arquivo"""
+    if inicio.startswith(b"\xff\xd8\xff"):
+        return "JPEG"
+    if inicio.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "PNG"
+    if inicio[:4] == b"RIFF" and inicio[8:12] == b"WEBP":
+        return "WEBP"
+    return None
+
+
+def _verificar_cabecalho(imagem: Image.Image) -> None:
+    """Recusa imagens com resolução acima de ImageConstants.MAX_PIXELS"""
+    largura, altura = imagem.size
+    if largura * altura > ImageConstants.MAX_PIXELS:
+        raise ValueError(
+            f"Resolução muito alta ({largura}x{altura}). "
+            f"Máximo: {ImageConstants.MAX_PIXELS // 1_000_000} megapixels"
+        )
+
+
+def _abrir(conteudo: bytes, tamanho: Tuple[int, int]) -> Image.Image:
+    """
+    Abre a imagem (só o cabeçalho é lido até o primeiro uso dos pixels). JPEGs
+    são decodificados já reduzidos pelo libjpeg (draft, escalas de 1/2 a 1/8)
+    para perto do tamanho final, sem passar pela resolução original.
+    """
+    imagem = Image.open(BytesIO(conteudo), formats=FORMATOS_PERMITIDOS)
+    _verificar_cabecalho(imagem)
+
+    largura, altura = imagem.size
+    escala = max(largura / tamanho[0], altura / tamanho[1])
+    if imagem.format == "JPEG" and escala > 1:
+        imagem.draft(None, (max(1, int(largura / escala)), max(1, int(altura / escala))))
+    return imagem
+
+
+def _quadrado(imagem: Image.Image, tamanho: Tuple[int, int]) -> Image.Image:
+    """Redimensiona mantendo a proporção e centraliza em um fundo branco"""
+    # Converter para RGB se necessário (RGBA ou P precisam ser convertidos)
+    if imagem.mode in ("RGBA", "P"):
+        imagem = imagem.convert("RGB")
+
+    # Redimensionar mantendo proporção
+    imagem.thumbnail(tamanho, Image.Resampling.LANCZOS)
+
+    # Criar imagem quadrada com fundo branco
+    imagem_quadrada = Image.new("RGB", tamanho, (255, 255, 255))
+
+    # Centralizar a imagem redimensionada no quadrado
+    x = (tamanho[0] - imagem.width) // 2
+    y = (tamanho[1] - imagem.height) // 2
+    imagem_quadrada.paste(imagem, (x, y))
+    return imagem_quadrada
+
+
+def _codificar(imagem: Image.Image, formato: str, qualidade: int) -> bytes:
+    saida = BytesIO()
+    if formato == "webp":
+        imagem.save(saida, "WEBP", quality=ImageConstants.WEBP_QUALITY, method=4)
+    else:
+        imagem.save(saida, "JPEG", quality=qualidade, optimize=True, progressive=True)
+    return saida.getvalue()
+
+
+def _gerar_variantes(
+    conteudo: bytes, lados: Dict[str, int], qualidade: int
+) -> Tuple[Dict[Tuple[str, str], bytes], float]:
+    """
+    Gera todas as variantes da imagem em WebP e JPEG (roda em um processo do
+    pool de imagens). A imagem é decodificada uma vez; cada variante menor sai
+    da anterior.
+
+    Args:
+        conteudo: Bytes da imagem enviada
+        lados: Nome da variante -> lado do quadrado em px
+        qualidade: Qualidade da compressão JPEG
+
+    Returns:
+        Tuple[Dict[Tuple[str, str], bytes], float]: ((variante, formato) -> bytes,
+            segundos de processamento)
+    """
+    inicio = time.perf_counter()
+    maior = max(lados.values())
+    imagem = _abrir(conteudo, (maior, maior))
+    arquivos = {}
+    for variante in sorted(lados, key=lambda v: lados[v], reverse=True):
+        lado = lados[variante]
+        imagem = _quadrado(imagem, (lado, lado))
+        for formato in FileStorageManager.FORMATOS:
+            arquivos[(variante, formato)] = _codificar(imagem, formato, qualidade)
+    return arquivos, time.perf_counter() - inicio
+
+
+def _destinos_variantes(
+    tipo: TipoArquivo, id_recurso: int, arquivos: Dict[Tuple[str, str], bytes]
+) -> List[Tuple[str, bytes]]:
+    """Caminhos físicos das variantes geradas, com o arquivo principal por
+    último (quem encontra o principal já encontra as variantes)"""
+    caminhos = FileStorageManager.caminhos_variantes(tipo, id_recurso, fisico=True)
+    principal = FileStorageManager.obter_caminho(tipo, id_recurso, fisico=True)
+    return sorted(
+        ((caminhos[chave], dados) for chave, dados in arquivos.items()),
+        key=lambda destino: destino[0] == principal,
+    )
+
+
+def _gravar_todos(arquivos: List[Tuple[str, bytes]]) -> None:
+    """Grava os arquivos na ordem dada (o principal por último)"""
+    for caminho_destino, dados in arquivos:
+        FileStorageManager.gravar(caminho_destino, dados)
+
+
+class FilaImagens:
+    """Pool limitado de processos para o processamento de imagens, com métricas"""
+
+    def __init__(self, processos: int, tamanho_fila: int, timeout: float):
+        """
+        Args:
+            processos: Processos dedicados ao processamento
+            tamanho_fila: Imagens aguardando um processo livre além das em processamento
+            timeout: Tempo máximo por imagem, incluindo a espera na fila (segundos)
+        """
+        self.processos = processos
+        self.tamanho_fila = tamanho_fila
+        self.timeout = timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pendentes = 0
+        self._processadas = 0
+        self._rejeitadas = 0
+        self._expiradas = 0
+        self._falhas = 0
+        self._tempo_total = 0.0
+        self._tempo_maximo = 0.0
+
+    def _obter_executor(self) -> ProcessPoolExecutor:
+        """Pool de processos, criado no primeiro uso"""
+        with self._lock:
+            if self._executor is None:
+                # spawn: os processos não herdam threads nem conexões do servidor
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processos,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _liberar(self, _futuro=None) -> None:
+        with self._lock:
+            self._pendentes -= 1
+
+    async def executar(self, funcao: Callable[..., Tuple[Any, float]], *args: Any) -> Any:
+        """
+        Executa funcao(*args) em um processo do pool.
+
+        Args:
+            funcao: Função de módulo que devolve (resultado, segundos de processamento)
+            *args: Argumentos repassados à função
+
+        Returns:
+            O resultado da função
+
+        Raises:
+            SobrecargaError: Processos e fila de espera ocupados
+            asyncio.TimeoutError: Processamento não terminou dentro do timeout
+        """
+        with self._lock:
+            cheia = self._pendentes >= self.processos + self.tamanho_fila
+            if cheia:
+                self._rejeitadas += 1
+            else:
+                self._pendentes += 1
+        if cheia:
+            logger.warning("Fila de imagens cheia, upload recusado", **self.metricas())
+            raise SobrecargaError(
+                "Muitas imagens sendo processadas no momento. Tente novamente em instantes.",
+                recurso="imagens",
+            )
+
+        try:
+            futuro = self._obter_executor().submit(funcao, *args)
+        except BaseException:
+            self._liberar()
+            raise
+        # A vaga só é devolvida quando o processo termina (mesmo após o timeout)
+        futuro.add_done_callback(self._liberar)
+
+        try:
+            resultado, segundos = await asyncio.wait_for(asyncio.wrap_future(futuro), self.timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._expiradas += 1
+            logger.warning("Tempo esgotado no processamento de imagem", timeout=self.timeout)
+            raise
+        except BrokenProcessPool:
+            # Um processo morreu (ex: falta de memória): recria o pool na próxima imagem
+            with self._lock:
+                self._falhas += 1
+                self._executor = None
+            raise
+        except Exception:
+            with self._lock:
+                self._falhas += 1
+            raise
+
+        with self._lock:
+            self._processadas += 1
+            self._tempo_total += segundos
+            self._tempo_maximo = max(self._tempo_maximo, segundos)
+        logger.info("Imagem processada", tempo_ms=round(segundos * 1000, 1), fila=self.metricas()["fila"])
+        return resultado
+
+    def metricas(self) -> Dict[str, float]:
+        """Profundidade da fila, contadores e tempos de processamento"""
+        with self._lock:
+            return {
+                "fila": max(0, self._pendentes - self.processos),
+                "em_processamento": min(self._pendentes, self.processos),
+                "processadas": self._processadas,
+                "rejeitadas": self._rejeitadas,
+                "expiradas": self._expiradas,
+                "falhas": self._falhas,
+                "tempo_medio_ms": round(self._tempo_total / self._processadas * 1000, 1) if self._processadas else 0.0,
+                "tempo_maximo_ms": round(self._tempo_maximo * 1000, 1),
+            }
+
+    def encerrar(self) -> None:
+        """Encerra os processos (encerramento da aplicação)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+fila_imagens = FilaImagens(
+    processos=int(os.environ.get("IMAGE_WORKERS", ImageConstants.WORKERS)),
+    tamanho_fila=int(os.environ.get("IMAGE_QUEUE_SIZE", ImageConstants.QUEUE_SIZE)),
+    timeout=float(os.environ.get("IMAGE_JOB_TIMEOUT", ImageConstants.JOB_TIMEOUT)),
+)
 
 
 class ImageProcessor:
@@ -26,74 +293,118 @@ class ImageProcessor:
     QUALIDADE_PADRAO = 85
 
     @staticmethod
-    async def processar_e_salvar_imagem(
-        arquivo_upload: UploadFile,
-        caminho_destino: str,
-        tamanho: Tuple[int, int] = (600, 600),
-        qualidade: int = QUALIDADE_PADRAO
-    ) -> Tuple[bool, Optional[str]]:
+    async def _ler_upload(arquivo_upload: UploadFile) -> Tuple[Optional[bytes], Optional[str]]:
         """
-        Processa e salva imagem com validação e redimensionamento.
-
-        Args:
-            arquivo_upload: Arquivo enviado pelo usuário
-            caminho_destino: Caminho onde a imagem será salva
-            tamanho: Tupla (largura, altura) para redimensionamento
-            qualidade: Qualidade da compressão JPEG (0-100)
+        Lê o upload em blocos e devolve (conteudo, mensagem_erro).
 
-        Returns:
-            Tuple[bool, Optional[str]]: (sucesso, mensagem_erro)
-                - (True, None) se sucesso
-                - (False, "mensagem de erro") se falha
+        A leitura para no primeiro bloco se os bytes iniciais não forem de um
+        formato permitido, e assim que o limite de tamanho é ultrapassado; a
+        memória usada fica limitada a TAMANHO_MAXIMO_BYTES mais um bloco. Por
+        fim só o cabeçalho é decodificado, para recusar resoluções acima de
+        ImageConstants.MAX_PIXELS antes do processamento.
         """
-        # Validar tipo de arquivo
+        tipos_formatados = ", ".join([t.split("/")[1].upper() for t in ImageProcessor.TIPOS_PERMITIDOS])
+        erro_tipo = f"Tipo de arquivo inválido. Use: {tipos_formatados}"
+
+        # Validar tipo declarado (o conteúdo é conferido abaixo)
         if arquivo_upload.content_type not in ImageProcessor.TIPOS_PERMITIDOS:
-            tipos_formatados = ", ".join([t.split("/")[1].upper() for t in ImageProcessor.TIPOS_PERMITIDOS])
-            return False, f"Tipo de arquivo inválido. Use: {tipos_formatados}"
+            return None, erro_tipo
+
+        # Validar tamanho informado pelo parser do formulário, quando houver
+        limite = ImageProcessor.TAMANHO_MAXIMO_BYTES
+        if arquivo_upload.size is not None and arquivo_upload.size > limite:
+            tamanho_mb = arquivo_upload.size / (1024 * 1024)
+            return None, f"Arquivo muito grande ({tamanho_mb:.1f}MB). Máximo permitido: {ImageProcessor.TAMANHO_MAXIMO_MB}MB"
 
-        # Ler conteúdo do arquivo
+        # Ler conteúdo do arquivo em blocos
+        conteudo = bytearray()
         try:
-            conteudo = await arquivo_upload.read()
+            while bloco := await arquivo_upload.read(ImageConstants.UPLOAD_CHUNK_SIZE):
+                if not conteudo and _formato_pelos_bytes(bloco) is None:
+                    return None, erro_tipo
+                conteudo += bloco
+                if len(conteudo) > limite:
+                    return None, f"Arquivo muito grande. Máximo permitido: {ImageProcessor.TAMANHO_MAXIMO_MB}MB"
         except Exception as e:
-            return False, f"Erro ao ler arquivo: {str(e)}"
+            return None, f"Erro ao ler arquivo: {str(e)}"
 
-        # Validar tamanho
-        tamanho_mb = len(conteudo) / (1024 * 1024)
-        if len(conteudo) > ImageProcessor.TAMANHO_MAXIMO_BYTES:
-            return False, f"Arquivo muito grande ({tamanho_mb:.1f}MB). Máximo permitido: {ImageProcessor.TAMANHO_MAXIMO_MB}MB"
+        if not conteudo:
+            return None, "Arquivo vazio"
 
+        # Validar cabeçalho (formato e resolução) sem decodificar os pixels
         try:
-            # Abrir imagem com PIL
-            imagem_bytes = BytesIO(conteudo)
-            imagem = Image.open(imagem_bytes)
+            with Image.open(BytesIO(conteudo), formats=FORMATOS_PERMITIDOS) as imagem:
+                _verificar_cabecalho(imagem)
+        except ValueError as e:
+            return None, str(e)
+        except Image.DecompressionBombError:
+            return None, f"Resolução muito alta. Máximo: {ImageConstants.MAX_PIXELS // 1_000_000} megapixels"
+        except Exception:
+            return None, erro_tipo
 
-            # Converter para RGB se necessário (RGBA ou P precisam ser convertidos)
-            if imagem.mode in ("RGBA", "P"):
-                imagem = imagem.convert("RGB")  # type: ignore[assignment]
+        return bytes(conteudo), None
 
-            # Redimensionar mantendo proporção
-            imagem.thumbnail(tamanho, Image.Resampling.LANCZOS)
+    @staticmethod
+    async def _processar_e_gravar(
+        funcao: Callable[..., Tuple[Any, float]],
+        args: Tuple[Any, ...],
+        destinos: Callable[[Any], List[Tuple[str, bytes]]],
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Processa no pool e grava os arquivos produzidos, convertendo falhas em
+        mensagem. A espera pelos dois passos conta como tempo de "imagem" da
+        requisição (Server-Timing).
+        """
+        try:
+            with medir_tempo("imagem"):
+                resultado = await fila_imagens.executar(funcao, *args)
+        except SobrecargaError:
+            raise
+        except asyncio.TimeoutError:
+            return False, "Tempo esgotado ao processar imagem. Tente novamente."
+        except Exception as e:
+            return False, f"Erro ao processar imagem: {str(e)}"
 
-            # Criar imagem quadrada com fundo branco
-            imagem_quadrada = Image.new("RGB", tamanho, (255, 255, 255))
+        try:
+            with medir_tempo("imagem"):
+                await asyncio.to_thread(_gravar_todos, destinos(resultado))
+            return True, None
 
-            # Centralizar a imagem redimensionada no quadrado
-            x = (tamanho[0] - imagem.width) // 2
-            y = (tamanho[1] - imagem.height) // 2
-            imagem_quadrada.paste(imagem, (x, y))
+        except Exception as e:
+            return False, f"Erro ao salvar imagem: {str(e)}"
 
-            # Criar diretório se não existir
-            diretorio = os.path.dirname(caminho_destino)
-            if diretorio:
-                os.makedirs(diretorio, exist_ok=True)
+    @staticmethod
+    async def processar_e_salvar_variantes(
+        arquivo_upload: UploadFile,
+        tipo: TipoArquivo,
+        id_recurso: int,
+        qualidade: int = QUALIDADE_PADRAO
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Processa e salva a imagem em todas as variantes do tipo
+        (FileStorageManager.VARIANTES), em WebP e JPEG.
 
-            # Salvar como JPEG com compressão
-            imagem_quadrada.save(caminho_destino, "JPEG", quality=qualidade, optimize=True)
+        Args:
+            arquivo_upload: Arquivo enviado pelo usuário
+            tipo: Tipo de arquivo (USUARIO ou ITEM)
+            id_recurso: ID do usuário ou item
+            qualidade: Qualidade da compressão JPEG (0-100)
 
-            return True, None
+        Returns:
+            Tuple[bool, Optional[str]]: (sucesso, mensagem_erro)
 
-        except Exception as e:
-            return False, f"Erro ao processar imagem: {str(e)}"
+        Raises:
+            SobrecargaError: Pool de imagens saturado (a rota deve responder 503)
+        """
+        conteudo, erro = await ImageProcessor._ler_upload(arquivo_upload)
+        if conteudo is None:
+            return False, erro
+
+        return await ImageProcessor._processar_e_gravar(
+            _gerar_variantes,
+            (conteudo, FileStorageManager.VARIANTES[tipo], qualidade),
+            lambda arquivos: _destinos_variantes(tipo, id_recurso, arquivos),
+        )
 
     @staticmethod
     def validar_arquivo(arquivo: UploadFile) -> Tuple[bool, Optional[str]]:
@@ -111,3 +422,37 @@ class ImageProcessor:
             return False, f"Tipo de arquivo inválido. Use: {tipos_formatados}"
 
         return True, None
+
+
+def gerar_variantes_faltantes() -> Dict[str, int]:
+    """
+    Gera as variantes das imagens enviadas antes delas existirem, a partir do
+    arquivo principal (que é mantido como está). Roda no próprio processo.
+
+    Returns:
+        Dict[str, int]: Imagens convertidas por tipo
+    """
+    convertidas = {}
+    for tipo in TipoArquivo:
+        principal_por_id = {
+            id_recurso: FileStorageManager.obter_caminho(tipo, id_recurso, fisico=True)
+            for id_recurso in FileStorageManager.listar_arquivos(tipo)
+            if not FileStorageManager.variantes_existem(tipo, id_recurso)
+        }
+        for id_recurso, principal in principal_por_id.items():
+            with open(principal, "rb") as arquivo:
+                arquivos, _ = _gerar_variantes(
+                    arquivo.read(), FileStorageManager.VARIANTES[tipo], ImageProcessor.QUALIDADE_PADRAO
+                )
+            _gravar_todos([
+                (caminho, dados)
+                for caminho, dados in _destinos_variantes(tipo, id_recurso, arquivos)
+                if caminho != principal
+            ])
+        convertidas[tipo.value] = len(principal_por_id)
+    return convertidas
+
+
+if __name__ == "__main__":
+    for tipo, total in gerar_variantes_faltantes().items():
+        print(f"{tipo}: {total} imagem(ns) convertida(s)")
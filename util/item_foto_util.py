@@ -1,5 +1,6 @@
 import os
 from infrastructure.logging import logger
+from util.file_storage import FileStorageManager, TipoArquivo
 
 def obter_caminho_foto_item(item_id: int) -> str:
     """
@@ -37,8 +38,7 @@ def foto_item_existe(item_id: int) -> bool:
     Returns:
         True se a foto existe, False caso contrário
     """
-    caminho_fisico = obter_caminho_foto_item_fisico(item_id)
-    return os.path.exists(caminho_fisico)
+    return FileStorageManager.arquivo_existe(TipoArquivo.ITEM, item_id)
 
 def obter_foto_item_ou_padrao(item_id: int) -> str:
     """
@@ -56,7 +56,7 @@ def obter_foto_item_ou_padrao(item_id: int) -> str:
 
 def excluir_foto_item(item_id: int) -> bool:
     """
-    Exclui a foto do item do sistema de arquivos.
+    Exclui a foto do item (e suas variantes) do sistema de arquivos.
 
     Args:
         item_id: ID do item
@@ -64,18 +64,7 @@ def excluir_foto_item(item_id: int) -> bool:
     Returns:
         True se excluído com sucesso, False caso contrário
     """
-    try:
-        caminho_fisico = obter_caminho_foto_item_fisico(item_id)
-        if os.path.exists(caminho_fisico):
-            os.remove(caminho_fisico)
-            return True
-        return False
-    except Exception as _e:
-        logger.error("Erro ao excluir foto do item",
-            item_id=item_id,
-            exc_info=True
-        )
-        return False
+    return FileStorageManager.excluir(TipoArquivo.ITEM, item_id)
 
 def criar_diretorio_itens() -> bool:
     """
@@ -4,12 +4,83 @@ Helper de paginação para o sistema CaseBem.
 Centraliza lógica de paginação que estava duplicada em múltiplas rotas.
 """
 
-from typing import List, Any, Optional, Dict
+from typing import List, Any, Optional, Dict, Tuple
 from dataclasses import dataclass
+from urllib.parse import urlencode
 from fastapi import Request
+import base64
+import json
 import math
 
 
+# Direções de navegação codificadas no cursor
+CURSOR_NEXT = "proximo"
+CURSOR_PREVIOUS = "anterior"
+
+
+def encode_cursor(direction: str, values: List[Any]) -> str:
+    """
+    Codifica um cursor opaco de paginação keyset.
+
+    Args:
+        direction: CURSOR_NEXT ou CURSOR_PREVIOUS
+        values: Valores da chave de ordenação da linha de referência (ex: [data, id])
+
+    Returns:
+        str: Cursor seguro para URL
+    """
+    payload = json.dumps({"d": direction, "v": values}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key_size: int) -> Tuple[str, List[Any]]:
+    """
+    Decodifica um cursor gerado por encode_cursor.
+
+    Args:
+        cursor: Cursor recebido da URL
+        key_size: Quantidade de valores esperada na chave de ordenação
+
+    Returns:
+        Tuple[str, List[Any]]: Direção e valores da chave
+
+    Raises:
+        ValueError: Se o cursor estiver malformado
+    """
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        direction, values = payload["d"], payload["v"]
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError("Cursor de paginação inválido") from e
+
+    if direction not in (CURSOR_NEXT, CURSOR_PREVIOUS):
+        raise ValueError("Cursor de paginação inválido")
+    if not isinstance(values, list) or len(values) != key_size:
+        raise ValueError("Cursor de paginação inválido")
+    return direction, values
+
+
+@dataclass
+class CursorPageInfo:
+    """Página obtida por paginação keyset (cursor)"""
+    items: List[Any]
+    page_size: int
+    next_cursor: Optional[str] = None
+    previous_cursor: Optional[str] = None
+    total_items: Optional[int] = None  # None quando a contagem foi dispensada
+
+    @property
+    def has_next(self) -> bool:
+        """Se existe página seguinte"""
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self) -> bool:
+        """Se existe página anterior"""
+        return self.previous_cursor is not None
+
+
 @dataclass
 class PageInfo:
     """Informações de paginação"""
@@ -215,3 +286,81 @@ class PaginationHelper:
             'next': build_url(page_info.next_page) if page_info.has_next else None,
             'last': build_url(page_info.total_pages),
         }
+
+    @staticmethod
+    def get_cursor(request: Request) -> Optional[str]:
+        """
+        Extrai o cursor de paginação keyset da query string.
+
+        Returns:
+            Optional[str]: Cursor ou None se ausente
+        """
+        cursor = request.query_params.get("cursor", "").strip()
+        return cursor or None
+
+    @staticmethod
+    def get_cursor_total(request: Request) -> Optional[int]:
+        """
+        Total já calculado, repassado pelos links de cursor.
+
+        Só é considerado junto com um cursor; na primeira página a contagem
+        é sempre refeita.
+
+        Returns:
+            Optional[int]: Total informado na URL ou None
+        """
+        total = request.query_params.get("total", "")
+        if PaginationHelper.get_cursor(request) and total.isdigit():
+            return int(total)
+        return None
+
+    @staticmethod
+    def build_cursor_links(
+        request: Request,
+        page_info: CursorPageInfo,
+        current_page: int = 1,
+        page_param: str = "pagina",
+    ) -> Dict[str, Optional[str]]:
+        """
+        Constrói URLs anterior/próxima para paginação keyset mantendo filtros.
+
+        Além do cursor, os links levam o número da página (apenas para exibição)
+        e o total já calculado, evitando um novo COUNT(*) a cada página.
+
+        Args:
+            request: Request do FastAPI
+            page_info: Página obtida por cursor
+            current_page: Número da página atual (exibição)
+            page_param: Nome do parâmetro de número de página na URL
+
+        Returns:
+            Dict[str, Optional[str]]: URLs 'previous' e 'next' (None se não houver)
+
+        Examples:
+            >>> links = PaginationHelper.build_cursor_links(request, page_info, pagina)
+            >>> # links = {'previous': None, 'next': '/itens?tipo=produto&pagina=2&cursor=eyJk...'}
+        """
+        base_url = str(request.url.path)
+        params = {
+            k: v
+            for k, v in request.query_params.items()
+            if k not in ("cursor", "total", page_param)
+        }
+        if page_info.total_items is not None:
+            params["total"] = str(page_info.total_items)
+
+        def build_url(page: int, cursor: str) -> str:
+            """Constrói URL com cursor e número de página"""
+            query = dict(params, **{page_param: str(page), "cursor": cursor})
+            return f"{base_url}?{urlencode(query)}"
+
+        return {
+            'previous': (
+                build_url(max(1, current_page - 1), page_info.previous_cursor)
+                if page_info.previous_cursor else None
+            ),
+            'next': (
+                build_url(current_page + 1, page_info.next_cursor)
+                if page_info.next_cursor else None
+            ),
+        }
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, List, Optional
 import json
 import os
 from core.models.usuario_model import TipoUsuario
@@ -14,23 +14,52 @@ from core.repositories import (
     demanda_repo,
     orcamento_repo,
 )
+from infrastructure.database import aplicar_migracoes
 from infrastructure.security import criar_hash_senha
 from infrastructure.logging import logger
 
 
+# Repositórios com tabela própria (verificação de índices)
+REPOSITORIOS_TABELAS = [
+    usuario_repo,
+    fornecedor_repo,
+    casal_repo,
+    item_repo,
+    categoria_repo,
+    demanda_repo,
+    orcamento_repo,
+    item_demanda_repo,
+    item_orcamento_repo,
+]
+
+
 def criar_tabelas_banco():
     """
-    Cria todas as tabelas necessárias no banco de dados.
+    Cria/atualiza o esquema do banco aplicando as migrações pendentes.
+    Índices declarados nos módulos SQL que ainda faltarem são criados em seguida.
+    """
+    aplicar_migracoes()
+
+    indices_faltantes = verificar_indices_banco()
+    if indices_faltantes:
+        logger.warning(
+            "Índices ausentes no banco serão criados", indices=indices_faltantes
+        )
+        for repo in REPOSITORIOS_TABELAS:
+            repo.criar_indices()
+
+
+def verificar_indices_banco() -> Dict[str, List[str]]:
+    """
+    Verifica quais índices declarados nos módulos SQL não existem no banco.
+    Retorna um dicionário tabela -> nomes dos índices ausentes.
     """
-    usuario_repo.criar_tabela()
-    fornecedor_repo.criar_tabela()
-    casal_repo.criar_tabela()
-    item_repo.criar_tabela()
-    categoria_repo.criar_tabela()
-    demanda_repo.criar_tabela()
-    orcamento_repo.criar_tabela()
-    item_demanda_repo.criar_tabela()
-    item_orcamento_repo.criar_tabela()
+    faltantes: Dict[str, List[str]] = {}
+    for repo in REPOSITORIOS_TABELAS:
+        ausentes = repo.verificar_indices()
+        if ausentes:
+            faltantes[repo.nome_tabela] = ausentes
+    return faltantes
 
 
 def criar_admin_padrao() -> Optional[int]:
@@ -213,6 +242,7 @@ def criar_categorias():
                     f"Categoria ID {cat_data['id']} '{cat_data['nome']}' criada com sucesso"
                 )
 
+        categoria_repo.cache.invalidar()
         logger.info(f"{len(lista_categorias)} categorias padrão criadas com sucesso!")
 
     except Exception as e:
@@ -661,7 +691,7 @@ def inicializar_sistema():
     Inicializa o sistema executando todas as verificações e configurações necessárias.
 
     Ordem de execução:
-    1. Criar tabelas
+    1. Aplicar migrações do esquema (tabelas e índices)
     2. Criar admin padrão (SEMPRE executa)
     3. Criar categorias padrão
     4. Importar usuários de teste (OPCIONAL - seeds/usuarios.json)
@@ -675,7 +705,7 @@ def inicializar_sistema():
     """
     logger.info("Inicializando sistema CaseBem...")
 
-    # Criar todas as tabelas necessárias
+    # Aplicar migrações pendentes do esquema
     criar_tabelas_banco()
 
     # Criar administrador padrão (SEMPRE executa, independente de seeds)
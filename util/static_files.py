@@ -0,0 +1,46 @@
+"""
+Servidor dos arquivos estáticos com cache de longa duração
+
+Os arquivos pedidos com a versão atual na URL (?v=..., gerada por
+FileStorageManager.versionar) são servidos com Cache-Control immutable por um
+ano: o navegador não volta a pedi-los, nem para revalidar. Os demais (URL sem
+versão ou com uma versão antiga) recebem no-cache e são revalidados pelo ETag.
+Range e If-None-Match ficam por conta do StaticFiles/FileResponse.
+"""
+
+import os
+from starlette.datastructures import Headers, QueryParams
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+from config.constants import CacheConstants
+from util.file_storage import versao_arquivo
+
+
+class ArquivosEstaticos(StaticFiles):
+    """StaticFiles com ETag pela versão do arquivo e Cache-Control immutable"""
+
+    CACHE_IMUTAVEL = f"public, max-age={CacheConstants.STATIC_IMMUTABLE_MAX_AGE}, immutable"
+    CACHE_REVALIDAR = "no-cache"
+
+    def file_response(
+        self,
+        full_path: "os.PathLike[str] | str",
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        versao = versao_arquivo(stat_result)
+        versionada = QueryParams(scope.get("query_string", b"")).get("v") == versao
+        response = FileResponse(
+            full_path,
+            status_code=status_code,
+            stat_result=stat_result,
+            headers={
+                "etag": f'"{versao}"',
+                "cache-control": self.CACHE_IMUTAVEL if versionada else self.CACHE_REVALIDAR,
+            },
+        )
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -6,13 +6,16 @@ from typing import Dict, Any, Optional
 from fastapi import Request
 from fastapi.templating import Jinja2Templates
 from fastapi.responses import Response
+from jinja2 import Template
+from markupsafe import Markup, escape
+from infrastructure.logging import medir_tempo
 from util.flash_messages import get_flashed_messages
 
 # Mantém imports antigos para compatibilidade
 from util.avatar_util import obter_avatar_ou_padrao, obter_caminho_avatar, avatar_existe
 from util.item_foto_util import obter_foto_item_ou_padrao, obter_caminho_foto_item, foto_item_existe
 
-# Imports novos (recomendado usar no futuro) - não usados aqui mas exportados
+# Imports novos (recomendado usar no futuro)
 from util.file_storage import FileStorageManager as _FileStorageManager, TipoArquivo as _TipoArquivo
 
 
@@ -257,6 +260,105 @@ def formatar_data_hora(data_hora):
         return str(data_hora) if data_hora else "Data não disponível"
 
 
+def destacar_trecho(trecho):
+    """
+    Converte o trecho retornado pela busca textual em HTML seguro.
+
+    O texto é escapado e os marcadores \x02/\x03 do snippet() do SQLite
+    viram <mark></mark>.
+
+    Args:
+        trecho: Texto com os termos encontrados entre \x02 e \x03
+
+    Returns:
+        Markup pronto para o template
+    """
+    if not trecho:
+        return ""
+    html = str(escape(trecho)).replace("\x02", "<mark>").replace("\x03", "</mark>")
+    return Markup(html)
+
+
+def imagem_responsiva(tipo: _TipoArquivo, id_recurso: int, sizes: str = "100vw", **atributos) -> Markup:
+    """
+    Renderiza a foto como <picture> com srcset/sizes em WebP e JPEG, para o
+    navegador baixar a menor variante que atende a largura exibida.
+
+    Imagens sem variantes (enviadas antes delas existirem) viram um <img> com o
+    arquivo principal, e recursos sem foto recebem a imagem padrão.
+
+    Args:
+        tipo: Tipo de arquivo (USUARIO ou ITEM)
+        id_recurso: ID do usuário ou item
+        sizes: Largura exibida (atributo sizes), ex: "(min-width: 992px) 33vw, 100vw"
+        **atributos: Atributos do <img> (alt, class_, style, loading...)
+
+    Returns:
+        Markup pronto para o template
+    """
+    html_atributos = "".join(
+        f' {nome.rstrip("_").replace("_", "-")}="{escape(valor)}"'
+        for nome, valor in atributos.items()
+        if valor is not None
+    )
+    if not _FileStorageManager.variantes_existem(tipo, id_recurso):
+        src = _FileStorageManager.obter_ou_padrao(tipo, id_recurso)
+        return Markup(f'<img src="{escape(src)}"{html_atributos}>')
+
+    lados = _FileStorageManager.VARIANTES[tipo]
+    caminhos = _FileStorageManager.caminhos_variantes(tipo, id_recurso)
+
+    def srcset(formato: str) -> str:
+        return ", ".join(
+            f"{_FileStorageManager.versionar(caminhos[(variante, formato)])} {lados[variante]}w"
+            for variante in sorted(lados, key=lambda v: lados[v])
+        )
+
+    principal = _FileStorageManager.versionar(_FileStorageManager.obter_caminho(tipo, id_recurso))
+    return Markup(
+        f'<picture><source type="image/webp" srcset="{srcset("webp")}" sizes="{escape(sizes)}">'
+        f'<img src="{principal}" srcset="{srcset("jpg")}" sizes="{escape(sizes)}"{html_atributos}>'
+        f'</picture>'
+    )
+
+
+def foto_item_responsiva(item_id: int, sizes: str = "100vw", **atributos) -> Markup:
+    """Foto do item com srcset (ver imagem_responsiva)"""
+    return imagem_responsiva(_TipoArquivo.ITEM, item_id, sizes, **atributos)
+
+
+def avatar_responsivo(usuario_id: int, sizes: str = "64px", **atributos) -> Markup:
+    """Avatar do usuário com srcset (ver imagem_responsiva)"""
+    return imagem_responsiva(_TipoArquivo.USUARIO, usuario_id, sizes, **atributos)
+
+
+def url_estatica(caminho: str) -> str:
+    """
+    URL versionada de um arquivo da pasta static, que o navegador guarda em
+    cache até o arquivo mudar.
+
+    Args:
+        caminho: Caminho dentro de static, ex: "css/styles.css"
+
+    Returns:
+        URL com a versão do arquivo, ex: "/static/css/styles.css?v=5f0c3a1e9b7d2c44"
+    """
+    return _FileStorageManager.versionar(f"{_FileStorageManager.STATIC_URL}/{caminho}")
+
+
+class TemplateMedido(Template):
+    """
+    Template que soma o tempo de renderização à categoria "template" do
+    contexto da requisição (Server-Timing). Includes e extends são
+    renderizados dentro do render() do template principal e não contam duas
+    vezes.
+    """
+
+    def render(self, *args: Any, **kwargs: Any) -> str:
+        with medir_tempo("template"):
+            return super().render(*args, **kwargs)
+
+
 def configurar_filtros_jinja(templates: Jinja2Templates):
     """
     Configura filtros customizados para os templates Jinja2
@@ -267,13 +369,18 @@ def configurar_filtros_jinja(templates: Jinja2Templates):
     templates.env.filters['moeda'] = formatar_moeda
     templates.env.filters['formatar_data'] = formatar_data
     templates.env.filters['formatar_data_hora'] = formatar_data_hora
+    templates.env.filters['destacar_trecho'] = destacar_trecho
     templates.env.globals['obter_avatar_ou_padrao'] = obter_avatar_ou_padrao
     templates.env.globals['obter_caminho_avatar'] = obter_caminho_avatar
     templates.env.globals['avatar_existe'] = avatar_existe
     templates.env.globals['obter_foto_item_ou_padrao'] = obter_foto_item_ou_padrao
     templates.env.globals['obter_caminho_foto_item'] = obter_caminho_foto_item
     templates.env.globals['foto_item_existe'] = foto_item_existe
+    templates.env.globals['foto_item_responsiva'] = foto_item_responsiva
+    templates.env.globals['avatar_responsivo'] = avatar_responsivo
+    templates.env.globals['url_estatica'] = url_estatica
     templates.env.globals['get_active_page_from_url'] = get_active_page_from_url
+    templates.env.template_class = TemplateMedido
 
 
 class TemplateRenderer: